@@ -0,0 +1,175 @@
+# Пакетна адресна арифметика IPv4 для генераторів.
+#
+# Маски, CIDR-префікси та IP-адреси розбираються в 32-бітні цілі один раз,
+# а wildcard і маски обчислюються для всього списку разом. Рядків масок у
+# таблиці маршрутів небагато (до 33 різних префіксів плюс рідкісні
+# нестандартні), тому розбір масок кешується за значенням.
+#
+# parse_address()/parse_netmask() — строгий розбір для валідаторів
+# (backend/validate.py) з тими ж правилами, що в ipaddress, але без
+# створення об'єктів: результат — 32-бітне ціле, спільне для всіх перевірок.
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+_FULL = 0xFFFFFFFF
+_OCTETS = tuple(str(i) for i in range(256))
+# Октет у строгій формі ipaddress: ASCII-цифри, 0-255, без ведучих нулів
+_OCTET = r'(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_RE_STRICT_IPV4 = re.compile(r'\.'.join([_OCTET] * 4))
+
+
+def int_to_ipv4(value: int) -> str:
+    # 32-бітне ціле -> dotted-decimal.
+    return ".".join((
+        _OCTETS[(value >> 24) & 0xFF], _OCTETS[(value >> 16) & 0xFF],
+        _OCTETS[(value >> 8) & 0xFF], _OCTETS[value & 0xFF],
+    ))
+
+
+# Маска і wildcard для кожного префіксу 0–32
+PREFIX_MASKS = tuple(int_to_ipv4((_FULL << (32 - p)) & _FULL) for p in range(33))
+PREFIX_WILDCARDS = tuple(int_to_ipv4(~(_FULL << (32 - p)) & _FULL) for p in range(33))
+
+
+def ipv4_to_int(ip: str) -> Optional[int]:
+    # Dotted-decimal -> 32-бітне ціле; None, якщо рядок не є IPv4-адресою.
+    if not isinstance(ip, str):
+        return None
+    parts = ip.strip().split(".")
+    if len(parts) != 4:
+        return None
+    value = 0
+    for part in parts:
+        if not part.isdecimal():
+            return None
+        octet = int(part)
+        if octet > 255:
+            return None
+        value = (value << 8) | octet
+    return value
+
+
+@lru_cache(maxsize=1024)
+def mask_to_int(mask: str) -> Optional[int]:
+    # Subnet mask або CIDR-префікс -> 32-бітна маска.
+    #
+    # Приймає dotted-decimal (``"255.255.255.0"``), CIDR без або з косою
+    # рискою (``"24"``, ``"/24"``). Dotted-маска не перевіряється на
+    # неперервність бітів — як і в попередній логіці генераторів.
+    #
+    # Returns:
+    #     int | None: Маска або None, якщо рядок некоректний.
+    if not mask or not isinstance(mask, str):
+        return None
+    mask = mask.strip()
+    prefix = mask[1:] if mask.startswith("/") else mask
+    if prefix.isdecimal():
+        cidr = int(prefix)
+        if 0 <= cidr <= 32:
+            return (_FULL << (32 - cidr)) & _FULL
+    return ipv4_to_int(mask)
+
+
+@lru_cache(maxsize=1024)
+def wildcard(mask: str, default: str = "0.0.0.0") -> str:
+    # Wildcard для однієї маски/CIDR; `default` для некоректних значень.
+    bits = mask_to_int(mask) if isinstance(mask, str) else None
+    if bits is None:
+        return default
+    return int_to_ipv4(~bits & _FULL)
+
+
+@lru_cache(maxsize=1024)
+def dotted_mask(mask: str, default: str = "255.255.255.0") -> str:
+    # Маска/CIDR у dotted-decimal; `default` для некоректних значень.
+    bits = mask_to_int(mask) if isinstance(mask, str) else None
+    if bits is None:
+        return default
+    return int_to_ipv4(bits)
+
+
+def cidr_mask(cidr: int, default: str = "255.255.255.0") -> str:
+    # CIDR-префікс (ціле) -> dotted-decimal маска з таблиці PREFIX_MASKS.
+    if isinstance(cidr, int) and 0 <= cidr <= 32:
+        return PREFIX_MASKS[cidr]
+    return default
+
+
+def wildcards(masks: Iterable[str], default: str = "0.0.0.0") -> list[str]:
+    # Wildcard для кожної маски списку; кожне унікальне значення
+    # розбирається і форматується один раз.
+    memo = {}
+    out = []
+    for mask in masks:
+        try:
+            out.append(memo[mask])
+        except KeyError:
+            memo[mask] = result = wildcard(mask, default)
+            out.append(result)
+        except TypeError:  # нехешовані значення (список тощо) — некоректні
+            out.append(default)
+    return out
+
+
+def dotted_masks(masks: Iterable[str], default: str = "255.255.255.0") -> list[str]:
+    # dotted_mask() для кожного елемента списку з кешуванням унікальних значень.
+    memo = {}
+    out = []
+    for mask in masks:
+        try:
+            out.append(memo[mask])
+        except KeyError:
+            memo[mask] = result = dotted_mask(mask, default)
+            out.append(result)
+        except TypeError:
+            out.append(default)
+    return out
+
+
+@lru_cache(maxsize=4096)
+def parse_address(text: str) -> Optional[int]:
+    # Строгий розбір IPv4-адреси -> 32-бітне ціле (None, якщо некоректна).
+    #
+    # Приймає рівно те, що ``ipaddress.IPv4Address(text)``: чотири октети
+    # з ASCII-цифр 0-255 без ведучих нулів і без пробілів.
+    #
+    # Examples:
+    # >>> parse_address("192.168.1.1")
+    # 3232235777
+    # >>> parse_address("192.168.01.1") is None
+    # True
+    match = _RE_STRICT_IPV4.fullmatch(text)
+    if match is None:
+        return None
+    a, b, c, d = match.groups()
+    return int(a) << 24 | int(b) << 16 | int(c) << 8 | int(d)
+
+
+def is_contiguous(mask: int) -> bool:
+    # Маска складається з неперервних одиниць зліва (255.255.0.0, а не 255.0.255.0).
+    inverted = ~mask & _FULL
+    return inverted & (inverted + 1) == 0
+
+
+@lru_cache(maxsize=256)
+def parse_netmask(text: str) -> Optional[int]:
+    # Строгий розбір маски -> 32-бітна маска мережі (None, якщо некоректна).
+    #
+    # Приймає те, що ``ipaddress.ip_network(f"0.0.0.0/{text}")``: префікс
+    # ``0``-``32`` (ASCII-цифри), неперервну маску ``255.255.255.0`` або
+    # hostmask ``0.0.0.255`` (інвертується).
+    #
+    # Examples:
+    # >>> parse_netmask("24") == parse_netmask("255.255.255.0") == parse_netmask("0.0.0.255")
+    # True
+    if text.isascii() and text.isdigit():
+        prefix = int(text)
+        return (_FULL << (32 - prefix)) & _FULL if prefix <= 32 else None
+    bits = parse_address(text)
+    if bits is None:
+        return None
+    if is_contiguous(bits):
+        return bits
+    inverted = ~bits & _FULL
+    return inverted if is_contiguous(inverted) else None
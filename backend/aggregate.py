@@ -0,0 +1,148 @@
+# Агрегація префіксів для статичних маршрутів і BGP network.
+#
+# Опціональний прохід (routing_config["aggregatePrefixes"]). Статичні
+# маршрути замінюються суперсетями, що зменшує кількість рядків без зміни
+# маршрутизації за longest-prefix match. BGP ``network`` не переписуються
+# (анонс вимагає точного збігу в RIB): для них bgp_aggregates() лише
+# знаходить суперсети для ``aggregate-address``. Алгоритм:
+#
+# 1. Злиття сусідів: два сусідні префікси /n з однаковими атрибутами
+#    (next hop, інтерфейс, AD, metric) замінюються батьківським /n-1, якщо
+#    батьківського префікса з іншими атрибутами в таблиці немає. Злиття
+#    повторюється вгору по рівнях (чотири /24 -> /22).
+# 2. Поглинання: префікс, найближчий охоплюючий префікс якого має ті самі
+#    атрибути, видаляється — трафік і так піде тим самим шляхом.
+#
+# Однакові префікси з різними атрибутами (ECMP) розглядаються як одна
+# множина атрибутів і зливаються лише з такою ж множиною. Записи з
+# некоректною адресою, нерегулярною маскою або хостовими бітами в адресі
+# не агрегуються і виводяться без змін.
+#
+# Складність: O(n * 32) для злиття і поглинання плюс O(n log n) на
+# сортування результату.
+from typing import Iterable
+
+from .addrmath import PREFIX_MASKS, int_to_ipv4, ipv4_to_int, mask_to_int
+from .ir import BgpNetwork, StaticRoute
+
+_FULL = 0xFFFFFFFF
+
+
+def prefix_of(address: str, mask: str):
+    # (network, prefixlen) для пари адреса/маска або None, якщо пару не можна
+    # безпечно агрегувати (некоректна адреса, нерегулярна маска, хостові біти).
+    net = ipv4_to_int(address)
+    bits = mask_to_int(mask) if isinstance(mask, str) else None
+    if net is None or bits is None:
+        return None
+    host = ~bits & _FULL
+    if host & (host + 1) or net & host:
+        return None
+    return net, 32 - host.bit_length()
+
+
+def collapse(table: dict) -> dict:
+    # Агрегує таблицю {(network, prefixlen): frozenset(attrs)}.
+    #
+    # Returns:
+    #     dict: Нова таблиця того ж формату з тією самою поведінкою LPM.
+    levels = [{} for _ in range(33)]
+    for (net, plen), attrs in table.items():
+        levels[plen][net] = attrs
+
+    # 1. Злиття сусідів знизу вгору
+    for plen in range(32, 0, -1):
+        level = levels[plen]
+        parent_level = levels[plen - 1]
+        bit = 1 << (32 - plen)
+        for net in [n for n in level if not n & bit]:
+            attrs = level.get(net)
+            if attrs is None or level.get(net | bit) != attrs:
+                continue
+            if parent_level.get(net, attrs) != attrs:
+                continue
+            del level[net], level[net | bit]
+            parent_level[net] = attrs
+
+    # 2. Поглинання найближчим охоплюючим префіксом з тими ж атрибутами
+    result = {}
+    for plen, level in enumerate(levels):
+        for net, attrs in level.items():
+            anc_attrs = None
+            for anc_len in range(plen - 1, -1, -1):
+                anc_attrs = levels[anc_len].get(net & ((_FULL << (32 - anc_len)) & _FULL))
+                if anc_attrs is not None:
+                    break
+            if anc_attrs != attrs:
+                result[(net, plen)] = attrs
+    return result
+
+
+def _aggregate(items: Iterable, prefix, attrs, build) -> tuple[list, int]:
+    # Спільна частина aggregate_*: будує таблицю, агрегує і відновлює вузли.
+    #
+    # prefix(item) -> (address, mask), attrs(item) -> tuple,
+    # build(address, mask, attrs) -> вузол IR.
+    table = {}
+    passthrough = []
+    total = 0
+    for item in items:
+        total += 1
+        key = prefix_of(*prefix(item))
+        if key is None:
+            passthrough.append(item)
+            continue
+        table[key] = table.get(key, frozenset()) | {attrs(item)}
+
+    out = []
+    for (net, plen), attr_set in sorted(collapse(table).items()):
+        address, mask = int_to_ipv4(net), PREFIX_MASKS[plen]
+        for item_attrs in sorted(attr_set, key=str):
+            out.append(build(address, mask, item_attrs))
+    out.extend(passthrough)
+    return out, total - len(out)
+
+
+def aggregate_static_routes(routes: Iterable[StaticRoute]) -> tuple[list[StaticRoute], int]:
+    # Агрегує статичні маршрути з однаковими next hop / інтерфейсом / AD / metric.
+    #
+    # Args:
+    #     routes (Iterable[StaticRoute]): Маршрути з dotted-decimal масками.
+    #
+    # Returns:
+    #     tuple[list[StaticRoute], int]: Маршрути, відсортовані за префіксом
+    #     (неагреговані — в кінці у вихідному порядку), та кількість
+    #     зекономлених рядків ``ip route``.
+    return _aggregate(
+        routes,
+        lambda r: (r.dest, r.mask),
+        lambda r: (r.next_hop, r.interface, r.ad, r.metric),
+        lambda address, mask, a: StaticRoute(address, mask, *a),
+    )
+
+
+def bgp_aggregates(networks: Iterable[BgpNetwork]) -> list[BgpNetwork]:
+    # Суперсети для ``aggregate-address ... summary-only`` над BGP network.
+    #
+    # Рядки ``network ... mask`` лишаються без змін: BGP анонсує їх лише за
+    # точного збігу в RIB, тож переписана суперсеть не анонсувалася б зовсім.
+    # Повертаються лише нові префікси, які складаються цілком з анонсованих
+    # мереж (злиття сусідів), тож aggregate-address охоплює той самий
+    # адресний простір, а роутер генерує його, поки є хоча б одна складова.
+    #
+    # Returns:
+    #     list[BgpNetwork]: Суперсети, відсортовані за префіксом.
+    #
+    # Examples:
+    # >>> bgp_aggregates([BgpNetwork("10.2.0.0", "255.255.255.0"), BgpNetwork("10.2.1.0", "255.255.255.0")])
+    # [BgpNetwork(ip='10.2.0.0', mask_str='255.255.254.0')]
+    table = {}
+    for network in networks:
+        key = prefix_of(network.ip, network.mask_str)
+        if key is not None:
+            table[key] = frozenset({()})
+    return [
+        BgpNetwork(int_to_ipv4(net), PREFIX_MASKS[plen])
+        for net, plen in sorted(collapse(table))
+        if (net, plen) not in table
+    ]
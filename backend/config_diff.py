@@ -0,0 +1,262 @@
+# Ієрархічний парсер конфігурації IOS і обчислення дельти для деплою.
+#
+# Обидві конфігурації — `show running-config` роутера і згенерована
+# майстром — розбираються в дерево ConfigNode за відступами. Діти кожного
+# вузла індексовані нормалізованим рядком (словник), тож порівняння
+# блоку — O(кількість рядків). config_delta() повертає команди, які
+# переводять running-config у згенерований стан:
+#
+# - рядки/блоки, яких немає на роутері, додаються (з батьківським рядком
+#   і ``exit``);
+# - застарілі рядки видаляються ``no``-формою, але лише в межах, якими
+#   керує майстер (REMOVABLE): решта конфігурації роутера не чіпається;
+# - однозначні параметри (hostname, ip address, router-id тощо) не
+#   видаляються — новий рядок замінює старе значення;
+# - ``no X`` у цілі вважається виконаним, якщо на роутері немає ``X``.
+#
+# config_removals() перелічує рядки running-config, які дельта видалить, —
+# UI показує їх перед деплоєм (дельта-деплой вмикається лише явно).
+#
+# Паролі та секрети роутер показує в зашифрованому вигляді, тому такі
+# рядки завжди потрапляють у дельту (повторне застосування безпечне).
+import re
+from typing import Iterable, Optional, Union
+
+# Рядки, що не є частиною конфігурації (режими CLI, службові заголовки)
+_SKIP_LINES = frozenset({"end", "exit", "enable", "configure terminal", "conf t", "write memory", "wr", "write"})
+_SKIP_PREFIXES = ("!", "Building configuration", "Current configuration")
+
+# Які застарілі рядки видаляти: префікс батьківського рядка -> префікси дітей.
+# "" — верхній рівень конфігурації.
+REMOVABLE = {
+    "": (
+        "ip route ", "ip dhcp excluded-address ", "ip nat inside source ", "access-list 1 ",
+        "snmp-server community ", "snmp-server host ", "ip multicast-routing",
+        "router ", "ephone-dn ", "ephone ",
+    ),
+    "interface ": ("ip nat ", "ip pim ", "ip router isis"),
+    "router ": ("network ", "neighbor "),
+    "ip dhcp pool ": ("option 150 ",),
+    "ephone ": ("mac-address ", "name "),
+}
+
+# Одноразові команди, що не зберігаються в running-config: надсилаються,
+# лише якщо на роутері ще немає рядка-ознаки їх виконання.
+ONE_SHOT = {
+    "crypto key generate": "ip ssh version 2",
+}
+
+# Повні назви інтерфейсів для нормалізації скорочень (Gi0/0 -> GigabitEthernet0/0)
+_INTERFACE_NAMES = (
+    "GigabitEthernet", "FastEthernet", "TenGigabitEthernet", "Ethernet", "Serial",
+    "Loopback", "Vlan", "Port-channel", "Tunnel", "Dialer", "Virtual-Template",
+)
+_INTERFACE_RE = re.compile(r"^([A-Za-z-]+)(\d[\d/.:]*)$")
+
+
+def _expand_interface(name: str) -> str:
+    # Розгортає скорочену назву інтерфейсу; невідомі назви повертаються як є.
+    match = _INTERFACE_RE.match(name)
+    if not match:
+        return name
+    prefix, number = match.groups()
+    prefix_lower = prefix.lower()
+    for full in _INTERFACE_NAMES:
+        if full.lower().startswith(prefix_lower):
+            return full + number
+    return name
+
+
+# Форми команд, які IOS показує в running-config інакше, ніж їх вводять
+_DISPLAY_ALIASES = (
+    ("line console ", "line con "),
+    ("ip domain-name ", "ip domain name "),
+)
+
+
+def normalize(line: str) -> str:
+    # Ключ рядка для порівняння: без зайвих пробілів, з повними назвами
+    # інтерфейсів після слова ``interface`` і у формі, яку показує IOS.
+    tokens = line.split()
+    for i in range(1, len(tokens)):
+        if tokens[i - 1].lower() == "interface":
+            tokens[i] = _expand_interface(tokens[i])
+    key = " ".join(tokens)
+    for entered, shown in _DISPLAY_ALIASES:
+        if key.startswith(entered):
+            return shown + key[len(entered):]
+    return key
+
+
+class ConfigNode:
+    # Вузол дерева конфігурації: рядок команди і впорядковані діти.
+    __slots__ = ("line", "children")
+
+    def __init__(self, line: str = ""):
+        # line — команда без відступу (порожня для кореня).
+        self.line = line
+        self.children = {}
+
+    def child(self, line: str) -> "ConfigNode":
+        # Повертає (створюючи за потреби) дочірній вузол для рядка.
+        key = normalize(line)
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = ConfigNode(line)
+        return node
+
+    def lines(self, depth: int = 0) -> list[str]:
+        # Рядки піддерева з відступами (без самого вузла).
+        out = []
+        for node in self.children.values():
+            out.append(" " * depth + node.line)
+            out.extend(node.lines(depth + 1))
+        return out
+
+
+def parse_config(config: Union[str, Iterable[str]]) -> ConfigNode:
+    # Розбирає конфігурацію IOS у дерево за відступами.
+    #
+    # Args:
+    #     config (str | Iterable[str]): Текст (наприклад, вивід
+    #         ``show running-config``) або список рядків генератора.
+    #
+    # Returns:
+    #     ConfigNode: Корінь дерева. Однакові блоки (``interface Gi0/0``
+    #     у секціях інтерфейсів і multicast) зливаються в один вузол.
+    if isinstance(config, str):
+        config = config.splitlines()
+    root = ConfigNode()
+    stack = [(-1, root)]
+    for raw in config:
+        stripped = raw.strip()
+        if not stripped or stripped in _SKIP_LINES or stripped.startswith(_SKIP_PREFIXES):
+            continue
+        indent = len(raw) - len(raw.lstrip())
+        while stack[-1][0] >= indent:
+            stack.pop()
+        node = stack[-1][1].child(stripped)
+        stack.append((indent, node))
+    return root
+
+
+def negate(line: str) -> str:
+    # ``X`` -> ``no X``, ``no X`` -> ``X``.
+    return line[3:] if line.startswith("no ") else "no " + line
+
+
+def _removable_prefixes(parent_key: str) -> tuple:
+    # Префікси дітей, які можна видаляти в блоці з ключем parent_key.
+    if not parent_key:
+        return REMOVABLE[""]
+    for prefix, children in REMOVABLE.items():
+        if prefix and parent_key.startswith(prefix):
+            return children
+    return ()
+
+
+def _emit(node: ConfigNode, depth: int) -> list[str]:
+    # Повний блок для додавання: рядок, діти та ``exit`` для блоків.
+    out = [" " * depth + node.line]
+    if node.children:
+        for child in node.children.values():
+            out.extend(_emit(child, depth + 1))
+        out.append(" " * (depth + 1) + "exit")
+    return out
+
+
+def _block_delta(
+    running: ConfigNode, target: ConfigNode, parent_key: str, depth: int,
+    skip=frozenset(), removed: Optional[list] = None, context: str = ""
+) -> list[str]:
+    # Дельта дітей одного блоку: спочатку видалення, потім додавання.
+    # skip — ключі цілі, які не надсилати (виконані одноразові команди);
+    # removed — список, куди додаються видалені рядки роутера (з батьківським
+    # рядком через " > ", context — шлях до поточного блоку).
+    indent = " " * depth
+    where = context + " > " if context else ""
+    out = []
+
+    removable = _removable_prefixes(parent_key)
+    # Нумерований ACL видаляється лише цілком (``no access-list 1 ...``
+    # прибирає весь список), тож після видалення його рядки цілі
+    # надсилаються повторно.
+    reset_acls = set()
+    if removable:
+        for key, node in running.children.items():
+            if key not in target.children and key.startswith(removable):
+                if key.startswith("access-list "):
+                    acl = key.split()[1]
+                    if acl not in reset_acls:
+                        reset_acls.add(acl)
+                        out.append(indent + f"no access-list {acl}")
+                    if removed is not None:
+                        removed.append(where + node.line)
+                    continue
+                out.append(indent + negate(node.line))
+                if removed is not None:
+                    removed.append(where + node.line)
+
+    for key, node in target.children.items():
+        if key in skip:
+            continue
+        if key.startswith("no ") and (key in running.children or key[3:] not in running.children):
+            continue
+        current = running.children.get(key)
+        if current is not None and reset_acls and key.startswith("access-list ") and key.split()[1] in reset_acls:
+            current = None
+        if current is None:
+            out.extend(_emit(node, depth))
+        elif node.children:
+            inner = _block_delta(current, node, key, depth + 1, removed=removed, context=where + current.line)
+            if inner:
+                out.append(indent + node.line)
+                out.extend(inner)
+                out.append(indent + " exit")
+    return out
+
+
+def diff_trees(running: ConfigNode, target: ConfigNode, removed: Optional[list] = None) -> list[str]:
+    # Команди, що переводять дерево `running` у стан `target`; видалені
+    # рядки роутера додаються в `removed` (якщо передано).
+    done = {
+        key for key in target.children
+        for prefix, marker in ONE_SHOT.items()
+        if key.startswith(prefix) and marker in running.children
+    }
+    return _block_delta(running, target, "", 0, done, removed)
+
+
+def config_delta(running_config: Union[str, Iterable[str]], target_config: Iterable[str]) -> list[str]:
+    # Мінімальний набір команд конфігурації для деплою.
+    #
+    # Args:
+    #     running_config: Вивід ``show running-config`` (текст або рядки).
+    #     target_config: Згенерована конфігурація (рядки generate_full_config()).
+    #
+    # Returns:
+    #     list[str]: Команди для send_config_set() (без ``end``/``write memory``);
+    #     порожній список, якщо роутер уже в цільовому стані.
+    #
+    # Examples:
+    # >>> config_delta("hostname R1\n", ["hostname R1", "ip route 0.0.0.0 0.0.0.0 10.0.0.2"])
+    # ['ip route 0.0.0.0 0.0.0.0 10.0.0.2']
+    return diff_trees(parse_config(running_config), parse_config(target_config))
+
+
+def config_removals(running_config: Union[str, Iterable[str]], target_config: Iterable[str]) -> list[str]:
+    # Рядки running-config, які config_delta() видалить (``no``-формою).
+    #
+    # Args:
+    #     running_config: Вивід ``show running-config`` (текст або рядки).
+    #     target_config: Згенерована конфігурація.
+    #
+    # Returns:
+    #     list[str]: Рядки роутера; вкладені — з батьківським рядком через " > ".
+    #
+    # Examples:
+    # >>> config_removals(["router rip", " network 10.0.0.0", "ip route 0.0.0.0 0.0.0.0 10.0.0.2"], ["router rip", " network 10.1.0.0"])
+    # ['ip route 0.0.0.0 0.0.0.0 10.0.0.2', 'router rip > network 10.0.0.0']
+    removed = []
+    diff_trees(parse_config(running_config), parse_config(target_config), removed)
+    return removed
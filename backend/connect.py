@@ -1,11 +1,46 @@
 import logging
-from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticationException
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from .config_diff import config_delta, config_removals
+    from .pipeline import PIPELINE_WINDOW, map_errors, send_config_pipelined, source_lines
+    from .transfer import copy_config, copy_errors, shared_server
+    from . import timing
+except ImportError:
+    from config_diff import config_delta, config_removals
+    from pipeline import PIPELINE_WINDOW, map_errors, send_config_pipelined, source_lines
+    from transfer import copy_config, copy_errors, shared_server
+    import timing
+
+# netmiko (paramiko, cryptography) імпортується в connect() при першому
+# підключенні: генерація конфігурації не потребує стеку SSH/Telnet.
 
 logger = logging.getLogger(__name__)
 
+# Верхня межа очікування prompt після end / write memory (запис NVRAM
+# на старих роутерах триває секунди); netmiko повертається раніше.
+_TERMINAL_TIMEOUT = 30.0
+
+# Рядки генератора, що лише перемикають режими CLI. send_config_set() сам
+# входить у config mode і виходить з нього, тож у конфігурації всередині
+# (config)# IOS відповів би на них "% Invalid input" / "% Incomplete command".
+_MODE_COMMANDS = frozenset({"enable", "configure terminal", "conf t", "end"})
+
+# Потоковий вивід деплою: команд рядкового режиму між подіями прогресу,
+# мінімальний інтервал між подіями (секунди) і розмір хвоста виводу в
+# результаті, коли повний вивід пишеться в spool-файл
+_STREAM_LINES = 10
+PROGRESS_INTERVAL = 0.1
+OUTPUT_TAIL = 16 * 1024
+
 # Глобальний стан з'єднання з роутером
 _connection = None
 _connection_info = {}
+# connect/disconnect/deploy з GUI виконуються в пулі потоків (backend/tasks.py):
+# операції над спільним з'єднанням не повинні перекриватися
+_session_lock = threading.RLock()
 
 
 def get_connection_state() -> dict:
@@ -19,38 +54,31 @@ def get_connection_state() -> dict:
     }
 
 
-def connect(
+def open_connection(
     host: str,
     port: int = 23,
     username: str = "",
     password: str = "",
     enable_secret: str = "",
     timeout: int = 15
-) -> dict:
-    # Встановлює Telnet-з'єднання з Cisco роутером через netmiko.
+):
+    # Відкриває нове Telnet-з'єднання netmiko і за потреби входить у enable.
     #
-    # Args:
-    #     host (str): IP-адреса роутера.
-    #     port (int): Telnet-порт (за замовчуванням 23).
-    #     username (str): Ім'я користувача (може бути порожнім для no-auth VTY).
-    #     password (str): Пароль для VTY-лінії.
-    #     enable_secret (str): Enable secret для привілейованого режиму.
-    #     timeout (int): Таймаут підключення у секундах.
+    # Спільна для інтерактивного connect() і пулу з'єднань (backend/deploy.py).
+    # Аргументи ті ж, що й у connect(). Паузи netmiko беруться з профілю
+    # таймінгів роутера (backend/timing.py), який уточнюється вимірюванням
+    # відповіді prompt одразу після входу і зберігається в з'єднанні
+    # (атрибут timing_profile) для push_config().
     #
     # Returns:
-    #     dict: {"ok": bool, "error": str}
-
-    global _connection, _connection_info
-
-    # Закриваємо попереднє з'єднання якщо є
-    if _connection is not None:
-        try:
-            _connection.disconnect()
-        except Exception:
-            pass
-        _connection = None
-        _connection_info = {}
+    #     netmiko-з'єднання (BaseConnection).
+    #
+    # Raises:
+    #     NetmikoAuthenticationException, NetmikoTimeoutException та інші
+    #     помилки підключення (див. connection_error()).
+    from netmiko import ConnectHandler
 
+    profile = timing.profiles.get(host, port)
     device_params = {
         "device_type": "cisco_ios_telnet",
         "host": host.strip(),
@@ -62,38 +90,87 @@ def connect(
         "session_timeout": 60,
         "conn_timeout": timeout,
         # Дозволяє підключення без username (no login / login local)
-        "global_delay_factor": 2,
+        "global_delay_factor": profile.delay_factor,
     }
 
-    logger.info(f"Підключення до роутера {host}:{port} (user='{username or 'noauth'}')")
+    conn = ConnectHandler(**device_params)
+
+    # Входимо в privileged exec якщо є enable_secret
+    if enable_secret:
+        try:
+            conn.enable()
+            logger.info(f"Успішно активовано privileged exec на {host}")
+        except Exception as e:
+            logger.warning(f"Не вдалося увійти в enable mode: {e}")
 
     try:
-        conn = ConnectHandler(**device_params)
+        timing.measure_prompt_rtt(conn, profile)
+        timing.apply(conn, profile)
+        logger.info(f"Таймінги {host}:{port}: {profile!r}, delay_factor={profile.delay_factor:.2f}")
+    except Exception as e:
+        logger.warning(f"Не вдалося виміряти затримку {host}:{port}: {e}")
+    conn.timing_profile = profile
+    timing.profiles.save()
+    return conn
 
-        # Входимо в privileged exec якщо є enable_secret
-        if enable_secret:
-            try:
-                conn.enable()
-                logger.info(f"Успішно активовано privileged exec на {host}")
-            except Exception as e:
-                logger.warning(f"Не вдалося увійти в enable mode: {e}")
 
-        _connection = conn
-        _connection_info = {"host": host, "port": port}
-        logger.info(f"З'єднання з {host}:{port} встановлено успішно")
-        return {"ok": True, "error": ""}
+def connection_error(e: Exception, host: str, port: int, timeout: int) -> str:
+    # Логує помилку підключення і повертає текст для UI/результату деплою.
+    from netmiko import NetmikoTimeoutException, NetmikoAuthenticationException
 
-    except NetmikoAuthenticationException as e:
+    if isinstance(e, NetmikoAuthenticationException):
         logger.error(f"Помилка автентифікації при підключенні до {host}: {e}")
-        return {"ok": False, "error": f"Authentication failed: {str(e)}"}
-
-    except NetmikoTimeoutException as e:
+        return f"Authentication failed: {str(e)}"
+    if isinstance(e, NetmikoTimeoutException):
         logger.error(f"Timeout при підключенні до {host}:{port}: {e}")
-        return {"ok": False, "error": f"Connection timeout ({timeout}s): check IP and port"}
+        return f"Connection timeout ({timeout}s): check IP and port"
+    logger.error(f"Невідома помилка при підключенні до {host}: {e}")
+    return str(e)
 
-    except Exception as e:
-        logger.error(f"Невідома помилка при підключенні до {host}: {e}")
-        return {"ok": False, "error": str(e)}
+
+def connect(
+    host: str,
+    port: int = 23,
+    username: str = "",
+    password: str = "",
+    enable_secret: str = "",
+    timeout: int = 15
+) -> dict:
+    # Встановлює Telnet-з'єднання з Cisco роутером через netmiko.
+    #
+    # Args:
+    #     host (str): IP-адреса роутера.
+    #     port (int): Telnet-порт (за замовчуванням 23).
+    #     username (str): Ім'я користувача (може бути порожнім для no-auth VTY).
+    #     password (str): Пароль для VTY-лінії.
+    #     enable_secret (str): Enable secret для привілейованого режиму.
+    #     timeout (int): Таймаут підключення у секундах.
+    #
+    # Returns:
+    #     dict: {"ok": bool, "error": str}
+
+    global _connection, _connection_info
+
+    with _session_lock:
+        # Закриваємо попереднє з'єднання якщо є
+        if _connection is not None:
+            try:
+                _connection.disconnect()
+            except Exception:
+                pass
+            _connection = None
+            _connection_info = {}
+
+        logger.info(f"Підключення до роутера {host}:{port} (user='{username or 'noauth'}')")
+
+        try:
+            _connection = open_connection(host, port, username, password, enable_secret, timeout)
+            _connection_info = {"host": host, "port": port}
+            logger.info(f"З'єднання з {host}:{port} встановлено успішно")
+            return {"ok": True, "error": ""}
+
+        except Exception as e:
+            return {"ok": False, "error": connection_error(e, host, port, timeout)}
 
 
 def disconnect() -> dict:
@@ -104,82 +181,322 @@ def disconnect() -> dict:
 
     global _connection, _connection_info
 
-    if _connection is None:
+    with _session_lock:
+        if _connection is None:
+            return {"ok": True}
+
+        try:
+            _connection.disconnect()
+            logger.info(f"З'єднання з {_connection_info.get('host', '?')} закрито")
+        except Exception as e:
+            logger.warning(f"Помилка при закритті з'єднання: {e}")
+        finally:
+            _connection = None
+            _connection_info = {}
+
         return {"ok": True}
 
-    try:
-        _connection.disconnect()
-        logger.info(f"З'єднання з {_connection_info.get('host', '?')} закрито")
-    except Exception as e:
-        logger.warning(f"Помилка при закритті з'єднання: {e}")
-    finally:
-        _connection = None
-        _connection_info = {}
 
-    return {"ok": True}
+def split_config(config_lines: list[str]) -> tuple[list[str], list[str]]:
+    # Відокремлює термінальні команди від основного конфігу: "write memory"
+    # не можна надсилати через send_config_set.
+    #
+    # Returns:
+    #     tuple: (термінальні команди, рядки для send_config_set()) — без
+    #     коментарів, порожніх рядків і перемикань режимів.
+    terminal_cmds = []
+    config_body = []
+    for line in config_lines:
+        stripped = line.strip()
+        if stripped in ("write memory", "wr"):
+            terminal_cmds.append(stripped)
+        elif not stripped or stripped == "!" or stripped in _MODE_COMMANDS:
+            continue  # Пропускаємо коментарі та перемикання режимів
+        else:
+            config_body.append(line)
+    return terminal_cmds, config_body
+
+
+def preview_delta(config_lines: list[str]) -> dict:
+    # Дельта для підключеного роутера без надсилання: що буде надіслано і
+    # які рядки running-config буде видалено (для підтвердження в UI).
+    #
+    # Args:
+    #     config_lines (list[str]): Список команд Cisco IOS.
+    #
+    # Returns:
+    #     dict: {"ok": bool, "error": str, "commands": list, "removals": list}
+    #     removals — рядки роутера (вкладені — з батьківським через " > ").
+
+    with _session_lock:
+        if _connection is None or not _connection.is_alive():
+            return {"ok": False, "error": "No active connection. Please connect to router first.", "commands": [], "removals": []}
+        try:
+            running = _connection.send_command("show running-config", read_timeout=60)
+        except Exception as e:
+            logger.error(f"Не вдалося прочитати running-config: {e}")
+            return {"ok": False, "error": str(e), "commands": [], "removals": []}
+    _terminal, config_body = split_config(config_lines)
+    return {
+        "ok": True,
+        "error": "",
+        "commands": config_delta(running, config_body),
+        "removals": config_removals(running, config_body),
+    }
 
 
-def deploy_config(config_lines: list[str]) -> dict:
+def deploy_config(
+    config_lines: list[str],
+    delta: bool = False,
+    pipelined: bool = False,
+    transfer: bool = False,
+    progress: Optional[Callable] = None,
+    stop_on_error: bool = False,
+    spool_path: str = ""
+) -> dict:
     # Надсилає список команд конфігурації на підключений роутер.
     #
+    # Args:
+    #     config_lines (list[str]): Список команд Cisco IOS.
+    #     delta (bool): Надіслати лише різницю з running-config (див. push_config()).
+    #     pipelined (bool): Пакетне надсилання (див. push_config()).
+    #     transfer (bool): Передати конфігурацію файлом по TFTP (див. push_config()).
+    #     progress (Callable, optional): Події прогресу (див. push_config()).
+    #     stop_on_error (bool): Зупинитися на першій відхиленій команді.
+    #     spool_path (str): Файл для повного виводу роутера (перезаписується);
+    #         у результаті тоді лише хвіст виводу і ключ ``output_file``.
+    #
+    # Returns:
+    #     dict: {"ok": bool, "output": str, "error": str, "sent": int, "errors": list}
+
+    with _session_lock:
+        if _connection is None or not _connection.is_alive():
+            logger.error("Спроба деплою без активного з'єднання")
+            return {"ok": False, "output": "", "error": "No active connection. Please connect to router first."}
+
+        options = {"transfer": transfer, "progress": progress, "stop_on_error": stop_on_error}
+        if spool_path:
+            with open(spool_path, "w", encoding="utf-8") as spool:
+                result = push_config(_connection, config_lines, delta, pipelined, spool=spool, **options)
+            result["output_file"] = spool_path
+        else:
+            result = push_config(_connection, config_lines, delta, pipelined, **options)
+    timing.profiles.save()
+    return result
+
+
+class _DeployOutput:
+    # Вивід одного деплою: spool-файл або пам'ять, хвіст для результату і
+    # події прогресу для UI.
+    #
+    # Із spool-файлом у пам'яті лишається лише останні OUTPUT_TAIL символів,
+    # тож великий деплой не тримає весь вивід роутера. Події прогресу
+    # надсилаються не частіше ніж раз на PROGRESS_INTERVAL (і одразу, якщо
+    # з'явилися помилки), з виводом, накопиченим від попередньої події.
+
+    def __init__(self, total: int, progress: Optional[Callable] = None, spool=None):
+        # total — кількість команд конфігурації, що будуть надіслані.
+        self.total = total
+        self.sent = 0
+        self.progress = progress
+        self.spool = spool
+        self._parts = []
+        self._tail = ""
+        self._pending = []
+        self._pending_errors = []
+        self._last_event = 0.0
+
+    def write(self, text: str) -> None:
+        # Додає фрагмент виводу роутера.
+        if not text:
+            return
+        if self.spool is not None:
+            self.spool.write(text if text.endswith("\n") else text + "\n")
+            self._tail = (self._tail + text + "\n")[-OUTPUT_TAIL:]
+        else:
+            self._parts.append(text)
+        if self.progress is not None:
+            self._pending.append(text)
+
+    def advance(self, sent: int, errors: list = ()) -> None:
+        # Фіксує кількість надісланих команд і нові помилки; за потреби — подія.
+        self.sent = sent
+        self._pending_errors.extend(errors)
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if errors or now - self._last_event >= PROGRESS_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        # Надсилає накопичений вивід і помилки подією прогресу.
+        if self.progress is None or (not self._pending and not self._pending_errors and self._last_event):
+            return
+        event = {
+            "sent": self.sent,
+            "total": self.total,
+            "output": "\n".join(self._pending),
+            "errors": self._pending_errors,
+        }
+        self._pending = []
+        self._pending_errors = []
+        self._last_event = time.monotonic()
+        try:
+            self.progress(event)
+        except Exception as e:
+            logger.warning(f"Не вдалося передати прогрес деплою: {e}")
+
+    def text(self) -> str:
+        # Вивід для результату: повний (без spool) або останні OUTPUT_TAIL символів.
+        if self.spool is not None:
+            return self._tail
+        return "\n".join(self._parts)
+
+
+def push_config(
+    conn,
+    config_lines: list[str],
+    delta: bool = False,
+    pipelined: bool = False,
+    window: int = PIPELINE_WINDOW,
+    transfer: bool = False,
+    server=None,
+    progress: Optional[Callable] = None,
+    stop_on_error: bool = False,
+    spool=None
+) -> dict:
+    # Надсилає список команд конфігурації через відкрите з'єднання.
+    #
     # Використовує send_config_set() який автоматично входить у
     # configuration terminal і виходить після виконання всіх команд.
-    # Рядки "end" та "write memory" виконуються окремо (поза conf t).
+    # "write memory" виконується окремо (поза conf t), а рядки enable,
+    # configure terminal і end пропускаються — режимами керує send_config_set().
     #
     # Args:
+    #     conn: netmiko-з'єднання (інтерактивне або з пулу backend/deploy.py).
     #     config_lines (list[str]): Список команд Cisco IOS.
+    #     delta (bool): Один раз читає ``show running-config`` і надсилає лише
+    #         різницю (backend/config_diff.py). Якщо роутер уже в цільовому
+    #         стані, нічого не надсилається і ``write memory`` не виконується.
+    #     pipelined (bool): Писати рядки пакетами по `window` і чекати prompt
+    #         лише на межі пакета (backend/pipeline.py) замість очікування
+    #         відлуння кожного рядка.
+    #     window (int): Розмір пакета для pipelined.
+    #     transfer (bool): Опублікувати команди файлом на вбудованому TFTP-сервері
+    #         і застосувати їх однією командою ``copy tftp://... running-config``
+    #         (backend/transfer.py). Має пріоритет над pipelined.
+    #     server (TFTPServer, optional): Сервер для transfer; за замовчуванням —
+    #         спільний сервер процесу на порту 69.
+    #     progress (Callable, optional): Отримує події ``{"sent", "total",
+    #         "output", "errors"}`` під час деплою: новий вивід роутера і
+    #         нові помилки з моменту попередньої події. Викликається з потоку
+    #         деплою. Без нього рядковий режим надсилає все одним викликом.
+    #     stop_on_error (bool): Зупинити надсилання після першої відхиленої
+    #         команди (рядковий режим — одразу, pipelined — після поточного
+    #         пакета; transfer застосовує файл повністю). ``write memory`` у
+    #         цьому разі не виконується.
+    #     spool (file, optional): Текстовий файл для повного виводу роутера;
+    #         у результаті лишається лише хвіст виводу (OUTPUT_TAIL символів).
     #
     # Returns:
-    #     dict: {"ok": bool, "output": str, "error": str}
-
-    global _connection
-
-    if _connection is None or not _connection.is_alive():
-        logger.error("Спроба деплою без активного з'єднання")
-        return {"ok": False, "output": "", "error": "No active connection. Please connect to router first."}
+    #     dict: {"ok": bool, "output": str, "error": str, "sent": int, "errors": list}
+    #     sent — кількість надісланих команд конфігурації; errors — команди,
+    #     які роутер відхилив (% Invalid input / % Incomplete / % Ambiguous):
+    #     {"line": номер рядка в config_lines або None, "command", "message"}.
+    #     Після зупинки через stop_on_error ok=False і ``"aborted": True``.
+    #
+    # Таймаути читання беруться з профілю таймінгів з'єднання; час відповіді
+    # на рядки конфігурації уточнює профіль (повільне відлуння піднімає
+    # затримки сесії, швидке — поступово знижує).
 
     if not config_lines:
         return {"ok": False, "output": "", "error": "No configuration commands to send."}
 
-    logger.info(f"Починаємо деплой {len(config_lines)} рядків конфігурації")
+    logger.info(f"Починаємо деплой {len(config_lines)} рядків конфігурації" + (" (delta)" if delta else ""))
 
-    try:
-        # Відокремлюємо термінальні команди від основного конфігу
-        # "end" і "write memory" не можна надсилати через send_config_set
-        terminal_cmds = []
-        config_body = []
-
-        for line in config_lines:
-            stripped = line.strip()
-            if stripped in ("end", "write memory", "wr"):
-                terminal_cmds.append(stripped)
-            elif stripped == "!":
-                continue  # Пропускаємо коментарі
-            else:
-                config_body.append(line)
+    profile = getattr(conn, "timing_profile", None) or timing.TimingProfile()
 
-        output_parts = []
+    try:
+        terminal_cmds, config_body = split_config(config_lines)
+
+        if delta:
+            running = conn.send_command("show running-config", read_timeout=60)
+            config_body = config_delta(running, config_body)
+            logger.info(f"Дельта: {len(config_body)} команд замість {len(config_lines)} рядків")
+            if not config_body:
+                return {"ok": True, "output": "Router configuration is already up to date.", "error": "", "sent": 0, "errors": []}
+
+        output = _DeployOutput(len(config_body), progress, spool)
+        lines = source_lines(config_body, config_lines)
+        errors = []
+
+        def collect(text: str, first: int, batch: list, find_errors: Callable = map_errors) -> bool:
+            # Обробляє вивід пакета команд config_body[first:first + len(batch)];
+            # повертає False, якщо деплой треба зупинити.
+            output.write(text)
+            found = []
+            for error in find_errors(text, batch):
+                index = error.pop("index")
+                found.append({"line": lines[first + index - 1] if index else None, **error})
+                logger.warning(f"Роутер відхилив рядок {found[-1]['line']}: {error['command']} ({error['message']})")
+            errors.extend(found)
+            output.advance(first + len(batch), found)
+            return not (stop_on_error and found)
 
         # Надсилаємо основну конфігурацію
         if config_body:
-            output = _connection.send_config_set(
-                config_body,
-                enter_config_mode=True,
-                exit_config_mode=True,
-                delay_factor=2,
-            )
-            output_parts.append(output)
+            if transfer:
+                text = copy_config(conn, config_body, server or shared_server(), profile.read_timeout(len(config_body)))
+                collect(text, 0, config_body, copy_errors)
+            elif pipelined:
+                send_config_pipelined(
+                    conn, config_body, window, profile.read_timeout(window),
+                    on_batch=lambda text, first, batch: collect(text, first, batch)
+                )
+            else:
+                # Без слухача — один виклик send_config_set(); для прогресу —
+                # пакети по _STREAM_LINES, для stop_on_error — по одній команді
+                size = 1 if stop_on_error else _STREAM_LINES if progress is not None else len(config_body)
+                start = time.perf_counter()
+                for first in range(0, len(config_body), size):
+                    batch = config_body[first:first + size]
+                    text = conn.send_config_set(
+                        batch,
+                        enter_config_mode=first == 0,
+                        exit_config_mode=first + size >= len(config_body),
+                        read_timeout=profile.read_timeout(len(batch)),
+                    )
+                    if not collect(text, first, batch) and first + size < len(config_body):
+                        output.write(conn.exit_config_mode())
+                        break
+                # + 2 відповіді prompt на вхід і вихід з config mode
+                profile.observe((time.perf_counter() - start) / (output.sent + 2))
+                timing.apply(conn, profile)
+
+            # Новий hostname змінює prompt: без цього наступна сесія на тому ж
+            # з'єднанні (пул backend/deploy.py) не впізнає prompt роутера
+            if any(line.strip().startswith("hostname ") for line in config_body[:output.sent]):
+                conn.set_base_prompt()
             logger.info("Основна конфігурація відправлена успішно")
 
-        # Виконуємо термінальні команди (end, write memory)
+        if stop_on_error and errors:
+            output.flush()
+            first = errors[0]
+            logger.warning(f"Деплой зупинено після {output.sent} з {len(config_body)} команд")
+            return {
+                "ok": False, "output": output.text(), "sent": output.sent, "errors": errors, "aborted": True,
+                "error": f"Deploy stopped at line {first['line']}: {first['command']} ({first['message']})",
+            }
+
+        # Виконуємо термінальні команди (write memory)
         for cmd in terminal_cmds:
-            out = _connection.send_command(cmd, expect_string=r"[>#]", delay_factor=3)
-            output_parts.append(f"{cmd}\n{out}")
+            out = conn.send_command(cmd, expect_string=r"[>#]", read_timeout=max(_TERMINAL_TIMEOUT, profile.read_timeout()))
+            output.write(f"{cmd}\n{out}")
             logger.info(f"Виконано команду: {cmd}")
+        output.flush()
 
-        full_output = "\n".join(output_parts)
         logger.info("Деплой завершено успішно")
-        return {"ok": True, "output": full_output, "error": ""}
+        return {"ok": True, "output": output.text(), "error": "", "sent": len(config_body), "errors": errors}
 
     except Exception as e:
         logger.error(f"Помилка деплою конфігурації: {e}")
@@ -0,0 +1,385 @@
+# Паралельний деплой на кілька роутерів через пул з'єднань.
+#
+# backend/connect.py тримає одне інтерактивне з'єднання для GUI. Для
+# флоту ConnectionPool зберігає відкриті Telnet-сесії за ключем
+# (host, port, username): повторний деплой на той самий роутер не платить за
+# логін і enable, мертві сесії виявляються перевіркою is_alive() не частіше
+# ніж раз на ``keepalive`` секунд, а простоювані довше ``idle_timeout``
+# закриваються при кожному запиті з'єднання (і явним evict_idle()) — застаріла
+# сесія не видається повторно. Розмір пулу обмежений: коли всі місця зайняті, закривається
+# найдавніше невикористане з'єднання, а якщо всі зайняті — виклик чекає.
+#
+# deploy_many() розподіляє пристрої по потоках (деплой — очікування мережі,
+# а не CPU) і повертає результати в порядку завершення, як generate_fleet().
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    from .connect import connection_error, open_connection, push_config
+    from . import timing
+except ImportError:
+    from connect import connection_error, open_connection, push_config
+    import timing
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    # Одне з'єднання пулу та його службовий стан.
+    __slots__ = ("key", "conn", "busy", "last_used", "last_checked")
+
+    def __init__(self, key: tuple):
+        # conn заповнюється після відкриття (поза блокуванням пулу).
+        self.key = key
+        self.conn = None
+        self.busy = True
+        self.last_used = self.last_checked = time.monotonic()
+
+
+class ConnectionPool:
+    # Потокобезпечний пул Telnet-з'єднань, одне з'єднання на (host, port, username).
+    #
+    # Args:
+    #     factory (Callable, optional): Відкриває з'єднання; сигнатура як у
+    #         connect.open_connection(host, port, username, password, enable_secret, timeout)
+    #         (вона ж за замовчуванням).
+    #     max_size (int): Максимальна кількість відкритих з'єднань.
+    #     idle_timeout (float): Через скільки секунд простою з'єднання закривається.
+    #     keepalive (float): Мінімальний інтервал між перевірками is_alive().
+    #
+    # Examples:
+    # >>> pool = ConnectionPool(max_size=16)
+    # >>> with pool.connection("10.0.0.1", 23, "admin", "cisco") as conn:
+    # ...     conn.send_command("show version")
+    # >>> pool.close()
+
+    def __init__(
+        self,
+        factory: Callable = None,
+        max_size: int = 32,
+        idle_timeout: float = 300.0,
+        keepalive: float = 30.0
+    ):
+        # Порожній пул; з'єднання відкриваються при першому запиті.
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._factory = factory or open_connection
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        # Порядок — від найдавніше використаного до останнього (LRU)
+        self._entries = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {"created": 0, "reused": 0, "evicted": 0, "dead": 0}
+
+    def __len__(self) -> int:
+        # Кількість відкритих (або тих, що відкриваються) з'єднань.
+        with self._cond:
+            return len(self._entries)
+
+    def __enter__(self):
+        # Пул як контекстний менеджер: close() при виході.
+        return self
+
+    def __exit__(self, *exc):
+        # Закриває всі з'єднання пулу.
+        self.close()
+
+    def stats(self) -> dict:
+        # Лічильники пулу: created/reused/evicted/dead та поточний розмір.
+        with self._cond:
+            return dict(self._stats, size=len(self._entries))
+
+    @staticmethod
+    def _disconnect(conn) -> None:
+        # Закриває з'єднання, ігноруючи помилки (сесія могла вже обірватися).
+        if conn is None:
+            return
+        try:
+            conn.disconnect()
+        except Exception as e:
+            logger.debug(f"Помилка при закритті з'єднання пулу: {e}")
+
+    def _evict_lru_idle(self) -> Optional[_PoolEntry]:
+        # Прибирає з пулу найдавніше використане вільне з'єднання (під блокуванням).
+        for key, entry in self._entries.items():
+            if not entry.busy:
+                del self._entries[key]
+                self._stats["evicted"] += 1
+                return entry
+        return None
+
+    def _expire_idle(self) -> list[_PoolEntry]:
+        # Прибирає з пулу вільні записи, що простоюють довше idle_timeout
+        # (під блокуванням); з'єднання закриває викликач.
+        now = time.monotonic()
+        expired = [
+            entry for entry in self._entries.values()
+            if not entry.busy and now - entry.last_used >= self.idle_timeout
+        ]
+        for entry in expired:
+            del self._entries[entry.key]
+        self._stats["evicted"] += len(expired)
+        return expired
+
+    def _checkout(self, key: tuple) -> tuple[_PoolEntry, list]:
+        # Резервує запис для ключа; повертає (запис, з'єднання на закриття).
+        #
+        # Кожне з'єднання видається лише одному потоку: Telnet-сесія CLI не
+        # підтримує паралельних команд. Якщо з'єднання з цим роутером зайняте
+        # або пул заповнений зайнятими з'єднаннями — чекаємо. Простоювані
+        # довше idle_timeout з'єднання (і цього ключа теж) закриваються.
+        stale = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                stale.extend(entry.conn for entry in self._expire_idle())
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if not entry.busy:
+                        entry.busy = True
+                        self._entries.move_to_end(key)
+                        return entry, stale
+                elif len(self._entries) < self.max_size:
+                    entry = self._entries[key] = _PoolEntry(key)
+                    return entry, stale
+                else:
+                    victim = self._evict_lru_idle()
+                    if victim is not None:
+                        entry = self._entries[key] = _PoolEntry(key)
+                        return entry, stale + [victim.conn]
+                self._cond.wait()
+
+    def _release(self, entry: _PoolEntry, broken: bool) -> None:
+        # Повертає з'єднання в пул або видаляє зламане.
+        with self._cond:
+            if broken or self._closed:
+                if self._entries.get(entry.key) is entry:
+                    del self._entries[entry.key]
+                conn = entry.conn
+            else:
+                entry.busy = False
+                entry.last_used = time.monotonic()
+                conn = None
+            self._cond.notify_all()
+        if conn is not None:
+            self._disconnect(conn)
+
+    def _healthy(self, entry: _PoolEntry) -> bool:
+        # Перевіряє сесію is_alive(), якщо з останньої перевірки минув keepalive.
+        now = time.monotonic()
+        if now - entry.last_checked < self.keepalive:
+            return True
+        entry.last_checked = now
+        try:
+            return bool(entry.conn.is_alive())
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(
+        self,
+        host: str,
+        port: int = 23,
+        username: str = "",
+        password: str = "",
+        enable_secret: str = "",
+        timeout: int = 15
+    ):
+        # Видає з'єднання з роутером на час блоку ``with``.
+        #
+        # Існуюче з'єднання перевикористовується (після keepalive-перевірки),
+        # відсутнє або мертве — відкривається заново. Якщо блок завершився
+        # винятком, з'єднання вважається зіпсованим і закривається.
+        #
+        # Raises:
+        #     Помилки factory (автентифікація, таймаут) та RuntimeError для закритого пулу.
+        key = (host.strip(), int(port), username.strip())
+        entry, stale = self._checkout(key)
+        for conn in stale:
+            self._disconnect(conn)
+
+        try:
+            if entry.conn is not None and not self._healthy(entry):
+                logger.info(f"З'єднання пулу з {host}:{port} неактивне, перепідключення")
+                self._disconnect(entry.conn)
+                entry.conn = None
+                with self._cond:
+                    self._stats["dead"] += 1
+            if entry.conn is None:
+                entry.conn = self._factory(host, port, username, password, enable_secret, timeout)
+                entry.last_checked = time.monotonic()
+                with self._cond:
+                    self._stats["created"] += 1
+            else:
+                with self._cond:
+                    self._stats["reused"] += 1
+        except BaseException:
+            self._release(entry, broken=True)
+            raise
+
+        try:
+            yield entry.conn
+        except BaseException:
+            self._release(entry, broken=True)
+            raise
+        self._release(entry, broken=False)
+
+    def evict_idle(self) -> int:
+        # Закриває з'єднання, що простоюють довше idle_timeout.
+        #
+        # Returns:
+        #     int: Кількість закритих з'єднань.
+        with self._cond:
+            expired = self._expire_idle()
+            if expired:
+                self._cond.notify_all()
+        for entry in expired:
+            self._disconnect(entry.conn)
+        return len(expired)
+
+    def close(self) -> None:
+        # Закриває всі вільні з'єднання; зайняті закриються при поверненні.
+        with self._cond:
+            self._closed = True
+            idle = [entry for entry in self._entries.values() if not entry.busy]
+            for entry in idle:
+                del self._entries[entry.key]
+            self._cond.notify_all()
+        for entry in idle:
+            self._disconnect(entry.conn)
+
+
+def _device_id(index: int, spec: dict) -> str:
+    # Ідентифікатор пристрою: явний device_id, далі host:port, далі порядковий номер.
+    if spec.get("device_id"):
+        return str(spec["device_id"])
+    if spec.get("host"):
+        return f"{spec['host']}:{spec.get('port', 23)}"
+    return f"device-{index}"
+
+
+class _DeployFailed(Exception):
+    # Невдалий push_config(): сигналізує пулу закрити з'єднання.
+
+    def __init__(self, result: dict):
+        # result — словник помилки push_config() для повернення викликачу.
+        super().__init__(result.get("error", ""))
+        self.result = result
+
+
+def deploy_device(
+    pool: ConnectionPool,
+    spec: dict,
+    delta: bool = False,
+    pipelined: bool = False,
+    transfer: bool = False
+) -> dict:
+    # Деплоїть конфігурацію одного пристрою через з'єднання з пулу.
+    #
+    # Args:
+    #     pool (ConnectionPool): Пул з'єднань.
+    #     spec (dict): Ключі host, port, username, password, enable_secret,
+    #         timeout та config (текст або список рядків).
+    #     delta (bool): Надіслати лише різницю з running-config.
+    #     pipelined (bool): Пакетне надсилання рядків (backend/pipeline.py).
+    #     transfer (bool): Передача файлом по TFTP (backend/transfer.py).
+    #
+    # Returns:
+    #     dict: Результат connect.push_config() — {"ok", "output", "error", "sent", "errors"}.
+    host = spec.get("host", "")
+    port = spec.get("port", 23)
+    timeout = spec.get("timeout", 15)
+    config = spec.get("config") or []
+    if isinstance(config, str):
+        config = config.splitlines()
+
+    if not host:
+        return {"ok": False, "output": "", "error": "Device host is required."}
+    if not config:
+        return {"ok": False, "output": "", "error": "No configuration commands to send."}
+
+    try:
+        with pool.connection(
+            host, port, spec.get("username", ""), spec.get("password", ""),
+            spec.get("enable_secret", ""), timeout
+        ) as conn:
+            result = push_config(conn, config, delta, pipelined, transfer=transfer)
+            if not result["ok"]:
+                # Помилка посеред сесії: стан CLI невідомий, з'єднання не повертаємо
+                raise _DeployFailed(result)
+            return result
+    except _DeployFailed as e:
+        return e.result
+    except Exception as e:
+        return {"ok": False, "output": "", "error": connection_error(e, host, port, timeout)}
+
+
+def deploy_many(
+    devices: Iterable[dict],
+    concurrency: int = 8,
+    delta: bool = False,
+    pool: ConnectionPool = None,
+    pipelined: bool = False,
+    transfer: bool = False
+) -> Iterator[tuple[str, dict]]:
+    # Паралельний деплой конфігурацій на кілька роутерів.
+    #
+    # Одночасно обробляється не більше ``concurrency`` пристроїв; вхідний
+    # ітератор читається ледачо. Результати повертаються в порядку
+    # завершення. Помилка одного пристрою не зупиняє решту.
+    #
+    # Args:
+    #     devices (Iterable[dict]): Специфікації пристроїв (див. deploy_device())
+    #         з опціональним ``device_id``.
+    #     concurrency (int): Максимальна кількість одночасних сесій.
+    #     delta (bool): Режим delta-деплою для всіх пристроїв.
+    #     pool (ConnectionPool, optional): Спільний пул для повторних деплоїв.
+    #         Без нього створюється тимчасовий пул, який закривається в кінці.
+    #     pipelined (bool): Пакетне надсилання рядків для всіх пристроїв.
+    #     transfer (bool): Передача конфігурацій файлами через спільний
+    #         TFTP-сервер (кожен роутер завантажує свій файл одночасно з іншими).
+    #
+    # Yields:
+    #     tuple: ``(device_id, result)``, result — {"ok", "output", "error", "sent", "errors"}.
+    #
+    # Examples:
+    # >>> for device_id, result in deploy_many(specs, concurrency=16):
+    # ...     if not result["ok"]:
+    # ...         print(device_id, result["error"])
+    concurrency = max(1, int(concurrency))
+    own_pool = pool is None
+    if own_pool:
+        pool = ConnectionPool(max_size=concurrency)
+
+    def run(index: int, spec: dict) -> tuple[str, dict]:
+        # Деплой одного пристрою у потоці-воркері.
+        return _device_id(index, spec), deploy_device(pool, spec, delta, pipelined, transfer)
+
+    indexed = enumerate(devices)
+    try:
+        if concurrency == 1:
+            for index, spec in indexed:
+                yield run(index, spec)
+            return
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="deploy") as executor:
+            pending = {executor.submit(run, index, spec) for index, spec in islice(indexed, concurrency)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                for index, spec in islice(indexed, len(done)):
+                    pending.add(executor.submit(run, index, spec))
+    finally:
+        if own_pool:
+            pool.close()
+        timing.profiles.save()
@@ -0,0 +1,290 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    from . import addrmath
+    from .generate import generate_full_config
+    from .request import normalize_request, new_error_id, RequestError
+    from .jinja_env import warm_up
+    from .overlap import request_prefixes, IFACE, DHCP, NAT_GLOBAL, STATIC
+    from .prefix_trie import PrefixTrie
+except ImportError:
+    import addrmath
+    from generate import generate_full_config
+    from request import normalize_request, new_error_id, RequestError
+    from jinja_env import warm_up
+    from overlap import request_prefixes, IFACE, DHCP, NAT_GLOBAL, STATIC
+    from prefix_trie import PrefixTrie
+
+logger = logging.getLogger(__name__)
+
+# Скільки задач тримати "в польоті" на одного воркера. Обмежує пам'ять
+# при генерації з ледачого ітератора (наприклад, читання JSONL з диска)
+# і водночас не дає воркерам простоювати між задачами.
+_INFLIGHT_PER_WORKER = 4
+
+
+def _device_id(index: int, spec: dict) -> str:
+    # Ідентифікатор пристрою: явний deviceId, далі hostname, далі порядковий номер.
+    if isinstance(spec, dict):
+        return str(spec.get("deviceId") or spec.get("hostname") or f"device-{index}")
+    return f"device-{index}"
+
+
+def _init_worker() -> None:
+    # Ініціалізатор процесу-воркера.
+    #
+    # Кожен процес має власний модульний `env` (backend/jinja_env.py).
+    # Завантажуємо всі шаблони один раз при старті, щоб перший пристрій у
+    # кожному воркері не платив за компіляцію.
+    warm_up()
+
+
+def _internal_error(device_id: str, code: str, message_key: str, message: str, exc: Exception) -> dict:
+    # Помилка у форматі process_text: текст винятку лише в лог (з id),
+    # клієнтові — загальне повідомлення, як у GUI.
+    err_id = new_error_id()
+    logger.error(f"[{code}] [{err_id}] Помилка пристрою {device_id}: {exc}", exc_info=True)
+    return {
+        "error": True, "code": code, "id": err_id,
+        "messageKey": message_key, "defaultMessage": message, "instructionsKey": "instrContactSupport"
+    }
+
+
+def render_device(index: int, spec: dict) -> tuple[str, Union[list[str], dict]]:
+    # Валідує та рендерить один пристрій флоту.
+    #
+    # Args:
+    #     index (int): Порядковий номер пристрою у вхідному потоці.
+    #     spec (dict): Дані пристрою у форматі config_data (як у process_text)
+    #         з опціональним ключем ``deviceId``.
+    #
+    # Returns:
+    #     tuple: ``(device_id, lines)`` при успіху або ``(device_id, error)``,
+    #     де error — словник у форматі відповіді process_text з ``"error": True``.
+    device_id = _device_id(index, spec)
+    try:
+        request = normalize_request(spec)
+    except RequestError as e:
+        return device_id, e.to_payload()
+    except Exception as e:
+        return device_id, _internal_error(device_id, "ERR-SYS-001", "errSystemGlobal", "Глобальна критична помилка системи.", e)
+
+    try:
+        return device_id, generate_full_config(**request.as_kwargs())
+    except Exception as e:
+        return device_id, _internal_error(device_id, "ERR-GEN-001", "errGenerationFailed", "Критична помилка генерації конфігурації.", e)
+
+
+def _render_chunk(chunk: list[tuple[int, dict]]) -> list[tuple[str, Union[list[str], dict]]]:
+    # Рендерить пачку пристроїв в одному воркері (одна IPC-передача на пачку).
+    return [render_device(index, spec) for index, spec in chunk]
+
+
+def _chunks(indexed: Iterator, size: int) -> Iterator[list]:
+    # Розбиває ітератор на списки довжиною до `size` елементів.
+    while True:
+        chunk = list(islice(indexed, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate_fleet(
+    devices: Iterable[dict],
+    max_workers: int = None,
+    chunksize: int = 8
+) -> Iterator[tuple[str, Union[list[str], dict]]]:
+    # Пакетна генерація конфігурацій для флоту роутерів.
+    #
+    # Розподіляє пристрої по пулу процесів і повертає результати в порядку
+    # завершення (не в порядку подачі). Вхідний ітератор читається ледачо:
+    # одночасно в роботі не більше ``max_workers * 4`` пачок по
+    # ``chunksize`` пристроїв.
+    #
+    # Args:
+    #     devices (Iterable[dict]): Специфікації пристроїв у форматі config_data
+    #         (ті ж ключі, що надсилає web/api.js) з опціональним ``deviceId``.
+    #     max_workers (int, optional): Кількість процесів. За замовчуванням
+    #         os.cpu_count(). Значення 1 виконує генерацію в поточному процесі
+    #         без накладних витрат на IPC.
+    #     chunksize (int, optional): Скільки пристроїв передавати воркеру за
+    #         одну задачу. Більші пачки зменшують накладні витрати на pickle/IPC.
+    #
+    # Yields:
+    #     tuple: ``(device_id, lines)`` або ``(device_id, error_dict)``.
+    #
+    # Examples:
+    # >>> for device_id, result in generate_fleet(specs):
+    # ...     if isinstance(result, dict):
+    # ...         print(device_id, result["defaultMessage"])
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    indexed = enumerate(devices)
+
+    if max_workers <= 1:
+        for index, spec in indexed:
+            yield render_device(index, spec)
+        return
+
+    chunks = _chunks(indexed, max(1, chunksize))
+    window = max_workers * _INFLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        pending = {pool.submit(_render_chunk, chunk) for chunk in islice(chunks, window)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+            for chunk in islice(chunks, len(done)):
+                pending.add(pool.submit(_render_chunk, chunk))
+
+
+def _fleet_records(devices: Iterable[dict], static: bool = True) -> list[tuple[int, int, tuple]]:
+    # Префікси всіх пристроїв як записи PrefixTrie.insert_many():
+    # ``(start, length, (device_index, device_id, prefix))``.
+    records = []
+    for index, spec in enumerate(devices):
+        if not isinstance(spec, dict):
+            continue
+        device_id = _device_id(index, spec)
+        for prefix in request_prefixes(spec):
+            if static or prefix.kind != STATIC:
+                length = 32 - (prefix.end - prefix.start).bit_length()
+                records.append((prefix.start, length, (index, device_id, prefix)))
+    return records
+
+
+def fleet_index(devices: Iterable[dict]) -> PrefixTrie:
+    # Спільний індекс префіксів флоту для пошуку найдовшого збігу.
+    #
+    # Містить мережі інтерфейсів, DHCP-пули, static NAT inside global і
+    # статичні маршрути всіх пристроїв (правила збору — overlap.request_prefixes()).
+    #
+    # Args:
+    #     devices (Iterable[dict]): Специфікації пристроїв (як у generate_fleet()).
+    #
+    # Returns:
+    #     PrefixTrie: Записи ``(device_index, device_id, prefix)``.
+    #
+    # Examples:
+    # >>> index = fleet_index(specs)
+    # >>> _, _, owners = index.longest_match(addrmath.parse_address("10.3.0.25"))
+    # >>> [(device_id, prefix.path) for _, device_id, prefix in owners]
+    # [('branch-3', 'networks[0].ip')]
+    trie = PrefixTrie()
+    trie.insert_many(_fleet_records(devices))
+    return trie
+
+
+def _describe(prefix, device_id: str) -> str:
+    # Префікс іншого пристрою в повідомленні про конфлікт.
+    if prefix.kind == IFACE:
+        return f"мережею {prefix.text()} інтерфейсу {prefix.where()} пристрою {device_id}"
+    if prefix.kind == DHCP:
+        return f"DHCP-пулом {prefix.text()} пристрою {device_id}"
+    return f"NAT inside global {addrmath.int_to_ipv4(prefix.address)} пристрою {device_id}"
+
+
+def _device_conflict(first: tuple, second: tuple, shared: set) -> Optional[str]:
+    # Повідомлення про конфлікт запису second із записом first іншого
+    # пристрою (префікси вкладені або рівні) або None, якщо перетин допустимий.
+    first_index, first_id, a = first
+    second_index, _, b = second
+    kinds = {a.kind, b.kind}
+    if kinds <= {IFACE, NAT_GLOBAL} and a.address == b.address:
+        address = addrmath.int_to_ipv4(b.address)
+        if a.kind == IFACE:
+            return f"❌ Error: Адреса {address} вже призначена інтерфейсу {a.where()} пристрою {first_id}."
+        return f"❌ Error: Адреса {address} вже використовується як NAT inside global пристрою {first_id}."
+    if kinds == {IFACE, NAT_GLOBAL}:
+        return None
+    if kinds == {IFACE} and a.start == b.start and a.end == b.end:
+        # Спільний сегмент (канал між роутерами, LAN з кількома шлюзами)
+        return None
+    if kinds == {IFACE, DHCP}:
+        pool_index, iface = (first_index, b) if a.kind == DHCP else (second_index, a)
+        if (pool_index, iface.start, iface.end) in shared:
+            # Пул обслуговує сегмент, до якого підключений і власник пулу
+            return None
+    if b.kind == IFACE:
+        subject = f"Мережа {b.text()}"
+    elif b.kind == DHCP:
+        subject = f"DHCP-пул {b.text()}"
+    else:
+        subject = f"NAT inside global {addrmath.int_to_ipv4(b.address)}"
+    return f"❌ Error: {subject} перетинається з {_describe(a, first_id)}."
+
+
+def fleet_conflicts(devices: Iterable[dict]) -> list[dict]:
+    # Конфлікти адрес між різними пристроями флоту.
+    #
+    # Префікси всіх пристроїв (крім статичних маршрутів — вони й мають
+    # вказувати на мережі інших роутерів) вставляються в PrefixTrie одним
+    # пакетом; у CIDR два префікси перетинаються лише тоді, коли один
+    # містить інший, тож кандидати — записи одного вузла і його предки
+    # в дереві. Конфлікти всередині одного пристрою перевіряє validate_config().
+    #
+    # Конфліктом вважається: та сама адреса інтерфейсу чи static NAT на двох
+    # пристроях; мережі інтерфейсів, що перетинаються, але не збігаються
+    # (збіг — спільний сегмент); DHCP-пули, що перетинаються між собою, з
+    # NAT inside global або з мережею чужого сегмента.
+    #
+    # Args:
+    #     devices (Iterable[dict]): Специфікації пристроїв (як у generate_fleet()).
+    #
+    # Returns:
+    #     list[dict]: ``{"device", "path", "message", "conflictsWith":
+    #     {"device", "path"}}``; помилка прив'язана до пізнішого з двох
+    #     пристроїв у порядку подачі.
+    #
+    # Examples:
+    # >>> fleet_conflicts([{"deviceId": "a", "networks": [("10.0.0.1", "24")]},
+    # ...                  {"deviceId": "b", "networks": [("10.0.0.1", "24")]}])[0]["message"]
+    # '❌ Error: Адреса 10.0.0.1 вже призначена інтерфейсу networks[0] пристрою a.'
+    records = _fleet_records(devices, static=False)
+    shared = {(item[0], item[2].start, item[2].end) for _, _, item in records if item[2].kind == IFACE}
+    trie = PrefixTrie()
+    trie.insert_many(records)
+
+    found = []
+
+    def check(first, second):
+        # Пара записів різних пристроїв; first — раніший у порядку подачі.
+        if (first[0], first[2].order) > (second[0], second[2].order):
+            first, second = second, first
+        message = _device_conflict(first, second, shared)
+        if message is not None:
+            found.append(((second[0], second[2].order, first[0], first[2].order), {
+                "device": second[1], "path": second[2].path, "message": message,
+                "conflictsWith": {"device": first[1], "path": first[2].path},
+            }))
+
+    for _, _, entries, ancestors in trie.walk():
+        for outer in ancestors:
+            for entry in entries:
+                for other in outer:
+                    if other[0] != entry[0]:
+                        check(other, entry)
+        # Однакові префікси: інтерфейси з різними адресами — спільний
+        # сегмент, тож інтерфейси порівнюються лише за адресою
+        by_address = {}
+        ifaces = []
+        others = []
+        for entry in entries:
+            if entry[2].kind == IFACE:
+                candidates = by_address.setdefault(entry[2].address, [])
+                earlier = candidates + others
+                candidates.append(entry)
+                ifaces.append(entry)
+            else:
+                earlier = ifaces + others
+                others.append(entry)
+            for other in earlier:
+                if other[0] != entry[0]:
+                    check(other, entry)
+    found.sort(key=lambda entry: entry[0])
+    return [error for _, error in found]
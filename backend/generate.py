@@ -1,8 +1,44 @@
-from .protocols import generate_protocol_config
-from .jinja_env import render_template_to_lines
+import inspect
+from typing import Iterator, Optional
 
-# Генерація конфігурації інтерфейсів
-def generate_interface_config(
+from . import addrmath
+from .ir import Ephone, Interface
+from .protocols import generate_protocol_config, protocol_section
+from .jinja_env import iter_template_lines, render_template_to_lines
+from .section_cache import section_cache
+
+# Тип "секції": пара (ім'я шаблону, контекст) або None, якщо секція вимкнена.
+# *_section() функції лише будують контекст з вузлів IR (backend/ir.py);
+# рендеринг виконують generate_*_config() (список рядків) або
+# iter_full_config() (потік рядків).
+Section = Optional[tuple[str, dict]]
+
+
+def _iter_section(section: Section, cache: bool = False) -> Iterator[str]:
+    # Потоково рендерить секцію; вимкнена секція (None) не дає жодного рядка.
+    # cache=True бере готові рядки з section_cache (однакові входи на різних
+    # пристроях рендеряться один раз).
+    if section is None:
+        return
+    # Великі таблиці (див. SectionCache.max_items) йдуть повз кеш потоково
+    if cache and section_cache.cacheable(section[1]):
+        yield from section_cache.render(*section)
+    else:
+        yield from iter_template_lines(*section)
+
+
+def _render_section(section: Section, cache: bool = False) -> list[str]:
+    # Рендерить секцію у список рядків; вимкнена секція дає порожній список.
+    # cache=True бере рядки з section_cache (копія кортежу кешу — викликач
+    # може змінювати список, не псуючи кеш).
+    if section is None:
+        return []
+    if cache:
+        return list(section_cache.render(*section))
+    return render_template_to_lines(*section)
+
+# Контекст секції інтерфейсів
+def interface_section(
     interfaces: list[str],
     networks: list[tuple[str, str]],
     no_shutdown_interfaces: list[str] = None,
@@ -10,7 +46,7 @@ def generate_interface_config(
     routing_config: dict = None,
     nat_inside: str = "",
     nat_outside: str = ""
-) -> list[str]:
+) -> Section:
 
     if no_shutdown_interfaces is None:
         no_shutdown_interfaces = interfaces
@@ -25,18 +61,36 @@ def generate_interface_config(
             if intf in routing_config.get("participatingInterfaces", []):
                 isis = True
                 
-        interface_data.append({
-            'name': intf,
-            'ip': ip,
-            'mask': mask,
-            'description': desc,
-            'no_shutdown': intf in no_shutdown_interfaces,
-            'isis': isis,
-            'is_nat_inside': intf == nat_inside,
-            'is_nat_outside': intf == nat_outside
-        })
-
-    return render_template_to_lines('interfaces.j2', {'interface_data': interface_data})
+        interface_data.append(Interface(
+            name=intf,
+            ip=ip,
+            mask=mask,
+            description=desc,
+            no_shutdown=intf in no_shutdown_interfaces,
+            isis=isis,
+            is_nat_inside=intf == nat_inside,
+            is_nat_outside=intf == nat_outside
+        ))
+
+    return 'interfaces.j2', {'interface_data': interface_data}
+
+# Генерація конфігурації інтерфейсів
+def generate_interface_config(
+    interfaces: list[str],
+    networks: list[tuple[str, str]],
+    no_shutdown_interfaces: list[str] = None,
+    descriptions: list[str] = None,
+    routing_config: dict = None,
+    nat_inside: str = "",
+    nat_outside: str = ""
+) -> list[str]:
+    return _render_section(interface_section(
+        interfaces, networks, no_shutdown_interfaces, descriptions, routing_config, nat_inside, nat_outside
+    ))
+
+# Контекст заголовка конфігурації (enable / configure terminal / hostname)
+def hostname_section(hostname: str) -> Section:
+    return 'base.j2', {'hostname': hostname or 'R1'}
 
 # Генерація базової конфігурації з hostname та інтерфейсами
 def generate_base_config(
@@ -49,98 +103,145 @@ def generate_base_config(
     nat_inside: str = "",
     nat_outside: str = ""
 ) -> list[str]:
-    cfg = render_template_to_lines('base.j2', {'hostname': hostname or 'R1'})
+    cfg = _render_section(hostname_section(hostname))
     cfg.extend(generate_interface_config(interfaces, networks, no_shutdown_interfaces, descriptions, routing_config, nat_inside, nat_outside))
     return cfg
 
-def generate_multicast_config(ip_multicast: bool, interfaces: list[str]) -> list[str]:
-    """Конфігурація multicast, якщо увімкнено"""
+def multicast_section(ip_multicast: bool, interfaces: list[str]) -> Section:
+    """Контекст секції multicast, якщо увімкнено"""
     if not ip_multicast:
-        return []
-    
-    return render_template_to_lines('multicast.j2', {
+        return None
+
+    return 'multicast.j2', {
         'ip_multicast': ip_multicast,
         'pim_interfaces': interfaces
-    })
+    }
 
-# Генерація конфігурації телефонії
-def generate_telephony_config(
+def generate_multicast_config(ip_multicast: bool, interfaces: list[str], cache: bool = True) -> list[str]:
+    """Конфігурація multicast, якщо увімкнено (кешується, якщо cache=True)"""
+    return _render_section(multicast_section(ip_multicast, interfaces), cache)
+
+# Контекст секції телефонії
+def telephony_section(
     telephony_enabled: bool,
     dn_list: list[dict],
     max_ephones: int = 3,
     max_dn: int = 3,
     ip_source_address: str = "10.0.0.1",
     auto_assign_range: str = "1 to 3"
-) -> list[str]:
+) -> Section:
     if not telephony_enabled:
-        return []
+        return None
 
     formatted_dn_list = []
     for idx, entry in enumerate(dn_list[:max_dn], start=1):
-        formatted_dn_list.append({
-            'idx': idx,
-            'number': entry.get("number", "").strip(),
-            'user': entry.get("user", "").strip(),
-            'mac': entry.get("mac", "").strip()
-        })
-
-    return render_template_to_lines('telephony.j2', {
+        formatted_dn_list.append(Ephone(
+            idx=idx,
+            number=entry.get("number", "").strip(),
+            user=entry.get("user", "").strip(),
+            mac=entry.get("mac", "").strip()
+        ))
+
+    return 'telephony.j2', {
         'telephony_enabled': telephony_enabled,
         'max_ephones': max_ephones,
         'max_dn': max_dn,
         'ip_source_address': ip_source_address,
         'auto_assign_range': auto_assign_range,
         'dn_list': formatted_dn_list
-    })
+    }
 
-# Генерація конфігурації безпеки (SSH, паролі)
-def generate_security_config(
+# Генерація конфігурації телефонії
+def generate_telephony_config(
+    telephony_enabled: bool,
+    dn_list: list[dict],
+    max_ephones: int = 3,
+    max_dn: int = 3,
+    ip_source_address: str = "10.0.0.1",
+    auto_assign_range: str = "1 to 3"
+) -> list[str]:
+    return _render_section(telephony_section(
+        telephony_enabled, dn_list, max_ephones, max_dn, ip_source_address, auto_assign_range
+    ))
+
+# Контекст секції безпеки (SSH, паролі)
+def security_section(
     enable_ssh: bool,
     enable_secret: str,
     console_password: str,
     admin_username: str,
     admin_password: str,
     domain_name: str
-) -> list[str]:
+) -> Section:
     # If SSH enabled, all SSH fields must be present to generate valid config
     effective_ssh = enable_ssh and bool(admin_username) and bool(admin_password) and bool(domain_name)
     
-    return render_template_to_lines('security.j2', {
+    return 'security.j2', {
         'enable_secret': enable_secret,
         'console_password': console_password,
         'enable_ssh': effective_ssh,
         'admin_username': admin_username,
         'admin_password': admin_password,
         'domain_name': domain_name
-    })
+    }
 
-# Генерація конфігурації DHCP
-def generate_dhcp_config(
+# Генерація конфігурації безпеки (SSH, паролі)
+def generate_security_config(
+    enable_ssh: bool,
+    enable_secret: str,
+    console_password: str,
+    admin_username: str,
+    admin_password: str,
+    domain_name: str,
+    cache: bool = False
+) -> list[str]:
+    # Секція містить паролі у відкритому вигляді, тож за замовчуванням не
+    # потрапляє в section_cache; cache=True — лише за явним запитом.
+    return _render_section(security_section(
+        enable_ssh, enable_secret, console_password, admin_username, admin_password, domain_name
+    ), cache)
+
+# Контекст секції DHCP
+def dhcp_section(
     dhcp_network: str,
     dhcp_mask: str,
     dhcp_gateway: str,
     dhcp_dns: str,
     excluded: list[str] = None,
     dhcp_option150: str = ""
-) -> list[str]:
+) -> Section:
     if not dhcp_network or not dhcp_mask:
-        return []
+        return None
 
     if isinstance(excluded, str):
         excluded = tuple(excluded.split())
     elif not excluded:
         excluded = []
 
-    return render_template_to_lines('dhcp.j2', {
+    return 'dhcp.j2', {
         'dhcp_network': dhcp_network,
         'dhcp_mask': dhcp_mask,
         'dhcp_gateway': dhcp_gateway,
         'dhcp_dns': dhcp_dns,
         'excluded': excluded,
         'dhcp_option150': dhcp_option150
-    })
+    }
 
-def generate_nat_config(
+# Генерація конфігурації DHCP
+def generate_dhcp_config(
+    dhcp_network: str,
+    dhcp_mask: str,
+    dhcp_gateway: str,
+    dhcp_dns: str,
+    excluded: list[str] = None,
+    dhcp_option150: str = ""
+) -> list[str]:
+    return _render_section(dhcp_section(
+        dhcp_network, dhcp_mask, dhcp_gateway, dhcp_dns, excluded, dhcp_option150
+    ))
+
+# Контекст секції NAT
+def nat_section(
     nat_type: str,
     nat_inside: str,
     nat_outside: str,
@@ -148,22 +249,15 @@ def generate_nat_config(
     nat_inside_global: str,
     dhcp_network: str,
     dhcp_mask: str
-) -> list[str]:
+) -> Section:
     if nat_type == "None" or not nat_type:
-        return []
+        return None
 
     # Calculate wildcard mask from DHCP mask
     # For a wizard, assuming DHCP network is the internal network
-    wildcard_mask = "0.0.0.0"
-    if dhcp_mask:
-        try:
-            octets = dhcp_mask.split('.')
-            wildcard_octets = [str(255 - int(o)) for o in octets]
-            wildcard_mask = ".".join(wildcard_octets)
-        except ValueError:
-            pass
-
-    return render_template_to_lines('nat.j2', {
+    wildcard_mask = addrmath.wildcard(dhcp_mask) if isinstance(dhcp_mask, str) else "0.0.0.0"
+
+    return 'nat.j2', {
         'nat_type': nat_type,
         'nat_inside': nat_inside,
         'nat_outside': nat_outside,
@@ -171,29 +265,133 @@ def generate_nat_config(
         'nat_inside_global': nat_inside_global,
         'local_network': dhcp_network,
         'wildcard_mask': wildcard_mask
-    })
+    }
 
-def generate_snmp_config(
+# Генерація конфігурації NAT
+def generate_nat_config(
+    nat_type: str,
+    nat_inside: str,
+    nat_outside: str,
+    nat_inside_local: str,
+    nat_inside_global: str,
+    dhcp_network: str,
+    dhcp_mask: str
+) -> list[str]:
+    return _render_section(nat_section(
+        nat_type, nat_inside, nat_outside, nat_inside_local, nat_inside_global, dhcp_network, dhcp_mask
+    ))
+
+# Контекст секції SNMP
+def snmp_section(
     snmp_enabled: bool,
     snmp_community_ro: str,
     snmp_community_rw: str,
     snmp_location: str,
     snmp_contact: str,
     snmp_trap_host: str
-) -> list[str]:
+) -> Section:
     if not snmp_enabled:
-        return []
-    
-    return render_template_to_lines('snmp.j2', {
+        return None
+
+    return 'snmp.j2', {
         'snmp_community_ro': snmp_community_ro,
         'snmp_community_rw': snmp_community_rw,
         'snmp_location': snmp_location,
         'snmp_contact': snmp_contact,
         'snmp_trap_host': snmp_trap_host
-    })
+    }
 
-# Збірка повної конфігурації
-def generate_full_config(
+# Генерація конфігурації SNMP
+def generate_snmp_config(
+    snmp_enabled: bool,
+    snmp_community_ro: str,
+    snmp_community_rw: str,
+    snmp_location: str,
+    snmp_contact: str,
+    snmp_trap_host: str,
+    cache: bool = False
+) -> list[str]:
+    # SNMP community — фактично паролі: кешується лише з cache=True.
+    return _render_section(snmp_section(
+        snmp_enabled, snmp_community_ro, snmp_community_rw, snmp_location, snmp_contact, snmp_trap_host
+    ), cache)
+
+# Склад і порядок секцій повної конфігурації.
+# Запис: (назва, builder(args) -> Section, політика кешу), де args —
+# аргументи iter_full_config() як словник. Політика: None — без кешу,
+# "shared" — секції, однакові для більшості пристроїв флоту (section_cache),
+# "secret" — як "shared", але містять паролі і вимикаються cache_secrets=False.
+# Таблицю також використовує інкрементальна генерація (backend/incremental.py).
+FULL_CONFIG_SECTIONS = (
+    # 1. Базова частина + інтерфейси
+    ("hostname", lambda a: hostname_section(a["hostname"]), None),
+    ("interfaces", lambda a: interface_section(
+        a["interfaces"], a["networks"],
+        a["no_shutdown_interfaces"] if a["no_shutdown_interfaces"] is not None else [],
+        a["descriptions"], a["routing_config"], a["nat_inside"], a["nat_outside"]
+    ), None),
+    # 2. Multicast (якщо потрібно)
+    ("multicast", lambda a: multicast_section(
+        a["ip_multicast"], a["pim_interfaces"] if a["pim_interfaces"] is not None else a["interfaces"]
+    ), "shared"),
+    # 3. Протокол маршрутизації
+    ("protocols", lambda a: protocol_section(
+        a["routing_protocol"], a["router_id"], a["networks"], a["no_auto_summary"], a["routing_config"]
+    ), "shared"),
+    # 4. Telephony
+    ("telephony", lambda a: telephony_section(
+        a["telephony_enabled"], a["dn_list"], a["max_ephones"], a["max_dn"],
+        a["ip_source_address"], a["auto_assign_range"]
+    ), None),
+    # 5. Безпека
+    ("security", lambda a: security_section(
+        a["enable_ssh"], a["enable_secret"], a["console_password"],
+        a["admin_username"], a["admin_password"], a["domain_name"]
+    ), "secret"),
+    # 6. DHCP
+    ("dhcp", lambda a: dhcp_section(
+        a["dhcp_network"], a["dhcp_mask"], a["dhcp_gateway"], a["dhcp_dns"], a["dhcp_excluded"], a["dhcp_option150"]
+    ), None),
+    # 7. NAT
+    ("nat", lambda a: nat_section(
+        a["nat_type"], a["nat_inside"], a["nat_outside"], a["nat_inside_local"], a["nat_inside_global"],
+        a["dhcp_network"], a["dhcp_mask"]
+    ), None),
+    # 8. SNMP
+    ("snmp", lambda a: snmp_section(
+        a["snmp_enabled"], a["snmp_community_ro"], a["snmp_community_rw"],
+        a["snmp_location"], a["snmp_contact"], a["snmp_trap_host"]
+    ), "secret"),
+)
+
+# 9. Завершення конфігурації (однакове для всіх пристроїв)
+CONFIG_TAIL = ("!", "end", "write memory")
+
+
+def _use_cache(policy: Optional[str], cache_sections: bool, cache_secrets: bool) -> bool:
+    # Чи брати секцію з section_cache згідно з її політикою в FULL_CONFIG_SECTIONS.
+    if policy is None or not cache_sections:
+        return False
+    return policy == "shared" or cache_secrets
+
+
+def render_named_section(name: str, args: dict, cache_sections: bool = True, cache_secrets: bool = True) -> list[str]:
+    # Рендерить одну секцію з FULL_CONFIG_SECTIONS за назвою.
+    #
+    # Args:
+    #     name (str): Назва секції (``"snmp"``, ``"protocols"`` тощо).
+    #     args (dict): Повний набір аргументів iter_full_config()
+    #         (див. full_config_args()).
+    #
+    # Returns:
+    #     list[str]: Рядки секції (порожньо, якщо секція вимкнена).
+    for section_name, build, policy in FULL_CONFIG_SECTIONS:
+        if section_name == name:
+            return _render_section(build(args), _use_cache(policy, cache_sections, cache_secrets))
+    raise KeyError(name)
+
+# Потокова збірка повної конфігурації
+def iter_full_config(
     hostname: str,
     interfaces: list[str],
     networks: list[tuple[str, str]],
@@ -233,58 +431,133 @@ def generate_full_config(
     auto_assign_range: str = "1 to 3",
     dhcp_excluded: list[str] = None,
     no_auto_summary: bool = True,
-    routing_config: dict = None
-) -> list[str]:
+    routing_config: dict = None,
+    cache_sections: bool = True,
+    cache_secrets: bool = True
+) -> Iterator[str]:
     """
-    Збирає всю конфігурацію разом
-    Повертає список рядків (кожний рядок — окрема команда)
+    Потоково збирає всю конфігурацію, секція за секцією.
+    Аргументи ті ж, що й у generate_full_config(). Рядки віддаються по
+    мірі рендерингу (Template.generate()), без проміжних списків, тож
+    великий конфіг можна писати у файл або сокет з пласким споживанням пам'яті.
+
+    cache_sections вмикає section_cache для multicast, протоколу, безпеки
+    та SNMP (секції, однакові для більшості пристроїв флоту);
+    cache_secrets=False виключає з кешу секції з паролями (безпека, SNMP).
     """
-    if no_shutdown_interfaces is None:
-        no_shutdown_interfaces = []
+    # Усі аргументи функції як словник для builder-ів FULL_CONFIG_SECTIONS
+    args = dict(locals())
+    for _name, build, policy in FULL_CONFIG_SECTIONS:
+        yield from _iter_section(build(args), _use_cache(policy, cache_sections, cache_secrets))
 
-    config = []
+    # Завершення конфігурації
+    yield from CONFIG_TAIL
 
-    # 1. Базова частина + інтерфейси
-    config.extend(generate_base_config(hostname, interfaces, networks, no_shutdown_interfaces, descriptions, routing_config, nat_inside, nat_outside))
 
-    # 2. Multicast (якщо потрібно)
-    config.extend(generate_multicast_config(ip_multicast, pim_interfaces if pim_interfaces is not None else interfaces))
+# Значення за замовчуванням аргументів iter_full_config()
+_FULL_CONFIG_DEFAULTS = {
+    name: param.default
+    for name, param in inspect.signature(iter_full_config).parameters.items()
+    if param.default is not inspect.Parameter.empty
+}
 
-    # 3. Протокол маршрутизації
-    config.extend(generate_protocol_config(routing_protocol, router_id, networks, no_auto_summary, routing_config))
 
-    # 4. Telephony
-    config.extend(generate_telephony_config(
-        telephony_enabled, dn_list, max_ephones, max_dn,
-        ip_source_address, auto_assign_range
-    ))
+def full_config_args(**kwargs) -> dict:
+    # Доповнює keyword-аргументи generate_full_config() значеннями за
+    # замовчуванням — формат `args`, який очікує render_named_section().
+    return {**_FULL_CONFIG_DEFAULTS, **kwargs}
 
-    # 5. Безпека
-    config.extend(generate_security_config(
-        enable_ssh, enable_secret, console_password,
-        admin_username, admin_password, domain_name
-    ))
 
-    # 6. DHCP
-    config.extend(generate_dhcp_config(
-        dhcp_network, dhcp_mask, dhcp_gateway, dhcp_dns, dhcp_excluded, dhcp_option150
-    ))
-
-    # 7. NAT
-    config.extend(generate_nat_config(
-        nat_type, nat_inside, nat_outside, nat_inside_local, nat_inside_global, dhcp_network, dhcp_mask
-    ))
-
-    # 8. SNMP
-    config.extend(generate_snmp_config(
-        snmp_enabled, snmp_community_ro, snmp_community_rw, snmp_location, snmp_contact, snmp_trap_host
+# Збірка повної конфігурації
+def generate_full_config(
+    hostname: str,
+    interfaces: list[str],
+    networks: list[tuple[str, str]],
+    ip_multicast: bool,
+    routing_protocol: str,
+    router_id: str,
+    telephony_enabled: bool,
+    dn_list: list[dict],
+    enable_ssh: bool,
+    enable_secret: str,
+    console_password: str,
+    admin_username: str,
+    admin_password: str,
+    domain_name: str,
+    dhcp_network: str,
+    dhcp_mask: str,
+    dhcp_gateway: str,
+    dhcp_dns: str,
+    dhcp_option150: str = "",
+    nat_type: str = "None",
+    nat_inside: str = "",
+    nat_outside: str = "",
+    nat_inside_local: str = "",
+    nat_inside_global: str = "",
+    snmp_enabled: bool = False,
+    snmp_community_ro: str = "",
+    snmp_community_rw: str = "",
+    snmp_location: str = "",
+    snmp_contact: str = "",
+    snmp_trap_host: str = "",
+    no_shutdown_interfaces: list[str] = None,
+    pim_interfaces: list[str] = None,
+    descriptions: list[str] = None,
+    max_ephones: int = 3,
+    max_dn: int = 3,
+    ip_source_address: str = "10.0.0.1",
+    auto_assign_range: str = "1 to 3",
+    dhcp_excluded: list[str] = None,
+    no_auto_summary: bool = True,
+    routing_config: dict = None,
+    cache_sections: bool = True,
+    cache_secrets: bool = True
+) -> list[str]:
+    """
+    Збирає всю конфігурацію разом
+    Повертає список рядків (кожний рядок — окрема команда)
+    """
+    return list(iter_full_config(
+        hostname=hostname,
+        interfaces=interfaces,
+        networks=networks,
+        ip_multicast=ip_multicast,
+        routing_protocol=routing_protocol,
+        router_id=router_id,
+        telephony_enabled=telephony_enabled,
+        dn_list=dn_list,
+        enable_ssh=enable_ssh,
+        enable_secret=enable_secret,
+        console_password=console_password,
+        admin_username=admin_username,
+        admin_password=admin_password,
+        domain_name=domain_name,
+        dhcp_network=dhcp_network,
+        dhcp_mask=dhcp_mask,
+        dhcp_gateway=dhcp_gateway,
+        dhcp_dns=dhcp_dns,
+        dhcp_option150=dhcp_option150,
+        nat_type=nat_type,
+        nat_inside=nat_inside,
+        nat_outside=nat_outside,
+        nat_inside_local=nat_inside_local,
+        nat_inside_global=nat_inside_global,
+        snmp_enabled=snmp_enabled,
+        snmp_community_ro=snmp_community_ro,
+        snmp_community_rw=snmp_community_rw,
+        snmp_location=snmp_location,
+        snmp_contact=snmp_contact,
+        snmp_trap_host=snmp_trap_host,
+        no_shutdown_interfaces=no_shutdown_interfaces,
+        pim_interfaces=pim_interfaces,
+        descriptions=descriptions,
+        max_ephones=max_ephones,
+        max_dn=max_dn,
+        ip_source_address=ip_source_address,
+        auto_assign_range=auto_assign_range,
+        dhcp_excluded=dhcp_excluded,
+        no_auto_summary=no_auto_summary,
+        routing_config=routing_config,
+        cache_sections=cache_sections,
+        cache_secrets=cache_secrets
     ))
-
-    # 9. Завершення конфігурації
-    config.extend([
-        "!",
-        "end",
-        "write memory"
-    ])
-
-    return config
\ No newline at end of file
@@ -0,0 +1,130 @@
+from .generate import CONFIG_TAIL, FULL_CONFIG_SECTIONS, full_config_args, render_named_section
+from .request import build_generation_kwargs
+
+# Усі секції повної конфігурації в порядку виводу
+ALL_SECTIONS = tuple(name for name, _build, _policy in FULL_CONFIG_SECTIONS)
+
+# Залежності секцій від ключів config_data (форма web/api.js).
+# Враховано похідні значення з build_generation_kwargs(): ip_source_address
+# телефонії береться з dhcpGateway або першої мережі, dhcp_excluded — з
+# dhcpGateway, NAT ACL — з DHCP-мережі, IS-IS на інтерфейсах — з routingConfig.
+# Без `networks` кожен інтерфейс отримує мережу-заглушку, тож зміна списку
+# інтерфейсів змінює і рядки ``network`` протоколів маршрутизації.
+KEY_SECTIONS = {
+    "hostname": ("hostname",),
+    "interfaces": ("interfaces", "multicast", "protocols", "telephony"),
+    "networks": ("interfaces", "protocols", "telephony"),
+    "noShutdownInterfaces": ("interfaces",),
+    "descriptions": ("interfaces",),
+    "ipMulticast": ("multicast",),
+    "routingProtocol": ("protocols",),
+    "routerId": ("protocols",),
+    "routingConfig": ("interfaces", "protocols"),
+    "telephonyEnabled": ("telephony",),
+    "dnList": ("telephony",),
+    "maxEphones": ("telephony",),
+    "maxDn": ("telephony",),
+    "autoAssignRange": ("telephony",),
+    "cmeSourceIp": ("telephony",),
+    "enableSsh": ("security",),
+    "enableSecret": ("security",),
+    "consolePassword": ("security",),
+    "adminUsername": ("security",),
+    "adminPassword": ("security",),
+    "domainName": ("security",),
+    "dhcpNetwork": ("dhcp", "nat"),
+    "dhcpMask": ("dhcp", "nat"),
+    "dhcpGateway": ("dhcp", "telephony"),
+    "dhcpDns": ("dhcp",),
+    "dhcpOption150": ("dhcp",),
+    "natInside": ("nat", "interfaces"),
+    "natOutside": ("nat", "interfaces"),
+}
+
+# Групи ключів за префіксом (snmpEnabled, snmpCommunityRo, ..., dhcpExcludedFrom, ...)
+PREFIX_SECTIONS = (
+    ("snmp", ("snmp",)),
+    ("nat", ("nat",)),
+    ("dhcpExcluded", ("dhcp",)),
+)
+
+# Ключі, що не впливають на текст конфігурації
+IGNORED_KEYS = frozenset({"deviceId"})
+
+
+def sections_for_keys(keys) -> set:
+    # Повертає множину секцій, які треба перерендерити для змінених ключів.
+    #
+    # Невідомий ключ вважається таким, що впливає на все: краще зайвий
+    # рендер, ніж застарілий рядок у прев'ю.
+    dirty = set()
+    for key in keys:
+        if key in IGNORED_KEYS:
+            continue
+        sections = KEY_SECTIONS.get(key)
+        if sections is None:
+            for prefix, prefixed in PREFIX_SECTIONS:
+                if key.startswith(prefix):
+                    sections = prefixed
+                    break
+        if sections is None:
+            return set(ALL_SECTIONS)
+        dirty.update(sections)
+    return dirty
+
+
+class IncrementalGenerator:
+    # Сесійний генератор для живого прев'ю у web-майстрі.
+    #
+    # Пам'ятає попередній config_data та відрендерені рядки кожної секції.
+    # update() знаходить змінені ключі, перерендерює лише залежні секції
+    # і склеює їх з уже готовими. Порівняння неглибоке (по ключах верхнього
+    # рівня), тож вкладені списки не слід змінювати на місці між викликами;
+    # eel десеріалізує нові об'єкти на кожен виклик.
+    #
+    # Спільний section_cache тут не використовується: сесія сама тримає
+    # свої секції, а проміжні стани форми (кожне натискання клавіші) лише
+    # витісняли б з нього корисні для флоту записи.
+
+    def __init__(self):
+        self._config_data = None
+        self._sections = {}
+        self.last_dirty = ()
+
+    def _changed_keys(self, config_data: dict) -> set:
+        # Ключі верхнього рівня, значення яких відрізняються від попереднього запиту.
+        previous = self._config_data
+        keys = set(config_data) | set(previous)
+        return {k for k in keys if config_data.get(k) != previous.get(k)}
+
+    def update(self, config_data: dict) -> list[str]:
+        # Оновлює прев'ю новими даними форми і повертає повну конфігурацію.
+        #
+        # Raises:
+        #     RequestError: Якщо дані не пройшли нормалізацію/валідацію.
+        #         Стан сесії при цьому не змінюється.
+        config_data = dict(config_data or {})
+        args = full_config_args(**build_generation_kwargs(config_data))
+
+        if self._config_data is None:
+            dirty = set(ALL_SECTIONS)
+        else:
+            dirty = sections_for_keys(self._changed_keys(config_data))
+
+        for name in ALL_SECTIONS:
+            if name in dirty:
+                self._sections[name] = render_named_section(name, args, cache_sections=False)
+
+        self._config_data = config_data
+        self.last_dirty = tuple(name for name in ALL_SECTIONS if name in dirty)
+        return self.lines()
+
+    def lines(self) -> list[str]:
+        # Поточна повна конфігурація з кешованих секцій.
+        if not self._sections:
+            return []
+        lines = []
+        for name in ALL_SECTIONS:
+            lines.extend(self._sections[name])
+        lines.extend(CONFIG_TAIL)
+        return lines
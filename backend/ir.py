@@ -0,0 +1,104 @@
+# Проміжне представлення (IR) елементів конфігурації.
+#
+# Генератори секцій (backend/generate.py, backend/protocols.py) будують
+# списки цих вузлів замість словників, а Jinja2-шаблони лишаються єдиним
+# серіалізатором у текст IOS: ``{{ intf.name }}`` однаково працює для
+# атрибутів. Вузли на __slots__ не мають __dict__, тож на тисячах
+# інтерфейсів/маршрутів займають у кілька разів менше пам'яті, ніж словники,
+# порівнюються та хешуються за значенням (diff, section_cache).
+
+
+class Node:
+    # Базовий клас вузла IR.
+    #
+    # Поля задаються через ``__slots__`` підкласу, значення за замовчуванням —
+    # через ``_defaults``. Конструктор приймає поля позиційно (в порядку
+    # ``__slots__``) або за іменем.
+    __slots__ = ()
+    _defaults = {}
+
+    def __init__(self, *values, **fields):
+        # Заповнює всі слоти: позиційні значення, потім іменовані, потім _defaults.
+        names = self.__slots__
+        if not fields and len(values) == len(names):
+            # Швидкий шлях: усі поля позиційно (так будують вузли генератори)
+            for name, value in zip(names, values):
+                setattr(self, name, value)
+            return
+        if len(values) > len(names):
+            raise TypeError(f"{type(self).__name__} takes at most {len(names)} fields")
+        for name, value in zip(names, values):
+            if name in fields:
+                raise TypeError(f"{type(self).__name__} got multiple values for '{name}'")
+            setattr(self, name, value)
+        for name in names[len(values):]:
+            if name in fields:
+                setattr(self, name, fields.pop(name))
+            elif name in self._defaults:
+                setattr(self, name, self._defaults[name])
+            else:
+                raise TypeError(f"{type(self).__name__} missing field '{name}'")
+        if fields:
+            raise TypeError(f"{type(self).__name__} got unexpected fields {sorted(fields)}")
+
+    def astuple(self) -> tuple:
+        # Значення полів у порядку __slots__.
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        # Вузли рівні, якщо мають однаковий тип і однакові значення полів.
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        # Хеш за типом і значеннями полів (поля вузлів — незмінні скаляри).
+        return hash((type(self).__name__, self.astuple()))
+
+    def __repr__(self):
+        # Interface(name='Gi0/0', ip='10.0.0.1', ...)
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Interface(Node):
+    # Фізичний/логічний інтерфейс (шаблон interfaces.j2).
+    __slots__ = ("name", "ip", "mask", "description", "no_shutdown", "isis", "is_nat_inside", "is_nat_outside")
+    _defaults = {
+        "description": "", "no_shutdown": True, "isis": False,
+        "is_nat_inside": False, "is_nat_outside": False,
+    }
+
+
+class Ephone(Node):
+    # Пара ephone-dn/ephone з однаковим індексом (шаблон telephony.j2).
+    __slots__ = ("idx", "number", "user", "mac")
+    _defaults = {"number": "", "user": "", "mac": ""}
+
+
+class OspfNetwork(Node):
+    # Рядок ``network <ip> <wildcard> area <area>`` (routing/ospf.j2).
+    __slots__ = ("ip", "wildcard", "area")
+    _defaults = {"area": "0"}
+
+
+class EigrpNetwork(Node):
+    # Рядок ``network <ip> [<wildcard>]`` (routing/eigrp.j2).
+    __slots__ = ("ip", "wildcard")
+    _defaults = {"wildcard": ""}
+
+
+class BgpNeighbor(Node):
+    # Рядок ``neighbor <ip> remote-as <remote_as>`` (routing/bgp.j2).
+    __slots__ = ("ip", "remote_as")
+
+
+class BgpNetwork(Node):
+    # Рядок ``network <ip> mask <mask_str>`` (routing/bgp.j2).
+    __slots__ = ("ip", "mask_str")
+
+
+class StaticRoute(Node):
+    # Рядок ``ip route`` (routing/static.j2); mask — завжди dotted-decimal.
+    __slots__ = ("dest", "mask", "next_hop", "interface", "ad", "metric")
+    _defaults = {"next_hop": "", "interface": "", "ad": "", "metric": ""}
@@ -1,5 +1,13 @@
+import hashlib
+import json
+import logging
 import os
-from jinja2 import Environment, FileSystemLoader
+from typing import Iterator
+
+import jinja2
+from jinja2 import Environment, FileSystemLoader, ModuleLoader
+
+logger = logging.getLogger(__name__)
 
 # Shared Jinja2 environment – single instance used by all generators.
 # auto_reload=False prevents filesystem checks on every get_template() call,
@@ -9,8 +17,17 @@ from jinja2 import Environment, FileSystemLoader
 # in this project.
 _template_dir = os.path.join(os.path.dirname(__file__), "templates")
 
-env = Environment(
-    loader=FileSystemLoader(_template_dir),
+# Precompiled template bundle produced by scripts/compile_templates.py.
+# CRW_TEMPLATE_BUNDLE selects the runtime behaviour:
+#   unset / "auto" – use the default bundle directory if it exists and is fresh
+#   "off" / "0"    – always compile templates from the filesystem
+#   <path>         – use the bundle at <path> if it is fresh
+DEFAULT_BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "_templates_compiled")
+MANIFEST_NAME = "manifest.json"
+
+# Options baked into compiled template code. A bundle built with different
+# options (or another Jinja2 version) is treated as stale.
+ENV_OPTIONS = dict(
     trim_blocks=True,
     lstrip_blocks=True,
     auto_reload=False,   # Hot spot 1 fix: skip mtime checks on every render
@@ -18,12 +35,133 @@ env = Environment(
 )
 
 
+def template_names() -> list[str]:
+    """Return all ``.j2`` template names (``routing/ospf.j2`` style), sorted."""
+    names = []
+    for root, _dirs, files in os.walk(_template_dir):
+        for filename in files:
+            if filename.endswith(".j2"):
+                rel = os.path.relpath(os.path.join(root, filename), _template_dir)
+                names.append(rel.replace(os.sep, "/"))
+    return sorted(names)
+
+
+def _manifest_header() -> dict:
+    # Jinja2 version and the ENV_OPTIONS that change generated code.
+    return {
+        "jinja2": jinja2.__version__,
+        "options": {k: v for k, v in ENV_OPTIONS.items() if k in ("trim_blocks", "lstrip_blocks")},
+    }
+
+
+def build_manifest() -> dict:
+    """Fingerprint of the template sources and compile-time options.
+
+    Stored next to a compiled bundle; any difference means the bundle no
+    longer matches the ``.j2`` files.
+    """
+    sources = {}
+    for name in template_names():
+        with open(os.path.join(_template_dir, name), "rb") as f:
+            sources[name] = hashlib.sha256(f.read()).hexdigest()
+    return {**_manifest_header(), "templates": sources}
+
+
+def template_stats() -> dict:
+    """``[mtime_ns, size]`` of every template, keyed like ``build_manifest()``.
+
+    Written into the bundle manifest so ``bundle_is_fresh()`` can skip
+    hashing when no template file has been touched since the build.
+    """
+    stats = {}
+    for name in template_names():
+        st = os.stat(os.path.join(_template_dir, name))
+        stats[name] = [st.st_mtime_ns, st.st_size]
+    return stats
+
+
+def bundle_is_fresh(bundle_dir: str) -> bool:
+    """True if ``bundle_dir`` holds a bundle built from the current templates.
+
+    Compares file mtimes and sizes first; the sources are hashed only when
+    those differ (e.g. after a checkout that rewrote identical files).
+    """
+    try:
+        with open(os.path.join(bundle_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(stored, dict):
+        return False
+    stats = stored.pop("stats", None)
+    if stats is not None and stats == template_stats():
+        return all(stored.get(k) == v for k, v in _manifest_header().items())
+    return stored == build_manifest()
+
+
+def _select_loader():
+    # Returns (loader, source) where source is "bundle" or "filesystem".
+    setting = os.environ.get("CRW_TEMPLATE_BUNDLE", "auto").strip()
+    if setting.lower() in ("off", "0", "false", "no"):
+        return FileSystemLoader(_template_dir), "filesystem"
+
+    bundle_dir = DEFAULT_BUNDLE_DIR if setting.lower() in ("", "auto") else setting
+    if os.path.isdir(bundle_dir):
+        if bundle_is_fresh(bundle_dir):
+            return ModuleLoader(bundle_dir), "bundle"
+        logger.warning(f"Template bundle {bundle_dir} is stale, falling back to filesystem templates")
+    return FileSystemLoader(_template_dir), "filesystem"
+
+
+def make_filesystem_env() -> Environment:
+    """Environment that compiles templates from ``backend/templates``.
+
+    Used by the bundle build step so compiled code matches ENV_OPTIONS.
+    """
+    return Environment(loader=FileSystemLoader(_template_dir), **ENV_OPTIONS)
+
+
+_loader, TEMPLATE_SOURCE = _select_loader()
+env = Environment(loader=_loader, **ENV_OPTIONS)
+
+
+def warm_up() -> None:
+    """Load every template into the environment cache.
+
+    Called once per worker process so the first request does not pay for
+    template loading/compilation.
+    """
+    for name in template_names():
+        env.get_template(name)
+
+
+def iter_template_lines(template_name: str, context: dict) -> Iterator[str]:
+    """Render a Jinja2 template lazily and yield non-empty lines.
+
+    Uses ``Template.generate()`` so the rendered text is never materialized
+    as one string: chunks are split on newlines as they are produced and
+    only the current partial line is buffered.
+    """
+    template = env.get_template(template_name)
+    pending = ""
+    for chunk in template.generate(**context):
+        if "\n" not in chunk:
+            pending += chunk
+            continue
+        parts = chunk.split("\n")
+        parts[0] = pending + parts[0]
+        pending = parts.pop()
+        for line in parts:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
 def render_template_to_lines(template_name: str, context: dict) -> list[str]:
     """Render a Jinja2 template and return non-empty lines.
 
     Single shared entry-point used by both generate.py and protocols.py
     to avoid creating duplicate Environment objects.
     """
-    template = env.get_template(template_name)
-    rendered = template.render(**context)
-    return [line for line in rendered.splitlines() if line.strip()]
+    return list(iter_template_lines(template_name, context))
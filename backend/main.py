@@ -1,10 +1,8 @@
-import eel
 import os
-import traceback
 import logging
 from logging.handlers import RotatingFileHandler
-import uuid
 import json
+from collections import OrderedDict
 
 # Налаштування мінімального рівня логування через змінну оточення LOG_LEVEL (за замовчуванням INFO)
 log_level_str = os.environ.get("LOG_LEVEL", "INFO").upper()
@@ -17,7 +15,8 @@ formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(module)s - [USER:
 # Для ротації за часом можна використати TimedRotatingFileHandler(filename, when="midnight", interval=1, backupCount=7)
 # Це вбудований засіб Python `logging.handlers`, який реалізує ротацію без зовнішніх утиліт (типу logrotate).
 # Якщо ж потрібне масштабування на рівні ОС, можна використовувати звичайний FileHandler і налаштувати logrotate у Linux.
-file_handler = RotatingFileHandler("crw_app.log", maxBytes=5*1024*1024, backupCount=3, encoding="utf-8")
+# delay=True: файл відкривається при першому записі, а не під час імпорту модуля.
+file_handler = RotatingFileHandler("crw_app.log", maxBytes=5*1024*1024, backupCount=3, encoding="utf-8", delay=True)
 file_handler.setLevel(log_level)
 file_handler.setFormatter(formatter)
 
@@ -37,27 +36,62 @@ class GlobalContextFilter(logging.Filter):
 logger.addFilter(GlobalContextFilter())
 
 try:
-    from .generate import generate_full_config
-    from .validate import validate_inputs
+    from .request import new_error_id, RequestError
+    from .incremental import IncrementalGenerator
+    from .result_cache import result_cache, disk_dir_from_env, generate_cached
+    from .section_cache import section_cache
+    from .tasks import TaskRunner
     from . import connect as router_connect
     logger.debug("Успішний імпорт генератора, валідатора та connect (relative)")
 except ImportError:
-    from generate import generate_full_config
-    from validate import validate_inputs
+    from request import new_error_id, RequestError
+    from incremental import IncrementalGenerator
+    from result_cache import result_cache, disk_dir_from_env, generate_cached
+    from section_cache import section_cache
+    from tasks import TaskRunner
     import connect as router_connect
     logger.debug("Успішний імпорт генератора, валідатора та connect (absolute)")
 
 
-# Ініціалізація eel
 web_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "web"))
-logger.debug(f"Ініціалізація eel. Директорія web: {web_dir}")
-eel.init(web_dir)
 
+# Функції, доступні з JS. eel (gevent, bottle) імпортується і реєструє їх
+# лише в start_gui(), тож імпорт модуля для генерації не платить за GUI-стек.
+_exposed = []
 
-@eel.expose
+
+def expose(func):
+    # Позначає функцію для виклику з JS (аналог @eel.expose).
+    _exposed.append(func)
+    return func
+
+
+# Блокуючі операції з роутером (netmiko) виконуються в пулі потоків, щоб
+# не зупиняти event loop eel: генерація і прев'ю відповідають під час деплою.
+_tasks = TaskRunner()
+
+# Повний вивід роутера останнього деплою (поруч із crw_app.log); у UI
+# він надходить частинами, а в результаті лишається лише хвіст
+_DEPLOY_LOG = "crw_deploy.log"
+
+# Модуль eel після start_gui(); до того виклики JS ігноруються
+_eel = None
+
+
+def _call_js(name: str, payload: dict) -> None:
+    # Викликає JS-функцію, зареєстровану через eel.expose() у web/*.js.
+    #
+    # Лише з потоку hub gevent (через _tasks.post() з потоків пулу); відповідь
+    # JS не очікується.
+    function = getattr(_eel, name, None)
+    if function is not None:
+        function(json.dumps(payload))
+
+
+@expose
 def process_text(config_data: dict = None) -> str:
     # Ініціалізація унікальної сесії/запиту та адаптера логування
-    req_id = str(uuid.uuid4()).split('-')[0].upper()
+    req_id = new_error_id()
     admin_user = config_data.get("adminUsername", "GUEST") if config_data else "GUEST"
     req_logger = logging.LoggerAdapter(logger, {"user": admin_user, "session": req_id})
 
@@ -67,277 +101,18 @@ def process_text(config_data: dict = None) -> str:
         config_data = {}
 
     try:
-        # Екстрагування значень із JSON об'єкта
-        routing_protocol = config_data.get("routingProtocol", "")
-        router_id = config_data.get("routerId", "")
-        ip_multicast = config_data.get("ipMulticast", False)
-        telephony_enabled = config_data.get("telephonyEnabled", False)
-        dn_list = config_data.get("dnList", [])
-        enable_ssh = config_data.get("enableSsh", False)
-        hostname = config_data.get("hostname", "")
-        enable_secret = config_data.get("enableSecret", "")
-        console_password = config_data.get("consolePassword", "")
-        admin_username = config_data.get("adminUsername", "admin")
-        admin_password = config_data.get("adminPassword", "")
-        domain_name = config_data.get("domainName", "local.lab")
-        dhcp_network = config_data.get("dhcpNetwork", "")
-        dhcp_mask = config_data.get("dhcpMask", "")
-        dhcp_gateway = config_data.get("dhcpGateway", "")
-        dhcp_dns = config_data.get("dhcpDns", "")
-        interfaces = config_data.get("interfaces", [])
-        networks = config_data.get("networks", [])
-        no_shutdown_interfaces = config_data.get("noShutdownInterfaces", [])
-        descriptions = config_data.get("descriptions", [])
-        max_ephones = config_data.get("maxEphones", 3)
-        max_dn = config_data.get("maxDn", 3)
-        auto_assign_range = config_data.get("autoAssignRange", "1 to 3")
-        
-        # Dynamic calculations for 2.5
-        ip_source_address = dhcp_gateway if dhcp_gateway else ""
-        if not ip_source_address and interfaces:
-            # Fallback to the first configured interface IP if available
-            for ip, mask in networks:
-                if ip:
-                    ip_source_address = ip
-                    break
-        if not ip_source_address:
-            ip_source_address = "10.0.0.1"  # ultimate fallback
-
-        dhcp_excluded = config_data.get("dhcpExcluded", [])
-        dhcp_excluded_from = config_data.get("dhcpExcludedFrom", "").strip()
-        dhcp_excluded_to = config_data.get("dhcpExcludedTo", "").strip()
-        dhcp_option150 = config_data.get("dhcpOption150", "").strip()
-        cme_source_ip_raw = config_data.get("cmeSourceIp", "").strip()
-        # Build dhcp_excluded from explicit From/To UI fields (overrides old logic)
-        if dhcp_excluded_from and dhcp_excluded_to:
-            dhcp_excluded = [dhcp_excluded_from, dhcp_excluded_to]
-        elif dhcp_excluded_from:
-            dhcp_excluded = [dhcp_excluded_from]
-        elif not dhcp_excluded and dhcp_gateway:
-            # Legacy auto-derive: gateway to gateway+9
-            try:
-                octets = dhcp_gateway.split('.')
-                last_octet = int(octets[-1])
-                if last_octet <= 245:
-                    end_ip = f"{octets[0]}.{octets[1]}.{octets[2]}.{last_octet + 9}"
-                    dhcp_excluded = [dhcp_gateway, end_ip]
-                else:
-                    dhcp_excluded = [dhcp_gateway]
-            except (ValueError, IndexError):
-                dhcp_excluded = [dhcp_gateway]
-
-        # CME source IP: use explicit field, fallback to DHCP gateway
-        cme_source_ip = cme_source_ip_raw or dhcp_gateway or ip_source_address or "10.0.0.1"
-
-        nat_type = config_data.get("natType", "None")
-        nat_inside = config_data.get("natInside", "")
-        nat_outside = config_data.get("natOutside", "")
-        nat_inside_local = config_data.get("natInsideLocal", "")
-        nat_inside_global = config_data.get("natInsideGlobal", "")
-        snmp_enabled = config_data.get("snmpEnabled", False)
-        snmp_community_ro = config_data.get("snmpCommunityRo", "")
-        snmp_community_rw = config_data.get("snmpCommunityRw", "")
-        snmp_location = config_data.get("snmpLocation", "")
-        snmp_contact = config_data.get("snmpContact", "")
-        snmp_trap_host = config_data.get("snmpTrapHost", "")
-        routing_config = config_data.get("routingConfig", {})
-
-        # Захист від None
-        if dn_list is None:
-            dn_list = []
-        if interfaces is None:
-            interfaces = []
-        if networks is None:
-            networks = []
-        if no_shutdown_interfaces is None:
-            no_shutdown_interfaces = []
-        if descriptions is None:
-            descriptions = []
-
-        # Мінімальна перевірка
-        if not interfaces:
-            err_code = "ERR-VAL-001"
-            err_id = str(uuid.uuid4()).split('-')[0].upper()
-            req_logger.error(f"[{err_code}] [{err_id}] Помилка генерації: не передано жодного інтерфейсу. Контекст: hostname={hostname}")
-            return json.dumps({
-                "error": True,
-                "code": err_code,
-                "id": err_id,
-                "messageKey": "errNoInterfaces",
-                "defaultMessage": "Не передано жодного інтерфейсу",
-                "instructionsKey": "instrNoInterfaces"
-            })
-
-        # Нормалізація/валідація `networks`
-        if isinstance(networks, int):
-            try:
-                if networks < 0:
-                    raise ValueError("Кількість мереж не може бути від'ємною")
-                networks = [("192.168.1.1", "255.255.255.0")] * networks
-            except ValueError as e:
-                err_code = "ERR-VAL-002"
-                err_id = str(uuid.uuid4()).split('-')[0].upper()
-                req_logger.error(f"[{err_code}] [{err_id}] {e}. Контекст: networks={networks}")
-                return json.dumps({
-                    "error": True, "code": err_code, "id": err_id,
-                    "messageKey": "errInvalidNetworkCount", "defaultMessage": f"{e}", "instructionsKey": "instrCheckForm"
-                })
-
-        elif not isinstance(networks, list):
-            err_code = "ERR-VAL-003"
-            err_id = str(uuid.uuid4()).split('-')[0].upper()
-            req_logger.error(f"[{err_code}] [{err_id}] Некоректний формат параметра `networks`. Type: {type(networks)}")
-            return json.dumps({
-                "error": True, "code": err_code, "id": err_id,
-                "messageKey": "errInvalidNetworkFormat", "defaultMessage": "Некоректний формат параметра `networks`", "instructionsKey": "instrContactSupport"
-            })
-
-        # Якщо `networks` не передали — заповнюємо дефолтними значеннями
-        if not networks and interfaces:
-            networks = [("192.168.1.1", "255.255.255.0")] * len(interfaces)
-
-        # Перевірка відповідності довжин
-        try:
-            if len(networks) != len(interfaces):
-                err_code = "ERR-VAL-004"
-                err_id = str(uuid.uuid4()).split('-')[0].upper()
-                req_logger.error(f"[{err_code}] [{err_id}] Невідповідність кількості мереж ({len(networks)}) та інтерфейсів ({len(interfaces)}). Контекст: interfaces={interfaces}")
-                return json.dumps({
-                    "error": True, "code": err_code, "id": err_id,
-                    "messageKey": "errNetworkInterfaceMismatch", 
-                    "defaultMessage": f"Кількість мереж ({len(networks)}) не відповідає кількості інтерфейсів ({len(interfaces)})",
-                    "instructionsKey": "instrMatchNetworks"
-                })
-        except TypeError:
-            err_code = "ERR-VAL-005"
-            err_id = str(uuid.uuid4()).split('-')[0].upper()
-            req_logger.error(f"[{err_code}] [{err_id}] Некоректний формат параметра `networks` — очікується список мереж")
-            return json.dumps({
-                "error": True, "code": err_code, "id": err_id,
-                "messageKey": "errInvalidNetworkFormat", "defaultMessage": "Некоректний формат параметра `networks`", "instructionsKey": "instrContactSupport"
-            })
-
-        # Базова валідація для OSPF
-        # Захищено: routing_protocol може бути неправильного типу
-        if not isinstance(routing_protocol, str):
-            routing_protocol = str(routing_protocol)
-
-        # Комлексна валідація вхідних даних
-        validation_error = validate_inputs(
-            networks=networks,
-            hostname=hostname.strip() or "R1",
-            routing_protocol=routing_protocol.strip(),
-            router_id=str(router_id).strip() if router_id else "",
-            enable_secret=str(enable_secret).strip() if enable_secret else "",
-            console_password=str(console_password).strip() if console_password else "",
-            admin_password=str(admin_password).strip() if admin_password else "",
-            dhcp_network=str(dhcp_network).strip() if dhcp_network else "",
-            dhcp_mask=str(dhcp_mask).strip() if dhcp_mask else "",
-            dhcp_gateway=str(dhcp_gateway).strip() if dhcp_gateway else "",
-            dhcp_dns=str(dhcp_dns).strip() if dhcp_dns else ""
-        )
-        
-        if validation_error:
-            err_code = "ERR-VAL-006"
-            err_id = str(uuid.uuid4()).split('-')[0].upper()
-            req_logger.warning(f"[{err_code}] [{err_id}] Дані не пройшли валідацію: {validation_error}. Контекст: hostname={hostname}")
-            return json.dumps({
-                "error": True, "code": err_code, "id": err_id,
-                "messageKey": "errValidationError", "defaultMessage": validation_error, "instructionsKey": "instrCheckValidation"
-            })
-
-        # Safeguard for max_ephones/max_dn receiving lists due to argument shifts
-        if isinstance(max_ephones, list):
-            max_ephones = 3
-        if isinstance(max_dn, list):
-            max_dn = 3
-
-        # Fallbacks for optional parameters
-        final_ip_source = cme_source_ip if cme_source_ip else (ip_source_address.strip() if ip_source_address else "10.0.0.1")
-        final_auto_assign = auto_assign_range.strip() if auto_assign_range else "1 to 3"
-        
-        # Ensure dhcp_excluded is at least a tuple of strings
-        if not dhcp_excluded:
-            if dhcp_gateway:
-                final_dhcp_excluded = (dhcp_gateway,)
-            else:
-                final_dhcp_excluded = ()
-        else:
-            final_dhcp_excluded = tuple(str(x).strip() for x in dhcp_excluded)
-
-        # Виклик генерації конфігурації
-        try:
-            req_logger.info(f"Старт генерації конфігурації для пристрою: {hostname.strip() or 'R1'}")
-            config_lines = generate_full_config(
-                hostname=hostname.strip() or "R1",
-                interfaces=[str(i).strip() for i in interfaces],
-                networks=networks,
-                ip_multicast=bool(ip_multicast),
-                routing_protocol=routing_protocol.strip(),
-                router_id=str(router_id).strip(),
-                telephony_enabled=bool(telephony_enabled),
-                dn_list=dn_list,
-                enable_ssh=bool(enable_ssh),
-                enable_secret=enable_secret.strip(),
-                console_password=console_password.strip(),
-                admin_username=admin_username.strip(),
-                admin_password=admin_password.strip(),
-                domain_name=domain_name.strip(),
-                dhcp_network=dhcp_network.strip(),
-                dhcp_mask=dhcp_mask.strip(),
-                dhcp_gateway=dhcp_gateway.strip(),
-                dhcp_dns=dhcp_dns.strip(),
-                nat_type=nat_type.strip(),
-                nat_inside=nat_inside.strip(),
-                nat_outside=nat_outside.strip(),
-                nat_inside_local=nat_inside_local.strip(),
-                nat_inside_global=nat_inside_global.strip(),
-                snmp_enabled=snmp_enabled,
-                snmp_community_ro=snmp_community_ro.strip(),
-                snmp_community_rw=snmp_community_rw.strip(),
-                snmp_location=snmp_location.strip(),
-                snmp_contact=snmp_contact.strip(),
-                snmp_trap_host=snmp_trap_host.strip(),
-                no_shutdown_interfaces=[str(i).strip() for i in no_shutdown_interfaces],
-                descriptions=[str(d).strip() for d in descriptions],
-                max_ephones=int(max_ephones),
-                max_dn=int(max_dn),
-                ip_source_address=final_ip_source,
-                auto_assign_range=final_auto_assign,
-                dhcp_excluded=final_dhcp_excluded,
-                dhcp_option150=dhcp_option150,
-                routing_config=routing_config
-            )
-
-            req_logger.info(f"Успішно згенеровано {len(config_lines)} рядків конфігурації")
-            return "\n".join(config_lines)
-
-        except Exception as e:
-            err_code = "ERR-GEN-001"
-            err_id = str(uuid.uuid4()).split('-')[0].upper()
-            error_details = traceback.format_exc()
-            # Контекст з основними безпечними параметрами
-            safe_context = {
-                "hostname": hostname,
-                "routing_protocol": routing_protocol,
-                "interfaces": interfaces,
-                "telephony_enabled": telephony_enabled
-            }
-            req_logger.error(f"[{err_code}] [{err_id}] Критична помилка генерації: {str(e)}. Контекст: {safe_context}", exc_info=True)
-            return json.dumps({
-                "error": True, "code": err_code, "id": err_id,
-                "messageKey": "errGenerationFailed", "defaultMessage": "Критична помилка генерації конфігурації.", "instructionsKey": "instrContactSupport"
-            })
+        # Кеш результатів, валідація і генерація — спільні з HTTP-сервером
+        result = generate_cached(config_data, req_logger)
+        return result if isinstance(result, str) else json.dumps(result)
 
     except Exception as e:
         err_code = "ERR-SYS-001"
-        err_id = str(uuid.uuid4()).split('-')[0].upper()
-        error_details = traceback.format_exc()
-        
+        err_id = new_error_id()
+
         # Безпечний дамп параметрів для контексту
         safe_keys = ['hostname', 'routingProtocol', 'interfaces']
         context_data = {k: config_data.get(k) for k in safe_keys} if isinstance(config_data, dict) else "Invalid config_data format"
-        
+
         # Тут не використовуємо req_logger, бо config_data може бути некоректним
         logger.critical(f"[{err_code}] [{err_id}] Глобальна помилка в process_text: {str(e)}. Контекст: {context_data}", exc_info=True)
         return json.dumps({
@@ -346,7 +121,60 @@ def process_text(config_data: dict = None) -> str:
         })
 
 
-@eel.expose
+@expose
+def cache_stats() -> str:
+    # Статистика кешів генерації для інструментування.
+    #
+    # Returns:
+    #     str: JSON {"result_cache": {...}, "section_cache": {...}} —
+    #     розмір, влучання/промахи, hit_ratio; для result_cache також
+    #     латентність process_text (p50/p95, мс) окремо для влучань і промахів.
+    return json.dumps({"result_cache": result_cache.stats(), "section_cache": section_cache.stats()})
+
+
+# Сесії живого прев'ю: session_id -> IncrementalGenerator (обмежений LRU)
+_MAX_PREVIEW_SESSIONS = 16
+_preview_sessions = OrderedDict()
+
+
+@expose
+def preview_config(config_data: dict = None, session_id: str = "") -> str:
+    # Інкрементальна генерація для живого прев'ю.
+    #
+    # Повертає той самий результат, що й process_text(), але в межах сесії
+    # перерендерює лише секції, залежні від змінених полів форми.
+    # Без session_id працює як звичайний process_text().
+    #
+    # Args:
+    #     config_data (dict): Дані форми.
+    #     session_id (str): Ідентифікатор вкладки/сесії UI.
+    #
+    # Returns:
+    #     str: Текст конфігурації або JSON-об'єкт помилки.
+    if not session_id:
+        return process_text(config_data)
+
+    generator = _preview_sessions.get(session_id)
+    if generator is None:
+        generator = IncrementalGenerator()
+        _preview_sessions[session_id] = generator
+        while len(_preview_sessions) > _MAX_PREVIEW_SESSIONS:
+            _preview_sessions.popitem(last=False)
+    _preview_sessions.move_to_end(session_id)
+
+    try:
+        lines = generator.update(config_data)
+        logger.debug(f"[PREVIEW] Сесія {session_id}: перерендерено секції {generator.last_dirty}")
+        return "\n".join(lines)
+    except RequestError as e:
+        return json.dumps(e.to_payload())
+    except Exception:
+        # Нестандартні випадки — повний шлях з логуванням та кодами помилок
+        _preview_sessions.pop(session_id, None)
+        return process_text(config_data)
+
+
+@expose
 def connect_router(host: str, port: int = 23, username: str = "", password: str = "", enable_secret: str = "") -> str:
     # Встановлює Telnet-з'єднання з Cisco роутером.
     #
@@ -364,7 +192,8 @@ def connect_router(host: str, port: int = 23, username: str = "", password: str
     #     str: JSON {"ok": bool, "error": str}
     logger.info(f"[TELNET] Запит на підключення до {host}:{port} (user='{username or 'noauth'}')")
     try:
-        result = router_connect.connect(
+        result = _tasks.run(
+            "connect", router_connect.connect,
             host=str(host).strip(),
             port=int(port),
             username=str(username).strip(),
@@ -381,7 +210,7 @@ def connect_router(host: str, port: int = 23, username: str = "", password: str
         return json.dumps({"ok": False, "error": str(e)})
 
 
-@eel.expose
+@expose
 def disconnect_router() -> str:
     # Закриває поточне Telnet-з'єднання з роутером.
     #
@@ -389,7 +218,7 @@ def disconnect_router() -> str:
     #     str: JSON {"ok": bool}
     logger.info("[TELNET] Запит на відключення")
     try:
-        result = router_connect.disconnect()
+        result = _tasks.run("disconnect", router_connect.disconnect)
         logger.info("[TELNET] З'єднання закрито")
         return json.dumps(result)
     except Exception as e:
@@ -397,8 +226,14 @@ def disconnect_router() -> str:
         return json.dumps({"ok": False, "error": str(e)})
 
 
-@eel.expose
-def deploy_config(config_text: str) -> str:
+@expose
+def deploy_config(
+    config_text: str,
+    delta: bool = False,
+    pipelined: bool = False,
+    transfer: bool = False,
+    stop_on_error: bool = False
+) -> str:
     # Надсилає конфігурацію з текстового поля на підключений роутер.
     #
     # Приймає повний текст конфігурації (рядки розділені '\n'),
@@ -406,18 +241,36 @@ def deploy_config(config_text: str) -> str:
     #
     # Args:
     #     config_text (str): Повний текст конфігурації IOS.
+    #     delta (bool): Надіслати лише різницю з running-config роутера.
+    #     pipelined (bool): Пакетне надсилання рядків (швидше на великих конфігураціях).
+    #     transfer (bool): Передати файлом по TFTP і застосувати ``copy tftp: running-config``.
+    #     stop_on_error (bool): Зупинити деплой на першій відхиленій команді
+    #         (без write memory).
+    #
+    # Під час деплою JS-функція crw_deploy_progress (web/api.js) отримує
+    # події {"sent", "total", "output", "errors"}; повний вивід роутера
+    # пишеться в _DEPLOY_LOG.
     #
     # Returns:
-    #     str: JSON {"ok": bool, "output": str, "error": str}
-    logger.info("[TELNET] Запит на деплой конфігурації")
+    #     str: JSON {"ok": bool, "output": str, "error": str, "sent": int, "errors": list, "output_file": str}
+    #     errors[].line — номер рядка в config_text (порожні рядки враховуються);
+    #     output — останні connect.OUTPUT_TAIL символів виводу.
+    logger.info("[TELNET] Запит на деплой конфігурації" + (" (delta)" if delta else "") + (" (pipelined)" if pipelined else "") + (" (tftp)" if transfer else ""))
     try:
-        lines = [line for line in config_text.splitlines() if line.strip()]
-        if not lines:
+        # Порожні рядки не відкидаємо: push_config() їх пропускає, а номери
+        # рядків у errors збігаються з текстовим полем
+        lines = config_text.splitlines()
+        if not any(line.strip() for line in lines):
             return json.dumps({"ok": False, "output": "", "error": "No configuration to deploy."})
 
-        result = router_connect.deploy_config(lines)
+        result = _tasks.run(
+            "deploy", router_connect.deploy_config,
+            lines, delta=bool(delta), pipelined=bool(pipelined), transfer=bool(transfer),
+            progress=lambda event: _tasks.post(_call_js, "crw_deploy_progress", event),
+            stop_on_error=bool(stop_on_error), spool_path=_DEPLOY_LOG
+        )
         if result["ok"]:
-            logger.info(f"[TELNET] Деплой успішний ({len(lines)} команд)")
+            logger.info(f"[TELNET] Деплой успішний ({result.get('sent', len(lines))} команд, відхилено: {len(result.get('errors', []))})")
         else:
             logger.warning(f"[TELNET] Деплой не вдався: {result['error']}")
         return json.dumps(result)
@@ -426,8 +279,48 @@ def deploy_config(config_text: str) -> str:
         return json.dumps({"ok": False, "output": "", "error": str(e)})
 
 
-if __name__ == "__main__":
-    logger.info("Запуск Cisco Router Wizard (Backend)")
+@expose
+def preview_deploy(config_text: str) -> str:
+    # Дельта деплою для підтвердження: команди і рядки роутера, які буде
+    # видалено (router_connect.preview_delta()).
+    #
+    # Args:
+    #     config_text (str): Повний текст конфігурації IOS.
+    #
+    # Returns:
+    #     str: JSON {"ok": bool, "error": str, "commands": list, "removals": list}
+    try:
+        result = _tasks.run("deploy-preview", router_connect.preview_delta, config_text.splitlines())
+        if result["ok"]:
+            logger.info(f"[TELNET] Дельта: {len(result['commands'])} команд, видалень: {len(result['removals'])}")
+        return json.dumps(result)
+    except Exception as e:
+        logger.error(f"[TELNET] Помилка preview_deploy: {e}", exc_info=True)
+        return json.dumps({"ok": False, "error": str(e), "commands": [], "removals": []})
+
+
+def start_gui() -> None:
+    # Ініціалізує eel, реєструє функції з _exposed і відкриває вікно програми.
+    global _eel
+    import eel
+
+    logger.debug(f"Ініціалізація eel. Директорія web: {web_dir}")
+    eel.init(web_dir)
+    # Профілі таймінгів роутерів зберігаються поруч із crw_app.log
+    router_connect.timing.profiles.use_file("crw_timing.json")
+    # Дисковий кеш конфігурацій — лише за явним CRW_DISK_CACHE (каталог
+    # користувача; конфігурації з паролями туди не пишуться)
+    cache_dir = disk_dir_from_env()
+    if cache_dir:
+        result_cache.use_dir(cache_dir)
+    for func in _exposed:
+        eel.expose(func)
+
+    _eel = eel
+    _tasks.use_gevent()
+    # Стан фонових операцій для UI (crw_task_update у web/api.js)
+    _tasks.notify = lambda event: _call_js("crw_task_update", event)
+
     window_size = (1180, 920)
 
     # Спробуємо різні режими браузерів
@@ -449,3 +342,17 @@ if __name__ == "__main__":
     else:
         logger.error("Не вдалося запустити додаток у жодному браузері")
         print("Не вдалося запустити додаток у жодному браузері")
+
+
+if __name__ == "__main__":
+    logger.info("Запуск Cisco Router Wizard (Backend)")
+    # EEL_MODE=None (docs/scripts/Dockerfile) — безголовий HTTP-сервер
+    # генерації замість вікна eel
+    if os.environ.get("EEL_MODE", "").strip().lower() == "none":
+        try:
+            from .server import main as serve_headless
+        except ImportError:
+            from server import main as serve_headless
+        serve_headless([])
+    else:
+        start_gui()
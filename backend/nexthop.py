@@ -0,0 +1,174 @@
+# Досяжність next-hop статичних маршрутів одного роутера.
+#
+# IOS встановлює маршрут ``ip route <мережа> <маска> <next-hop>``, лише
+# якщо next-hop резолвиться: найдовший збіг у таблиці маршрутизації —
+# підключена мережа інтерфейсу або інший статичний маршрут, чий next-hop
+# у свою чергу резолвиться (рекурсивно). Інакше маршрут мовчки не працює.
+#
+# Індекс — PrefixTrie (backend/prefix_trie.py) над підключеними мережами
+# та мережами призначення маршрутів, тож найдовший збіг для кожного
+# next-hop — спуск максимум на 32 біти. Рекурсія не обходиться вглиб:
+# маршрути з next-hop у підключеній мережі (чи лише з вихідним
+# інтерфейсом) досяжні одразу, а досяжність поширюється зворотними
+# ребрами «маршрут -> маршрути, що резолвляться через нього». Що лишилося
+# недосяжним — резолвиться в нікуди або по циклу; ланцюжок за першим
+# кандидатом показує, який саме випадок. Усе разом — O(32·n + ребра).
+try:
+    from . import addrmath
+    from .overlap import request_prefixes, network_prefix, IFACE
+    from .prefix_trie import PrefixTrie
+except ImportError:
+    import addrmath
+    from overlap import request_prefixes, network_prefix, IFACE
+    from prefix_trie import PrefixTrie
+
+# Стан маршруту: досяжний, next-hop поза таблицею, next-hop — власна адреса
+_REACHABLE, _NO_ROUTE, _OWN_ADDRESS = "reachable", "no-route", "own"
+
+
+def _text(value) -> str:
+    # Рядкове значення поля без пробілів по краях.
+    return value.strip() if isinstance(value, str) else ""
+
+
+class _Route:
+    # Статичний маршрут запиту: індекс у staticRoutes, префікс призначення,
+    # next-hop (ціле) і чи задано вихідний інтерфейс.
+    __slots__ = ("index", "start", "end", "next_hop", "interface")
+
+    def __init__(self, index, start, end, next_hop, interface):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.next_hop = next_hop
+        self.interface = interface
+
+    def text(self) -> str:
+        # Мережа призначення в нотації CIDR.
+        return f"{addrmath.int_to_ipv4(self.start)}/{32 - (self.end - self.start).bit_length()}"
+
+    def ref(self) -> str:
+        # Запис форми маршруту.
+        return f"routingConfig.staticRoutes[{self.index}]"
+
+
+def _static_routes(config_data: dict) -> list[_Route]:
+    # Маршрути з коректними мережею та next-hop; решту перевіряють правила
+    # полів у validate.py.
+    routing_config = config_data.get("routingConfig")
+    routes = routing_config.get("staticRoutes") if isinstance(routing_config, dict) else None
+    parsed = []
+    for index, route in enumerate(routes if isinstance(routes, list) else ()):
+        if not isinstance(route, dict):
+            continue
+        interval = network_prefix(_text(route.get("dest")), _text(route.get("mask")) or "255.255.255.0")
+        next_hop_text = _text(route.get("nextHop"))
+        next_hop = addrmath.parse_address(next_hop_text) if next_hop_text else None
+        if interval is None or (next_hop_text and next_hop is None):
+            continue
+        parsed.append(_Route(index, *interval, next_hop, bool(_text(route.get("interface")))))
+    return parsed
+
+
+def unresolved_next_hops(config_data: dict) -> list[dict]:
+    # Статичні маршрути, next-hop яких не резолвиться в таблиці роутера.
+    #
+    # Таблиця — підключені мережі інтерфейсів (``networks``) і статичні
+    # маршрути запиту. Маршрут з вихідним інтерфейсом вважається досяжним.
+    # Перевіряється лише для ``routingProtocol == "STATIC"`` — інакше
+    # маршрути не генеруються.
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/state.js.
+    #
+    # Returns:
+    #     list[dict]: Помилки ``{"path": "routingConfig.staticRoutes[i].nextHop",
+    #     "message"}`` у порядку маршрутів.
+    #
+    # Examples:
+    # >>> unresolved_next_hops({"networks": [("10.0.0.1", "30")], "routingProtocol": "STATIC",
+    # ...     "routingConfig": {"staticRoutes": [{"dest": "0.0.0.0", "mask": "0", "nextHop": "10.0.1.2"}]}})
+    # [{'path': 'routingConfig.staticRoutes[0].nextHop', 'message': '❌ Error: Next-hop 10.0.1.2 не входить
+    #   у жодну підключену мережу і резолвиться лише через сам маршрут 0.0.0.0/0.'}]
+    if _text(config_data.get("routingProtocol")).upper() != "STATIC":
+        return []
+    routes = _static_routes(config_data)
+    if not routes:
+        return []
+    interfaces = [prefix for prefix in request_prefixes(config_data) if prefix.kind == IFACE]
+    trie = PrefixTrie()
+    trie.insert_many(
+        [(p.start, 32 - (p.end - p.start).bit_length(), p) for p in interfaces]
+        + [(r.start, 32 - (r.end - r.start).bit_length(), r) for r in routes]
+    )
+    own = {p.address: p for p in interfaces}
+
+    # Для кожного маршруту: стан або маршрути, через які резолвиться next-hop
+    state = {}
+    via = {}
+    dependents = {}
+    ready = []
+    for route in routes:
+        if route.next_hop is None or route.interface:
+            state[route.index] = _REACHABLE
+        elif route.next_hop in own:
+            state[route.index] = _OWN_ADDRESS
+        else:
+            match = trie.longest_match(route.next_hop)
+            entries = match[2] if match else ()
+            if any(not isinstance(entry, _Route) for entry in entries):
+                state[route.index] = _REACHABLE
+            elif not entries:
+                state[route.index] = _NO_ROUTE
+            else:
+                via[route.index] = entries
+                for entry in entries:
+                    dependents.setdefault(entry.index, []).append(route)
+                continue
+        if state[route.index] == _REACHABLE:
+            ready.append(route.index)
+
+    # Досяжність поширюється на маршрути, що резолвляться через досяжні
+    while ready:
+        for route in dependents.get(ready.pop(), ()):
+            if route.index not in state:
+                state[route.index] = _REACHABLE
+                ready.append(route.index)
+
+    errors = []
+    for route in routes:
+        status = state.get(route.index)
+        if status == _REACHABLE:
+            continue
+        next_hop = addrmath.int_to_ipv4(route.next_hop)
+        if status == _OWN_ADDRESS:
+            message = f"❌ Error: Next-hop {next_hop} — власна адреса роутера на інтерфейсі {own[route.next_hop].where()}."
+        elif status == _NO_ROUTE:
+            message = f"❌ Error: Next-hop {next_hop} недосяжний: адреса не входить у жодну підключену мережу і не покривається іншими маршрутами."
+        else:
+            message = _recursion_error(route, via, next_hop)
+        errors.append({"path": f"{route.ref()}.nextHop", "message": message})
+    return errors
+
+
+def _recursion_error(route: _Route, via: dict, next_hop: str) -> str:
+    # Повідомлення для маршруту, що резолвиться лише через недосяжні
+    # маршрути: через себе, по циклу чи до маршруту без шляху.
+    chain = [route]
+    position = {route.index: 0}
+    current = route
+    while current.index in via:
+        current = via[current.index][0]
+        if current.index in position:
+            loop = chain[position[current.index]:] + [current]
+            if current is route:
+                if len(loop) == 2:
+                    return f"❌ Error: Next-hop {next_hop} не входить у жодну підключену мережу і резолвиться лише через сам маршрут {route.text()}."
+                return f"❌ Error: Next-hop {next_hop} резолвиться рекурсивно по циклу маршрутів: {' → '.join(r.text() for r in loop)}."
+            break
+        position[current.index] = len(chain)
+        chain.append(current)
+    return (
+        f"❌ Error: Next-hop {next_hop} резолвиться через маршрут {chain[1].text()} ({chain[1].ref()}), "
+        f"next-hop якого недосяжний."
+    )
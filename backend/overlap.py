@@ -0,0 +1,221 @@
+# Перетини IPv4-префіксів у межах одного роутера.
+#
+# Кожен префікс — інтервал цілих [мережа, broadcast]. find_overlaps()
+# сортує інтервали один раз і проходить їх зліва направо (sweep line),
+# тримаючи в купі за кінцем ті, що ще «відкриті». Новий інтервал
+# перетинається рівно з відкритими на момент його початку, тож усі пари
+# знаходяться за O(n log n + k), де k — кількість знайдених перетинів,
+# а не за O(n²) попарних порівнянь.
+#
+# address_conflicts() будує інтервали з мереж інтерфейсів, DHCP-пулу,
+# static NAT і статичних маршрутів запиту та перетворює перетини на
+# помилки валідації у форматі validate_config() (``{"path", "message"}``).
+# Статичний маршрут усередині підключеної мережі (більш специфічний, через
+# сусіда в цій мережі) допустимий — помилкою є лише маршрут, що збігається
+# з підключеним префіксом.
+# Некоректні адреси й маски тут пропускаються — про них повідомляють
+# правила validate.py.
+import heapq
+from typing import Optional, Sequence
+
+try:
+    from . import addrmath
+except ImportError:
+    import addrmath
+
+_FULL = 0xFFFFFFFF
+
+# Види префіксів запиту
+IFACE, DHCP, NAT_GLOBAL, STATIC = "iface", "dhcp", "nat", "static"
+
+
+def prefix_interval(address: int, mask: int) -> tuple[int, int]:
+    # (мережа, broadcast) для адреси та маски, заданих цілими.
+    start = address & mask
+    return start, start | (~mask & _FULL)
+
+
+def find_overlaps(intervals: Sequence[tuple[int, int]], anchors: Optional[Sequence[bool]] = None) -> list[tuple[int, int]]:
+    # Усі пари інтервалів, що перетинаються.
+    #
+    # Args:
+    #     intervals (Sequence[tuple[int, int]]): Пари ``(start, end)``
+    #         включно.
+    #     anchors (Sequence[bool], optional): Якщо задано, повертаються лише
+    #         пари, де хоча б один інтервал позначено True. Пари «пасивних»
+    #         інтервалів (наприклад, статичний маршрут з маршрутом) навіть
+    #         не перебираються.
+    #
+    # Returns:
+    #     list[tuple[int, int]]: Індекси ``(i, j)`` пар, де інтервал i
+    #     починається не пізніше за j.
+    #
+    # Examples:
+    # >>> find_overlaps([(0, 255), (128, 383), (512, 767)])
+    # [(0, 1)]
+    order = sorted(range(len(intervals)), key=lambda i: (intervals[i][0], -intervals[i][1]))
+    open_anchors = []
+    open_passive = []
+    pairs = []
+    for index in order:
+        start, end = intervals[index]
+        for heap in (open_anchors, open_passive):
+            while heap and heap[0][0] < start:
+                heapq.heappop(heap)
+        anchor = anchors is None or anchors[index]
+        pairs.extend((other, index) for _, other in open_anchors)
+        if anchor:
+            pairs.extend((other, index) for _, other in open_passive)
+        heapq.heappush(open_anchors if anchor else open_passive, (end, index))
+    return pairs
+
+
+def _prefix_text(start: int, end: int) -> str:
+    # 10.0.0.0/24 для інтервалу префікса.
+    return f"{addrmath.int_to_ipv4(start)}/{32 - (end - start).bit_length()}"
+
+
+class _Prefix:
+    # Префікс запиту: вид, запис форми, шлях поля для помилки, інтервал,
+    # адреса (інтерфейси й NAT) і назва інтерфейсу.
+    __slots__ = ("kind", "ref", "path", "start", "end", "address", "label", "order")
+
+    def __init__(self, kind, ref, field, start, end, address=None, label=""):
+        self.kind = kind
+        self.ref = ref
+        self.path = f"{ref}.{field}" if field else ref
+        self.start = start
+        self.end = end
+        self.address = address
+        self.label = label
+        self.order = 0
+
+    def text(self) -> str:
+        # Префікс у нотації CIDR.
+        return _prefix_text(self.start, self.end)
+
+    def where(self) -> str:
+        # Назва інтерфейсу із записом форми, або лише запис.
+        return f"{self.label} ({self.ref})" if self.label else self.ref
+
+
+def _text(value) -> str:
+    # Рядкове значення поля без пробілів по краях.
+    return value.strip() if isinstance(value, str) else ""
+
+
+def network_prefix(address: str, mask: str) -> Optional[tuple[int, int]]:
+    # Інтервал мережі з адреси та маски; None, якщо пару не розібрано або
+    # адреса має біти хоста.
+    start = addrmath.parse_address(address)
+    bits = addrmath.mask_to_int(mask)
+    if start is None or bits is None or not addrmath.is_contiguous(bits) or start & ~bits & _FULL:
+        return None
+    return prefix_interval(start, bits)
+
+
+def request_prefixes(config_data: dict) -> list[_Prefix]:
+    # Префікси запиту, які можуть конфліктувати між собою.
+    prefixes = []
+    interfaces = config_data.get("interfaces") or []
+    networks = config_data.get("networks")
+    for index, item in enumerate(networks if isinstance(networks, (list, tuple)) else ()):
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            continue
+        address = addrmath.parse_address(_text(item[0]))
+        bits = addrmath.parse_netmask(_text(item[1]))
+        if address is None or bits is None:
+            continue
+        label = str(interfaces[index]).strip() if isinstance(interfaces, list) and index < len(interfaces) else ""
+        prefixes.append(_Prefix(IFACE, f"networks[{index}]", "ip", *prefix_interval(address, bits), address, label))
+
+    pool = network_prefix(_text(config_data.get("dhcpNetwork")), _text(config_data.get("dhcpMask")))
+    if pool is not None:
+        prefixes.append(_Prefix(DHCP, "dhcpNetwork", "", *pool))
+
+    if _text(config_data.get("natType")) == "Static":
+        address = addrmath.parse_address(_text(config_data.get("natInsideGlobal")))
+        if address is not None:
+            prefixes.append(_Prefix(NAT_GLOBAL, "natInsideGlobal", "", address, address, address))
+
+    routing_config = config_data.get("routingConfig")
+    if _text(config_data.get("routingProtocol")).upper() == "STATIC" and isinstance(routing_config, dict):
+        routes = routing_config.get("staticRoutes")
+        for index, route in enumerate(routes if isinstance(routes, list) else ()):
+            if isinstance(route, dict):
+                interval = network_prefix(_text(route.get("dest")), _text(route.get("mask")) or "255.255.255.0")
+                if interval is not None:
+                    prefixes.append(_Prefix(STATIC, f"routingConfig.staticRoutes[{index}]", "dest", *interval))
+    for order, prefix in enumerate(prefixes):
+        prefix.order = order
+    return prefixes
+
+
+def _contains(outer: _Prefix, inner: _Prefix) -> bool:
+    # inner повністю всередині outer.
+    return outer.start <= inner.start and inner.end <= outer.end
+
+
+def _conflict(a: _Prefix, b: _Prefix, nat_outside: str) -> Optional[tuple[_Prefix, str]]:
+    # Помилка для пари префіксів, що перетинаються: пара (префікс, до поля
+    # якого прив'язати помилку; повідомлення) або None, якщо перетин допустимий.
+    kinds = {a.kind, b.kind}
+    if kinds == {IFACE}:
+        first, second = (a, b) if a.order < b.order else (b, a)
+        if a.address == b.address:
+            address = addrmath.int_to_ipv4(a.address)
+            return second, f"❌ Error: Адреса {address} вже призначена інтерфейсу {first.where()}."
+        return second, f"❌ Error: Мережа {second.text()} перетинається з мережею {first.text()} інтерфейсу {first.where()}."
+    if kinds == {IFACE, DHCP}:
+        iface, pool = (a, b) if a.kind == IFACE else (b, a)
+        if not _contains(iface, pool):
+            return pool, f"❌ Error: DHCP-пул {pool.text()} перетинається з мережею {iface.text()} інтерфейсу {iface.where()}."
+        return None
+    if kinds == {IFACE, NAT_GLOBAL}:
+        iface, nat = (a, b) if a.kind == IFACE else (b, a)
+        if iface.address == nat.address:
+            return nat, f"❌ Error: NAT inside global {addrmath.int_to_ipv4(nat.address)} вже призначена інтерфейсу {iface.where()}."
+        if iface.label != nat_outside:
+            return nat, f"❌ Error: NAT inside global {addrmath.int_to_ipv4(nat.address)} входить у внутрішню мережу {iface.text()} інтерфейсу {iface.where()}."
+        return None
+    if kinds == {DHCP, NAT_GLOBAL}:
+        pool, nat = (a, b) if a.kind == DHCP else (b, a)
+        return nat, f"❌ Error: NAT inside global {addrmath.int_to_ipv4(nat.address)} входить у DHCP-пул {pool.text()}."
+    if kinds == {IFACE, STATIC}:
+        iface, route = (a, b) if a.kind == IFACE else (b, a)
+        if (iface.start, iface.end) == (route.start, route.end):
+            return route, f"❌ Error: Маршрут {route.text()} дублює підключену мережу інтерфейсу {iface.where()}."
+    return None
+
+
+def address_conflicts(config_data: dict) -> list[dict]:
+    # Конфлікти адрес запиту: дублікати й перетини мереж інтерфейсів,
+    # DHCP-пул поза своєю мережею, NAT inside global у внутрішній мережі
+    # чи DHCP-пулі, статичні маршрути на підключені мережі.
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/state.js.
+    #
+    # Returns:
+    #     list[dict]: Помилки ``{"path", "message"}``; шлях вказує на
+    #     пізніший з двох конфліктних записів.
+    #
+    # Examples:
+    # >>> address_conflicts({"interfaces": ["Gi0/0", "Gi0/1"],
+    # ...                    "networks": [("10.0.0.1", "24"), ("10.0.0.1", "30")]})
+    # [{'path': 'networks[1].ip', 'message': '❌ Error: Адреса 10.0.0.1 вже призначена інтерфейсу Gi0/0 (networks[0]).'}]
+    prefixes = request_prefixes(config_data)
+    if len(prefixes) < 2:
+        return []
+    # Маршрути між собою не конфліктують — їх пари навіть не перебираються
+    anchors = [prefix.kind != STATIC for prefix in prefixes]
+    nat_outside = _text(config_data.get("natOutside"))
+    found = []
+    for i, j in find_overlaps([(p.start, p.end) for p in prefixes], anchors):
+        conflict = _conflict(prefixes[i], prefixes[j], nat_outside)
+        if conflict is not None:
+            prefix, message = conflict
+            found.append((prefix.order, min(i, j), {"path": prefix.path, "message": message}))
+    # Порядок помилок — як записи у формі
+    found.sort(key=lambda entry: entry[:2])
+    return [error for _, _, error in found]
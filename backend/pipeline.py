@@ -0,0 +1,154 @@
+# Пакетне (pipelined) надсилання конфігурації і пошук помилок IOS у виводі.
+#
+# netmiko.send_config_set() надсилає рядок і чекає його відлуння та prompt
+# перед наступним: 2000 рядків — 2000 мережевих round trip. У пакетному
+# режимі рядки пишуться вікнами по ``window`` штук, а синхронізація з
+# роутером відбувається лише на межі вікна: IOS обробляє введення наперед
+# (type-ahead) і на кожен рядок відповідає відлунням, можливим
+# повідомленням і новим prompt, тож кінець вікна — це ``window`` нових prompt.
+#
+# Вивід обох режимів має однакову структуру ``<prompt><команда>\n<вивід>``,
+# тому map_errors() розбиває його за prompt і зіставляє кожне повідомлення
+# ``% Invalid input`` / ``% Incomplete command`` / ``% Ambiguous command`` з
+# командою, на яку його видав роутер.
+import re
+import time
+from typing import Callable, Optional, Sequence
+
+# Prompt IOS на початку рядка: R1#, R1(config)#, R1(config-if)#
+PROMPT_RE = re.compile(r"^[\w.-]+(?:\([\w.-]+\))?#", re.M)
+# Повідомлення, якими IOS відхиляє команду
+ERROR_RE = re.compile(r"^% (?:Invalid input|Incomplete command|Ambiguous command).*$", re.M)
+
+# Кількість рядків між синхронізаціями з роутером
+PIPELINE_WINDOW = 50
+# Пауза між опитуваннями каналу під час очікування prompt (секунди)
+_POLL_INTERVAL = 0.002
+
+
+def map_errors(output: str, commands: Sequence[str]) -> list[dict]:
+    # Знаходить повідомлення про помилки IOS і команди, що їх спричинили.
+    #
+    # Вивід розбивається на відповіді за prompt; відповідь починається з
+    # відлуння команди. Команди зіставляються послідовно, тож службові
+    # відповіді (configure terminal, end) і повтори на кшталт `` exit``
+    # не збивають нумерацію.
+    #
+    # Args:
+    #     output (str): Вивід сесії (send_config_set() або send_config_pipelined()).
+    #     commands (Sequence[str]): Надіслані команди в порядку надсилання.
+    #
+    # Returns:
+    #     list[dict]: ``{"index", "command", "message"}``; index — 1-based номер
+    #     команди в `commands` (None, якщо відповідь не вдалося зіставити).
+    #
+    # Examples:
+    # >>> map_errors("R1(config)#hostname R1\nR1(config)#bogus\n  ^\n% Invalid input detected at '^' marker.\nR1(config)#",
+    # ...            ["hostname R1", "bogus"])
+    # [{'index': 2, 'command': 'bogus', 'message': "% Invalid input detected at '^' marker."}]
+    output = output.replace("\r\n", "\n").replace("\r", "\n")
+    errors = []
+    cursor = 0
+    for response in PROMPT_RE.split(output):
+        echo = response.split("\n", 1)[0].strip()
+        index = None
+        if cursor < len(commands) and echo == commands[cursor].strip():
+            cursor += 1
+            index = cursor
+        for match in ERROR_RE.finditer(response):
+            errors.append({
+                "index": index,
+                "command": commands[index - 1].strip() if index else echo,
+                "message": match.group(0).strip(),
+            })
+    return errors
+
+
+def source_lines(commands: Sequence[str], config_lines: Sequence[str]) -> list[Optional[int]]:
+    # Номер рядка вихідної конфігурації (1-based) для кожної надісланої команди.
+    #
+    # Команди йдуть у тому ж порядку, що й у конфігурації (повна або
+    # delta), тож пошук іде вперед від попереднього збігу. Команди, яких у
+    # конфігурації немає (``no``-форми дельти), отримують None.
+    stripped = [line.strip() for line in config_lines]
+    result = []
+    pos = 0
+    for command in commands:
+        command = command.strip()
+        try:
+            found = stripped.index(command, pos)
+        except ValueError:
+            result.append(None)
+            continue
+        result.append(found + 1)
+        pos = found + 1
+    return result
+
+
+def _read_prompts(conn, count: int, text: str, scan: list, read_timeout: float) -> str:
+    # Читає канал, доки у виводі не з'явиться ще `count` prompt.
+    #
+    # text — вивід, прочитаний раніше; scan — [позиція в text, з якої шукати
+    # наступний prompt, кількість уже знайдених]. Повертає доповнений text.
+    deadline = time.monotonic() + read_timeout
+    target = scan[1] + count
+    while True:
+        for match in PROMPT_RE.finditer(text, scan[0]):
+            scan[0] = match.end()
+            scan[1] += 1
+        if scan[1] >= target:
+            return text
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Router did not answer {target - scan[1]} of {count} pipelined commands in {read_timeout:.0f}s")
+        chunk = conn.read_channel()
+        if chunk:
+            text += chunk.replace("\r\n", "\n")
+        else:
+            time.sleep(_POLL_INTERVAL)
+
+
+def send_config_pipelined(
+    conn,
+    commands: Sequence[str],
+    window: int = PIPELINE_WINDOW,
+    read_timeout: float = 60.0,
+    on_batch: Optional[Callable] = None
+) -> str:
+    # Надсилає команди конфігурації вікнами, синхронізуючись на межі вікна.
+    #
+    # Входить у config mode і виходить з нього, як send_config_set().
+    #
+    # Args:
+    #     conn: netmiko-з'єднання у privileged exec.
+    #     commands (Sequence[str]): Команди конфігурації без enable/conf t/end.
+    #     window (int): Кількість рядків в одному пакеті.
+    #     read_timeout (float): Максимальне очікування відповіді на один пакет.
+    #     on_batch (Callable, optional): Викликається після кожного пакета з
+    #         (вивід пакета, індекс його першої команди, команди пакета);
+    #         якщо повертає False, решта пакетів не надсилається. Вивід
+    #         пакетів тоді не входить у результат функції.
+    #
+    # Returns:
+    #     str: Вивід сесії у форматі send_config_set() (для map_errors()).
+    #
+    # Raises:
+    #     TimeoutError: Роутер не відповів на пакет за read_timeout.
+    head = conn.config_mode()
+    output = ""
+    scan = [0, 0]
+    window = max(1, window)
+    for start in range(0, len(commands), window):
+        batch = commands[start:start + window]
+        conn.write_channel("".join(conn.normalize_cmd(command) for command in batch))
+        output = _read_prompts(conn, len(batch), output, scan, read_timeout)
+        if on_batch is not None:
+            # Вивід пакета віддано викликачу: не накопичуємо його в пам'яті
+            batch_output, output, scan = output, "", [0, 0]
+            if on_batch(batch_output, start, batch) is False:
+                break
+    tail = conn.exit_config_mode()
+    # Перший prompt (config)# уже прочитав config_mode(): відповіді пакетів
+    # продовжують його рядок, як у виводі send_config_set()
+    if not head.rstrip().endswith("#"):
+        head += "\n" + conn.base_prompt + "(config)#"
+    return head + output + tail
@@ -0,0 +1,222 @@
+# Бінарне radix-дерево (Patricia) над IPv4-префіксами.
+#
+# Вузол — префікс (value, length); нащадки розгалужуються за бітом одразу
+# після префікса вузла. Ланцюжки вузлів з одним нащадком стиснуті, тож
+# глибина не перевищує 33, а вузлів — не більше ніж 2n. Вузол зберігає
+# список записів (items) для префікса; у проміжних вузлах розгалуження
+# він None.
+#
+# Вузли — індекси в паралельних списках (value, length, нащадки, items),
+# а не окремі об'єкти: на 100k префіксів це сотні тисяч вузлів, і
+# створення об'єктів разом з проходами GC по них коштувало б більше, ніж
+# сама побудова. Індекс 0 — корінь (0.0.0.0/0); 0 у списках нащадків
+# означає «немає нащадка».
+#
+# insert_many() у порожнє дерево будує його одним проходом по
+# відсортованих префіксах (стек правого краю дерева, як при побудові
+# стиснутого trie з відсортованих рядків): сортування — O(n log n) на C,
+# решта — O(n) без спусків від кореня. longest_match() і covering()
+# спускаються від кореня максимум на 32 біти.
+from typing import Any, Iterable, Iterator, Optional
+
+_FULL = 0xFFFFFFFF
+_MASKS = tuple((_FULL << (32 - length)) & _FULL for length in range(33))
+
+
+class PrefixTrie:
+    # Індекс IPv4-префіксів з пошуком найдовшого збігу.
+    #
+    # Префікси — пари цілих ``(value, length)``; біти хоста у value
+    # відкидаються. Кожному префіксу відповідає список записів у порядку
+    # вставки (кілька пристроїв можуть мати той самий префікс).
+    #
+    # Examples:
+    # >>> trie = PrefixTrie()
+    # >>> trie.insert_many([(0x0A000000, 8, "core"), (0x0A010000, 16, "branch")])
+    # >>> trie.longest_match(0x0A010203)
+    # (167837696, 16, ['branch'])
+
+    def __init__(self):
+        self._values = [0]
+        self._lengths = [0]
+        self._zero = [0]
+        self._one = [0]
+        self._items = [None]
+        self._size = 0
+
+    def __len__(self) -> int:
+        # Кількість різних префіксів.
+        return self._size
+
+    def _new_node(self, value: int, length: int, items: Optional[list]) -> int:
+        # Додає вузол без нащадків і повертає його індекс.
+        self._values.append(value)
+        self._lengths.append(length)
+        self._zero.append(0)
+        self._one.append(0)
+        self._items.append(items)
+        return len(self._values) - 1
+
+    def _attach(self, parent: int, child: int) -> None:
+        # Підвішує child за бітом, що йде одразу після префікса parent.
+        if (self._values[child] >> (31 - self._lengths[parent])) & 1:
+            self._one[parent] = child
+        else:
+            self._zero[parent] = child
+
+    def insert(self, value: int, length: int, item: Any) -> None:
+        # Додає запис для префікса.
+        value &= _MASKS[length]
+        values, lengths = self._values, self._lengths
+        node = 0
+        while lengths[node] < length:
+            bit = (value >> (31 - lengths[node])) & 1
+            child = self._one[node] if bit else self._zero[node]
+            if not child:
+                self._attach(node, self._new_node(value, length, [item]))
+                self._size += 1
+                return
+            child_length = lengths[child]
+            common = min(32 - (values[child] ^ value).bit_length(), child_length, length)
+            if common == child_length:
+                node = child
+                continue
+            # Префікс відгалужується посередині ребра до child
+            if common == length:
+                fork = self._new_node(value, length, [item])
+            else:
+                fork = self._new_node(value & _MASKS[common], common, None)
+                self._attach(fork, self._new_node(value, length, [item]))
+            self._attach(fork, child)
+            self._attach(node, fork)
+            self._size += 1
+            return
+        # Префікс уже є вузлом дерева
+        if self._items[node] is None:
+            self._items[node] = []
+            self._size += 1
+        self._items[node].append(item)
+
+    def insert_many(self, prefixes: Iterable[tuple[int, int, Any]]) -> None:
+        # Додає записи ``(value, length, item)`` пакетом.
+        #
+        # У порожнє дерево — побудова за один прохід по відсортованих
+        # префіксах; інакше — послідовні insert().
+        if len(self._values) > 1 or self._items[0] is not None:
+            for value, length, item in prefixes:
+                self.insert(value, length, item)
+            return
+        records = prefixes if isinstance(prefixes, list) else list(prefixes)
+        # Ключ (value << 6) | length упорядковує префікси в прямому обході
+        # дерева: префікс іде перед своїми розширеннями. Сортування стабільне,
+        # тож записи одного префікса лишаються в порядку вставки.
+        keys = [(value & _MASKS[length]) << 6 | length for value, length, _ in records]
+        values, lengths, zero, one, items = self._values, self._lengths, self._zero, self._one, self._items
+        stack = [0]
+        top = top_length = 0
+        last_key = -1
+        last_value = 0
+        node = 0
+        for index in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[index]
+            item = records[index][2]
+            if key == last_key:
+                items[node].append(item)
+                continue
+            last_key = key
+            self._size += 1
+            value = key >> 6
+            length = key & 63
+            if length == 0:
+                node = 0
+                items[0] = [item]
+                continue
+            # Спільні старші біти з попереднім префіксом (не довше за обидва)
+            common = min(32 - (last_value ^ value).bit_length(), length, top_length)
+            last_value = value
+            popped = 0
+            while top_length > common:
+                popped = stack.pop()
+                top = stack[-1]
+                top_length = lengths[top]
+            if top_length < common:
+                # Попередня гілка і новий префікс розходяться нижче top
+                fork = len(values)
+                values.append(value & _MASKS[common])
+                lengths.append(common)
+                items.append(None)
+                if (values[popped] >> (31 - common)) & 1:
+                    zero.append(0)
+                    one.append(popped)
+                else:
+                    zero.append(popped)
+                    one.append(0)
+                if (value >> (31 - top_length)) & 1:
+                    one[top] = fork
+                else:
+                    zero[top] = fork
+                stack.append(fork)
+                top, top_length = fork, common
+            node = len(values)
+            values.append(value)
+            lengths.append(length)
+            zero.append(0)
+            one.append(0)
+            items.append([item])
+            if (value >> (31 - top_length)) & 1:
+                one[top] = node
+            else:
+                zero[top] = node
+            stack.append(node)
+            top, top_length = node, length
+
+    def longest_match(self, address: int, length: int = 32) -> Optional[tuple[int, int, list]]:
+        # Найдовший збережений префікс, що містить address/length.
+        #
+        # Returns:
+        #     tuple | None: ``(value, length, items)`` або None.
+        found = self.covering(address, length)
+        return found[-1] if found else None
+
+    def covering(self, address: int, length: int = 32) -> list[tuple[int, int, list]]:
+        # Усі збережені префікси, що містять address/length, від найкоротшого.
+        #
+        # Спуск від кореня: не більше одного вузла на біт адреси.
+        values, lengths, zero, one, items = self._values, self._lengths, self._zero, self._one, self._items
+        found = [(0, 0, items[0])] if items[0] is not None else []
+        node = 0
+        node_length = 0
+        while node_length < length:
+            node = one[node] if (address >> (31 - node_length)) & 1 else zero[node]
+            if not node:
+                break
+            node_length = lengths[node]
+            if node_length > length or (address ^ values[node]) & _MASKS[node_length]:
+                break
+            if items[node] is not None:
+                found.append((values[node], node_length, items[node]))
+        return found
+
+    def walk(self) -> Iterator[tuple[int, int, list, tuple]]:
+        # Збережені префікси в порядку (value, length) з їхніми предками.
+        #
+        # Yields:
+        #     tuple: ``(value, length, items, ancestors)``, де ancestors —
+        #     списки items збережених префіксів, що містять цей, від
+        #     найкоротшого.
+        values, lengths, zero, one, items = self._values, self._lengths, self._zero, self._one, self._items
+        stack = [(0, ())]
+        while stack:
+            node, ancestors = stack.pop()
+            if items[node] is not None:
+                yield values[node], lengths[node], items[node], ancestors
+                ancestors += (items[node],)
+            if one[node]:
+                stack.append((one[node], ancestors))
+            if zero[node]:
+                stack.append((zero[node], ancestors))
+
+    def __iter__(self) -> Iterator[tuple[int, int, list]]:
+        # Збережені префікси ``(value, length, items)`` у порядку (value, length).
+        for value, length, items, _ in self.walk():
+            yield value, length, items
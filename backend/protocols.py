@@ -1,4 +1,13 @@
+import logging
+from typing import Optional
+
+from . import addrmath
+from .aggregate import aggregate_static_routes, bgp_aggregates
+from .ir import BgpNeighbor, BgpNetwork, EigrpNetwork, OspfNetwork, StaticRoute
 from .jinja_env import render_template_to_lines
+from .section_cache import section_cache
+
+logger = logging.getLogger(__name__)
 
 def _mask_to_wildcard(mask: str) -> str:
     # Конвертує subnet mask або CIDR-префікс в wildcard mask.
@@ -6,44 +15,16 @@ def _mask_to_wildcard(mask: str) -> str:
     # Приймає dotted-decimal (наприклад, "255.255.255.0"),
     # CIDR без префіксу ("24") або з префіксом ("/24").
     # Використовується для Jinja2 шаблонів OSPF, EIGRP, NAT.
+    # Обчислення та кеш розбору масок — у backend/addrmath.py.
     #
     # Args:
     #     mask (str): Subnet mask або CIDR-префікс.
     #
     # Returns:
-    #     str: Wildcard mask у dotted-decimal форматі.
-
-    try:
-        if not mask or not isinstance(mask, str):
-            return "0.0.0.0"
-        mask = mask.strip()
-        
-        # ЛОГІКА CIDR: Якщо передано число (наприклад 24 або /22)
-        # 1. Визначаємо кількість хостових бітів: 32 - префікс
-        # 2. Створюємо бітову маску хостової частини: (1 << host_bits) - 1
-        # 3. Розбиваємо 32-бітне число на 4 октети
-        if mask.isdigit() or (mask.startswith('/') and mask[1:].isdigit()):
-            cidr_str = mask[1:] if mask.startswith('/') else mask
-            cidr = int(cidr_str)
-            if 0 <= cidr <= 32:
-                host_bits = (1 << (32 - cidr)) - 1
-                return f"{(host_bits >> 24) & 0xFF}.{(host_bits >> 16) & 0xFF}.{(host_bits >> 8) & 0xFF}.{host_bits & 0xFF}"
-        
-        # ЛОГІКА MASK: Якщо передано 255.255.255.0
-        # 1. Розбиваємо на октети
-        # 2. Для кожного октета: wildcard = 255 - mask_octet
-        parts = mask.split('.')
-        if len(parts) == 4:
-            try:
-                vals = [int(p) for p in parts]
-                if all(0 <= v <= 255 for v in vals):
-                    return ".".join(str(255 - v) for v in vals)
-            except ValueError:
-                pass
-            
-        return "0.0.0.0"
-    except Exception:
+    #     str: Wildcard mask у dotted-decimal форматі ("0.0.0.0" для некоректних).
+    if not isinstance(mask, str):
         return "0.0.0.0"
+    return addrmath.wildcard(mask)
 
 def _cidr_to_mask(cidr: int) -> str:
     # Перетворює CIDR-префікс (ціле число) в dotted-decimal subnet mask.
@@ -52,87 +33,99 @@ def _cidr_to_mask(cidr: int) -> str:
     #     cidr (int): Префікс в діапазоні 0–32.
     #
     # Returns:
-    #     str: Subnet mask у dotted-decimal форматі.
+    #     str: Subnet mask у dotted-decimal форматі ("255.255.255.0" поза діапазоном).
+    return addrmath.cidr_mask(cidr)
 
-    try:
-        if not (0 <= cidr <= 32):
-            return "255.255.255.0"
-        # 1. Беремо 0xFFFFFFFF (всі одиниці)
-        # 2. Зсуваємо вліво на (32 - cidr) нулів
-        # 3. Накладаємо маску 0xFFFFFFFF для коректної роботи зі знаковими числами
-        mask_bits = (0xFFFFFFFF << (32 - cidr)) & 0xFFFFFFFF
-        return f"{(mask_bits >> 24) & 0xFF}.{(mask_bits >> 16) & 0xFF}.{(mask_bits >> 8) & 0xFF}.{mask_bits & 0xFF}"
-    except Exception:
-        return "255.255.255.0"
 
+def _prefix_to_mask(mask: str, default: str) -> str:
+    # Маска з UI: CIDR ("24", "/24") -> dotted-decimal, інше — як є (або default).
+    if mask.isdigit() or mask.startswith('/'):
+        return addrmath.dotted_mask(mask)
+    return mask or default
 
-def generate_protocol_config(
+
+def _static_route_context(r: dict) -> StaticRoute:
+    # Нормалізує один статичний маршрут з UI у вузол IR для routing/static.j2.
+    #
+    # Префікс (``"24"`` або ``"/24"``) перетворюється на dotted-decimal маску.
+    dest = r.get("dest")
+    mask = r.get("mask", "")
+    next_hop = r.get("nextHop", "")
+    intf = r.get("interface", "")
+    ad = r.get("ad", "")
+    metric = r.get("metric", "")
+
+    # Convert prefix to mask if needed
+    mask_final = _prefix_to_mask(mask, "255.255.255.0")
+
+    return StaticRoute(dest, mask_final, next_hop, intf, ad, metric)
+
+
+def _network_items(networks: list) -> list[tuple[str, str]]:
+    # Пари (ip, mask) з мереж інтерфейсів без порожніх та "invalid" адрес.
+    # Елемент без маски отримує "24".
+    items = []
+    for item in networks:
+        net_ip = item[0] if isinstance(item, (list, tuple)) else item
+        net_mask = item[1] if isinstance(item, (list, tuple)) and len(item) > 1 else "24"
+        if net_ip and net_ip != "invalid":
+            items.append((net_ip, net_mask))
+    return items
+
+
+def _bgp_mask(mask: str, default: str) -> str:
+    # Маска для ``network ... mask``: CIDR ("24") -> dotted-decimal, інше — як є.
+    if mask.isdigit():
+        return addrmath.dotted_mask(mask)
+    return mask or default
+
+
+class _LazyList:
+    # Повторно ітерована ледача проєкція списку для контексту шаблону.
+    #
+    # Кожен елемент `source` перетворюється функцією `convert` лише в момент
+    # ітерації, тож шаблон, який рендериться через Template.generate(),
+    # тримає в пам'яті один нормалізований елемент замість усього списку.
+    # __bool__/__len__ дозволяють шаблонам використовувати ``{% if items %}``.
+    __slots__ = ("_source", "_convert")
+
+    def __init__(self, source: list, convert):
+        # source — вихідний список, convert — функція нормалізації елемента.
+        self._source = source
+        self._convert = convert
+
+    def __iter__(self):
+        # Кожна ітерація створює новий ледачий прохід по джерелу.
+        return map(self._convert, self._source)
+
+    def __len__(self):
+        # Довжина без матеріалізації елементів.
+        return len(self._source)
+
+    def __bool__(self):
+        # Порожнє джерело — порожня секція у шаблоні.
+        return bool(self._source)
+
+
+def protocol_section(
     protocol: str,
     router_id: str,
     networks: list,
     no_auto_summary: bool = True,
     routing_config: dict = None
-) -> list[str]:
-    # Генерує Cisco IOS команди для заданого протоколу маршрутизації.
-    #
-    # Підтримувані протоколи: RIP, OSPF, EIGRP, BGP, STATIC, IS-IS.
-    #
-    # Args:
-    #     protocol (str): Назва протоколу.
-    #     router_id (str): Router ID (IPv4).
-    #     networks (list): Мережі для RIP.
-    #     routing_config (dict): Конфігурація конкретного протоколу.
-    #
-    # Returns:
-    #     list[str]: Список команд.
-
-    #
-    # Фабрикний метод для всіх підтримуваних протоколів. Визначає потрібний
-    # Jinja2-шаблон (наприклад, ``routing/ospf.j2``) і передає ньому
-    # контекст з інформацією про мережі, роутер-ID та параметрами
-    # протоколу.
+) -> Optional[tuple[str, dict]]:
+    # Будує пару (шаблон, контекст) для протоколу маршрутизації без рендерингу.
     #
-    # Підтримувані протоколи:
-    # - ``RIP`` — RIP v2 з списком мереж цластерних мереж.
-    # - ``OSPF`` — single/multi-area OSPF з wildcard masks та area per-network.
-    # - ``EIGRP`` — EIGRP з AS number і опціональним wildcard.
-    # - ``BGP`` — BGP з списком neighbor і advertised networks.
-    # - ``STATIC`` — статичні маршрути з next-hop або exit interface.
-    # - ``IS-IS`` — IS-IS з NET-адресою та рівнем маршрутизації.
-    #
-    # Args:
-    # protocol (str): Назва протоколу (регістронезалежна).
-    # Допустимі значення: ``"RIP"``, ``"OSPF"``, ``"EIGRP"``,
-    # ``"BGP"``, ``"STATIC"``, ``"IS-IS"``, ``"None"``.
-    # router_id (str): Router ID у форматі IPv4. Обов'язковий для OSPF.
-    # networks (list): Список кортежів ``(ip: str, mask: str)``.
-    # Використовується для RIP. OSPF/EIGRP/BGP читають з ``routing_config``.
-    # no_auto_summary (bool, optional): Додає ``no auto-summary`` для
-    # RIP і EIGRP. Defaults to ``True``.
-    # routing_config (dict, optional): Розширена конфігурація протоколу.
-    # Ключі залежать від протоколу:
-    #
-    # - OSPF: ``{"processId": str, "routerId": str,``
-    # ``"ospfNetworks": [{"network", "wildcard", "area"}]}``
-    # - EIGRP: ``{"asNumber": str, "eigrpNetworks": [{"network", "wildcard"}]}``
-    # - BGP: ``{"localAs": str, "routerId": str,``
-    # ``"bgpNeighbors": [{"ip", "remoteAs"}],``
-    # ``"bgpAdvertisedNetworks": [{"network", "mask"}]}``
-    # - STATIC: ``{"staticRoutes": [{"dest", "mask", "nextHop",``
-    # ``"interface", "ad", "metric"}]}``
-    # - IS-IS: ``{"areaId": str, "systemId": str, "routerType": str}``
+    # Спільна основа для generate_protocol_config() (повний список рядків)
+    # та iter_full_config() (потокова генерація). Аргументи ті ж, що й у
+    # generate_protocol_config().
     #
     # Returns:
-    # list[str]: Список Cisco IOS команд. Порожний список, якщо
-    # ``protocol`` дорівнює ``"None"`` або порожній.
-    #
-    # Examples:
-    # >>> generate_protocol_config("RIP", "", [("192.168.1.0", "255.255.255.0")])
-    # ['!', 'router rip', ' version 2', ' network 192.168.1.0', ' no auto-summary', ' exit']
-    # >>> generate_protocol_config("None", "", [])
-    # []
+    #     tuple[str, dict] | None: Ім'я шаблону та контекст, або None якщо
+    #     протокол не заданий. З ``aggregatePrefixes`` контекст містить
+    #     ``aggregation`` — підсумок агрегації (див. aggregation_summary()).
     if not isinstance(protocol, str) or not protocol or protocol.upper() == "NONE":
-        return []
+        return None
 
     proto = protocol.upper().strip()
     rc = routing_config or {}
@@ -143,32 +136,15 @@ def generate_protocol_config(
     }
 
     if proto == "STATIC":
-        static_routes = []
-        routes = rc.get("staticRoutes", [])
-        for r in routes:
-            dest = r.get("dest")
-            mask = r.get("mask", "")
-            next_hop = r.get("nextHop", "")
-            intf = r.get("interface", "")
-            ad = r.get("ad", "")
-            metric = r.get("metric", "")
-            
-            # Convert prefix to mask if needed
-            if mask.isdigit() or mask.startswith('/'):
-                m_val = mask[1:] if mask.startswith('/') else mask
-                mask_final = _cidr_to_mask(int(m_val))
-            else:
-                mask_final = mask or "255.255.255.0"
-                
-            static_routes.append({
-                'dest': dest,
-                'mask_final': mask_final,
-                'nextHop': next_hop,
-                'interface': intf,
-                'ad': ad,
-                'metric': metric
-            })
-        context['static_routes'] = static_routes
+        # Маршрути нормалізуються ледачо під час рендерингу: для таблиць
+        # з десятками тисяч маршрутів не створюємо другу копію списку.
+        routes = _LazyList(rc.get("staticRoutes", []), _static_route_context)
+        if rc.get("aggregatePrefixes"):
+            # Агрегація потребує всієї таблиці в пам'яті (сортування префіксів)
+            routes, saved = aggregate_static_routes(routes)
+            logger.info(f"Агрегація статичних маршрутів: -{saved} рядків ip route")
+            context['aggregation'] = {"savedLines": saved}
+        context['static_routes'] = routes
 
     elif proto == "RIP":
         rip_networks = []
@@ -196,15 +172,12 @@ def generate_protocol_config(
                 wildcard = item.get("wildcard", "0.0.0.255") if isinstance(item, dict) else "0.0.0.255"
                 area = item.get("area", "0") if isinstance(item, dict) else "0"
                 if net_ip and net_ip != "invalid":
-                    ospf_networks.append({'ip': net_ip, 'wildcard': wildcard, 'area': area})
+                    ospf_networks.append(OspfNetwork(net_ip, wildcard, area))
         else:
             # Fallback: derive from interface networks with default area 0
-            for item in networks:
-                net_ip = item[0] if isinstance(item, (list, tuple)) else item
-                net_mask = item[1] if isinstance(item, (list, tuple)) and len(item) > 1 else "24"
-                if net_ip and net_ip != "invalid":
-                    wildcard = _mask_to_wildcard(net_mask)
-                    ospf_networks.append({'ip': net_ip, 'wildcard': wildcard, 'area': '0'})
+            items = _network_items(networks)
+            for (net_ip, _mask), wildcard in zip(items, addrmath.wildcards(m for _ip, m in items)):
+                ospf_networks.append(OspfNetwork(net_ip, wildcard, '0'))
         context.update({
             'ospf_pid': rc.get("processId", "1"),
             'ospf_rid': rc.get("routerId") or router_id,
@@ -219,13 +192,13 @@ def generate_protocol_config(
                 net_ip = item.get("network", "") if isinstance(item, dict) else ""
                 wildcard = item.get("wildcard", "") if isinstance(item, dict) else ""
                 if net_ip and net_ip != "invalid":
-                    eigrp_networks.append({'ip': net_ip, 'wildcard': wildcard})
+                    eigrp_networks.append(EigrpNetwork(net_ip, wildcard))
         else:
             # Fallback: use interface networks (classful, no wildcard)
             for item in networks:
                 net_ip = item[0] if isinstance(item, (list, tuple)) else item
                 if net_ip and net_ip != "invalid":
-                    eigrp_networks.append({'ip': net_ip, 'wildcard': ''})
+                    eigrp_networks.append(EigrpNetwork(net_ip, ''))
         context.update({
             'eigrp_asn': rc.get("asNumber", rc.get("eigrpAs", "100")),
             'eigrp_networks': eigrp_networks
@@ -239,13 +212,13 @@ def generate_protocol_config(
                 ip = nb.get("ip", "") if isinstance(nb, dict) else ""
                 remote_as = nb.get("remoteAs", "") if isinstance(nb, dict) else ""
                 if ip and remote_as:
-                    bgp_neighbors.append({'ip': ip, 'remote_as': remote_as})
+                    bgp_neighbors.append(BgpNeighbor(ip, remote_as))
         else:
             # Fallback: single neighbor from old fields
             nb_ip = rc.get("neighborIp", "")
             nb_as = rc.get("remoteAs", "")
             if nb_ip and nb_as:
-                bgp_neighbors.append({'ip': nb_ip, 'remote_as': nb_as})
+                bgp_neighbors.append(BgpNeighbor(nb_ip, nb_as))
 
         bgp_adv_networks = []
         manual_bgp_nets = rc.get("bgpAdvertisedNetworks", [])
@@ -254,27 +227,22 @@ def generate_protocol_config(
                 net_ip = item.get("network", "") if isinstance(item, dict) else ""
                 net_mask = item.get("mask", "") if isinstance(item, dict) else ""
                 if net_ip and net_ip != "invalid":
-                    if net_mask.isdigit():
-                        mask_str = _cidr_to_mask(int(net_mask))
-                    else:
-                        mask_str = net_mask or "255.255.255.0"
-                    bgp_adv_networks.append({'ip': net_ip, 'mask_str': mask_str})
+                    bgp_adv_networks.append(BgpNetwork(net_ip, _bgp_mask(net_mask, "255.255.255.0")))
         else:
             # Fallback: derive from interface networks
-            for item in networks:
-                net_ip = item[0] if isinstance(item, (list, tuple)) else item
-                net_mask = item[1] if isinstance(item, (list, tuple)) and len(item) > 1 else "24"
-                if net_ip and net_ip != "invalid":
-                    if net_mask.isdigit():
-                        mask_str = _cidr_to_mask(int(net_mask))
-                    else:
-                        mask_str = net_mask
-                    bgp_adv_networks.append({'ip': net_ip, 'mask_str': mask_str})
+            for net_ip, net_mask in _network_items(networks):
+                bgp_adv_networks.append(BgpNetwork(net_ip, _bgp_mask(net_mask, "")))
+        bgp_aggregate_networks = []
+        if rc.get("aggregatePrefixes"):
+            bgp_aggregate_networks = bgp_aggregates(bgp_adv_networks)
+            logger.info(f"Агрегація BGP: {len(bgp_aggregate_networks)} aggregate-address")
+            context['aggregation'] = {"aggregateAddresses": len(bgp_aggregate_networks)}
         context.update({
             'bgp_local_as': rc.get("localAs", "65001"),
             'bgp_rid': rc.get("routerId") or router_id,
             'bgp_neighbors': bgp_neighbors,
-            'bgp_networks': bgp_adv_networks
+            'bgp_networks': bgp_adv_networks,
+            'bgp_aggregates': bgp_aggregate_networks
         })
 
     elif proto == "IS-IS":
@@ -286,4 +254,113 @@ def generate_protocol_config(
 
     # Normalize protocol name for template file (IS-IS → isis)
     template_name = proto.lower().replace('-', '')
-    return render_template_to_lines(f'routing/{template_name}.j2', context)
+    return f'routing/{template_name}.j2', context
+
+
+def aggregation_summary(
+    protocol: str,
+    router_id: str,
+    networks: list,
+    no_auto_summary: bool = True,
+    routing_config: dict = None
+) -> Optional[dict]:
+    # Підсумок агрегації префіксів (routing_config["aggregatePrefixes"]).
+    #
+    # Аргументи ті ж, що й у generate_protocol_config(). Рахується тим
+    # самим protocol_section(), що й конфігурація, тож цифри збігаються
+    # з рендером.
+    #
+    # Returns:
+    #     dict | None: ``{"savedLines": int}`` для STATIC (скільки рядків
+    #     ip route прибрано), ``{"aggregateAddresses": int}`` для BGP;
+    #     None, якщо агрегація не ввімкнена або протокол її не підтримує.
+    #
+    # Examples:
+    # >>> aggregation_summary("STATIC", "", [], routing_config={"aggregatePrefixes": True, "staticRoutes": [
+    # ...     {"dest": "10.1.0.0", "mask": "24", "nextHop": "10.0.0.2"},
+    # ...     {"dest": "10.1.1.0", "mask": "24", "nextHop": "10.0.0.2"}]})
+    # {'savedLines': 1}
+    if not (routing_config or {}).get("aggregatePrefixes"):
+        return None
+    section = protocol_section(protocol, router_id, networks, no_auto_summary, routing_config)
+    if section is None:
+        return None
+    return section[1].get("aggregation")
+
+
+def generate_protocol_config(
+    protocol: str,
+    router_id: str,
+    networks: list,
+    no_auto_summary: bool = True,
+    routing_config: dict = None,
+    cache: bool = True
+) -> list[str]:
+    # Генерує Cisco IOS команди для заданого протоколу маршрутизації.
+    #
+    # Підтримувані протоколи: RIP, OSPF, EIGRP, BGP, STATIC, IS-IS.
+    #
+    # Args:
+    #     protocol (str): Назва протоколу.
+    #     router_id (str): Router ID (IPv4).
+    #     networks (list): Мережі для RIP.
+    #     routing_config (dict): Конфігурація конкретного протоколу.
+    #     cache (bool): Брати/класти результат у section_cache.
+    #
+    # Returns:
+    #     list[str]: Список команд (новий список і з кешем, і без нього).
+
+    #
+    # Фабрикний метод для всіх підтримуваних протоколів. Визначає потрібний
+    # Jinja2-шаблон (наприклад, ``routing/ospf.j2``) і передає ньому
+    # контекст з інформацією про мережі, роутер-ID та параметрами
+    # протоколу.
+    #
+    # Підтримувані протоколи:
+    # - ``RIP`` — RIP v2 з списком мереж цластерних мереж.
+    # - ``OSPF`` — single/multi-area OSPF з wildcard masks та area per-network.
+    # - ``EIGRP`` — EIGRP з AS number і опціональним wildcard.
+    # - ``BGP`` — BGP з списком neighbor і advertised networks.
+    # - ``STATIC`` — статичні маршрути з next-hop або exit interface.
+    # - ``IS-IS`` — IS-IS з NET-адресою та рівнем маршрутизації.
+    #
+    # Args:
+    # protocol (str): Назва протоколу (регістронезалежна).
+    # Допустимі значення: ``"RIP"``, ``"OSPF"``, ``"EIGRP"``,
+    # ``"BGP"``, ``"STATIC"``, ``"IS-IS"``, ``"None"``.
+    # router_id (str): Router ID у форматі IPv4. Обов'язковий для OSPF.
+    # networks (list): Список кортежів ``(ip: str, mask: str)``.
+    # Використовується для RIP. OSPF/EIGRP/BGP читають з ``routing_config``.
+    # no_auto_summary (bool, optional): Додає ``no auto-summary`` для
+    # RIP і EIGRP. Defaults to ``True``.
+    # routing_config (dict, optional): Розширена конфігурація протоколу.
+    # Ключі залежать від протоколу:
+    #
+    # - OSPF: ``{"processId": str, "routerId": str,``
+    # ``"ospfNetworks": [{"network", "wildcard", "area"}]}``
+    # - EIGRP: ``{"asNumber": str, "eigrpNetworks": [{"network", "wildcard"}]}``
+    # - BGP: ``{"localAs": str, "routerId": str,``
+    # ``"bgpNeighbors": [{"ip", "remoteAs"}],``
+    # ``"bgpAdvertisedNetworks": [{"network", "mask"}]}``
+    # - STATIC: ``{"staticRoutes": [{"dest", "mask", "nextHop",``
+    # ``"interface", "ad", "metric"}]}``
+    # - STATIC/BGP: ``"aggregatePrefixes": True`` зливає суміжні статичні
+    # маршрути з однаковими атрибутами в суперсеті; для BGP network
+    # додає ``aggregate-address ... summary-only`` (див. backend/aggregate.py).
+    # - IS-IS: ``{"areaId": str, "systemId": str, "routerType": str}``
+    #
+    # Returns:
+    # list[str]: Список Cisco IOS команд. Порожний список, якщо
+    # ``protocol`` дорівнює ``"None"`` або порожній.
+    #
+    # Examples:
+    # >>> generate_protocol_config("RIP", "", [("192.168.1.0", "255.255.255.0")])
+    # ['!', 'router rip', ' version 2', ' network 192.168.1.0', ' no auto-summary', ' exit']
+    # >>> generate_protocol_config("None", "", [])
+    # []
+    section = protocol_section(protocol, router_id, networks, no_auto_summary, routing_config)
+    if section is None:
+        return []
+    if cache:
+        return list(section_cache.render(*section))
+    return render_template_to_lines(*section)
@@ -0,0 +1,319 @@
+import os
+
+try:
+    from .validate import validate_config
+except ImportError:
+    from validate import validate_config
+
+
+def new_error_id() -> str:
+    # Короткий ідентифікатор помилки/запиту для логів та UI: 8 випадкових
+    # hex-символів у верхньому регістрі (формат перших 8 символів UUID4).
+    return os.urandom(4).hex().upper()
+
+
+class RequestError(Exception):
+    # Помилка нормалізації або валідації запиту на генерацію.
+    #
+    # Містить усе, що потрібно process_text() та пакетному шляху
+    # (backend/fleet.py), щоб сформувати однаковий JSON-об'єкт помилки
+    # і запис у лог.
+    #
+    # Args:
+    #     code (str): Код помилки (наприклад, ``ERR-VAL-004``).
+    #     message_key (str): Ключ i18n для повідомлення у UI.
+    #     default_message (str): Текст повідомлення за замовчуванням.
+    #     instructions_key (str): Ключ i18n для інструкцій користувачу.
+    #     log_message (str): Повідомлення для лога (з контекстом).
+    #     log_level (str): Рівень логування (``"error"`` або ``"warning"``).
+    #     errors (list, optional): Усі помилки валідації ``{"path", "message"}``
+    #         (validate_config()); передаються у UI полем ``errors``.
+
+    def __init__(self, code, message_key, default_message, instructions_key, log_message="", log_level="error", errors=None):
+        super().__init__(default_message)
+        self.code = code
+        self.message_key = message_key
+        self.default_message = default_message
+        self.instructions_key = instructions_key
+        self.log_message = log_message or default_message
+        self.log_level = log_level
+        self.errors = errors or []
+
+    def to_payload(self, err_id: str = None) -> dict:
+        # Повертає словник у форматі, який очікує фронтенд (web/api.js).
+        payload = {
+            "error": True,
+            "code": self.code,
+            "id": err_id or new_error_id(),
+            "messageKey": self.message_key,
+            "defaultMessage": self.default_message,
+            "instructionsKey": self.instructions_key
+        }
+        if self.errors:
+            payload["errors"] = self.errors
+        return payload
+
+
+# Схема запиту: (атрибут GenerationRequest, ключ форми web/api.js, спосіб
+# нормалізації, значення за замовчуванням). Порядок — порядок аргументів у
+# build_generation_kwargs(). Значення None у формі означає «не передано».
+#
+# text       — рядок без пробілів по краях (не-рядок спершу str());
+# text_or    — як text, але порожній рядок теж замінюється значенням за замовчуванням;
+# text_list  — список рядків без пробілів по краях;
+# flag       — bool();
+# count      — int(); список (зсув аргументів у старих клієнтах) — значення за замовчуванням;
+# raw        — як є.
+REQUEST_SCHEMA = (
+    ("hostname", "hostname", "text_or", "R1"),
+    ("interfaces", "interfaces", "text_list", None),
+    ("networks", "networks", "raw", []),
+    ("ip_multicast", "ipMulticast", "flag", False),
+    ("routing_protocol", "routingProtocol", "text", ""),
+    ("router_id", "routerId", "text", ""),
+    ("telephony_enabled", "telephonyEnabled", "flag", False),
+    ("dn_list", "dnList", "raw", []),
+    ("enable_ssh", "enableSsh", "flag", False),
+    ("enable_secret", "enableSecret", "text", ""),
+    ("console_password", "consolePassword", "text", ""),
+    ("admin_username", "adminUsername", "text", "admin"),
+    ("admin_password", "adminPassword", "text", ""),
+    ("domain_name", "domainName", "text", "local.lab"),
+    ("dhcp_network", "dhcpNetwork", "text", ""),
+    ("dhcp_mask", "dhcpMask", "text", ""),
+    ("dhcp_gateway", "dhcpGateway", "text", ""),
+    ("dhcp_dns", "dhcpDns", "text", ""),
+    ("nat_type", "natType", "text", "None"),
+    ("nat_inside", "natInside", "text", ""),
+    ("nat_outside", "natOutside", "text", ""),
+    ("nat_inside_local", "natInsideLocal", "text", ""),
+    ("nat_inside_global", "natInsideGlobal", "text", ""),
+    ("snmp_enabled", "snmpEnabled", "raw", False),
+    ("snmp_community_ro", "snmpCommunityRo", "text", ""),
+    ("snmp_community_rw", "snmpCommunityRw", "text", ""),
+    ("snmp_location", "snmpLocation", "text", ""),
+    ("snmp_contact", "snmpContact", "text", ""),
+    ("snmp_trap_host", "snmpTrapHost", "text", ""),
+    ("no_shutdown_interfaces", "noShutdownInterfaces", "text_list", None),
+    ("descriptions", "descriptions", "text_list", None),
+    ("max_ephones", "maxEphones", "count", 3),
+    ("max_dn", "maxDn", "count", 3),
+    ("auto_assign_range", "autoAssignRange", "text_or", "1 to 3"),
+    ("dhcp_excluded", "dhcpExcluded", "raw", []),
+    ("dhcp_option150", "dhcpOption150", "text", ""),
+    ("routing_config", "routingConfig", "raw", {}),
+    # Лише для похідних значень (ip_source_address, dhcp_excluded)
+    ("cme_source_ip", "cmeSourceIp", "text", ""),
+    ("dhcp_excluded_from", "dhcpExcludedFrom", "text", ""),
+    ("dhcp_excluded_to", "dhcpExcludedTo", "text", ""),
+)
+
+# Похідні атрибути: обчислюються після валідації (_derive_fields())
+_DERIVED = ("ip_source_address",)
+
+# Аргументи generate_full_config() у порядку build_generation_kwargs()
+GENERATION_ARGS = tuple(
+    name for name, _key, _kind, _default in REQUEST_SCHEMA
+    if name not in ("cme_source_ip", "dhcp_excluded_from", "dhcp_excluded_to")
+) + _DERIVED
+
+# Вираз нормалізації значення `value` для кожного способу
+_COERCE = {
+    "text": "value.strip() if value.__class__ is str else {default!r} if value is None else str(value).strip()",
+    "text_or": "(value.strip() if value.__class__ is str else '' if value is None else str(value).strip()) or {default!r}",
+    "text_list": "[] if value is None else [str(item).strip() for item in value]",
+    "flag": "bool(value)",
+    "count": "{default!r} if value is None or value.__class__ is list else int(value)",
+    "raw": "{default!r} if value is None else value",
+}
+
+
+def _compile(source: str, name: str, namespace: dict):
+    # Компілює згенерований код і повертає функцію `name`; вихідний код
+    # зберігається в атрибуті ``source`` для налагодження.
+    exec(compile(source, f"<request schema: {name}>", "exec"), namespace)
+    function = namespace[name]
+    function.source = source
+    return function
+
+
+def _compile_as_kwargs(names: tuple):
+    # Генерує метод as_kwargs(): словник-літерал з атрибутів запиту.
+    items = ", ".join(f"{name!r}: self.{name}" for name in names)
+    return _compile(f"def as_kwargs(self):\n    return {{{items}}}", "as_kwargs", {})
+
+
+class GenerationRequest:
+    # Нормалізований запит на генерацію: поля REQUEST_SCHEMA та похідні.
+    #
+    # Створюється normalize_request(); as_kwargs() повертає аргументи
+    # generate_full_config().
+    __slots__ = tuple(name for name, _key, _kind, _default in REQUEST_SCHEMA) + _DERIVED + ("placeholder_networks",)
+
+    as_kwargs = _compile_as_kwargs(GENERATION_ARGS)
+
+    def __repr__(self):
+        # GenerationRequest(hostname='R1', ...)
+        fields = ", ".join(f"{name}={getattr(self, name, None)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _compile_normalizer(schema: tuple):
+    # Генерує з схеми одну функцію normalizer(config_data) -> GenerationRequest.
+    #
+    # Кожен ключ читається один раз, нормалізація — вбудований вираз без
+    # викликів допоміжних функцій на поле; значення за замовчуванням —
+    # літерали, тож списки/словники створюються заново для кожного запиту.
+    lines = [
+        "def normalizer(config_data):",
+        "    get = config_data.get",
+        "    request = new(GenerationRequest)",
+    ]
+    for name, key, kind, default in schema:
+        lines.append(f"    value = get({key!r})")
+        lines.append(f"    request.{name} = {_COERCE[kind].format(default=default)}")
+    lines.append("    return request")
+    return _compile("\n".join(lines), "normalizer", {"new": object.__new__, "GenerationRequest": GenerationRequest})
+
+
+_normalize_fields = _compile_normalizer(REQUEST_SCHEMA)
+
+
+def _normalize_networks(request: GenerationRequest) -> None:
+    # Перевіряє кількість і формат `networks`; підставляє заглушки для
+    # інтерфейсів без адрес (placeholder_networks).
+    networks = request.networks
+    interfaces = request.interfaces
+    request.placeholder_networks = False
+    if isinstance(networks, int):
+        if networks < 0:
+            e = "Кількість мереж не може бути від'ємною"
+            raise RequestError(
+                "ERR-VAL-002", "errInvalidNetworkCount", e, "instrCheckForm",
+                log_message=f"{e}. Контекст: networks={networks}"
+            )
+        networks = [("192.168.1.1", "255.255.255.0")] * networks
+        request.placeholder_networks = True
+
+    elif not isinstance(networks, list):
+        raise RequestError(
+            "ERR-VAL-003", "errInvalidNetworkFormat", "Некоректний формат параметра `networks`", "instrContactSupport",
+            log_message=f"Некоректний формат параметра `networks`. Type: {type(networks)}"
+        )
+
+    # Якщо `networks` не передали — заповнюємо дефолтними значеннями
+    if not networks:
+        networks = [("192.168.1.1", "255.255.255.0")] * len(interfaces)
+        request.placeholder_networks = True
+
+    # Перевірка відповідності довжин
+    if len(networks) != len(interfaces):
+        raise RequestError(
+            "ERR-VAL-004", "errNetworkInterfaceMismatch",
+            f"Кількість мереж ({len(networks)}) не відповідає кількості інтерфейсів ({len(interfaces)})",
+            "instrMatchNetworks",
+            log_message=f"Невідповідність кількості мереж ({len(networks)}) та інтерфейсів ({len(interfaces)}). Контекст: interfaces={interfaces}"
+        )
+    request.networks = networks
+
+
+def _derive_fields(request: GenerationRequest) -> None:
+    # Похідні значення: джерело CME/телефонії та виключені адреси DHCP.
+    gateway = request.dhcp_gateway
+
+    # CME source IP: явне поле, далі шлюз DHCP, далі перша адреса інтерфейсу
+    source = request.cme_source_ip or gateway
+    if not source and not request.placeholder_networks:
+        for item in request.networks:
+            if isinstance(item, (list, tuple)) and item and item[0]:
+                source = item[0]
+                break
+    request.ip_source_address = source or "10.0.0.1"
+
+    # Виключені адреси: поля From/To форми, далі список dhcpExcluded, далі
+    # (застаріле) шлюз .. шлюз+9
+    if request.dhcp_excluded_from and request.dhcp_excluded_to:
+        excluded = (request.dhcp_excluded_from, request.dhcp_excluded_to)
+    elif request.dhcp_excluded_from:
+        excluded = (request.dhcp_excluded_from,)
+    elif request.dhcp_excluded:
+        excluded = tuple(str(x).strip() for x in request.dhcp_excluded)
+    elif gateway:
+        excluded = (gateway,)
+        try:
+            octets = gateway.split('.')
+            last_octet = int(octets[-1])
+            if last_octet <= 245:
+                excluded = (gateway, f"{octets[0]}.{octets[1]}.{octets[2]}.{last_octet + 9}")
+        except (ValueError, IndexError):
+            pass
+    else:
+        excluded = ()
+    request.dhcp_excluded = excluded
+
+
+def normalize_request(config_data: dict) -> GenerationRequest:
+    # Нормалізує та валідує JSON-об'єкт форми (config_data).
+    #
+    # Один прохід по REQUEST_SCHEMA (функція, згенерована з схеми при
+    # імпорті модуля), перевірка `networks`, повна валідація через
+    # validate_config() (усі помилки запиту разом) і похідні значення.
+    # Чиста функція без логування та побічних ефектів — спільна для GUI
+    # (process_text) та пакетної генерації.
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/api.js.
+    #
+    # Returns:
+    #     GenerationRequest: Нормалізований запит.
+    #
+    # Raises:
+    #     RequestError: Якщо дані некоректні (коди ERR-VAL-001..006).
+    #
+    # Examples:
+    # >>> request = normalize_request({"hostname": " Edge ", "interfaces": ["Gi0/0"]})
+    # >>> request.hostname, request.networks
+    # ('Edge', [('192.168.1.1', '255.255.255.0')])
+    if config_data is None:
+        config_data = {}
+    request = _normalize_fields(config_data)
+
+    # Мінімальна перевірка
+    if not request.interfaces:
+        raise RequestError(
+            "ERR-VAL-001", "errNoInterfaces", "Не передано жодного інтерфейсу", "instrNoInterfaces",
+            log_message=f"Помилка генерації: не передано жодного інтерфейсу. Контекст: hostname={request.hostname}"
+        )
+    _normalize_networks(request)
+
+    # Комлексна валідація вхідних даних: усі помилки за один прохід
+    # Однакові дефолтні мережі — заглушки, а не дублікати адрес від користувача
+    checked_networks = request.networks[:1] if request.placeholder_networks else request.networks
+    errors = validate_config(dict(config_data, networks=checked_networks, routingProtocol=request.routing_protocol))
+    if errors:
+        validation_error = errors[0]["message"]
+        raise RequestError(
+            "ERR-VAL-006", "errValidationError", validation_error, "instrCheckValidation",
+            log_message=f"Дані не пройшли валідацію ({len(errors)} помилок): {validation_error}. Контекст: hostname={request.hostname}",
+            log_level="warning",
+            errors=errors
+        )
+
+    _derive_fields(request)
+    return request
+
+
+def build_generation_kwargs(config_data: dict) -> dict:
+    # Перетворює JSON-об'єкт форми (config_data) на аргументи generate_full_config().
+    #
+    # Те саме, що normalize_request(config_data).as_kwargs().
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/api.js.
+    #
+    # Returns:
+    #     dict: Keyword-аргументи для generate_full_config().
+    #
+    # Raises:
+    #     RequestError: Якщо дані некоректні (коди ERR-VAL-001..006).
+    return normalize_request(config_data).as_kwargs()
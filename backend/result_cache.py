@@ -0,0 +1,419 @@
+# Кеш готових конфігурацій process_text() за канонічним хешем запиту.
+#
+# Користувачі натискають «Згенерувати» кілька разів з незмінною формою, а
+# той самий шаблон філії генерується десятки разів на день. Ключ —
+# SHA-256 канонічного JSON форми: ключі відсортовані, текстові поля
+# REQUEST_SCHEMA без пробілів по краях (нормалізатор і validate_config()
+# однаково їх відкидають, тож результат від цього не залежить).
+#
+# Два рівні: обмежений LRU у пам'яті процесу та (після use_dir()) каталог
+# на диску, що переживає перезапуск. Дисковий рівень вмикається лише явно
+# (CRW_DISK_CACHE, disk_dir_from_env()), живе в каталозі користувача з
+# правами 0700/0600 і ніколи не отримує конфігурацій з обліковими даними
+# (enable secret, паролі, SNMP community) — вони лишаються тільки в
+# пам'яті. У ключ входить відбиток коду —
+# шаблони (jinja_env.build_manifest()) і вихідні файли backend/*.py, тож
+# після зміни шаблону чи оновлення програми старі записи не знаходяться,
+# а при першому зверненні до каталогу з іншим відбитком він очищається.
+#
+# Кешуються лише успішні результати: помилки валідації залежать від
+# повідомлень і кодів, які дешевше перерахувати.
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Union
+
+try:
+    from .generate import generate_full_config
+    from .jinja_env import build_manifest
+    from .request import REQUEST_SCHEMA, RequestError, new_error_id, normalize_request
+except ImportError:
+    from generate import generate_full_config
+    from jinja_env import build_manifest
+    from request import REQUEST_SCHEMA, RequestError, new_error_id, normalize_request
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Поля форми, значення яких нормалізатор обрізає (рядок / список рядків)
+_TEXT_KEYS = frozenset(key for _name, key, kind, _default in REQUEST_SCHEMA if kind in ("text", "text_or"))
+_TEXT_LIST_KEYS = frozenset(key for _name, key, kind, _default in REQUEST_SCHEMA if kind == "text_list")
+
+# Файл з відбитком коду в каталозі дискового кешу
+FINGERPRINT_NAME = "fingerprint"
+_SUFFIX = ".txt"
+
+# Рядки конфігурації з обліковими даними у відкритому вигляді
+# (security.j2, snmp.j2): такий результат на диск не пишеться
+_CREDENTIAL_LINE = re.compile(r"^\s*(enable\b.*\b(secret|password)\b|username\b|password\b|snmp-server (community|host)\b)", re.M)
+
+# Скільки останніх вимірів латентності тримати для перцентилів
+_LATENCY_SAMPLES = 1000
+
+_fingerprint = None
+
+
+def code_fingerprint() -> str:
+    # Відбиток шаблонів і коду генератора (SHA-256 у hex).
+    #
+    # Рахується один раз на процес: шаблони під час роботи не
+    # перечитуються (auto_reload=False у jinja_env).
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256(json.dumps(build_manifest(), sort_keys=True).encode("utf-8"))
+        for root, dirs, files in os.walk(_BACKEND_DIR):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(("_", ".")))
+            for filename in sorted(files):
+                if filename.endswith(".py"):
+                    path = os.path.join(root, filename)
+                    digest.update(os.path.relpath(path, _BACKEND_DIR).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(hashlib.sha256(f.read()).digest())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+def default_cache_dir() -> str:
+    # Каталог дискового кешу в профілі користувача (не робочий каталог).
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, "CiscoRouterWizard", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "cisco-router-wizard")
+
+
+def disk_dir_from_env() -> Optional[str]:
+    # Каталог дискового рівня з CRW_DISK_CACHE; None — рівень вимкнено.
+    #
+    # unset / "off" — лише пам'ять (за замовчуванням);
+    # "on" / "1"    — default_cache_dir();
+    # <path>        — заданий каталог.
+    setting = os.environ.get("CRW_DISK_CACHE", "").strip()
+    if setting.lower() in ("", "off", "0", "false", "no"):
+        return None
+    if setting.lower() in ("on", "1", "true", "yes"):
+        return default_cache_dir()
+    return setting
+
+
+def has_credentials(text: str) -> bool:
+    # True, якщо конфігурація містить паролі, секрети чи SNMP community.
+    return _CREDENTIAL_LINE.search(text) is not None
+
+
+def canonical_request(config_data: dict) -> str:
+    # Канонічний JSON форми: відсортовані ключі, обрізані текстові поля.
+    #
+    # Raises:
+    #     TypeError: Якщо форма містить значення, що не серіалізуються в JSON.
+    #
+    # Examples:
+    # >>> canonical_request({"hostname": " R1 ", "interfaces": ["Gi0/0 "]})
+    # '{"hostname":"R1","interfaces":["Gi0/0"]}'
+    canonical = {}
+    for key, value in config_data.items():
+        if key in _TEXT_KEYS and isinstance(value, str):
+            value = value.strip()
+        elif key in _TEXT_LIST_KEYS and isinstance(value, (list, tuple)):
+            value = [item.strip() if isinstance(item, str) else item for item in value]
+        canonical[key] = value
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _open_private(path: str):
+    # Файл для запису, доступний лише власнику (0600 на POSIX).
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8")
+
+
+def _percentile(samples, fraction: float) -> float:
+    # Перцентиль вибірки (найближчий ранг), 0.0 для порожньої.
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResultCache:
+    # Двохрівневий кеш тексту конфігурації за ключем запиту.
+    #
+    # Args:
+    #     maxsize (int): Максимальна кількість записів у пам'яті (0 вимикає кеш).
+    #     path (str, optional): Каталог дискового рівня; без нього — лише пам'ять.
+    #     max_files (int): Максимальна кількість записів на диску; понад це
+    #         видаляється найстаріша чверть (за часом останнього використання).
+    #
+    # Examples:
+    # >>> cache = ResultCache()
+    # >>> key = cache.key({"hostname": "R1", "interfaces": ["Gi0/0"]})
+    # >>> cache.get(key) is None
+    # True
+    # >>> cache.put(key, "hostname R1")
+    # >>> cache.get(key)
+    # 'hostname R1'
+
+    def __init__(self, maxsize: int = 256, path: Optional[str] = None, max_files: int = 4096):
+        self.maxsize = maxsize
+        self.path = path
+        self.max_files = max_files
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # Підготовка каталогу (перший доступ) — окремо від швидкого _lock
+        self._disk_lock = threading.Lock()
+        self._disk_ready = False
+        self._files = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+        self._latency = {"hit": deque(maxlen=_LATENCY_SAMPLES), "miss": deque(maxlen=_LATENCY_SAMPLES)}
+
+    def key(self, config_data: dict) -> Optional[str]:
+        # Ключ запиту або None, якщо кеш вимкнено чи форму не серіалізовано.
+        if self.maxsize <= 0 or not isinstance(config_data, dict):
+            return None
+        try:
+            payload = canonical_request(config_data)
+        except (TypeError, ValueError):
+            with self._lock:
+                self.bypassed += 1
+            return None
+        return hashlib.sha256(f"{code_fingerprint()}\n{payload}".encode("utf-8")).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        # Текст конфігурації з пам'яті, далі з диску; None — промах.
+        if key is None:
+            return None
+        with self._lock:
+            text = self._data.get(key)
+            if text is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return text
+        text = self._read(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: Optional[str], text: str) -> None:
+        # Зберігає текст у пам'яті та (якщо увімкнено) на диску; конфігурації
+        # з обліковими даними на диск не потрапляють.
+        if key is None:
+            return
+        with self._lock:
+            self._remember(key, text)
+        if self.path and not has_credentials(text):
+            self._write(key, text)
+
+    def observe(self, hit: bool, seconds: float) -> None:
+        # Латентність обробленого запиту (process_text) для stats().
+        with self._lock:
+            self._latency["hit" if hit else "miss"].append(seconds)
+
+    def _remember(self, key: str, text: str) -> None:
+        # Додає запис у LRU (під блокуванням) і витісняє найстаріші.
+        self._data[key] = text
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _prepare_dir(self) -> bool:
+        # Створює каталог і очищає його, якщо записи зроблено іншою версією
+        # коду чи шаблонів. False, якщо дисковий рівень недоступний.
+        if self._disk_ready:
+            return True
+        with self._disk_lock:
+            return self._disk_ready or self._init_dir()
+
+    def _init_dir(self) -> bool:
+        # _prepare_dir() під _disk_lock.
+        if not self.path:
+            return False
+        fingerprint = code_fingerprint()
+        marker = os.path.join(self.path, FINGERPRINT_NAME)
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            try:
+                with open(marker, encoding="utf-8") as f:
+                    stored = f.read().strip()
+            except OSError:
+                stored = ""
+            names = [name for name in os.listdir(self.path) if name.endswith(_SUFFIX)]
+            if stored != fingerprint:
+                for name in names:
+                    os.remove(os.path.join(self.path, name))
+                names = []
+                with _open_private(marker) as f:
+                    f.write(fingerprint)
+                if stored:
+                    logger.info(f"Кеш конфігурацій {self.path} очищено: змінилися шаблони або код")
+        except OSError as e:
+            logger.warning(f"Дисковий кеш конфігурацій {self.path} недоступний: {e}")
+            self.path = None
+            return False
+        self._files = len(names)
+        self._disk_ready = True
+        return True
+
+    def _read(self, key: str) -> Optional[str]:
+        # Запис з диску; час зміни файлу оновлюється як час використання.
+        if not self._prepare_dir():
+            return None
+        path = os.path.join(self.path, key + _SUFFIX)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return text
+
+    def _write(self, key: str, text: str) -> None:
+        # Атомарно записує файл запису і стежить за розміром каталогу.
+        if not self._prepare_dir():
+            return
+        path = os.path.join(self.path, key + _SUFFIX)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            existed = os.path.exists(path)
+            with _open_private(tmp) as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Не вдалося записати кеш конфігурацій {path}: {e}")
+            return
+        with self._lock:
+            if not existed:
+                self._files += 1
+            prune = self._files > self.max_files
+        if prune:
+            self._prune()
+
+    def _prune(self) -> None:
+        # Видаляє найстарішу чверть записів на диску.
+        try:
+            entries = []
+            for entry in os.scandir(self.path):
+                if entry.name.endswith(_SUFFIX):
+                    entries.append((entry.stat().st_mtime, entry.path))
+            entries.sort()
+            drop = entries[:max(1, len(entries) - self.max_files * 3 // 4)]
+            for _mtime, path in drop:
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Не вдалося очистити кеш конфігурацій {self.path}: {e}")
+            return
+        with self._lock:
+            self._files = len(entries) - len(drop)
+
+    def use_dir(self, path: str) -> None:
+        # Вмикає дисковий рівень у каталозі path (перевіряється ледачо).
+        with self._lock:
+            self.path = path
+            self._disk_ready = False
+
+    def stats(self) -> dict:
+        # Лічильники та латентність (мс) для інструментування.
+        with self._lock:
+            lookups = self.hits + self.misses
+            latency = {}
+            for kind, samples in self._latency.items():
+                latency[kind] = {
+                    "count": len(samples),
+                    "p50_ms": round(_percentile(samples, 0.5) * 1000, 3),
+                    "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+                }
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "disk": self.path,
+                "disk_size": self._files,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "latency": latency,
+            }
+
+    def clear(self) -> None:
+        # Очищає пам'ять і скидає лічильники; дисковий рівень не чіпає.
+        with self._lock:
+            self._data.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = self.bypassed = 0
+            for samples in self._latency.values():
+                samples.clear()
+
+
+# Кеш процесу. GUI (main.start_gui) вмикає дисковий рівень через use_dir(),
+# якщо його задано в CRW_DISK_CACHE.
+result_cache = ResultCache()
+
+
+def generate_cached(config_data: dict, log=logger) -> Union[str, dict]:
+    # Конфігурація однієї форми через кеш результатів — спільне ядро
+    # main.process_text() (GUI) і server.api_generate() (HTTP).
+    #
+    # Промах: нормалізація й валідація (normalize_request()), рендер,
+    # запис у кеш; латентність обох випадків потрапляє в stats().
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/state.js.
+    #     log: Логер або LoggerAdapter запиту (контекст користувача/сесії).
+    #
+    # Returns:
+    #     str | dict: Текст конфігурації або помилка у форматі відповіді
+    #     process_text (``"error": True``, ``code``, ``id``, ``messageKey``...).
+    started = time.perf_counter()
+    key = result_cache.key(config_data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        log.info("Конфігурацію взято з кешу результатів")
+        result_cache.observe(True, time.perf_counter() - started)
+        return cached
+
+    try:
+        request = normalize_request(config_data)
+    except RequestError as e:
+        err_id = new_error_id()
+        (log.warning if e.log_level == "warning" else log.error)(f"[{e.code}] [{err_id}] {e.log_message}")
+        return e.to_payload(err_id)
+
+    try:
+        log.info(f"Старт генерації конфігурації для пристрою: {request.hostname}")
+        config_lines = generate_full_config(**request.as_kwargs())
+    except Exception as e:
+        err_code = "ERR-GEN-001"
+        err_id = new_error_id()
+        # Контекст з основними безпечними параметрами
+        safe_context = {
+            "hostname": request.hostname,
+            "routing_protocol": request.routing_protocol,
+            "interfaces": request.interfaces,
+            "telephony_enabled": request.telephony_enabled
+        }
+        log.error(f"[{err_code}] [{err_id}] Критична помилка генерації: {str(e)}. Контекст: {safe_context}", exc_info=True)
+        return {
+            "error": True, "code": err_code, "id": err_id,
+            "messageKey": "errGenerationFailed", "defaultMessage": "Критична помилка генерації конфігурації.", "instructionsKey": "instrContactSupport"
+        }
+
+    log.info(f"Успішно згенеровано {len(config_lines)} рядків конфігурації")
+    text = "\n".join(config_lines)
+    result_cache.put(key, text)
+    result_cache.observe(False, time.perf_counter() - started)
+    return text
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Sized
+
+from .ir import Node
+from .jinja_env import render_template_to_lines
+
+
+def _json_default(obj):
+    # Серіалізація нестандартних значень контексту для канонічного ключа.
+    # Вузли IR (backend/ir.py) — ім'я типу та значення полів; ледачі
+    # послідовності (наприклад, _LazyList у protocols.py) та інші ітеровані
+    # об'єкти перетворюються на список.
+    if isinstance(obj, Node):
+        return [type(obj).__name__, *obj.astuple()]
+    try:
+        return list(obj)
+    except TypeError:
+        return repr(obj)
+
+
+def canonical_key(template_name: str, context: dict) -> str:
+    # Канонічний хеш входів секції: ім'я шаблону + контекст.
+    #
+    # Ключі словників сортуються, кортежі та списки еквівалентні, тож
+    # однакові за змістом контексти з різних пристроїв дають однаковий ключ.
+    #
+    # Returns:
+    #     str: SHA-256 у hex.
+    payload = json.dumps(
+        [template_name, context],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    # Обмежений LRU-кеш відрендерених секцій конфігурації.
+    #
+    # Ключ — canonical_key(template_name, context), значення — незмінний
+    # кортеж рядків, тож один результат безпечно ділиться між пристроями.
+    # Секції з великими таблицями (більше `max_items` елементів у будь-якому
+    # значенні контексту) не кешуються: хешування і зберігання коштували б
+    # більше, ніж повторний рендер, і зламали б потокову генерацію.
+    #
+    # Args:
+    #     maxsize (int): Максимальна кількість секцій у кеші.
+    #     max_items (int): Поріг розміру колекцій у контексті для кешування.
+
+    def __init__(self, maxsize: int = 512, max_items: int = 1000):
+        self.maxsize = maxsize
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def cacheable(self, context: dict) -> bool:
+        # True, якщо жодна колекція в контексті не перевищує max_items.
+        for value in context.values():
+            if isinstance(value, Sized) and not isinstance(value, str) and len(value) > self.max_items:
+                return False
+        return True
+
+    def render(self, template_name: str, context: dict) -> tuple[str, ...]:
+        # Повертає рядки секції з кешу або рендерить і кешує їх.
+        if not self.cacheable(context):
+            with self._lock:
+                self.bypassed += 1
+            return tuple(render_template_to_lines(template_name, context))
+
+        key = canonical_key(template_name, context)
+        with self._lock:
+            lines = self._data.get(key)
+            if lines is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return lines
+            self.misses += 1
+
+        lines = tuple(render_template_to_lines(template_name, context))
+
+        with self._lock:
+            self._data[key] = lines
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return lines
+
+    def stats(self) -> dict:
+        # Лічильники для інструментування.
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        # Очищає кеш і скидає лічильники.
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.bypassed = 0
+
+
+# Спільний кеш процесу (у пулі процесів — окремий у кожному воркері)
+section_cache = SectionCache()
@@ -0,0 +1,362 @@
+# Безголовий HTTP-режим генерації: JSON API без eel і браузера.
+#
+# GUI (main.py) — один процес eel з глобальним підключенням до роутера;
+# для контейнера (docs/scripts/Dockerfile) потрібен сервер, що обслуговує
+# багато клієнтів. Тут лише генерація та валідація — роутер не
+# підключається, тож воркери нічого не ділять між собою.
+#
+# Модель pre-fork: батьківський процес відкриває сокет, один раз
+# завантажує шаблони (jinja_env.warm_up(), з готового бандла
+# scripts/compile_templates.py, якщо він є) і форкає воркерів — скомпільовані
+# шаблони успадковуються copy-on-write. Кожен воркер приймає з'єднання
+# зі спільного неблокуючого сокета (хто перший, той і приймає) і
+# обслуговує їх у потоках: HTTP/1.1 keep-alive тримає з'єднання між
+# запитами, а простоюване закривається через KEEPALIVE_TIMEOUT. Воркер,
+# що впав, батько перезапускає. Без os.fork (Windows) або з workers=1
+# сервер працює в одному процесі.
+#
+# Ендпоінти:
+#     POST /api/generate  config_data -> {"config": "..."} | помилка process_text (422/500);
+#                         з routingConfig.aggregatePrefixes ще й "aggregation" (підсумок агрегації)
+#     POST /api/validate  config_data -> {"ok": bool, "errors": [{"path", "message"}]}
+#     POST /api/batch     [spec, ...] або {"devices": [...]} -> {"results": [...]}
+#     GET  /api/stats     кеші воркера (як main.cache_stats()) і його pid
+#     GET  /health        {"ok": true}
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from .fleet import render_device
+    from .jinja_env import warm_up, TEMPLATE_SOURCE
+    from .protocols import aggregation_summary
+    from .request import normalize_request
+    from .result_cache import generate_cached, result_cache
+    from .section_cache import section_cache
+    from .validate import validate_config
+except ImportError:
+    from fleet import render_device
+    from jinja_env import warm_up, TEMPLATE_SOURCE
+    from protocols import aggregation_summary
+    from request import normalize_request
+    from result_cache import generate_cached, result_cache
+    from section_cache import section_cache
+    from validate import validate_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8000
+# Скільки секунд тримати простоюване keep-alive з'єднання
+KEEPALIVE_TIMEOUT = 15
+# Максимальний розмір тіла запиту (пакетна генерація — тисячі пристроїв)
+MAX_BODY = 16 * 1024 * 1024
+# Черга з'єднань, що очікують accept()
+BACKLOG = 512
+# Воркер, що впав швидше за це, перезапускається з паузою (без циклу падінь)
+RESPAWN_DELAY = 1.0
+
+
+class _HTTPError(Exception):
+    # Відповідь з помилкою протоколу (400/404/411/413) до виклику ендпоінта.
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _error_status(payload: dict) -> int:
+    # HTTP-статус для помилки у форматі process_text: валідація — 422.
+    return 422 if str(payload.get("code", "")).startswith("ERR-VAL") else 500
+
+
+def _require_object(data) -> dict:
+    # Тіло запиту має бути JSON-об'єктом форми.
+    if not isinstance(data, dict):
+        raise _HTTPError(400, "Request body must be a JSON object")
+    return data
+
+
+def api_generate(data) -> tuple[int, dict]:
+    # Конфігурація одного роутера — те саме ядро, що й process_text()
+    # (result_cache.generate_cached()).
+    result = generate_cached(_require_object(data), logger)
+    if isinstance(result, dict):
+        return _error_status(result), result
+    payload = {"config": result}
+    routing_config = data.get("routingConfig")
+    if isinstance(routing_config, dict) and routing_config.get("aggregatePrefixes"):
+        # Запит уже пройшов нормалізацію під час генерації (або взятий з кешу)
+        request = normalize_request(data)
+        summary = aggregation_summary(request.routing_protocol, request.router_id, request.networks,
+                                      routing_config=request.routing_config)
+        if summary is not None:
+            payload["aggregation"] = summary
+    return 200, payload
+
+
+def api_validate(data) -> tuple[int, dict]:
+    # Усі помилки валідації форми (validate_config()).
+    errors = validate_config(_require_object(data))
+    return 200, {"ok": not errors, "errors": errors}
+
+
+def api_batch(data) -> tuple[int, dict]:
+    # Пакетна генерація в поточному воркері, результати в порядку подачі.
+    #
+    # Паралельність дає пул воркерів сервера; окремий пул процесів
+    # generate_fleet() на кожен запит коштував би більше, ніж рендер.
+    devices = data.get("devices") if isinstance(data, dict) else data
+    if not isinstance(devices, list):
+        raise _HTTPError(400, "Request body must be a list of devices or {\"devices\": [...]}")
+    results = []
+    for index, spec in enumerate(devices):
+        device_id, result = render_device(index, spec if isinstance(spec, dict) else {})
+        if isinstance(result, dict):
+            results.append({"deviceId": device_id, "error": result})
+        else:
+            results.append({"deviceId": device_id, "config": "\n".join(result)})
+    return 200, {"results": results}
+
+
+def api_stats(data) -> tuple[int, dict]:
+    # Лічильники кешів воркера, що обслужив запит.
+    return 200, {
+        "pid": os.getpid(),
+        "templates": TEMPLATE_SOURCE,
+        "result_cache": result_cache.stats(),
+        "section_cache": section_cache.stats(),
+    }
+
+
+def api_health(data) -> tuple[int, dict]:
+    # Перевірка живучості для балансувальника / k8s probe.
+    return 200, {"ok": True}
+
+
+# (метод, шлях) -> ендпоінт
+ROUTES = {
+    ("POST", "/api/generate"): api_generate,
+    ("POST", "/api/validate"): api_validate,
+    ("POST", "/api/batch"): api_batch,
+    ("GET", "/api/stats"): api_stats,
+    ("GET", "/health"): api_health,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # JSON-ендпоінти з ROUTES поверх HTTP/1.1 keep-alive.
+    protocol_version = "HTTP/1.1"
+    server_version = "CiscoRouterWizard"
+    # Простоюване з'єднання закривається (звільняє потік воркера)
+    timeout = KEEPALIVE_TIMEOUT
+    # Заголовки й тіло відповіді — окремі send(): без TCP_NODELAY Nagle
+    # разом із delayed ACK клієнта додає ~40 мс до кожного keep-alive запиту
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        # GET-ендпоінти (stats, health).
+        self._dispatch("GET")
+
+    def do_POST(self):
+        # POST-ендпоінти з JSON-тілом.
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        # Викликає ендпоінт з ROUTES і надсилає його відповідь; помилки — JSON.
+        path = self.path.split("?", 1)[0]
+        endpoint = ROUTES.get((method, path))
+        try:
+            # Тіло читається й для невідомих шляхів: інакше його залишок
+            # зламає наступний запит у keep-alive з'єднанні
+            data = self._read_json() if method == "POST" else None
+            if endpoint is None:
+                if any(route_path == path for _method, route_path in ROUTES):
+                    raise _HTTPError(405, f"Method {method} not allowed for {path}")
+                raise _HTTPError(404, f"Unknown endpoint {path}")
+            status, payload = endpoint(data)
+        except _HTTPError as e:
+            status, payload = e.status, {"error": True, "code": f"HTTP-{e.status}", "defaultMessage": str(e)}
+        except Exception as e:
+            logger.error(f"[HTTP] Помилка ендпоінта {path}: {e}", exc_info=True)
+            status, payload = 500, {"error": True, "code": "ERR-SYS-001", "defaultMessage": str(e)}
+        self._send_json(status, payload)
+
+    def _read_json(self):
+        # Тіло запиту як JSON (лише з Content-Length, без chunked).
+        if self.headers.get("Transfer-Encoding"):
+            self.close_connection = True
+            raise _HTTPError(411, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True
+            raise _HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            # Тіло не дочитується — з'єднання далі не придатне
+            self.close_connection = True
+            raise _HTTPError(413, f"Request body exceeds {MAX_BODY} bytes")
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body) if body else None
+        except ValueError as e:
+            raise _HTTPError(400, f"Invalid JSON: {e}")
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        # JSON-відповідь з Content-Length (обов'язково для keep-alive).
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Журнал запитів — у logging (DEBUG), а не в stderr.
+        logger.debug(f"[HTTP] {self.address_string()} {format % args}")
+
+
+class _WorkerServer(ThreadingHTTPServer):
+    # HTTP-сервер воркера над уже відкритим (спільним) сокетом.
+    daemon_threads = True
+
+    def __init__(self, sock: socket.socket):
+        super().__init__(sock.getsockname()[:2], _Handler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+
+
+def make_server(sock: socket.socket) -> ThreadingHTTPServer:
+    # HTTP-сервер одного воркера над слухаючим сокетом sock.
+    #
+    # Returns:
+    #     ThreadingHTTPServer: Сервер; запуск — serve_forever().
+    return _WorkerServer(sock)
+
+
+def listen(host: str = "0.0.0.0", port: int = DEFAULT_PORT) -> socket.socket:
+    # Слухаючий сокет, спільний для всіх воркерів.
+    #
+    # Неблокуючий: усі воркери чекають на ньому в select(), і ті, кому
+    # з'єднання не дісталося, отримують EAGAIN замість блокування в accept().
+    sock = socket.create_server((host, port), backlog=BACKLOG)
+    sock.setblocking(False)
+    return sock
+
+
+def _run_worker(sock: socket.socket) -> None:
+    # Цикл воркера; SIGTERM завершує його після поточного select().
+    server = make_server(sock)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _prefork(sock: socket.socket, workers: int) -> None:
+    # Форкає воркерів і перезапускає тих, що завершилися, до SIGTERM/SIGINT.
+    children = {}
+    stopping = False
+
+    def spawn():
+        # Новий воркер; у дочірньому процесі не повертається.
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                _run_worker(sock)
+            except BaseException as e:
+                logger.critical(f"[HTTP] Воркер {os.getpid()} аварійно завершився: {e}", exc_info=True)
+                status = 1
+            finally:
+                os._exit(status)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        # SIGTERM/SIGINT батьку: зупинити воркерів і не перезапускати їх.
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        logger.warning(f"[HTTP] Воркер {pid} завершився (status={status}), перезапуск")
+        if time.monotonic() - started < RESPAWN_DELAY:
+            time.sleep(RESPAWN_DELAY)
+        spawn()
+    sock.close()
+
+
+def serve(host: str = "0.0.0.0", port: int = DEFAULT_PORT, workers: int = None) -> None:
+    # Запускає безголовий сервер і блокує до SIGTERM/SIGINT.
+    #
+    # Args:
+    #     host (str): Адреса для прослуховування.
+    #     port (int): Порт (0 — вільний порт, друкується при старті).
+    #     workers (int, optional): Кількість процесів-воркерів. За
+    #         замовчуванням os.cpu_count(); без os.fork — завжди 1.
+    #
+    # Examples:
+    # >>> serve("127.0.0.1", 8000, workers=4)   # python -m backend.server --workers 4
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not hasattr(os, "fork"):
+        workers = 1
+    sock = listen(host, port)
+    # Шаблони завантажуються до fork: воркери отримують їх готовими
+    warm_up()
+    bound_host, bound_port = sock.getsockname()[:2]
+    logger.info(f"[HTTP] Сервер на {bound_host}:{bound_port}, воркерів: {workers}, шаблони: {TEMPLATE_SOURCE}")
+    print(f"Serving on http://{bound_host}:{bound_port} ({workers} workers)", flush=True)
+    if workers <= 1:
+        try:
+            _run_worker(sock)
+        except KeyboardInterrupt:
+            pass
+        return
+    _prefork(sock, workers)
+
+
+def main(argv: list = None) -> None:
+    # CLI: python -m backend.server [--host H] [--port P] [--workers N]
+    #
+    # Значення за замовчуванням — зі змінних CRW_HOST, EEL_PORT, CRW_WORKERS
+    # (docs/scripts/Dockerfile, k8s_deployment.yaml).
+    parser = argparse.ArgumentParser(description="Headless Cisco Router Wizard generation server")
+    parser.add_argument("--host", default=os.environ.get("CRW_HOST", "0.0.0.0"))
+    # Рядкові значення за замовчуванням argparse перетворює через type=int,
+    # тож нечислова змінна оточення — звичайна помилка CLI, а не traceback
+    parser.add_argument("--port", type=int, default=os.environ.get("EEL_PORT", str(DEFAULT_PORT)))
+    parser.add_argument("--workers", type=int, default=os.environ.get("CRW_WORKERS", "0"),
+                        help="worker processes (default: CRW_WORKERS or CPU count)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), stream=sys.stderr)
+    serve(args.host, args.port, args.workers or None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,597 @@
+# Локальний симулятор Telnet-інтерфейсу Cisco IOS для тестів і бенчмарків деплою.
+#
+# asyncio-сервер емулює те, що netmiko бачить від справжнього роутера:
+# логін (Username:/Password: або лише Password:), режими ``>``, ``#``,
+# ``(config)#`` і підрежими (``(config-if)#``, ``(config-router)#`` тощо),
+# enable з паролем, ``show running-config`` за фактично прийнятою
+# конфігурацією, ``write memory`` та повідомлення ``% Invalid input``,
+# ``% Incomplete command`` і ``% Ambiguous command``. Сервер, як і IOS,
+# сам повторює (echo) введені команди. ``copy tftp://<host>/<файл> running-config``
+# завантажує файл TFTP-клієнтом (backend/transfer.py) з порту ``tftp_port``
+# і застосовує його рядки як команди конфігурації.
+#
+# Затримка відповіді задається на рядок: ``latency`` ± ``jitter`` секунд
+# від надходження рядка до появи відповіді (мережевий RTT — відповіді на
+# рядки, надіслані пачкою, перекриваються) плюс ``line_cost`` — послідовний
+# час обробки кожної команди (CPU роутера).
+#
+# Запуск окремим процесом:
+#     python -m backend.simulator --port 2323 --hostname R1 --password cisco --latency 0.005
+#
+# У тестах:
+#     with IOSSimulator(password="cisco") as sim:
+#         connect("127.0.0.1", sim.port, password="cisco")
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Iterable, Optional
+
+try:
+    from .config_diff import ConfigNode, normalize
+    from .transfer import TFTP_PORT, tftp_fetch
+except ImportError:
+    from config_diff import ConfigNode, normalize
+    from transfer import TFTP_PORT, tftp_fetch
+
+# Telnet IAC (netmiko надсилає IAC NOP як keepalive у is_alive())
+_IAC, _SB, _SE = 255, 250, 240
+_WILL_DONT = range(251, 255)
+
+INVALID_INPUT = "% Invalid input detected at '^' marker."
+INCOMPLETE = "% Incomplete command."
+AMBIGUOUS = '% Ambiguous command:  "{line}"'
+
+# Команди, які симулятор відхиляє в режимі конфігурації: (шаблон, повідомлення)
+DEFAULT_ERRORS = (
+    (re.compile(r"^(?:bogus|invalid)\b"), INVALID_INPUT),
+    (re.compile(r"^(?:configure|conf)\b"), INVALID_INPUT),
+    (re.compile(r"^(?:interface|router|hostname|ip route|network|description|enable)$"), INCOMPLETE),
+    (re.compile(r"^[a-z]$"), AMBIGUOUS),
+)
+
+# Команди, що відкривають підрежим: префікс -> назва режиму в prompt
+_SUBMODES = (
+    ("interface ", "config-if"),
+    ("router ", "config-router"),
+    ("line ", "config-line"),
+    ("ip dhcp pool ", "dhcp-config"),
+    ("ip access-list ", "config-nacl"),
+    ("ephone-dn ", "config-ephone-dn"),
+    ("ephone ", "config-ephone"),
+    ("telephony-service", "config-telephony"),
+)
+
+# Однозначні параметри: новий рядок замінює попередній у тому ж блоці
+_SINGLE_VALUED = ("hostname ", "ip address ", "router-id ", "ip domain name ", "enable secret ", "description ")
+
+# Виконуються, але не зберігаються в running-config
+_NOT_STORED = ("crypto key generate",)
+
+_SECRET_RE = re.compile(r"^(.*?\b)(?:algorithm-type \S+ )?secret (?!\d )(\S+)$")
+_PASSWORD_RE = re.compile(r"^(.*?\bpassword) (?!\d )(\S+)$")
+
+# copy tftp://<host>/<файл> running-config: (url, host, файл)
+_COPY_RE = re.compile(r"^copy (tftp://([^/\s]+)/(\S+)) (?:running-config|system:running-config)$")
+
+
+def _hide_secret(line: str) -> str:
+    # Вигляд паролів у running-config: ``secret 9 $9$...``, ``password 7 ...``.
+    match = _SECRET_RE.match(line)
+    if match:
+        digest = hashlib.sha256(match.group(2).encode()).hexdigest()[:32]
+        return f"{match.group(1)}secret 9 $9${digest}"
+    match = _PASSWORD_RE.match(line)
+    if match:
+        return f"{match.group(1)} 7 {match.group(2).encode().hex().upper()}"
+    return line
+
+
+def _strip_telnet(data: bytes) -> bytes:
+    # Прибирає з вхідного потоку команди протоколу Telnet (IAC ...).
+    if _IAC not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte != _IAC:
+            out.append(byte)
+            i += 1
+            continue
+        command = data[i + 1] if i + 1 < len(data) else None
+        if command == _IAC:
+            out.append(_IAC)
+            i += 2
+        elif command in _WILL_DONT:
+            i += 3
+        elif command == _SB:
+            end = data.find(bytes((_IAC, _SE)), i)
+            i = len(data) if end < 0 else end + 2
+        else:
+            i += 2
+    return bytes(out)
+
+
+class _Session:
+    # Одна Telnet-сесія: читання рядків, режими CLI і відкладене надсилання відповідей.
+
+    def __init__(self, sim: "IOSSimulator", reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Сесія починається з логіну в режимі user exec.
+        self.sim = sim
+        self.reader = reader
+        self.writer = writer
+        self.privileged = False
+        # Стек підрежимів конфігурації: [(вузол, назва режиму)]; None — exec
+        self.config_stack = None
+        self.outbox = asyncio.Queue()
+        self.last_due = 0.0
+        self.lines = asyncio.Queue()
+        self.closed = False
+        # Після ``enable`` наступний рядок — пароль
+        self.awaiting_secret = False
+        # Після ``copy tftp://...`` наступний рядок підтверджує destination
+        self.pending_copy = None
+
+    # --- введення/виведення ---
+
+    async def _read_loop(self) -> None:
+        # Розбиває вхідний потік на рядки; час надходження — для затримки відповіді.
+        #
+        # Рядок завершується \r\n, \n або окремим \r (netmiko надсилає
+        # логін і пароль з \r); \n одразу після \r з попередньої порції
+        # пропускається.
+        loop = asyncio.get_running_loop()
+        buffer = ""
+        after_cr = False
+        while True:
+            data = await self.reader.read(65536)
+            if not data:
+                break
+            arrived = loop.time()
+            text = _strip_telnet(data).decode("utf-8", "replace").replace("\x00", "")
+            if after_cr and text.startswith("\n"):
+                text = text[1:]
+            after_cr = text.endswith("\r")
+            buffer += text.replace("\x1a", "\nend\n")
+            *complete, buffer = re.split(r"\r\n|\r|\n", buffer)
+            for line in complete:
+                await self.lines.put((line, arrived))
+        await self.lines.put((None, loop.time()))
+
+    async def _write_loop(self) -> None:
+        # Надсилає відповіді в порядку черги не раніше їх часу готовності.
+        loop = asyncio.get_running_loop()
+        while True:
+            due, data = await self.outbox.get()
+            if data is None:
+                break
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.writer.write(data.encode())
+            await self.writer.drain()
+
+    def send(self, text: str, arrived: Optional[float] = None) -> None:
+        # Ставить відповідь у чергу з затримкою latency ± jitter від надходження рядка.
+        loop = asyncio.get_running_loop()
+        delay = self.sim.latency
+        if self.sim.jitter:
+            delay += self.sim.random.uniform(-self.sim.jitter, self.sim.jitter)
+        due = max((arrived or loop.time()) + max(0.0, delay), self.last_due)
+        self.last_due = due
+        self.outbox.put_nowait((due, text))
+
+    async def readline(self) -> tuple[Optional[str], float]:
+        # Наступний рядок вводу та час його надходження (None — клієнт відключився).
+        return await self.lines.get()
+
+    # --- CLI ---
+
+    @property
+    def prompt(self) -> str:
+        # Поточний prompt: R1>, R1#, R1(config)#, R1(config-if)#.
+        if self.config_stack is not None:
+            mode = self.config_stack[-1][1] if self.config_stack else "config"
+            return f"{self.sim.hostname}({mode})#"
+        return self.sim.hostname + ("#" if self.privileged else ">")
+
+    async def run(self) -> None:
+        # Логін, потім цикл команд до exit або відключення клієнта.
+        reader_task = asyncio.create_task(self._read_loop())
+        writer_task = asyncio.create_task(self._write_loop())
+        try:
+            if await self._login():
+                self.send(self.prompt)
+                while not self.closed:
+                    line, arrived = await self.readline()
+                    if line is None:
+                        break
+                    if self.sim.line_cost:
+                        await asyncio.sleep(self.sim.line_cost)
+                    self.sim.stats["commands"] += 1
+                    # Пароль enable, як і в IOS, не повторюється
+                    echo = "" if self.awaiting_secret else line
+                    if self.pending_copy is not None:
+                        output = await self._copy(self.pending_copy)
+                    else:
+                        output = self.execute(line.strip())
+                    self.send(echo + "\r\n" + output, arrived)
+        finally:
+            self.outbox.put_nowait((0.0, None))
+            try:
+                await asyncio.wait_for(writer_task, timeout=5)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+            reader_task.cancel()
+            self.writer.close()
+
+    async def _ask(self, prompt: str) -> Optional[str]:
+        # Виводить запит (Username:/Password:) і чекає рядок відповіді.
+        self.send(prompt)
+        line, _ = await self.readline()
+        return None if line is None else line.strip()
+
+    async def _login(self) -> bool:
+        # Автентифікація VTY: username/password, лише password або без логіну.
+        sim = self.sim
+        if not sim.username and not sim.password:
+            return True
+        self.send("\r\nUser Access Verification\r\n\r\n")
+        for _ in range(3):
+            username = ""
+            if sim.username:
+                username = await self._ask("Username: ")
+                if username is None:
+                    return False
+            password = await self._ask("Password: ")
+            if password is None:
+                return False
+            if username == sim.username and password == sim.password:
+                self.send("\r\n")
+                return True
+            self.send("\r\n% Login invalid\r\n\r\n" if sim.username else "\r\n% Bad passwords\r\n\r\n")
+        self.closed = True
+        return False
+
+    def execute(self, line: str) -> str:
+        # Виконує одну команду; повертає вивід разом із наступним prompt.
+        if self.awaiting_secret:
+            self.awaiting_secret = False
+            if line == self.sim.enable_secret:
+                self.privileged = True
+                return self.prompt
+            return "% Bad secrets\r\n\r\n" + self.prompt
+        if self.config_stack is None and not self.privileged and line in ("enable", "en") and self.sim.enable_secret:
+            self.awaiting_secret = True
+            return "Password: "
+        match = _COPY_RE.match(line)
+        if match and self.config_stack is None and self.privileged:
+            self.pending_copy = match
+            return "Destination filename [running-config]? "
+        if self.config_stack is not None:
+            output = self._config_command(line)
+        else:
+            output = self._exec_command(line)
+        if self.closed:
+            return output
+        if output and not output.endswith("\r\n"):
+            output += "\r\n"
+        return output + self.prompt
+
+    async def _copy(self, match: re.Match) -> str:
+        # Завантажує файл по TFTP і застосовує його як команди конфігурації.
+        #
+        # Як і IOS, повторює кожен рядок файлу, на який роутер відповів
+        # повідомленням (``% Invalid input`` тощо), перед самим повідомленням.
+        self.pending_copy = None
+        url, host, name = match.groups()
+        start = time.perf_counter()
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(None, tftp_fetch, host, self.sim.tftp_port, name)
+        except FileNotFoundError:
+            return f"Accessing {url}...\r\n%Error opening {url} (No such file or directory)\r\n" + self.prompt
+        except (OSError, ValueError):
+            return f"Accessing {url}...\r\n%Error opening {url} (Timed out)\r\n" + self.prompt
+        elapsed = max(time.perf_counter() - start, 0.001)
+
+        responses = []
+        self.config_stack = []
+        for raw in data.decode("utf-8", "replace").splitlines():
+            if raw.strip() == "end":
+                break
+            output = self._config_command(raw.strip())
+            if output:
+                responses.append(f"{raw}\r\n{output}\r\n")
+        self.config_stack = None
+        self.sim.stats["copies"] += 1
+        return (
+            f"Accessing {url}...\r\nLoading {name} from {host} (via GigabitEthernet0/0): !\r\n"
+            f"[OK - {len(data)} bytes]\r\n\r\n" + "".join(responses) +
+            f"\r\n{len(data)} bytes copied in {elapsed:.3f} secs ({int(len(data) / elapsed)} bytes/sec)\r\n"
+            + self.prompt
+        )
+
+    def _error(self, message: str, line: str) -> str:
+        # Повідомлення про помилку у форматі IOS (з маркером ``^`` для Invalid input).
+        self.sim.stats["errors"] += 1
+        if message == INVALID_INPUT:
+            return " " * len(self.prompt) + "^\r\n" + message
+        return message.format(line=line)
+
+    def _exec_command(self, line: str) -> str:
+        # Команди режимів user/privileged exec.
+        if not line:
+            return ""
+        word = line.split()[0]
+        if line in ("exit", "logout", "quit"):
+            self.closed = True
+            return ""
+        if line.startswith("terminal "):
+            return ""
+        if line in ("enable", "en"):
+            self.privileged = True
+            return ""
+        if line == "disable":
+            self.privileged = False
+            return ""
+        if not self.privileged:
+            return self._error(INVALID_INPUT, line)
+        if line in ("configure terminal", "conf t", "configure"):
+            self.config_stack = []
+            return "Enter configuration commands, one per line.  End with CNTL/Z."
+        if line in ("write memory", "write", "wr", "copy running-config startup-config"):
+            self.sim.stats["writes"] += 1
+            self.sim.startup_config = self.sim.running_config()
+            return "Building configuration...\r\n[OK]"
+        if line in ("show running-config", "show run", "sh run"):
+            return self.sim.running_config().replace("\n", "\r\n")
+        if word in ("show", "sh"):
+            return ""
+        return self._error(INVALID_INPUT, line)
+
+    def _config_command(self, line: str) -> str:
+        # Команди режиму конфігурації та його підрежимів.
+        sim = self.sim
+        if not line or line.startswith("!"):
+            return ""
+        if line == "end":
+            self.config_stack = None
+            return ""
+        if line == "exit":
+            if self.config_stack:
+                self.config_stack.pop()
+            else:
+                self.config_stack = None
+            return ""
+        if line.startswith("do "):
+            return self._exec_command(line[3:].strip())
+        for pattern, message in sim.errors:
+            if pattern.search(line):
+                return self._error(message, line)
+        if line.startswith(_NOT_STORED):
+            return "% Generating keys ...[OK]"
+
+        for prefix, mode in _SUBMODES:
+            if line.startswith(prefix) or line == prefix.strip():
+                node = sim.config.child(normalize(line))
+                self.config_stack = [(node, mode)]
+                return ""
+
+        parent = self.config_stack[-1][0] if self.config_stack else sim.config
+        if line.startswith("no "):
+            sim.remove(parent, line[3:].strip())
+            return ""
+        if line.startswith("hostname "):
+            sim.hostname = line.split()[1]
+        if line.startswith("enable ") and "secret" in line.split():
+            sim.enable_secret = line.split()[-1]
+        sim.store(parent, line)
+        sim.stats["config_lines"] += 1
+        return ""
+
+
+class IOSSimulator:
+    # Симульований роутер Cisco IOS з Telnet-доступом на localhost.
+    #
+    # Args:
+    #     hostname (str): Початковий hostname (змінюється командою ``hostname``).
+    #     username (str): Ім'я для логіну; порожнє — запит лише пароля.
+    #     password (str): Пароль VTY; разом із порожнім username — без логіну.
+    #     enable_secret (str): Пароль enable; порожній — enable без пароля.
+    #     latency (float): Затримка відповіді на кожен рядок, секунди.
+    #     jitter (float): Випадкове відхилення затримки (± секунди).
+    #     line_cost (float): Послідовний час обробки однієї команди, секунди.
+    #     errors (Iterable, optional): Пари (regex, повідомлення) для команд
+    #         конфігурації, які треба відхиляти (за замовчуванням DEFAULT_ERRORS).
+    #     host (str), port (int): Адреса прослуховування; port=0 — вільний порт.
+    #     seed (int, optional): Зерно генератора jitter для відтворюваних замірів.
+    #     tftp_port (int): Порт TFTP-сервера для ``copy tftp://...`` (IOS завжди
+    #         використовує 69; у тестах — порт локального TFTPServer).
+
+    def __init__(
+        self,
+        hostname: str = "Router",
+        username: str = "",
+        password: str = "",
+        enable_secret: str = "",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        line_cost: float = 0.0,
+        errors: Optional[Iterable] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+        tftp_port: int = TFTP_PORT
+    ):
+        # Сервер не запускається до start() / входу в with.
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.enable_secret = enable_secret
+        self.latency = latency
+        self.jitter = jitter
+        self.line_cost = line_cost
+        self.errors = tuple(
+            (re.compile(p) if isinstance(p, str) else p, m)
+            for p, m in (DEFAULT_ERRORS if errors is None else errors)
+        )
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        self.tftp_port = tftp_port
+        self.config = ConfigNode()
+        self.config.child(f"hostname {hostname}")
+        self.startup_config = ""
+        self.stats = {"sessions": 0, "commands": 0, "config_lines": 0, "errors": 0, "writes": 0, "copies": 0}
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    # --- конфігурація ---
+
+    def store(self, parent: ConfigNode, line: str) -> None:
+        # Додає рядок у блок running-config; однозначний параметр замінює
+        # попереднє значення на тому ж місці (hostname лишається вгорі).
+        line = _hide_secret(normalize(line))
+        prefix = next((p for p in _SINGLE_VALUED if line.startswith(p)), None)
+        if prefix and line not in parent.children:
+            old = next((k for k in parent.children if k.startswith(prefix)), None)
+            if old is not None:
+                parent.children = {
+                    (line if k == old else k): (ConfigNode(line) if k == old else node)
+                    for k, node in parent.children.items()
+                }
+                return
+        parent.child(line)
+
+    def remove(self, parent: ConfigNode, line: str) -> None:
+        # Виконує ``no <line>``: видаляє рядок/блок або зберігає ``no``-форму.
+        key = normalize(line)
+        if key.startswith("access-list "):
+            number = key.split()[1]
+            for k in [k for k in parent.children if k.startswith(f"access-list {number} ")]:
+                del parent.children[k]
+            return
+        if key in parent.children:
+            del parent.children[key]
+        elif key != "shutdown":
+            parent.child("no " + key)
+
+    def running_config(self) -> str:
+        # Текст ``show running-config`` за поточним станом.
+        body = []
+        for node in self.config.children.values():
+            body.append(node.line)
+            body.extend(" " + line for line in node.lines())
+            if node.children:
+                body.append("!")
+        text = "\n".join(["!", "version 15.4", "!", *body, "!", "end"])
+        return f"Building configuration...\n\nCurrent configuration : {len(text)} bytes\n{text}"
+
+    # --- сервер ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Обслуговує одне Telnet-підключення.
+        self.stats["sessions"] += 1
+        session = _Session(self, reader, writer)
+        try:
+            await session.run()
+        except (ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+    async def serve(self) -> None:
+        # Запускає сервер у поточному event loop (port уточнюється після bind).
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def start(self) -> "IOSSimulator":
+        # Запускає сервер у фоновому потоці з власним event loop.
+        ready = threading.Event()
+        failure = []
+
+        def run():
+            # Тіло фонового потоку: event loop симулятора.
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.serve())
+            except Exception as e:
+                failure.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._shutdown())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=f"ios-sim-{self.hostname}", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        return self
+
+    async def _shutdown(self) -> None:
+        # Закриває сервер і скасовує активні сесії.
+        self._server.close()
+        await self._server.wait_closed()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        # Зупиняє фоновий сервер, запущений start().
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def __enter__(self):
+        # with IOSSimulator(...) as sim: — запускає сервер.
+        return self.start()
+
+    def __exit__(self, *exc):
+        # Зупиняє сервер при виході з блоку.
+        self.stop()
+
+
+def main(argv=None) -> None:
+    # CLI: запускає симулятор на вказаному порту до Ctrl+C.
+    parser = argparse.ArgumentParser(description="Local Cisco IOS telnet simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--hostname", default="Router")
+    parser.add_argument("--username", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--enable-secret", default="")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--line-cost", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    sim = IOSSimulator(
+        hostname=args.hostname, username=args.username, password=args.password,
+        enable_secret=args.enable_secret, latency=args.latency, jitter=args.jitter,
+        line_cost=args.line_cost, host=args.host, port=args.port,
+    )
+
+    async def serve_forever():
+        # Сервер у головному потоці.
+        await sim.serve()
+        print(f"IOS simulator '{sim.hostname}' listening on {sim.host}:{sim.port}")
+        await sim._server.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
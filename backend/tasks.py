@@ -0,0 +1,152 @@
+# Фонове виконання блокуючих операцій GUI (connect, deploy) поза event loop eel.
+#
+# eel обслуговує кожен виклик з JS у greenlet gevent в одному потоці ОС.
+# netmiko не кооперативний (звичайні сокети, time.sleep), тож виклик, що
+# чекає роутер десятки секунд, зупиняє весь hub: process_text і
+# preview_config з інших вкладок стоять у черзі до кінця деплою.
+#
+# TaskRunner виконує такі операції в обмеженому пулі потоків і повертає
+# concurrent.futures.Future. У режимі gevent (use_gevent()) виклик з
+# greenlet чекає результат кооперативно, а завершення доставляється в потік
+# hub через loop.run_callback_threadsafe() — лише там безпечно звертатися до
+# websocket eel (сповіщення UI через notify).
+#
+# Без gevent (тести, CLI) очікування — звичайний Future.result().
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Кількість потоків для роботи з роутерами
+DEFAULT_WORKERS = 4
+
+
+def _call(callback: Callable, *args) -> None:
+    # Диспетчер за замовчуванням: виклик у поточному потоці.
+    callback(*args)
+
+
+class TaskRunner:
+    # Обмежений пул потоків для блокуючих операцій з подіями стану для UI.
+    #
+    # Args:
+    #     max_workers (int): Максимальна кількість одночасних операцій;
+    #         решта чекає в черзі пулу.
+    #     notify (Callable, optional): Отримує подію ``{"id", "name", "state",
+    #         "elapsed"}`` (state: queued, running, done, failed) у потоці
+    #         диспетчера (hub gevent у GUI).
+    #
+    # Examples:
+    # >>> runner = TaskRunner(max_workers=2)
+    # >>> runner.run("deploy", push_config, conn, lines)
+    # {'ok': True, ...}
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, notify: Optional[Callable] = None):
+        # Потоки пулу створюються при першій операції.
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.notify = notify
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crw-task")
+        self._dispatch = _call
+        self._wait = Future.result
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = {}
+
+    def use_gevent(self) -> None:
+        # Перемикає диспетчер і очікування на hub gevent поточного потоку.
+        #
+        # Викликається з потоку, в якому працює eel (start_gui()).
+        import gevent
+        from gevent.event import AsyncResult
+
+        loop = gevent.get_hub().loop
+
+        def dispatch(callback: Callable, *args) -> None:
+            # Виконує callback у потоці hub (безпечно з будь-якого потоку).
+            loop.run_callback_threadsafe(callback, *args)
+
+        def wait(future: Future):
+            # Кооперативне очікування: інші greenlet працюють, доки триває операція.
+            #
+            # Активний async-watcher тримає loop живим (без нього hub, не
+            # маючи інших подій, вважав би очікування вічним — LoopExit).
+            done = AsyncResult()
+            watcher = loop.async_()
+            watcher.start(done.set)
+            try:
+                future.add_done_callback(lambda _: watcher.send())
+                done.get()
+            finally:
+                watcher.close()
+            return future.result()
+
+        self._dispatch = dispatch
+        self._wait = wait
+
+    def _emit(self, task_id: int, name: str, state: str, started: float) -> None:
+        # Надсилає подію стану операції через диспетчер.
+        if self.notify is None:
+            return
+        event = {"id": task_id, "name": name, "state": state, "elapsed": round(time.monotonic() - started, 3)}
+        self._dispatch(self._notify_safely, event)
+
+    def _notify_safely(self, event: dict) -> None:
+        # Помилка сповіщення UI не повинна зривати операцію.
+        try:
+            self.notify(event)
+        except Exception as e:
+            logger.warning(f"Не вдалося надіслати стан завдання {event['name']}: {e}")
+
+    def post(self, callback: Callable, *args) -> None:
+        # Виконує callback у потоці диспетчера (hub gevent у GUI).
+        #
+        # Для сповіщень UI з потоків пулу (прогрес деплою): websocket eel
+        # можна використовувати лише з потоку hub.
+        self._dispatch(callback, *args)
+
+    def submit(self, name: str, func: Callable, *args, **kwargs) -> Future:
+        # Ставить операцію в пул і одразу повертає Future.
+        task_id = next(self._ids)
+        queued = time.monotonic()
+
+        def run():
+            # Тіло операції у потоці пулу.
+            self._emit(task_id, name, "running", queued)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                self._emit(task_id, name, "failed", queued)
+                raise
+            finally:
+                with self._lock:
+                    self._active.pop(task_id, None)
+            self._emit(task_id, name, "done", queued)
+            return result
+
+        with self._lock:
+            self._active[task_id] = name
+        self._emit(task_id, name, "queued", queued)
+        return self._executor.submit(run)
+
+    def run(self, name: str, func: Callable, *args, **kwargs):
+        # Виконує операцію в пулі й повертає її результат (винятки прокидаються).
+        return self.wait(self.submit(name, func, *args, **kwargs))
+
+    def wait(self, future: Future):
+        # Чекає Future: кооперативно в режимі gevent, інакше блокуюче.
+        return self._wait(future)
+
+    def active(self) -> list[str]:
+        # Назви операцій у черзі або у виконанні.
+        with self._lock:
+            return list(self._active.values())
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Зупиняє пул (нові операції не приймаються).
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,186 @@
+# Адаптивні таймінги Telnet-сесій замість фіксованого delay_factor.
+#
+# netmiko множить свої паузи (логін, вхід у config mode, пауза між рядками)
+# на global_delay_factor, а read_timeout — лише верхня межа очікування
+# prompt. Фіксований множник 2 змушує LAN-роутер, що відповідає за
+# мілісекунди, чекати як повільний лінк. Тут для кожного роутера
+# (host, port) ведеться TimingProfile: оцінка часу відповіді prompt (RTT),
+# виміряна при підключенні і уточнена під час деплою. З неї виводяться
+# delay_factor і read_timeout сесії.
+#
+# Оцінка зростає одразу, щойно відповідь повільніша за поточну (back-off),
+# і знижується поступово (EWMA), тож поодинока швидка відповідь не робить
+# таймінги агресивними. Невідомий роутер стартує з консервативного
+# профілю, що відповідає попередньому global_delay_factor=2.
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# RTT, якому відповідає delay_factor=1 (калібрування пауз netmiko)
+REFERENCE_RTT = 0.1
+# Початкова оцінка для невідомого роутера: delay_factor=2, як раніше
+DEFAULT_RTT = 2 * REFERENCE_RTT
+MIN_DELAY_FACTOR = 0.1
+MAX_DELAY_FACTOR = 4.0
+# Вага нового виміру при зниженні оцінки
+DECAY = 0.25
+# read_timeout: запас над очікуваним часом і нижня межа (секунди)
+TIMEOUT_MARGIN = 20
+MIN_READ_TIMEOUT = 10.0
+# Кількість вимірів prompt при підключенні
+PROBES = 3
+
+
+class TimingProfile:
+    # Оцінка швидкості відповіді одного роутера.
+    #
+    # rtt — згладжений час відповіді prompt (секунди), peak — найбільший
+    # спостережений, samples — кількість вимірів.
+    __slots__ = ("rtt", "peak", "samples")
+
+    def __init__(self, rtt: float = DEFAULT_RTT, peak: float = 0.0, samples: int = 0):
+        # Профіль за замовчуванням — консервативний (невідомий роутер).
+        self.rtt = rtt
+        self.peak = peak
+        self.samples = samples
+
+    def observe(self, seconds: float) -> None:
+        # Враховує один вимір часу відповіді.
+        #
+        # Перший вимір замінює початкову оцінку; повільніший за оцінку —
+        # піднімає її одразу; швидший — знижує з вагою DECAY.
+        if seconds < 0:
+            return
+        if self.samples == 0 or seconds > self.rtt:
+            self.rtt = seconds
+        else:
+            self.rtt += DECAY * (seconds - self.rtt)
+        self.peak = max(self.peak, seconds)
+        self.samples += 1
+
+    @property
+    def delay_factor(self) -> float:
+        # Множник пауз netmiko (global_delay_factor) для цього роутера.
+        return min(MAX_DELAY_FACTOR, max(MIN_DELAY_FACTOR, self.rtt / REFERENCE_RTT))
+
+    def read_timeout(self, lines: int = 1) -> float:
+        # Верхня межа очікування відповіді на `lines` рядків (секунди).
+        #
+        # netmiko повертається, щойно бачить prompt, тож великий запас не
+        # сповільнює швидкий роутер, але рятує від обриву на повільному.
+        expected = max(self.rtt, self.peak) * max(1, lines)
+        return max(MIN_READ_TIMEOUT, TIMEOUT_MARGIN * expected)
+
+    def to_dict(self) -> dict:
+        # Серіалізація для файлу профілів.
+        return {"rtt": round(self.rtt, 6), "peak": round(self.peak, 6), "samples": self.samples}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimingProfile":
+        # Відновлює профіль зі словника to_dict().
+        return cls(float(data["rtt"]), float(data.get("peak", 0.0)), int(data.get("samples", 0)))
+
+    def __repr__(self):
+        # TimingProfile(rtt=0.004, peak=0.006, samples=12)
+        return f"TimingProfile(rtt={self.rtt:.4f}, peak={self.peak:.4f}, samples={self.samples})"
+
+
+class TimingStore:
+    # Профілі таймінгів за роутером ("host:port"), потокобезпечно.
+    #
+    # Args:
+    #     path (str, optional): JSON-файл для збереження профілів між
+    #         запусками. Без нього профілі живуть лише в пам'яті процесу.
+    def __init__(self, path: Optional[str] = None):
+        # Файл читається ледачо при першому зверненні.
+        self.path = path
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._loaded = path is None
+
+    @staticmethod
+    def _key(host: str, port: int) -> str:
+        # Ключ профілю: "10.0.0.1:23".
+        return f"{str(host).strip()}:{int(port)}"
+
+    def _load(self) -> None:
+        # Читає файл профілів (під блокуванням); пошкоджений файл ігнорується.
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for key, value in data.items():
+                self._profiles.setdefault(key, TimingProfile.from_dict(value))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Не вдалося прочитати профілі таймінгів {self.path}: {e}")
+
+    def get(self, host: str, port: int = 23) -> TimingProfile:
+        # Профіль роутера (створює консервативний, якщо роутер невідомий).
+        key = self._key(host, port)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = TimingProfile()
+            return profile
+
+    def save(self) -> None:
+        # Атомарно записує профілі у файл (якщо path задано).
+        if not self.path:
+            return
+        with self._lock:
+            data = {key: profile.to_dict() for key, profile in self._profiles.items()}
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Не вдалося зберегти профілі таймінгів {self.path}: {e}")
+
+    def use_file(self, path: str) -> None:
+        # Вмикає збереження профілів у файл; наявні профілі з файлу не
+        # перезаписують виміряні в цьому процесі.
+        with self._lock:
+            self.path = path
+            self._loaded = False
+
+    def clear(self) -> None:
+        # Забуває всі профілі в пам'яті.
+        with self._lock:
+            self._profiles.clear()
+
+
+# Профілі процесу. GUI (main.start_gui) вмикає збереження у файл через use_file().
+profiles = TimingStore()
+
+
+def measure_prompt_rtt(conn, profile: TimingProfile, probes: int = PROBES) -> TimingProfile:
+    # Вимірює час відповіді prompt на порожній рядок і оновлює профіль.
+    #
+    # Args:
+    #     conn: netmiko-з'єднання з уже визначеним base_prompt.
+    #     profile (TimingProfile): Профіль роутера.
+    #     probes (int): Кількість вимірів.
+    #
+    # Returns:
+    #     TimingProfile: Той самий профіль (для ланцюжкових викликів).
+    for _ in range(probes):
+        start = time.perf_counter()
+        conn.write_channel(conn.RETURN)
+        conn.read_until_prompt(read_timeout=profile.read_timeout())
+        profile.observe(time.perf_counter() - start)
+    return profile
+
+
+def apply(conn, profile: TimingProfile) -> None:
+    # Переносить delay_factor профілю в активну сесію netmiko.
+    conn.global_delay_factor = profile.delay_factor
@@ -0,0 +1,414 @@
+# Деплой через передачу файлу: вбудований TFTP-сервер і ``copy tftp: running-config``.
+#
+# Порядкове надсилання через Telnet платить за відлуння кожного рядка. Тут
+# згенерована конфігурація публікується як файл на вбудованому TFTP-сервері
+# (RFC 1350, лише читання, з опцією blksize з RFC 2347/2348), а роутеру
+# надсилається одна команда ``copy tftp://<адреса хоста>/<файл> running-config``:
+# передача і застосування відбуваються на боці роутера без round trip на рядок.
+#
+# Файли мають випадкові імена і знімаються з публікації одразу після
+# копіювання (конфігурація містить паролі). Запис (WRQ) сервер відхиляє.
+#
+# Стандартний порт TFTP 69 потребує прав на прослуховування привілейованого
+# порту; IOS не дозволяє вказати інший порт у URL, тож спільний сервер
+# (shared_server()) слухає саме TFTP_PORT.
+import logging
+import re
+import secrets
+import socket
+import struct
+import threading
+import time
+from typing import Optional, Sequence, Union
+
+try:
+    from .pipeline import ERROR_RE
+except ImportError:
+    from pipeline import ERROR_RE
+
+logger = logging.getLogger(__name__)
+
+TFTP_PORT = 69
+
+# Коди операцій і помилок TFTP
+_RRQ, _WRQ, _DATA, _ACK, _ERROR, _OACK = 1, 2, 3, 4, 5, 6
+_NOT_FOUND, _ACCESS_VIOLATION, _UNKNOWN_TID, _BAD_OPTION = 1, 2, 5, 8
+
+# Розмір блоку за замовчуванням і межі опції blksize (RFC 2348)
+BLOCK_SIZE = 512
+_MIN_BLOCK, _MAX_BLOCK = 8, 65464
+
+# Запит destination, яким IOS підтверджує copy ... running-config
+_DESTINATION_RE = r"\[running-config\]\?"
+# Prompt privileged exec на початку рядка (hostname може змінитися під час copy)
+_EXEC_PROMPT_RE = r"(?m)^[\w.-]+#"
+
+
+def _error_packet(code: int, message: str) -> bytes:
+    # Пакет ERROR з кодом і текстом.
+    return struct.pack("!HH", _ERROR, code) + message.encode() + b"\0"
+
+
+def _parse_request(packet: bytes) -> tuple[str, str, dict]:
+    # Розбирає RRQ/WRQ: ім'я файлу, режим і опції (RFC 2347) у нижньому регістрі.
+    fields = packet[2:].split(b"\0")
+    if len(fields) < 3:
+        raise ValueError("Malformed request")
+    filename, mode = fields[0].decode(), fields[1].decode().lower()
+    options = {}
+    for name, value in zip(fields[2:-1:2], fields[3:-1:2]):
+        options[name.decode().lower()] = value.decode()
+    return filename, mode, options
+
+
+class TFTPServer:
+    # TFTP-сервер лише для читання опублікованих у пам'яті файлів.
+    #
+    # Кожна передача йде з окремого сокета (власний transfer ID) у своєму
+    # потоці, тож кілька роутерів завантажують конфігурації одночасно.
+    #
+    # Args:
+    #     host (str): Адреса прослуховування (0.0.0.0 — усі інтерфейси).
+    #     port (int): UDP-порт; 0 — вільний порт (для тестів).
+    #     timeout (float): Очікування ACK перед повторним надсиланням блоку.
+    #     retries (int): Кількість повторів блоку до обриву передачі.
+    #
+    # Examples:
+    # >>> with TFTPServer("127.0.0.1", 0) as server:
+    # ...     name = server.publish("hostname R1\nend\n")
+    # ...     tftp_fetch("127.0.0.1", server.port, name)
+    # b'hostname R1\nend\n'
+
+    def __init__(self, host: str = "0.0.0.0", port: int = TFTP_PORT, timeout: float = 1.0, retries: int = 5):
+        # Сервер не слухає порт до start() / входу в with.
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self._files = {}
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._stats = {"requests": 0, "served": 0, "failed": 0, "bytes": 0}
+
+    # --- файли ---
+
+    def publish(self, content: Union[str, bytes], name: Optional[str] = None) -> str:
+        # Робить вміст доступним для завантаження; повертає ім'я файлу.
+        #
+        # Без `name` генерується випадкове ім'я, яке неможливо вгадати.
+        if isinstance(content, str):
+            content = content.encode()
+        name = name or f"crw-{secrets.token_hex(8)}.cfg"
+        with self._lock:
+            self._files[name] = content
+        return name
+
+    def withdraw(self, name: str) -> None:
+        # Знімає файл з публікації (активна передача завершується).
+        with self._lock:
+            self._files.pop(name, None)
+
+    def stats(self) -> dict:
+        # Лічильники: запити, успішні й невдалі передачі, передані байти.
+        with self._lock:
+            return dict(self._stats, published=len(self._files))
+
+    def _count(self, **deltas) -> None:
+        # Потокобезпечне оновлення лічильників.
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    # --- сервер ---
+
+    def start(self) -> "TFTPServer":
+        # Відкриває UDP-порт і запускає потік прийому запитів.
+        if self._thread is not None:
+            return self
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((self.host, self.port))
+        sock.settimeout(0.2)
+        self._sock = sock
+        self.port = sock.getsockname()[1]
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name=f"tftp-{self.port}", daemon=True)
+        self._thread.start()
+        logger.info(f"TFTP-сервер слухає {self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        # Зупиняє прийом нових запитів і закриває порт.
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout=5)
+        self._sock.close()
+        self._thread = self._sock = None
+
+    @property
+    def running(self) -> bool:
+        # Чи приймає сервер запити.
+        return self._thread is not None
+
+    def __enter__(self):
+        # with TFTPServer(...) as server: — запускає сервер.
+        return self.start()
+
+    def __exit__(self, *exc):
+        # Зупиняє сервер при виході з блоку.
+        self.stop()
+
+    def _listen(self) -> None:
+        # Приймає запити на основному порту; кожну передачу веде окремий потік.
+        while not self._stopped.is_set():
+            try:
+                packet, client = self._sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._count(requests=1)
+            threading.Thread(target=self._transfer, args=(packet, client), daemon=True).start()
+
+    def _transfer(self, packet: bytes, client: tuple) -> None:
+        # Обслуговує один запит з нового сокета (transfer ID сервера).
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((self.host, 0))
+        sock.settimeout(self.timeout)
+        try:
+            opcode = struct.unpack("!H", packet[:2])[0] if len(packet) >= 2 else 0
+            if opcode == _WRQ:
+                sock.sendto(_error_packet(_ACCESS_VIOLATION, "Read-only server"), client)
+                self._count(failed=1)
+                return
+            if opcode != _RRQ:
+                return
+            filename, mode, options = _parse_request(packet)
+            with self._lock:
+                data = self._files.get(filename.lstrip("/"))
+            if data is None:
+                sock.sendto(_error_packet(_NOT_FOUND, "File not found"), client)
+                logger.warning(f"TFTP: {client[0]} запитав невідомий файл {filename!r}")
+                self._count(failed=1)
+                return
+            if mode == "netascii":
+                data = data.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+
+            block_size = BLOCK_SIZE
+            if "blksize" in options:
+                try:
+                    block_size = min(_MAX_BLOCK, max(_MIN_BLOCK, int(options["blksize"])))
+                except ValueError:
+                    sock.sendto(_error_packet(_BAD_OPTION, "Bad blksize"), client)
+                    self._count(failed=1)
+                    return
+                oack = struct.pack("!H", _OACK) + b"blksize\0" + str(block_size).encode() + b"\0"
+                self._exchange(sock, client, oack, 0)
+
+            # Останній блок коротший за block_size (порожній, якщо розмір кратний)
+            for number, offset in enumerate(range(0, len(data) + 1, block_size), 1):
+                chunk = data[offset:offset + block_size]
+                self._exchange(sock, client, struct.pack("!HH", _DATA, number & 0xFFFF) + chunk, number & 0xFFFF)
+            self._count(served=1, bytes=len(data))
+            logger.info(f"TFTP: {filename} ({len(data)} байт) передано на {client[0]}")
+        except (TimeoutError, ValueError, ConnectionError, OSError) as e:
+            logger.warning(f"TFTP: передача на {client[0]} перервана: {e}")
+            self._count(failed=1)
+        finally:
+            sock.close()
+
+    def _exchange(self, sock: socket.socket, client: tuple, packet: bytes, block: int) -> None:
+        # Надсилає пакет і чекає ACK блоку `block`, повторюючи після timeout.
+        #
+        # Дубльовані ACK попередніх блоків ігноруються (без повторного
+        # надсилання — інакше виникає "Sorcerer's Apprentice" з RFC 1350).
+        for _ in range(self.retries + 1):
+            sock.sendto(packet, client)
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    reply, address = sock.recvfrom(65536)
+                except socket.timeout:
+                    break
+                if address != client:
+                    sock.sendto(_error_packet(_UNKNOWN_TID, "Unknown transfer ID"), address)
+                    continue
+                opcode, number = struct.unpack("!HH", reply[:4]) if len(reply) >= 4 else (0, 0)
+                if opcode == _ERROR:
+                    raise ConnectionError(reply[4:].rstrip(b"\0").decode(errors="replace"))
+                if opcode == _ACK and number == block:
+                    return
+        raise TimeoutError(f"no ACK for block {block}")
+
+
+def tftp_fetch(
+    host: str,
+    port: int,
+    filename: str,
+    mode: str = "octet",
+    block_size: Optional[int] = None,
+    timeout: float = 2.0,
+    retries: int = 5
+) -> bytes:
+    # Завантажує файл з TFTP-сервера (клієнт RRQ; симулятор IOS і тести).
+    #
+    # Args:
+    #     host (str), port (int): Адреса сервера.
+    #     filename (str): Ім'я файлу.
+    #     mode (str): "octet" або "netascii".
+    #     block_size (int, optional): Запросити опцію blksize.
+    #     timeout (float): Очікування кожного блоку.
+    #     retries (int): Кількість повторів ACK до обриву.
+    #
+    # Returns:
+    #     bytes: Вміст файлу.
+    #
+    # Raises:
+    #     FileNotFoundError: Сервер не має такого файлу.
+    #     ConnectionError: Сервер повернув іншу помилку TFTP.
+    #     TimeoutError: Сервер перестав відповідати.
+    request = struct.pack("!H", _RRQ) + filename.encode() + b"\0" + mode.encode() + b"\0"
+    if block_size:
+        request += b"blksize\0" + str(block_size).encode() + b"\0"
+    size = BLOCK_SIZE
+    expected = 1
+    data = bytearray()
+    server = None
+    last = request
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(request, (host, port))
+        attempts = 0
+        while True:
+            try:
+                packet, address = sock.recvfrom(65536)
+            except socket.timeout:
+                attempts += 1
+                if attempts > retries:
+                    raise TimeoutError(f"TFTP server {host}:{port} stopped answering")
+                sock.sendto(last, server or (host, port))
+                continue
+            if server is None:
+                server = address
+            elif address != server:
+                continue
+            attempts = 0
+            opcode = struct.unpack("!H", packet[:2])[0]
+            if opcode == _ERROR:
+                code = struct.unpack("!H", packet[2:4])[0]
+                message = packet[4:].rstrip(b"\0").decode(errors="replace")
+                raise (FileNotFoundError if code == _NOT_FOUND else ConnectionError)(message)
+            if opcode == _OACK:
+                fields = packet[2:].split(b"\0")
+                options = {k.decode().lower(): v.decode() for k, v in zip(fields[::2], fields[1::2])}
+                size = int(options.get("blksize", size))
+                last = struct.pack("!HH", _ACK, 0)
+            elif opcode == _DATA:
+                number = struct.unpack("!H", packet[2:4])[0]
+                if number == expected & 0xFFFF:
+                    data += packet[4:]
+                    last = struct.pack("!HH", _ACK, number)
+                    expected += 1
+                    if len(packet) - 4 < size:
+                        sock.sendto(last, server)
+                        break
+            sock.sendto(last, server)
+    if mode == "netascii":
+        data = data.replace(b"\r\n", b"\n")
+    return bytes(data)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_server() -> TFTPServer:
+    # Спільний для процесу сервер на TFTP_PORT (запускається при першому виклику).
+    #
+    # Raises:
+    #     OSError: Порт зайнятий або немає прав на привілейований порт.
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TFTPServer("0.0.0.0", TFTP_PORT).start()
+        return _shared
+
+
+def local_address(conn) -> str:
+    # Адреса цього хоста, через яку роутер бачить сесію (адреса TFTP-сервера в URL).
+    #
+    # Береться з локального кінця Telnet-сокета netmiko; якщо його немає —
+    # з маршруту до роутера (UDP connect не надсилає пакетів).
+    sock = getattr(getattr(conn, "remote_conn", None), "sock", None)
+    try:
+        address = sock.getsockname()[0]
+        if address not in ("0.0.0.0", ""):
+            return address
+    except (AttributeError, OSError):
+        pass
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.connect((conn.host, 9))
+        return probe.getsockname()[0]
+
+
+def copy_errors(output: str, commands: Sequence[str]) -> list[dict]:
+    # Помилки IOS у виводі ``copy ... running-config``.
+    #
+    # Роутер повторює відхилений рядок файлу перед маркером ``^`` і
+    # повідомленням, тож для кожного повідомлення береться найближчий
+    # попередній рядок виводу; команди зіставляються послідовно, як у
+    # pipeline.map_errors().
+    #
+    # Returns:
+    #     list[dict]: ``{"index", "command", "message"}`` (index — 1-based або None).
+    lines = output.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    stripped = [command.strip() for command in commands]
+    errors = []
+    cursor = 0
+    for number, line in enumerate(lines):
+        if not ERROR_RE.match(line):
+            continue
+        echo = next(
+            (lines[i].strip() for i in range(number - 1, -1, -1) if lines[i].strip() and lines[i].strip() != "^"),
+            ""
+        )
+        index = None
+        if echo in stripped[cursor:]:
+            cursor = stripped.index(echo, cursor) + 1
+            index = cursor
+        errors.append({"index": index, "command": echo, "message": line.strip()})
+    return errors
+
+
+def copy_config(conn, commands: Sequence[str], server: TFTPServer, read_timeout: float = 60.0) -> str:
+    # Публікує команди як файл і застосовує їх одним ``copy tftp: running-config``.
+    #
+    # Args:
+    #     conn: netmiko-з'єднання у privileged exec.
+    #     commands (Sequence[str]): Команди конфігурації без enable/conf t/end.
+    #     server (TFTPServer): Запущений сервер, доступний роутеру.
+    #     read_timeout (float): Верхня межа очікування завершення копіювання.
+    #
+    # Returns:
+    #     str: Вивід роутера (для copy_errors()).
+    #
+    # Raises:
+    #     RuntimeError: Роутер не зміг завантажити файл (%Error opening ...).
+    name = server.publish("\n".join(commands) + "\nend\n")
+    try:
+        url = f"tftp://{local_address(conn)}/{name}"
+        logger.info(f"Копіювання {url} у running-config")
+        output = conn.send_command(f"copy {url} running-config", expect_string=_DESTINATION_RE, read_timeout=read_timeout)
+        output += "\n" + conn.send_command("", expect_string=_EXEC_PROMPT_RE, read_timeout=read_timeout)
+    finally:
+        server.withdraw(name)
+    failure = re.search(r"^%Error.*$", output, re.M)
+    if failure:
+        raise RuntimeError(failure.group(0).strip())
+    return output
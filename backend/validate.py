@@ -1,5 +1,20 @@
 import ipaddress
+import logging
 import re
+from typing import Iterable
+
+try:
+    from . import addrmath
+    from .overlap import address_conflicts
+    from .nexthop import unresolved_next_hops
+except ImportError:
+    import addrmath
+    from overlap import address_conflicts
+    from nexthop import unresolved_next_hops
+
+logger = logging.getLogger(__name__)
+
+_FULL_MASK = 0xFFFFFFFF
 
 # Hot spot 2 fix: pre-compile regex patterns once at module load time.
 # Previously re.match(r'...') was called with a literal string inside each
@@ -10,6 +25,8 @@ _RE_HOSTNAME_START = re.compile(r'^[a-zA-Z]')
 _RE_HOSTNAME_FULL  = re.compile(r'^[a-zA-Z0-9\-_\.]+$')
 _RE_DIGIT          = re.compile(r'\d')
 _RE_ALPHA          = re.compile(r'[a-zA-Z]')
+# \w у str-шаблоні — це саме c.isalnum() або "_"
+_RE_GENERAL        = re.compile(r'[\w./-]*')
 
 # Загальна валідація рядкових полів (дозволяє літери, цифри та основні роздільники)
 def validate_general(value: str) -> str:
@@ -38,7 +55,7 @@ def validate_general(value: str) -> str:
         return f"❌ Error: '{value}' містить пробіли."
 
     # Дозволені символи для мережевих налаштувань та імен
-    if not all(c.isalnum() or c in "./-_" for c in value):
+    if not _RE_GENERAL.fullmatch(value):
         return f"❌ Error: '{value}' містить недопустимі символи (дозволено: a-z, 0-9, ., /, -, _)."
 
     return ""
@@ -99,34 +116,37 @@ def validate_ip(ip: str) -> str:
     # "❌ Error: IP '127.0.0.1' є зарезервованим (multicast, loopback тощо)."
     # >>> validate_ip("255.255.255.255")  # broadcast дозволений
     # ''
-    try:
-        if not isinstance(ip, str):
-            raise TypeError(f"IP must be str, got {type(ip)}")
-
-        addr = ipaddress.ip_address(ip)
+    # Адреса розбирається в ціле (addrmath.parse_address, з кешем) без
+    # створення об'єктів ipaddress; IPv6 перевіряється через ipaddress.
+    if not isinstance(ip, str):
+        return f"❌ Error: Неправильний формат IP-адреси '{ip}'."
+    address = addrmath.parse_address(ip)
+    if address is None:
+        return _ipv6_error(ip) if ":" in ip else f"❌ Error: Неправильний формат IP-адреси '{ip}'."
 
-        # Змінено логіку: дозволяємо broadcast, але блокуємо інші зарезервовані
-        if addr.is_multicast or addr.is_loopback or addr.is_reserved:
-            # Дозволяємо broadcast-адресу
-            if str(addr) == "255.255.255.255":
-                return ""
-            return f"❌ Error: IP '{ip}' є зарезервованим (multicast, loopback тощо)."
+    # Дозволяємо broadcast, але блокуємо loopback (127/8), multicast (224/4) і reserved (240/4)
+    first = address >> 24
+    if first == 127 or (first >= 224 and address != _FULL_MASK):
+        return f"❌ Error: IP '{ip}' є зарезервованим (multicast, loopback тощо)."
+    return ""
 
-        return ""
-    except (ValueError, TypeError) as e:
-        print(f"Validate IP error: {e}")
+def _ipv6_error(ip: str) -> str:
+    # validate_ip() для рядків з ":" — правила ipaddress для IPv6.
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
         return f"❌ Error: Неправильний формат IP-адреси '{ip}'."
+    if addr.is_multicast or addr.is_loopback or addr.is_reserved:
+        return f"❌ Error: IP '{ip}' є зарезервованим (multicast, loopback тощо)."
+    return ""
 
 # Валідація маски підмережі
 def validate_mask(mask: str) -> str:
-    try:
-        if not isinstance(mask, str):
-            raise TypeError(f"Mask must be str, got {type(mask)}")
-        ipaddress.ip_network(f"0.0.0.0/{mask}")
-        return ""
-    except (ValueError, TypeError) as e:
-        print(f"Validate mask error: {e}")
+    # Перевіряє маску так само, як ``ipaddress.ip_network(f"0.0.0.0/{mask}")``:
+    # префікс 0-32, неперервна маска або hostmask (addrmath.parse_netmask).
+    if not isinstance(mask, str) or addrmath.parse_netmask(mask) is None:
         return f"❌ Error: Неправильний формат маски '{mask}'."
+    return ""
 
 # Валідація Router ID залежно від протоколу маршрутизації
 def validate_router_id(router_id: str, routing_protocol: str) -> str:
@@ -170,8 +190,7 @@ def validate_router_id(router_id: str, routing_protocol: str) -> str:
             if router_id == "0.0.0.0" or router_id == "255.255.255.255":
                 return f"❌ Error: Router ID не може бути {router_id}."
         return ""
-    except (ValueError, TypeError) as e:
-        print(f"Validate router_id error: {e}")
+    except (ValueError, TypeError):
         return f"❌ Error: Некоректний Router ID: {router_id}"
 
 # Валідація паролів
@@ -192,16 +211,32 @@ def validate_dhcp(dhcp_network: str, dhcp_mask: str, dhcp_gateway: str, dhcp_dns
         error = validate_ip(dhcp_network) or validate_mask(dhcp_mask)
         if error:
             return error
-        try:
-            network = ipaddress.ip_network(f"{dhcp_network}/{dhcp_mask}")
-            if dhcp_gateway and ipaddress.ip_address(dhcp_gateway) not in network:
-                return "❌ Error: Gateway не в межах DHCP мережі."
-        except ValueError:
-            return "❌ Error: Некоректна DHCP мережа/маска."
+        if dhcp_gateway:
+            try:
+                if not _dhcp_contains(dhcp_network, dhcp_mask, dhcp_gateway):
+                    return "❌ Error: Gateway не в межах DHCP мережі."
+            except ValueError:
+                return "❌ Error: Некоректна DHCP мережа/маска."
     if dhcp_dns:
         return validate_ip(dhcp_dns)
     return ""
 
+def _dhcp_contains(network: str, mask: str, address: str) -> bool:
+    # Чи належить address мережі network/mask.
+    #
+    # network і mask вже розібрані validate_ip()/validate_mask(), тож тут —
+    # попадання в кеш addrmath. ValueError (як в ipaddress), якщо мережа
+    # має біти хоста або address некоректна.
+    start = addrmath.parse_address(network)
+    bits = addrmath.parse_netmask(mask)
+    host = addrmath.parse_address(address) if isinstance(address, str) else None
+    if start is None or bits is None or host is None:
+        # IPv6, некоректний gateway тощо — правила і винятки ipaddress
+        return ipaddress.ip_address(address) in ipaddress.ip_network(f"{network}/{mask}")
+    if start & ~bits & _FULL_MASK:
+        raise ValueError(f"{network}/{mask} has host bits set")
+    return host & bits == start
+
 # Головна функція валідації всіх вхідних даних
 def validate_inputs(
         networks: list,
@@ -279,6 +314,16 @@ def validate_inputs(
             if not ip or not mask:
                 return "❌ Error: Будь ласка, заповніть усі поля IP та маски."
 
+            # Розібрані адреса й маска складаються лише з цифр і крапок, тож
+            # validate_general() для них зайвий; лишається перевірка діапазонів.
+            if isinstance(ip, str) and isinstance(mask, str):
+                address = addrmath.parse_address(ip)
+                if address is not None and addrmath.parse_netmask(mask) is not None:
+                    first = address >> 24
+                    if first == 127 or (first >= 224 and address != _FULL_MASK):
+                        return validate_ip(ip)
+                    continue
+
             error = validate_general(ip) or validate_general(mask)
             if error: return error
 
@@ -303,6 +348,389 @@ def validate_inputs(
             return error
 
         return ""
-    except Exception as e:
-        print(f"Unexpected error in validate_inputs: {e}")
-        return "❌ Error: Внутрішня помилка валідації."
\ No newline at end of file
+    except Exception:
+        logger.exception("Unexpected error in validate_inputs")
+        return "❌ Error: Внутрішня помилка валідації."
+
+
+# ---------------------------------------------------------------------------
+# Повна валідація запиту: усі помилки за один прохід
+# ---------------------------------------------------------------------------
+#
+# validate_inputs() зупиняється на першій помилці, тож UI робить окремий
+# запит на кожну. validate_config() проганяє таблицю правил по всьому
+# запиту (config_data у форматі web/state.js) і повертає всі помилки зі
+# шляхом до поля, включно з вмістом routingConfig, NAT і SNMP.
+#
+# Таблиця правил компілюється один раз при імпорті: для кожного протоколу —
+# готовий кортеж (ключ, шлях, перевірка) зі спільних правил і правил
+# routingConfig цього протоколу. Перевірка отримує значення поля і весь
+# запит та дописує помилки в список у вигляді ``{"path", "message"}``.
+
+_INTERNAL_ERROR = "❌ Error: Внутрішня помилка валідації."
+_NAT_TYPES = ("None", "PAT", "Static")
+
+
+def _text(value) -> str:
+    # Значення поля як рядок без пробілів по краях (None -> "").
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value).strip()
+
+
+def _int_in_range(value: str, low: int, high: int) -> bool:
+    # Десяткове ціле в межах [low, high].
+    return value.isdecimal() and low <= int(value) <= high
+
+
+def _check_address(errors: list, path: str, value: str, required: bool = True) -> None:
+    # Адреса хоста (інтерфейс, next-hop, сервер): правила validate_ip().
+    if not value:
+        if required:
+            errors.append({"path": path, "message": "❌ Error: Поле не може бути порожнім."})
+        return
+    error = validate_ip(value)
+    if error:
+        errors.append({"path": path, "message": error})
+
+
+def _check_network_address(errors: list, path: str, value: str) -> None:
+    # Адреса мережі (network/dest): лише формат IPv4, 0.0.0.0 дозволено.
+    if not value:
+        errors.append({"path": path, "message": "❌ Error: Вкажіть адресу мережі."})
+    elif addrmath.parse_address(value) is None:
+        errors.append({"path": path, "message": f"❌ Error: Неправильний формат IP-адреси '{value}'."})
+
+
+def _check_prefix_mask(errors: list, path: str, value: str, network: str = "") -> None:
+    # Маска мережі: dotted-decimal або CIDR (``24``, ``/24``), біти неперервні.
+    #
+    # Якщо задано network, адреса не повинна мати біти хоста (IOS відхиляє
+    # ``ip route 10.0.0.1 255.255.255.0`` як Inconsistent address and mask).
+    bits = addrmath.mask_to_int(value)
+    if bits is None or not addrmath.is_contiguous(bits):
+        errors.append({"path": path, "message": f"❌ Error: Неправильний формат маски '{value}'."})
+        return
+    address = addrmath.parse_address(network) if network else None
+    if address is not None and address & ~bits & _FULL_MASK:
+        errors.append({"path": path, "message": f"❌ Error: Адреса '{network}' має біти хоста для маски '{value}'."})
+
+
+def _check_wildcard(errors: list, path: str, value: str) -> None:
+    # Wildcard-маска OSPF/EIGRP: dotted-decimal.
+    if addrmath.parse_address(value) is None:
+        errors.append({"path": path, "message": f"❌ Error: Неправильний формат wildcard-маски '{value}'."})
+
+
+def _check_hostname(errors: list, path: str, value, data: dict) -> None:
+    # Порожній hostname замінюється на R1 (build_generation_kwargs).
+    hostname = _text(value)
+    error = validate_hostname(hostname) if hostname else ""
+    if error:
+        errors.append({"path": path, "message": error})
+
+
+def _check_networks(errors: list, path: str, value, data: dict) -> None:
+    # Мережі інтерфейсів: ті ж правила й повідомлення, що у validate_inputs().
+    if not value:
+        errors.append({"path": path, "message": "❌ Error: Будь ласка, вкажіть хоча б одну мережу (IP та маску)."})
+        return
+    if not isinstance(value, (list, tuple)):
+        errors.append({"path": path, "message": "❌ Error: Некоректний формат параметра `networks`."})
+        return
+    for index, item in enumerate(value):
+        if not isinstance(item, (tuple, list)) or len(item) != 2:
+            continue
+        for field, part, check in (("ip", item[0], validate_ip), ("mask", item[1], validate_mask)):
+            part = part.strip() if isinstance(part, str) else part
+            if not part:
+                error = "❌ Error: Будь ласка, заповніть усі поля IP та маски."
+            else:
+                error = validate_general(part) or check(part)
+            if error:
+                errors.append({"path": f"{path}[{index}].{field}", "message": error})
+
+
+def _check_router_id(errors: list, path: str, value, data: dict) -> None:
+    # Router ID: обов'язковий для OSPF (validate_router_id()).
+    error = validate_router_id(_text(value), _text(data.get("routingProtocol")))
+    if error:
+        errors.append({"path": path, "message": error})
+
+
+def _password_rule(name: str):
+    # Правило для поля пароля з назвою для повідомлення.
+    def check(errors: list, path: str, value, data: dict) -> None:
+        password = _text(value)
+        error = validate_password(password, name) if password else ""
+        if error:
+            errors.append({"path": path, "message": error})
+    return check
+
+
+def _check_dhcp(errors: list, path: str, value, data: dict) -> None:
+    # DHCP-пул: кожне поле окремо, gateway — у межах мережі (validate_dhcp()).
+    network = _text(value)
+    mask = _text(data.get("dhcpMask"))
+    gateway = _text(data.get("dhcpGateway"))
+    dns = _text(data.get("dhcpDns"))
+    if network and mask:
+        network_error = validate_ip(network)
+        mask_error = validate_mask(mask)
+        if network_error:
+            errors.append({"path": path, "message": network_error})
+        if mask_error:
+            errors.append({"path": "dhcpMask", "message": mask_error})
+        if gateway and not network_error and not mask_error:
+            try:
+                if not _dhcp_contains(network, mask, gateway):
+                    errors.append({"path": "dhcpGateway", "message": "❌ Error: Gateway не в межах DHCP мережі."})
+            except ValueError:
+                errors.append({"path": "dhcpGateway", "message": "❌ Error: Некоректна DHCP мережа/маска."})
+    if dns:
+        _check_address(errors, "dhcpDns", dns)
+
+
+def _check_nat(errors: list, path: str, value, data: dict) -> None:
+    # NAT: тип, інтерфейси з переліку interfaces, адреси static NAT.
+    nat_type = _text(value) or "None"
+    if nat_type not in _NAT_TYPES:
+        errors.append({"path": path, "message": f"❌ Error: Невідомий тип NAT '{nat_type}'."})
+        return
+    if nat_type == "None":
+        return
+    interfaces = {_text(name) for name in data.get("interfaces") or ()}
+    # PAT обрано у формі за замовчуванням (web/index.html); поки інтерфейси
+    # NAT порожні, nat.j2 просто пропускає блок PAT — це не помилка
+    pat_started = nat_type == "PAT" and any(_text(data.get(key)) for key in ("natInside", "natOutside"))
+    for key in ("natInside", "natOutside"):
+        name = _text(data.get(key))
+        if not name:
+            if key == "natOutside" and pat_started:
+                errors.append({"path": key, "message": "❌ Error: Для PAT потрібно вказати зовнішній інтерфейс."})
+        elif interfaces and name not in interfaces:
+            errors.append({"path": key, "message": f"❌ Error: Інтерфейс '{name}' не налаштований на роутері."})
+    if nat_type == "PAT":
+        if not pat_started:
+            return
+        if not _text(data.get("dhcpNetwork")) or not _text(data.get("dhcpMask")):
+            errors.append({"path": path, "message": "❌ Error: PAT транслює DHCP мережу — вкажіть мережу та маску DHCP."})
+    else:
+        _check_address(errors, "natInsideLocal", _text(data.get("natInsideLocal")))
+        _check_address(errors, "natInsideGlobal", _text(data.get("natInsideGlobal")))
+
+
+def _check_snmp(errors: list, path: str, value, data: dict) -> None:
+    # SNMP: хоча б одна community без пробілів, адреса trap-сервера.
+    if not value:
+        return
+    ro = _text(data.get("snmpCommunityRo"))
+    rw = _text(data.get("snmpCommunityRw"))
+    if not ro and not rw:
+        errors.append({"path": "snmpCommunityRo", "message": "❌ Error: Вкажіть хоча б одну SNMP community."})
+    for key, community in (("snmpCommunityRo", ro), ("snmpCommunityRw", rw)):
+        if community and (len(community) > 32 or " " in community or "?" in community):
+            errors.append({"path": key, "message": f"❌ Error: SNMP community '{community}' повинна бути до 32 символів без пробілів і '?'."})
+    if ro and ro == rw:
+        errors.append({"path": "snmpCommunityRw", "message": "❌ Error: RO та RW community не повинні збігатися."})
+    _check_address(errors, "snmpTrapHost", _text(data.get("snmpTrapHost")), required=False)
+
+
+def _range_rule(low: int, high: int, name: str):
+    # Правило для числового поля routingConfig (process ID, номер AS).
+    def check(errors: list, path: str, value, data: dict) -> None:
+        number = _text(value)
+        if number and not _int_in_range(number, low, high):
+            errors.append({"path": path, "message": f"❌ Error: {name} повинен бути числом {low}-{high}, отримано '{number}'."})
+    return check
+
+
+def _list_rule(check_item, records: bool = True):
+    # Правило для списку routingConfig: перевірка кожного елемента з індексом у шляху.
+    #
+    # records — елементи є словниками (рядки таблиць UI), а не рядками.
+    def check(errors: list, path: str, value, data: dict) -> None:
+        if not value:
+            return
+        if not isinstance(value, (list, tuple)):
+            errors.append({"path": path, "message": "❌ Error: Очікується список."})
+            return
+        for index, item in enumerate(value):
+            item_path = f"{path}[{index}]"
+            if records and not isinstance(item, dict):
+                errors.append({"path": item_path, "message": "❌ Error: Некоректний формат запису."})
+            else:
+                check_item(errors, item_path, item)
+    return check
+
+
+def _check_static_route(errors: list, path: str, route: dict) -> None:
+    # ip route: мережа, маска без бітів хоста, next-hop або інтерфейс, AD 1-255.
+    dest = _text(route.get("dest"))
+    mask = _text(route.get("mask"))
+    next_hop = _text(route.get("nextHop"))
+    _check_network_address(errors, f"{path}.dest", dest)
+    if mask:
+        _check_prefix_mask(errors, f"{path}.mask", mask, dest)
+    if next_hop:
+        _check_address(errors, f"{path}.nextHop", next_hop)
+    elif not _text(route.get("interface")):
+        errors.append({"path": f"{path}.nextHop", "message": "❌ Error: Вкажіть next-hop або вихідний інтерфейс маршруту."})
+    distance = _text(route.get("ad"))
+    if distance and not _int_in_range(distance, 1, 255):
+        errors.append({"path": f"{path}.ad", "message": f"❌ Error: Адміністративна відстань повинна бути 1-255, отримано '{distance}'."})
+
+
+def _check_rip_network(errors: list, path: str, network) -> None:
+    # RIP network: класова адреса мережі.
+    _check_network_address(errors, path, _text(network))
+
+
+def _check_ospf_network(errors: list, path: str, item: dict) -> None:
+    # OSPF network: адреса, wildcard, area (число або dotted-decimal).
+    _check_network_address(errors, f"{path}.network", _text(item.get("network")))
+    _check_wildcard(errors, f"{path}.wildcard", _text(item.get("wildcard", "0.0.0.255")))
+    area = _text(item.get("area", "0"))
+    if not _int_in_range(area, 0, _FULL_MASK) and addrmath.parse_address(area) is None:
+        errors.append({"path": f"{path}.area", "message": f"❌ Error: Некоректний OSPF area '{area}'."})
+
+
+def _check_eigrp_network(errors: list, path: str, item: dict) -> None:
+    # EIGRP network: адреса і необов'язкова wildcard.
+    _check_network_address(errors, f"{path}.network", _text(item.get("network")))
+    wildcard = _text(item.get("wildcard"))
+    if wildcard:
+        _check_wildcard(errors, f"{path}.wildcard", wildcard)
+
+
+def _check_bgp_neighbor(errors: list, path: str, item: dict) -> None:
+    # BGP neighbor: адреса сусіда і remote-as.
+    _check_address(errors, f"{path}.ip", _text(item.get("ip")))
+    remote_as = _text(item.get("remoteAs"))
+    if not _int_in_range(remote_as, 1, _FULL_MASK):
+        errors.append({"path": f"{path}.remoteAs", "message": f"❌ Error: remote-as повинен бути числом 1-{_FULL_MASK}, отримано '{remote_as}'."})
+
+
+def _check_bgp_network(errors: list, path: str, item: dict) -> None:
+    # BGP network ... mask: адреса мережі і необов'язкова маска.
+    network = _text(item.get("network"))
+    _check_network_address(errors, f"{path}.network", network)
+    mask = _text(item.get("mask"))
+    if mask:
+        _check_prefix_mask(errors, f"{path}.mask", mask, network)
+
+
+# Спільні правила для будь-якого протоколу: (ключ config_data, перевірка).
+# Шлях помилки за замовчуванням — ключ; групові правила (DHCP, NAT, SNMP)
+# задають шлях конкретного поля самі.
+_COMMON_RULES = (
+    ("hostname", _check_hostname),
+    ("networks", _check_networks),
+    ("routerId", _check_router_id),
+    ("enableSecret", _password_rule("Enable secret")),
+    ("consolePassword", _password_rule("Console password")),
+    ("adminPassword", _password_rule("Admin password")),
+    ("dhcpNetwork", _check_dhcp),
+    ("natType", _check_nat),
+    ("snmpEnabled", _check_snmp),
+)
+
+def _check_conflicts(errors: list, path: str, value, data: dict) -> None:
+    # Перетини й дублікати адрес між полями запиту (backend/overlap.py).
+    errors.extend(address_conflicts(data))
+
+
+def _check_next_hops(errors: list, path: str, value, data: dict) -> None:
+    # Next-hop статичних маршрутів резолвиться в таблиці роутера (backend/nexthop.py).
+    errors.extend(unresolved_next_hops(data))
+
+
+# Правила routingConfig за протоколом: (ключ routingConfig, перевірка).
+_ROUTING_RULES = {
+    "STATIC": (
+        ("staticRoutes", _list_rule(_check_static_route)),
+        ("staticRoutes", _check_next_hops),
+    ),
+    "RIP": (
+        ("ripNetworks", _list_rule(_check_rip_network, records=False)),
+    ),
+    "OSPF": (
+        ("processId", _range_rule(1, 65535, "OSPF process ID")),
+        ("ospfNetworks", _list_rule(_check_ospf_network)),
+    ),
+    "EIGRP": (
+        ("asNumber", _range_rule(1, 65535, "EIGRP AS")),
+        ("eigrpNetworks", _list_rule(_check_eigrp_network)),
+    ),
+    "BGP": (
+        ("localAs", _range_rule(1, _FULL_MASK, "BGP local AS")),
+        ("bgpNeighbors", _list_rule(_check_bgp_neighbor)),
+        ("bgpAdvertisedNetworks", _list_rule(_check_bgp_network)),
+    ),
+}
+
+
+# Правила між полями — після перевірки кожного поля окремо.
+_CROSS_RULES = (
+    ("networks", _check_conflicts),
+)
+
+
+def _compile_rules() -> dict:
+    # Протокол -> кортеж (ключ, шлях, перевірка, чи з routingConfig).
+    common = tuple((key, key, check, False) for key, check in _COMMON_RULES)
+    cross = tuple((key, key, check, False) for key, check in _CROSS_RULES)
+    plans = {"": common + cross}
+    for protocol, rules in _ROUTING_RULES.items():
+        plans[protocol] = common + tuple((key, f"routingConfig.{key}", check, True) for key, check in rules) + cross
+    return plans
+
+
+_PLANS = _compile_rules()
+
+
+def validate_config(config_data: dict) -> list[dict]:
+    # Перевіряє весь запит і повертає всі знайдені помилки.
+    #
+    # Args:
+    #     config_data (dict): Дані форми у форматі web/state.js (як у
+    #         process_text); ``networks`` — список пар ``(ip, mask)``.
+    #
+    # Returns:
+    #     list[dict]: Помилки ``{"path": "networks[1].mask", "message": "❌ Error: ..."}``
+    #     у порядку полів форми; порожній список, якщо запит коректний.
+    #
+    # Examples:
+    # >>> validate_config({"hostname": "1R", "networks": [("10.0.0.1", "255.0.255.0")]})
+    # [{'path': 'hostname', 'message': '❌ Error: Hostname повинен починатися з літери.'},
+    #  {'path': 'networks[0].mask', 'message': "❌ Error: Неправильний формат маски '255.0.255.0'."}]
+    if not isinstance(config_data, dict):
+        return [{"path": "", "message": "❌ Error: Дані запиту повинні бути об'єктом."}]
+    routing_config = config_data.get("routingConfig") or {}
+    if not isinstance(routing_config, dict):
+        routing_config = {}
+    plan = _PLANS.get(_text(config_data.get("routingProtocol")).upper(), _PLANS[""])
+    errors = []
+    for key, path, check, nested in plan:
+        value = routing_config.get(key) if nested else config_data.get(key)
+        try:
+            check(errors, path, value, config_data)
+        except Exception:
+            # Неочікуваний тип значення не зупиняє решту перевірок
+            errors.append({"path": path, "message": _INTERNAL_ERROR})
+    return errors
+
+
+def validate_many(devices: Iterable[dict]) -> list[list[dict]]:
+    # Пакетна валідація флоту: validate_config() для кожного пристрою.
+    #
+    # Args:
+    #     devices (Iterable[dict]): Специфікації пристроїв (як у generate_fleet()).
+    #
+    # Returns:
+    #     list[list[dict]]: Списки помилок у порядку подачі пристроїв.
+    #
+    # Examples:
+    # >>> [bool(errors) for errors in validate_many(specs)]
+    # [False, True, False]
+    return [validate_config(spec) for spec in devices]
@@ -0,0 +1,47 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+
+# Дозволяє запуск як `python scripts/compile_templates.py` з кореня репозиторію
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.jinja_env import (  # noqa: E402
+    DEFAULT_BUNDLE_DIR, MANIFEST_NAME, build_manifest, make_filesystem_env, template_names, template_stats
+)
+
+
+# Компілює backend/templates/**/*.j2 у Python-модулі для jinja2.ModuleLoader.
+#
+# Бандл разом з manifest.json (хеші, mtime і розміри шаблонів, версія
+# Jinja2, опції середовища) підхоплюється backend/jinja_env.py під час старту. Якщо
+# шаблони змінилися після збірки, бандл вважається застарілим і
+# використовується звичайний FileSystemLoader.
+def compile_bundle(target: str) -> int:
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.makedirs(target)
+
+    env = make_filesystem_env()
+    names = template_names()
+    env.compile_templates(target, zip=None, filter_func=lambda name: name in names)
+
+    with open(os.path.join(target, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({**build_manifest(), "stats": template_stats()}, f, indent=2, sort_keys=True)
+    return len(names)
+
+
+# Точка входу CLI
+def main():
+    parser = argparse.ArgumentParser(description="Precompile Jinja2 templates into a Python module bundle.")
+    parser.add_argument("target", nargs="?", default=DEFAULT_BUNDLE_DIR,
+                        help=f"output directory (default: {DEFAULT_BUNDLE_DIR})")
+    args = parser.parse_args()
+
+    count = compile_bundle(args.target)
+    print(f"[SUCCESS] Compiled {count} templates into {args.target}")
+
+
+if __name__ == "__main__":
+    main()
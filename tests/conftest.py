@@ -6,6 +6,25 @@ import os
 # Додаємо корінь проєкту в sys.path, щоб тести бачили папку backend
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# 0. Жорсткі перевірки часу (швидкодія залежить від машини) — лише за запитом:
+# pytest --run-timing або CRW_TIMING_TESTS=1
+def pytest_addoption(parser):
+    parser.addoption("--run-timing", action="store_true", default=False,
+                     help="run tests marked 'timing' (hard wall-clock assertions)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "timing: hard wall-clock assertion, skipped unless --run-timing is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-timing") or os.environ.get("CRW_TIMING_TESTS") == "1":
+        return
+    skip = pytest.mark.skip(reason="timing gate: run with --run-timing")
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip)
+
 # 1. Глобальний мок для Eel 
 @pytest.fixture(scope="session", autouse=True)
 def mock_eel():
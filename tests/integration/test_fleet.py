@@ -0,0 +1,110 @@
+import pytest
+from backend import addrmath, fleet
+from backend.fleet import fleet_conflicts, fleet_index, generate_fleet, render_device
+
+
+def _spec(i, **overrides):
+    spec = {
+        "deviceId": f"branch-{i}",
+        "hostname": f"Branch{i}",
+        "interfaces": ["Gi0/0", "Gi0/1"],
+        "networks": [(f"10.{i}.0.1", "255.255.255.0"), (f"172.16.{i}.1", "255.255.255.252")],
+        "routingProtocol": "RIP",
+        "noShutdownInterfaces": ["Gi0/0", "Gi0/1"],
+    }
+    spec.update(overrides)
+    return spec
+
+
+class TestGenerateFleet:
+
+    def test_serial_mode_renders_every_device(self):
+        results = dict(generate_fleet([_spec(i) for i in range(5)], max_workers=1))
+        assert sorted(results) == [f"branch-{i}" for i in range(5)]
+        assert "hostname Branch3" in results["branch-3"]
+        assert results["branch-3"][-1] == "write memory"
+
+    def test_process_pool_matches_serial(self):
+        specs = [_spec(i) for i in range(12)]
+        serial = dict(generate_fleet(specs, max_workers=1))
+        pooled = dict(generate_fleet(specs, max_workers=2, chunksize=3))
+        assert pooled == serial
+
+    def test_invalid_device_yields_error_not_exception(self):
+        specs = [_spec(0), _spec(1, interfaces=[]), _spec(2, hostname="1bad")]
+        results = dict(generate_fleet(specs, max_workers=1))
+        assert isinstance(results["branch-0"], list)
+        assert results["branch-1"]["code"] == "ERR-VAL-001"
+        assert results["branch-2"]["code"] == "ERR-VAL-006"
+
+    def test_generation_failure_does_not_leak_exception_text(self, monkeypatch, caplog):
+        def broken(**kwargs):
+            raise RuntimeError("secret-path /etc/crw/keys")
+        monkeypatch.setattr(fleet, "generate_full_config", broken)
+        device_id, error = render_device(0, _spec(0))
+        assert device_id == "branch-0" and error["code"] == "ERR-GEN-001"
+        assert error["defaultMessage"] == "Критична помилка генерації конфігурації."
+        assert "secret-path" not in str(error)
+        assert error["id"] in caplog.text and "secret-path" in caplog.text
+
+    def test_device_id_fallbacks(self):
+        specs = [_spec(0, deviceId=None), _spec(1, deviceId=None, hostname="")]
+        ids = [device_id for device_id, _ in generate_fleet(specs, max_workers=1)]
+        assert ids == ["Branch0", "device-1"]
+
+    def test_lazy_iterable_input(self):
+        gen = (_spec(i) for i in range(4))
+        assert len(list(generate_fleet(gen, max_workers=2, chunksize=1))) == 4
+
+
+class TestFleetConflicts:
+
+    def test_distinct_branches_have_no_conflicts(self):
+        assert fleet_conflicts([_spec(i) for i in range(20)]) == []
+
+    def test_same_lan_on_two_branches(self):
+        specs = [_spec(0), _spec(1), _spec(2, networks=[("10.1.0.1", "255.255.255.0"), ("172.16.2.1", "255.255.255.252")])]
+        assert fleet_conflicts(specs) == [{
+            "device": "branch-2", "path": "networks[0].ip",
+            "message": "❌ Error: Адреса 10.1.0.1 вже призначена інтерфейсу Gi0/0 (networks[0]) пристрою branch-1.",
+            "conflictsWith": {"device": "branch-1", "path": "networks[0].ip"},
+        }]
+
+    def test_shared_link_is_not_a_conflict(self):
+        # Both ends of a /30 between two routers
+        specs = [_spec(0), _spec(1, networks=[("10.1.0.1", "24"), ("172.16.0.2", "30")])]
+        assert fleet_conflicts(specs) == []
+        specs[1]["networks"][1] = ("172.16.0.3", "29")
+        errors = fleet_conflicts(specs)
+        assert [(e["device"], e["path"]) for e in errors] == [("branch-1", "networks[1].ip")]
+        assert "172.16.0.0/29 перетинається з мережею 172.16.0.0/30" in errors[0]["message"]
+
+    def test_dhcp_pools_and_nat(self):
+        specs = [
+            _spec(0, dhcpNetwork="10.0.0.0", dhcpMask="255.255.255.0"),
+            # A second gateway on branch-0's LAN serving the same pool
+            _spec(1, networks=[("10.0.0.2", "24"), ("172.16.1.1", "30")], dhcpNetwork="10.0.0.0", dhcpMask="255.255.255.0"),
+            _spec(2, natType="Static", natOutside="Gi0/1", natInsideLocal="10.2.0.5", natInsideGlobal="10.0.0.77"),
+            _spec(3, dhcpNetwork="10.2.0.0", dhcpMask="255.255.255.0"),
+        ]
+        errors = fleet_conflicts(specs)
+        assert [(e["device"], e["path"], e["conflictsWith"]["device"]) for e in errors] == [
+            ("branch-1", "dhcpNetwork", "branch-0"),
+            ("branch-2", "natInsideGlobal", "branch-0"),
+            ("branch-2", "natInsideGlobal", "branch-1"),
+            ("branch-3", "dhcpNetwork", "branch-2"),
+        ]
+        assert errors[0]["message"] == "❌ Error: DHCP-пул 10.0.0.0/24 перетинається з DHCP-пулом 10.0.0.0/24 пристрою branch-0."
+        assert "перетинається з мережею 10.2.0.0/24 інтерфейсу Gi0/0 (networks[0]) пристрою branch-2" in errors[3]["message"]
+
+    def test_static_routes_are_indexed_but_never_conflict(self):
+        routes = {"staticRoutes": [{"dest": "0.0.0.0", "mask": "0", "nextHop": "172.16.0.2"}, {"dest": "10.1.0.0", "mask": "24"}]}
+        specs = [_spec(0, routingProtocol="STATIC", routingConfig=routes), _spec(1)]
+        assert fleet_conflicts(specs) == []
+        index = fleet_index(specs)
+        value, length, owners = index.longest_match(addrmath.parse_address("10.1.0.9"))
+        assert (addrmath.int_to_ipv4(value), length) == ("10.1.0.0", 24)
+        assert [(device_id, prefix.path) for _, device_id, prefix in owners] == [
+            ("branch-0", "routingConfig.staticRoutes[1].dest"), ("branch-1", "networks[0].ip"),
+        ]
+        assert index.longest_match(addrmath.parse_address("8.8.8.8"))[1] == 0
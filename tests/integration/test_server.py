@@ -0,0 +1,252 @@
+"""
+Headless HTTP server (backend/server.py): JSON endpoints over keep-alive
+connections, served in-process, plus the pre-forked mode as a subprocess.
+"""
+
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from backend import main, server
+from backend.result_cache import result_cache
+
+
+FORM = {
+    "hostname": "Edge1",
+    "interfaces": ["Gi0/0", "Gi0/1"],
+    "networks": [["10.0.0.1", "30"], ["192.168.1.1", "24"]],
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "routingConfig": {"ospfProcessId": "1", "ospfArea": "0"},
+}
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def address():
+    result_cache.clear()
+    sock = server.listen("127.0.0.1", 0)
+    httpd = server.make_server(sock)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield sock.getsockname()[:2]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+        result_cache.clear()
+
+
+def _request(conn, method, path, payload=None, raw=None):
+    body = raw if raw is not None else (json.dumps(payload) if payload is not None else None)
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+class TestEndpoints:
+
+    def test_generate_matches_process_text(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        status, payload = _request(conn, "POST", "/api/generate", FORM)
+        assert status == 200
+        assert payload["config"] == main.process_text(dict(FORM))
+
+    def test_generate_reports_aggregation(self, address):
+        form = dict(FORM, routingProtocol="STATIC", routingConfig={"aggregatePrefixes": True, "staticRoutes": [
+            {"dest": f"10.1.{i}.0", "mask": "24", "nextHop": "10.0.0.2"} for i in range(4)
+        ]})
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        for _ in range(2):  # miss, then result-cache hit
+            status, payload = _request(conn, "POST", "/api/generate", form)
+            assert status == 200 and payload["aggregation"] == {"savedLines": 3}
+        assert "aggregation" not in _request(conn, "POST", "/api/generate", FORM)[1]
+
+    def test_generate_validation_error(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        status, payload = _request(conn, "POST", "/api/generate", dict(FORM, hostname="bad host"))
+        assert status == 422
+        assert payload["code"] == "ERR-VAL-006" and payload["errors"][0]["path"] == "hostname"
+
+    def test_validate(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        assert _request(conn, "POST", "/api/validate", FORM) == (200, {"ok": True, "errors": []})
+        status, payload = _request(conn, "POST", "/api/validate", dict(FORM, routerId=""))
+        assert status == 200 and not payload["ok"]
+        assert [error["path"] for error in payload["errors"]] == ["routerId"]
+
+    def test_batch_keeps_input_order(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        devices = [dict(FORM, hostname=f"Branch{n}") for n in range(3)]
+        devices.insert(1, dict(FORM, deviceId="broken", interfaces=[]))
+        status, payload = _request(conn, "POST", "/api/batch", {"devices": devices})
+        assert status == 200
+        results = payload["results"]
+        assert [r["deviceId"] for r in results] == ["Branch0", "broken", "Branch1", "Branch2"]
+        assert results[1]["error"]["code"] == "ERR-VAL-001"
+        assert "hostname Branch2" in results[3]["config"]
+
+    def test_stats_and_health(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        _request(conn, "POST", "/api/generate", FORM)
+        _request(conn, "POST", "/api/generate", FORM)
+        status, stats = _request(conn, "GET", "/api/stats")
+        assert status == 200 and stats["pid"] == os.getpid()
+        assert stats["result_cache"]["hits"] == 1 and stats["result_cache"]["misses"] == 1
+        assert _request(conn, "GET", "/health") == (200, {"ok": True})
+
+    def test_generate_shares_cache_with_process_text(self, address):
+        text = main.process_text(dict(FORM, hostname="Shared1"))
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        assert _request(conn, "POST", "/api/generate", dict(FORM, hostname="Shared1")) == (200, {"config": text})
+        stats = result_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    @pytest.mark.parametrize("method, path, raw, status", [
+        ("POST", "/api/unknown", "{}", 404),
+        ("GET", "/api/generate", None, 405),
+        ("POST", "/api/generate", "{not json", 400),
+        ("POST", "/api/generate", "[1, 2]", 400),
+        ("POST", "/api/batch", '{"devices": 3}', 400),
+    ])
+    def test_protocol_errors(self, address, method, path, raw, status):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        code, payload = _request(conn, method, path, raw=raw)
+        assert code == status and payload["code"] == f"HTTP-{status}"
+        # The connection stays usable after an error response
+        assert _request(conn, "GET", "/health") == (200, {"ok": True})
+
+    def test_oversized_body_closes_connection(self, address, monkeypatch):
+        monkeypatch.setattr(server, "MAX_BODY", 64)
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        conn.request("POST", "/api/generate", body=json.dumps(FORM))
+        response = conn.getresponse()
+        assert response.status == 413 and response.getheader("Connection") == "close"
+
+
+class TestKeepAlive:
+
+    def test_requests_share_one_connection(self, address):
+        conn = http.client.HTTPConnection(*address, timeout=10)
+        _request(conn, "GET", "/health")
+        sock = conn.sock
+        for n in range(20):
+            status, _ = _request(conn, "POST", "/api/generate", dict(FORM, hostname=f"R{n}"))
+            assert status == 200
+        assert conn.sock is sock
+
+    def test_concurrent_connections(self, address):
+        errors = []
+
+        def client(n):
+            conn = http.client.HTTPConnection(*address, timeout=10)
+            for i in range(5):
+                status, payload = _request(conn, "POST", "/api/generate", dict(FORM, hostname=f"C{n}x{i}"))
+                if status != 200 or f"hostname C{n}x{i}" not in payload["config"]:
+                    errors.append((n, i, status))
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+
+class TestCommandLine:
+
+    @pytest.mark.parametrize("variable", ["EEL_PORT", "CRW_WORKERS"])
+    def test_non_numeric_environment_is_a_usage_error(self, monkeypatch, capsys, variable):
+        monkeypatch.setenv(variable, "auto")
+        with pytest.raises(SystemExit) as info:
+            server.main([])
+        assert info.value.code == 2
+        assert "invalid int value: 'auto'" in capsys.readouterr().err
+
+    def test_environment_defaults(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(server, "serve", lambda host, port, workers: calls.append((host, port, workers)))
+        monkeypatch.setattr(server.logging, "basicConfig", lambda **kwargs: None)
+        monkeypatch.setenv("EEL_PORT", "9001")
+        monkeypatch.setenv("CRW_WORKERS", "3")
+        server.main(["--host", "127.0.0.1"])
+        monkeypatch.delenv("CRW_WORKERS")
+        server.main(["--port", "9002"])
+        assert calls == [("127.0.0.1", 9001, 3), (calls[1][0], 9002, None)]
+
+
+def start_prefork(workers):
+    """Starts `python -m backend.server` on a free port; returns (process, (host, port))."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.server", "--host", "127.0.0.1", "--port", "0", "--workers", str(workers)],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    line = process.stdout.readline()
+    assert line.startswith("Serving on http://"), line
+    host, port = line.split("//", 1)[1].split(" ", 1)[0].rsplit(":", 1)
+    return process, (host, int(port))
+
+
+def stop_prefork(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def _children(pid):
+    """PIDs whose parent is `pid` (Linux /proc)."""
+    found = set()
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) == pid:
+                found.add(int(entry))
+    return found
+
+
+def _wait_for_children(pid, count, exclude=()):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        children = _children(pid) - set(exclude)
+        if len(children) == count:
+            return children
+        time.sleep(0.05)
+    raise AssertionError(f"expected {count} workers, have {_children(pid)}")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or not os.path.isdir("/proc"), reason="pre-fork mode needs os.fork and /proc")
+class TestPrefork:
+
+    def test_dead_worker_is_replaced(self):
+        process, address = start_prefork(2)
+        try:
+            workers = _wait_for_children(process.pid, 2)
+            status, stats = _request(http.client.HTTPConnection(*address, timeout=10), "GET", "/api/stats")
+            assert status == 200 and stats["pid"] in workers
+            os.kill(stats["pid"], signal.SIGKILL)
+            replaced = _wait_for_children(process.pid, 2, exclude=[stats["pid"]])
+            assert stats["pid"] not in replaced
+            for n in range(10):
+                conn = http.client.HTTPConnection(*address, timeout=10)
+                status, payload = _request(conn, "POST", "/api/generate", dict(FORM, hostname=f"P{n}"))
+                assert status == 200 and f"hostname P{n}" in payload["config"]
+        finally:
+            stop_prefork(process)
+        # The parent waits for its workers before exiting
+        assert process.returncode == 0
+        assert not any(os.path.exists(f"/proc/{pid}") for pid in replaced)
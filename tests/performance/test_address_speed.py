@@ -0,0 +1,128 @@
+"""
+Address checks at large-device and fleet scale.
+
+backend/overlap.py sorts one request's intervals once, so 10k prefixes
+take milliseconds, while a pairwise check over the same request needs
+~50M comparisons. backend/prefix_trie.py bulk-loads 100k fleet prefixes
+from one sort instead of 100k descents from the root, and
+backend/nexthop.py resolves each static next hop with one trie lookup.
+"""
+
+import random
+import time
+
+from backend.fleet import fleet_conflicts
+from backend.nexthop import unresolved_next_hops
+from backend.overlap import address_conflicts
+from backend.prefix_trie import PrefixTrie
+
+
+PREFIXES = 10_000
+
+
+def _large_request():
+    half = PREFIXES // 2
+    networks = [(f"10.{i // 256}.{i % 256}.1", "255.255.255.0") for i in range(half)]
+    routes = [
+        {"dest": f"172.{16 + i // 65536}.{i // 256 % 256}.{i % 256}", "mask": "32", "nextHop": "10.0.0.2"}
+        for i in range(half)
+    ]
+    # One duplicate interface address and one route duplicating a connected subnet
+    networks[-1] = ("10.0.7.1", "255.255.255.0")
+    routes[0] = {"dest": "10.0.3.0", "mask": "24", "nextHop": "10.0.0.2"}
+    return {
+        "interfaces": [f"Gi0/{i}" for i in range(half)],
+        "networks": networks,
+        "routingProtocol": "STATIC",
+        "routingConfig": {"staticRoutes": routes},
+    }
+
+
+def test_address_conflicts_10k_prefixes(benchmark):
+    """10k interface and route prefixes checked in well under a second"""
+    request = _large_request()
+    errors = benchmark.pedantic(address_conflicts, args=(request,), rounds=3, iterations=1, warmup_rounds=1)
+    assert [error["path"] for error in errors] == [f"networks[{PREFIXES // 2 - 1}].ip", "routingConfig.staticRoutes[0].dest"]
+    start = time.perf_counter()
+    address_conflicts(request)
+    assert time.perf_counter() - start < 0.5
+
+
+FLEET_PREFIXES = 100_000
+
+
+def _fleet_records():
+    # LAN /24s, WAN /30s and loopback /32s, as a large fleet would have
+    rng = random.Random(11)
+    records = []
+    for i in range(FLEET_PREFIXES):
+        length = (24, 30, 32)[i % 3]
+        records.append((rng.getrandbits(32), length, i))
+    return records
+
+
+def _bulk_trie(records):
+    trie = PrefixTrie()
+    trie.insert_many(records)
+    return trie
+
+
+def test_prefix_trie_bulk_insert_100k(benchmark):
+    """100k prefixes load into the trie in well under a second"""
+    records = _fleet_records()
+    trie = benchmark.pedantic(_bulk_trie, args=(records,), rounds=3, iterations=1)
+    assert len(trie) == len({(value & ((0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF), length) for value, length, _ in records})
+    start = time.perf_counter()
+    _bulk_trie(records)
+    bulk = time.perf_counter() - start
+    assert bulk < 1.0, f"bulk insert took {bulk:.2f}s"
+    start = time.perf_counter()
+    single = PrefixTrie()
+    for record in records:
+        single.insert(*record)
+    assert time.perf_counter() - start > bulk
+    assert list(single) == list(trie)
+    value, length, item = records[-1]
+    assert trie.longest_match(value)[1:] == (length, [item])
+
+
+def test_fleet_conflicts_10k_devices(benchmark):
+    """Cross-device conflicts over 10k branches (40k prefixes plus default routes)"""
+    specs = [{
+        "deviceId": f"branch-{i}",
+        "interfaces": ["Gi0/0", "Gi0/1", "Gi0/2", "Lo0"],
+        "networks": [
+            (f"10.{i // 256}.{i % 256}.1", "255.255.255.0"),
+            (f"172.16.{i // 64}.{i % 64 * 4 + 1}", "255.255.255.252"),
+            (f"100.64.{i // 256}.{i % 256}", "255.255.255.255"),
+            (f"192.168.{i // 256}.{i % 256}", "255.255.255.255"),
+        ],
+        "routingProtocol": "STATIC",
+        "routingConfig": {"staticRoutes": [{"dest": "0.0.0.0", "mask": "0", "nextHop": "172.16.0.2"}]},
+    } for i in range(10_000)]
+    specs[-1]["networks"][0] = ("10.0.7.1", "255.255.255.0")
+    errors = benchmark.pedantic(fleet_conflicts, args=(specs,), rounds=1, iterations=1)
+    assert [(e["device"], e["conflictsWith"]["device"]) for e in errors] == [("branch-9999", "branch-7")]
+
+
+def test_next_hops_10k_static_routes(benchmark):
+    """10k routes, half resolving recursively through the other half"""
+    half = 5_000
+    # /32 routes via the transit link, then /24s through those /32s, in reverse order
+    routes = [{"dest": f"172.16.{i // 256}.{i % 256}", "mask": "32", "nextHop": "10.0.0.2"} for i in range(half)]
+    routes += [
+        {"dest": f"10.{100 + i // 256}.{i % 256}.0", "mask": "24", "nextHop": f"172.16.{i // 256}.{i % 256}"}
+        for i in reversed(range(half))
+    ]
+    routes.append({"dest": "10.99.0.0", "mask": "16", "nextHop": "10.98.0.1"})
+    config = {
+        "interfaces": ["Gi0/0"],
+        "networks": [("10.0.0.1", "255.255.255.252")],
+        "routingProtocol": "STATIC",
+        "routingConfig": {"staticRoutes": routes},
+    }
+    errors = benchmark.pedantic(unresolved_next_hops, args=(config,), rounds=3, iterations=1, warmup_rounds=1)
+    assert [error["path"] for error in errors] == [f"routingConfig.staticRoutes[{2 * half}].nextHop"]
+    start = time.perf_counter()
+    unresolved_next_hops(config)
+    assert time.perf_counter() - start < 0.5
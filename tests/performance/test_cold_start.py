@@ -0,0 +1,66 @@
+"""
+Cold-start benchmark: fresh interpreter -> import -> first full config.
+
+Short-lived CLI runs, containers and freshly forked pool workers all pay
+for compiling the .j2 templates on first use. The precompiled bundle
+(scripts/compile_templates.py) must make that first render faster.
+Each measurement runs in a new subprocess; the child reports the time
+from just after import to the end of its first full config, which is
+where template compilation happens (interpreter startup and the jinja2
+import are identical in both modes and excluded).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scripts.compile_templates import compile_bundle
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+CHILD = """
+import time
+from backend.generate import generate_full_config
+from backend import jinja_env
+t0 = time.perf_counter()
+generate_full_config(
+    hostname="Cold", interfaces=["Gi0/0", "Gi0/1"],
+    networks=[("10.0.0.1", "255.255.255.0"), ("10.0.1.1", "255.255.255.0")],
+    ip_multicast=True, routing_protocol="OSPF", router_id="1.1.1.1",
+    telephony_enabled=True, dn_list=[{"number": "1001", "user": "u", "mac": ""}],
+    enable_ssh=True, enable_secret="C0ldSecret", console_password="C0nsole99",
+    admin_username="admin", admin_password="Adm1nPass", domain_name="cold.lab",
+    dhcp_network="10.0.0.0", dhcp_mask="255.255.255.0", dhcp_gateway="10.0.0.1",
+    dhcp_dns="8.8.8.8", nat_type="PAT", nat_inside="Gi0/0", nat_outside="Gi0/1",
+    snmp_enabled=True, snmp_community_ro="public",
+)
+print(jinja_env.TEMPLATE_SOURCE, time.perf_counter() - t0)
+"""
+
+
+def _cold_start(bundle_setting, runs=5):
+    env = dict(os.environ, CRW_TEMPLATE_BUNDLE=bundle_setting, PYTHONDONTWRITEBYTECODE="1")
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        timings.append((out[0], float(out[1])))
+    sources = {source for source, _ in timings}
+    return sources, min(t for _, t in timings)
+
+
+class TestColdStart:
+    def test_bundle_faster_than_filesystem(self, tmp_path):
+        """First render with the precompiled bundle beats compiling from .j2"""
+        bundle = str(tmp_path / "bundle")
+        compile_bundle(bundle)
+
+        fs_sources, fs_time = _cold_start("off")
+        bundle_sources, bundle_time = _cold_start(bundle)
+
+        assert fs_sources == {"filesystem"}
+        assert bundle_sources == {"bundle"}
+        print(f"\nfirst render: filesystem {fs_time * 1000:.1f} ms, bundle {bundle_time * 1000:.1f} ms")
+        assert bundle_time < 0.7 * fs_time
@@ -0,0 +1,213 @@
+"""
+Deploy-path benchmarks against the local IOS telnet simulator
+(backend/simulator.py), using the real netmiko session code.
+
+- Line-by-line config push throughput (lines per second) on a LAN-like
+  router and on one with a few milliseconds of latency per line.
+- Pipelined (windowed) push against line-by-line push on the same router.
+- File-transfer deploy (embedded TFTP server + copy tftp: running-config).
+- Streamed deploy: router output goes to a spool file, so traced memory
+  stays below a deploy that keeps the whole output.
+- Multi-session scaling of deploy_many() across several simulated routers.
+- Adaptive timing: reconnecting to a router whose profile was learned is
+  faster than the first, conservatively timed, contact.
+"""
+
+import time
+import tracemalloc
+
+import pytest
+
+from backend import connect, timing
+from backend.deploy import ConnectionPool, deploy_many
+from backend.simulator import IOSSimulator
+from backend.transfer import TFTPServer
+
+
+PUSH_LINES = 200
+ROUTERS = 4
+
+
+def _routes(count, tag=0):
+    return [f"ip route 10.{tag}.{n // 250}.{n % 250} 255.255.255.255 192.0.2.1" for n in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiles(monkeypatch):
+    monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+
+
+def _open(sim):
+    return connect.open_connection("127.0.0.1", sim.port, password="cisco", enable_secret="en")
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.002])
+def test_push_lines_per_second(benchmark, latency):
+    """Line-by-line push sustains a useful rate; latency bounds it from above."""
+    with IOSSimulator(password="cisco", enable_secret="en", latency=latency) as sim:
+        conn = _open(sim)
+        try:
+            runs = iter(range(1000))
+            result = benchmark.pedantic(
+                lambda: connect.push_config(conn, _routes(PUSH_LINES, next(runs))), rounds=3, iterations=1
+            )
+            assert result["ok"] and result["sent"] == PUSH_LINES
+        finally:
+            conn.disconnect()
+
+    if benchmark.stats is not None:
+        rate = PUSH_LINES / benchmark.stats["mean"]
+        benchmark.extra_info["lines_per_second"] = round(rate)
+        # netmiko waits for each line's echo and prompt before sending the next
+        assert rate > (40 if latency else 300)
+        if latency:
+            assert rate < 1 / latency
+
+
+def test_pipelined_push_outpaces_line_mode(benchmark):
+    """Windowed push pays one round trip per window instead of one per line."""
+    with IOSSimulator(password="cisco", enable_secret="en", latency=0.002) as sim:
+        conn = _open(sim)
+        try:
+            runs = iter(range(1000))
+            start = time.perf_counter()
+            assert connect.push_config(conn, _routes(PUSH_LINES, next(runs)))["ok"]
+            line_mode = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = connect.push_config(conn, _routes(PUSH_LINES, next(runs)), pipelined=True)
+            pipelined = time.perf_counter() - start
+            assert result["ok"] and result["sent"] == PUSH_LINES and result["errors"] == []
+
+            benchmark.pedantic(
+                lambda: connect.push_config(conn, _routes(PUSH_LINES, next(runs)), pipelined=True),
+                rounds=3, iterations=1
+            )
+        finally:
+            conn.disconnect()
+
+    assert pipelined * 5 < line_mode, f"line mode {line_mode:.2f}s vs pipelined {pipelined:.2f}s"
+    if benchmark.stats is not None:
+        benchmark.extra_info["lines_per_second"] = round(PUSH_LINES / benchmark.stats["mean"])
+
+
+def test_transfer_push_outpaces_line_mode(benchmark):
+    """One copy command replaces a round trip per line; cost no longer grows with latency x lines."""
+    with TFTPServer("127.0.0.1", 0) as server, \
+            IOSSimulator(password="cisco", enable_secret="en", latency=0.002, tftp_port=server.port) as sim:
+        conn = _open(sim)
+        try:
+            runs = iter(range(1000))
+            start = time.perf_counter()
+            assert connect.push_config(conn, _routes(PUSH_LINES, next(runs)))["ok"]
+            line_mode = time.perf_counter() - start
+
+            def push():
+                return connect.push_config(conn, _routes(PUSH_LINES, next(runs)), transfer=True, server=server)
+
+            start = time.perf_counter()
+            result = push()
+            copied = time.perf_counter() - start
+            assert result["ok"] and result["sent"] == PUSH_LINES and result["errors"] == []
+
+            benchmark.pedantic(push, rounds=3, iterations=1)
+        finally:
+            conn.disconnect()
+
+    assert copied * 5 < line_mode, f"line mode {line_mode:.2f}s vs transfer {copied:.2f}s"
+    assert sim.stats["copies"] >= 2
+    if benchmark.stats is not None:
+        benchmark.extra_info["lines_per_second"] = round(PUSH_LINES / benchmark.stats["mean"])
+
+
+def test_streamed_deploy_keeps_output_out_of_memory(benchmark, tmp_path):
+    """A spooled, streamed push holds only the output tail; peak memory is below a buffered push."""
+    lines = 3000
+    routes = [f"ip route 10.{n // 62500}.{n // 250 % 250}.{n % 250} 255.255.255.255 192.0.2.1" for n in range(lines)]
+    events = []
+
+    def streamed():
+        with open(tmp_path / "deploy.log", "w") as spool:
+            # The UI keeps its own bounded log; here only the counters are kept
+            return connect.push_config(conn, routes, pipelined=True, spool=spool, progress=lambda e: events.append(e["sent"]))
+
+    def peak(push):
+        tracemalloc.start()
+        try:
+            result = push()
+            return result, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    with IOSSimulator(password="cisco", enable_secret="en") as sim:
+        conn = _open(sim)
+        try:
+            # The routes are already present afterwards, so the simulator's own state stops growing
+            assert connect.push_config(conn, routes, pipelined=True)["ok"]
+            buffered, buffered_peak = peak(lambda: connect.push_config(conn, routes, pipelined=True))
+            result, streamed_peak = peak(streamed)
+            benchmark.pedantic(streamed, rounds=2, iterations=1)
+        finally:
+            conn.disconnect()
+
+    assert result["ok"] and result["sent"] == lines
+    assert len(result["output"]) <= connect.OUTPUT_TAIL < len(buffered["output"])
+    assert (tmp_path / "deploy.log").read_text().count("ip route") >= lines
+    assert events[-1] == lines
+    assert streamed_peak < buffered_peak, f"streamed {streamed_peak} B vs buffered {buffered_peak} B"
+    benchmark.extra_info.update(buffered_peak_kb=buffered_peak // 1024, streamed_peak_kb=streamed_peak // 1024)
+
+
+def test_multi_session_scaling(benchmark):
+    """Pushing to 4 routers concurrently is at least 2.5x faster than one at a time."""
+    sims = [IOSSimulator(hostname=f"R{i}", password="cisco", enable_secret="en", latency=0.005).start()
+            for i in range(ROUTERS)]
+    pool = ConnectionPool(max_size=ROUTERS)
+    runs = iter(range(1000))
+    try:
+        def devices():
+            tag = next(runs)
+            return [
+                {"device_id": f"R{i}", "host": "127.0.0.1", "port": sim.port, "password": "cisco",
+                 "enable_secret": "en", "config": _routes(100, tag)}
+                for i, sim in enumerate(sims)
+            ]
+
+        def deploy(concurrency):
+            results = dict(deploy_many(devices(), concurrency=concurrency, pool=pool))
+            assert all(r["ok"] for r in results.values()), results
+
+        # Log in once so both measurements time only the config push
+        deploy(ROUTERS)
+
+        start = time.perf_counter()
+        deploy(1)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        deploy(ROUTERS)
+        concurrent = time.perf_counter() - start
+
+        assert concurrent * 2.5 < serial, f"serial {serial:.2f}s vs concurrent {concurrent:.2f}s"
+        benchmark.pedantic(deploy, args=(ROUTERS,), rounds=2, iterations=1)
+        assert pool.stats()["created"] == ROUTERS
+    finally:
+        pool.close()
+        for sim in sims:
+            sim.stop()
+
+
+def test_learned_profile_speeds_up_reconnect():
+    """The second login to a fast router skips the conservative first-contact delays."""
+    with IOSSimulator(password="cisco", enable_secret="en") as sim:
+        start = time.perf_counter()
+        _open(sim).disconnect()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        conn = _open(sim)
+        second = time.perf_counter() - start
+        conn.disconnect()
+
+    assert conn.global_delay_factor < 0.5
+    assert second < first * 0.8, f"first {first:.2f}s vs learned {second:.2f}s"
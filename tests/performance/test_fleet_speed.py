@@ -0,0 +1,73 @@
+"""
+Fleet-scale batch generation benchmarks (backend/fleet.py).
+
+The scaling test compares single-process throughput with a process pool
+of ``os.cpu_count()`` workers and requires near-linear speedup. It is a
+``timing`` test (run with ``pytest --run-timing``) and is skipped on
+single-core machines where there is nothing to scale to.
+"""
+
+import os
+import time
+
+import pytest
+
+from backend.fleet import generate_fleet
+
+
+FLEET_SIZE = 400
+
+
+def _branch_spec(i):
+    return {
+        "deviceId": f"branch-{i:04d}",
+        "hostname": f"Branch{i}",
+        "interfaces": [f"Gi0/{n}" for n in range(4)],
+        "networks": [(f"10.{i % 250}.{n}.1", "255.255.255.0") for n in range(4)],
+        "noShutdownInterfaces": [f"Gi0/{n}" for n in range(4)],
+        "routingProtocol": "OSPF",
+        "routerId": f"1.1.{i % 250}.1",
+        "enableSecret": "Branch5ecret",
+        "dhcpNetwork": f"10.{i % 250}.0.0",
+        "dhcpMask": "255.255.255.0",
+        "dhcpGateway": f"10.{i % 250}.0.1",
+        "dhcpDns": "8.8.8.8",
+        "natType": "PAT",
+        "natInside": "Gi0/0",
+        "natOutside": "Gi0/1",
+        "snmpEnabled": True,
+        "snmpCommunityRo": "public",
+    }
+
+
+FLEET = [_branch_spec(i) for i in range(FLEET_SIZE)]
+
+
+def _drain(max_workers):
+    start = time.perf_counter()
+    count = sum(1 for _ in generate_fleet(FLEET, max_workers=max_workers, chunksize=16))
+    assert count == FLEET_SIZE
+    return time.perf_counter() - start
+
+
+class TestFleetThroughput:
+    def test_fleet_serial_speed(self, benchmark):
+        """400 branch routers rendered in-process (baseline for scaling)"""
+        results = benchmark.pedantic(
+            lambda: list(generate_fleet(FLEET, max_workers=1)), rounds=3, iterations=1
+        )
+        assert len(results) == FLEET_SIZE
+        assert all(isinstance(r, list) for _, r in results)
+
+    @pytest.mark.timing
+    @pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="process-pool scaling needs 2+ cores")
+    def test_fleet_scales_with_cores(self):
+        """Pool of N workers must reach at least 60% of ideal N-times speedup"""
+        workers = min(os.cpu_count(), 8)
+        _drain(workers)  # warm-up: fork cost, template compilation in workers
+        serial = min(_drain(1) for _ in range(2))
+        pooled = min(_drain(workers) for _ in range(2))
+        speedup = serial / pooled
+        assert speedup >= 0.6 * workers, (
+            f"speedup {speedup:.2f}x with {workers} workers (serial {serial:.3f}s, pooled {pooled:.3f}s)"
+        )
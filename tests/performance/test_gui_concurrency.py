@@ -0,0 +1,107 @@
+"""
+Generation latency while a deploy is in flight, under eel's gevent loop.
+
+eel runs every JS call in a greenlet on one OS thread. The exposed
+connect/deploy functions hand netmiko work to the TaskRunner thread pool
+(backend/tasks.py) and wait cooperatively, so process_text calls from
+other tabs keep their normal latency. The same deploy run inline on the
+hub stalls them for the whole deploy, which the comparison shows.
+"""
+
+import statistics
+import time
+
+import pytest
+
+from backend import main, timing
+from backend.simulator import IOSSimulator
+from backend.tasks import TaskRunner
+
+gevent = pytest.importorskip("gevent")
+
+
+CONFIG_DATA = {
+    "hostname": "TabR1",
+    "interfaces": ["Gi0/0", "Gi0/1"],
+    "networks": [["192.168.10.1", "255.255.255.0"], ["10.0.0.1", "255.255.255.252"]],
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "routingConfig": {"ospfProcessId": "10", "ospfArea": "0"},
+    "enableSecret": "Liv3Secret",
+    "adminUsername": "admin",
+    "adminPassword": "AdminP4ss99",
+    "domainName": "live.lab",
+}
+
+DEPLOY_TEXT = "\n".join(f"ip route 10.9.{n // 250}.{n % 250} 255.255.255.255 192.0.2.1" for n in range(150))
+PERIOD = 0.02
+
+
+class _InlineRunner(TaskRunner):
+    """Runs tasks on the calling greenlet, as the exposed functions used to."""
+
+    def run(self, name, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+def _generation_delays(until):
+    """Calls process_text every PERIOD until `until` is ready; returns how late each call finished."""
+    delays = []
+    while not until.ready():
+        due = time.perf_counter() + PERIOD
+        gevent.sleep(PERIOD)
+        assert not main.process_text(dict(CONFIG_DATA)).startswith("{")
+        delays.append(time.perf_counter() - due)
+    return delays
+
+
+def _deploy_with(runner, monkeypatch):
+    monkeypatch.setattr(main, "_tasks", runner)
+    with IOSSimulator(password="cisco", enable_secret="en", latency=0.003) as sim:
+        assert '"ok": true' in main.connect_router("127.0.0.1", sim.port, "", "cisco", "en")
+        try:
+            start = time.perf_counter()
+            # Starts while the generation loop is already waiting for its next call
+            deploy = gevent.spawn_later(PERIOD / 2, main.deploy_config, DEPLOY_TEXT)
+            delays = _generation_delays(deploy)
+            elapsed = time.perf_counter() - start
+            assert '"ok": true' in deploy.get()
+        finally:
+            main.disconnect_router()
+    return delays, elapsed
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+    monkeypatch.setattr(main, "_DEPLOY_LOG", str(tmp_path / "crw_deploy.log"))
+
+
+def test_generation_latency_flat_during_deploy(benchmark, monkeypatch):
+    """process_text keeps its idle latency while a deploy runs in the pool."""
+    idle = gevent.spawn(gevent.sleep, 0.5)
+    baseline = _generation_delays(idle)
+
+    runner = TaskRunner(max_workers=2)
+    runner.use_gevent()
+    try:
+        offloaded, deploy_time = _deploy_with(runner, monkeypatch)
+    finally:
+        runner.shutdown()
+    blocking, _ = _deploy_with(_InlineRunner(), monkeypatch)
+
+    assert deploy_time > 0.3, "deploy too short to overlap generation"
+    assert len(offloaded) >= deploy_time / PERIOD / 3
+    # With the pool, no generation call waits anywhere near as long as the deploy
+    assert max(offloaded) < 0.15, f"worst generation delay {max(offloaded):.3f}s"
+    assert statistics.median(offloaded) < statistics.median(baseline) + 0.02
+    # Inline, generation is stalled behind the deploy
+    assert max(blocking) > deploy_time / 2
+
+    benchmark.extra_info.update(
+        idle_p50_ms=round(statistics.median(baseline) * 1000, 2),
+        deploy_p50_ms=round(statistics.median(offloaded) * 1000, 2),
+        deploy_max_ms=round(max(offloaded) * 1000, 2),
+        inline_max_ms=round(max(blocking) * 1000, 2),
+    )
+    benchmark.pedantic(main.process_text, args=(dict(CONFIG_DATA),), rounds=20, iterations=1)
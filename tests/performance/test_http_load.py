@@ -0,0 +1,130 @@
+"""
+Load test for the headless HTTP server (backend/server.py).
+
+Starts `python -m backend.server` with one pre-forked worker per core and
+drives /api/generate from several client threads, each on its own
+keep-alive connection. Every request carries a different hostname, so
+each one is a result-cache miss and goes through validation and
+rendering. Throughput (requests/s) and p50/p99 latency are reported in
+the benchmark's extra_info.
+"""
+
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+WORKERS = os.cpu_count() or 1
+CLIENTS = max(4, 2 * WORKERS)
+REQUESTS_PER_CLIENT = 50
+
+FORM = {
+    "hostname": "Load1",
+    "interfaces": ["Gi0/0", "Gi0/1", "Gi0/2"],
+    "networks": [["10.0.0.1", "30"], ["192.168.1.1", "24"], ["192.168.2.1", "24"]],
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "routingConfig": {"ospfProcessId": "1", "ospfArea": "0"},
+    "enableSsh": True,
+    "enableSecret": "Liv3Secret",
+    "adminUsername": "admin",
+    "adminPassword": "AdminP4ss99",
+    "domainName": "load.lab",
+    "dhcpNetwork": "192.168.1.0",
+    "dhcpMask": "255.255.255.0",
+    "dhcpGateway": "192.168.1.1",
+}
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode needs os.fork")
+
+
+@pytest.fixture(scope="module")
+def address():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.server", "--host", "127.0.0.1", "--port", "0", "--workers", str(WORKERS)],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    line = process.stdout.readline()
+    assert line.startswith("Serving on http://"), line
+    host, port = line.split("//", 1)[1].split(" ", 1)[0].rsplit(":", 1)
+    try:
+        yield host, int(port)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+
+def _generate(conn, form):
+    start = time.perf_counter()
+    conn.request("POST", "/api/generate", body=json.dumps(form), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = response.read()
+    return response.status, body, time.perf_counter() - start
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def test_generate_throughput_keepalive(benchmark, address):
+    """CLIENTS keep-alive connections x REQUESTS_PER_CLIENT unique forms"""
+    latencies = []
+    failures = []
+    reused = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(CLIENTS + 1)
+
+    def client(n):
+        conn = http.client.HTTPConnection(*address, timeout=30)
+        conn.connect()
+        sock = conn.sock
+        barrier.wait()
+        mine = []
+        for i in range(REQUESTS_PER_CLIENT):
+            status, body, elapsed = _generate(conn, dict(FORM, hostname=f"Load{n}x{i}"))
+            if status != 200 or f"hostname Load{n}x{i}".encode() not in body:
+                failures.append((n, i, status))
+            mine.append(elapsed)
+        with lock:
+            latencies.extend(mine)
+            reused.append(conn.sock is sock)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    assert failures == []
+    assert len(latencies) == CLIENTS * REQUESTS_PER_CLIENT
+    # Every client kept its single connection for all of its requests
+    assert all(reused)
+    rps = len(latencies) / wall
+    p50, p99 = _percentile(latencies, 0.5), _percentile(latencies, 0.99)
+    benchmark.extra_info.update(
+        workers=WORKERS, clients=CLIENTS, requests=len(latencies),
+        rps=round(rps, 1), p50_ms=round(p50 * 1000, 2), p99_ms=round(p99 * 1000, 2),
+    )
+    print(f"\n{WORKERS} workers, {CLIENTS} clients: {rps:.0f} req/s, p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms")
+    assert p99 < 2.0, f"p99 {p99 * 1000:.0f} ms"
+
+    conn = http.client.HTTPConnection(*address, timeout=30)
+    counter = iter(range(10**9))
+    benchmark.pedantic(lambda: _generate(conn, dict(FORM, hostname=f"Bench{next(counter)}")), rounds=50, iterations=1)
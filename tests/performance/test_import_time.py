@@ -0,0 +1,55 @@
+"""
+Import-time budget for backend.main.
+
+Importing the backend for generation (tests, CLI tools, fleet workers)
+must not pull in the GUI stack (eel, gevent, bottle) or the deploy stack
+(netmiko, paramiko), and must not touch the log file. Measured with
+``python -X importtime`` in a fresh interpreter from an empty working
+directory; the budget is the cumulative import time of backend.main.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Cumulative microseconds for `import backend.main` (measured ~110 ms;
+# the eager eel/netmiko version took ~850 ms).
+IMPORT_BUDGET_US = 400_000
+
+HEAVY_MODULES = ("eel", "gevent", "bottle", "netmiko", "paramiko")
+
+
+def _importtime(cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+class TestImportTime:
+    def test_heavy_stacks_are_not_imported(self, tmp_path):
+        """GUI and deploy stacks load on first use, not on import"""
+        modules = _importtime(tmp_path)
+        assert "backend.main" in modules
+        assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+
+    def test_log_file_is_not_created_on_import(self, tmp_path):
+        """RotatingFileHandler opens crw_app.log on first record only"""
+        _importtime(tmp_path)
+        assert not (tmp_path / "crw_app.log").exists()
+
+    def test_import_budget(self, tmp_path):
+        """Best of 3 cold imports of backend.main stays within budget"""
+        best = min(_importtime(tmp_path)["backend.main"] for _ in range(3))
+        print(f"\nimport backend.main: {best / 1000:.1f} ms")
+        assert best < IMPORT_BUDGET_US
@@ -10,10 +10,18 @@ All timings are wall-clock (process_time excluded) measured by pytest-benchmark.
 Memory deltas are captured via memory_profiler.memory_usage.
 """
 
+import ipaddress
+import time
+import tracemalloc
+
 import pytest
 from memory_profiler import memory_usage
 
-from backend.generate import generate_full_config
+from backend import main
+from backend.generate import generate_full_config, interface_section, iter_full_config
+from backend.incremental import IncrementalGenerator
+from backend.result_cache import result_cache
+from backend.section_cache import section_cache
 from backend.validate import validate_inputs
 
 
@@ -155,8 +163,31 @@ class TestScenarioC_LargeScale:
 
 # ---------------------------------------------------------------------------
 # Scenario D – Validation pipeline in isolation
-# Measures validate_inputs() with both valid and invalid payloads.
+# Measures validate_inputs() with both valid and invalid payloads, and a
+# 1k-interface request against the previous ipaddress-based checks.
 # ---------------------------------------------------------------------------
+
+
+def _ipaddress_validate_networks(networks):
+    """The per-field checks as they were before addrmath.parse_address/parse_netmask."""
+    for ip, mask in networks:
+        ip, mask = ip.strip(), mask.strip()
+        for value in (ip, mask):
+            if " " in value or not all(c.isalnum() or c in "./-_" for c in value):
+                return "general"
+        try:
+            addr = ipaddress.ip_address(ip)
+            if (addr.is_multicast or addr.is_loopback or addr.is_reserved) and str(addr) != "255.255.255.255":
+                return "reserved"
+        except ValueError:
+            return "ip"
+        try:
+            ipaddress.ip_network(f"0.0.0.0/{mask}")
+        except ValueError:
+            return "mask"
+    return ""
+
+
 class TestScenarioD_Validation:
     _VALID_NETWORKS = [
         ("192.168.1.1", "255.255.255.0"),
@@ -195,6 +226,26 @@ class TestScenarioD_Validation:
         result = benchmark(self._validate_invalid_hostname)
         assert result.startswith("❌")
 
+    def test_validation_1k_interfaces(self, benchmark):
+        """1k-interface request: an order of magnitude faster than per-field ipaddress objects"""
+        networks = [(f"10.{i // 250}.{i % 250}.1", "255.255.255.0") for i in range(1000)]
+        assert _ipaddress_validate_networks(networks) == ""
+
+        def best(func):
+            func(networks)
+            runs = []
+            for _ in range(5):
+                start = time.perf_counter()
+                func(networks)
+                runs.append(time.perf_counter() - start)
+            return min(runs)
+
+        reference = best(_ipaddress_validate_networks)
+        parsed = best(validate_inputs)
+        assert reference / parsed >= 10, f"{reference * 1000:.2f} ms -> {parsed * 1000:.2f} ms"
+        benchmark.extra_info["speedup"] = round(reference / parsed, 1)
+        assert benchmark(validate_inputs, networks) == ""
+
 
 # ---------------------------------------------------------------------------
 # Scenario E – Memory snapshot
@@ -222,3 +273,212 @@ class TestScenarioE_Memory:
         )
         delta_mb = max(mem) - min(mem)
         assert delta_mb < 10.0, f"Memory delta too high: {delta_mb:.2f} MB"
+
+
+# ---------------------------------------------------------------------------
+# Scenario F – Streaming a 50k-line config
+# iter_full_config() must keep peak allocations flat (independent of the
+# number of output lines), unlike the materialized list from
+# generate_full_config(). Measured with tracemalloc on Python allocations.
+# ---------------------------------------------------------------------------
+HUGE_STATIC_KWARGS = dict(
+    MINIMAL_KWARGS,
+    hostname="HugeStatic",
+    routing_protocol="STATIC",
+    routing_config={"staticRoutes": [
+        {"dest": f"10.{i >> 8 & 0xFF}.{i & 0xFF}.0", "mask": "24", "nextHop": "192.168.1.254"}
+        for i in range(50_000)
+    ]},
+)
+
+
+def _peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestScenarioF_Streaming:
+    def _stream_to_sink(self):
+        count = 0
+        for _line in iter_full_config(**HUGE_STATIC_KWARGS):
+            count += 1
+        return count
+
+    def test_streaming_50k_lines_speed(self, benchmark):
+        """Streaming 50k static routes – throughput reference"""
+        count = benchmark.pedantic(self._stream_to_sink, rounds=3, iterations=1)
+        assert count > 50_000
+
+    def test_streaming_memory_is_flat(self):
+        """Streaming peak must be a small fraction of the materialized list"""
+        streamed = _peak_bytes(self._stream_to_sink)
+        materialized = _peak_bytes(lambda: generate_full_config(**HUGE_STATIC_KWARGS))
+        assert streamed < 1024 * 1024, f"streaming peak {streamed / 1e6:.2f} MB"
+        assert streamed * 10 < materialized
+
+
+# ---------------------------------------------------------------------------
+# Scenario G – Section memoization across a fleet
+# 100 branch routers differ only in hostname/interfaces; security, SNMP,
+# multicast and routing (summary OSPF table) sections are identical and
+# come from section_cache.
+# ---------------------------------------------------------------------------
+_SHARED_OSPF = {"processId": "10", "ospfNetworks": [
+    {"network": f"10.{i}.0.0", "wildcard": "0.0.255.255", "area": str(i % 4)} for i in range(40)
+]}
+FLEET_KWARGS = [
+    dict(FULL_KWARGS, hostname=f"Branch{i}", routing_config=_SHARED_OSPF,
+         networks=[(f"10.{i}.0.1", "255.255.255.0"), (f"10.{i}.1.1", "255.255.255.252"),
+                   (f"10.{i}.2.1", "255.255.255.0")])
+    for i in range(100)
+]
+
+
+class TestScenarioG_SectionCache:
+    def _fleet(self, cache):
+        for kwargs in FLEET_KWARGS:
+            generate_full_config(**kwargs, cache_sections=cache)
+
+    def test_fleet_without_section_cache(self, benchmark):
+        """100 similar devices, every section rendered"""
+        benchmark(self._fleet, False)
+
+    def test_fleet_with_section_cache(self, benchmark):
+        """100 similar devices, shared sections served from section_cache"""
+        section_cache.clear()
+        benchmark(self._fleet, True)
+        stats = section_cache.stats()
+        assert stats["hits"] > stats["misses"]
+
+
+# ---------------------------------------------------------------------------
+# Scenario H – Live preview, one field edited
+# IncrementalGenerator re-renders only the sections that depend on the
+# changed form key (here SNMP), so a keystroke costs a fraction of a full
+# regeneration.
+# ---------------------------------------------------------------------------
+PREVIEW_DATA = {
+    "hostname": "Preview1",
+    "interfaces": [f"Gi0/{i}" for i in range(8)],
+    "networks": [[f"10.{i}.0.1", "255.255.255.0"] for i in range(8)],
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "telephonyEnabled": True,
+    "dnList": [{"number": str(1000 + i), "user": f"U{i}", "mac": ""} for i in range(20)],
+    "enableSsh": True,
+    "enableSecret": "Pr3viewSecret",
+    "adminPassword": "AdminP4ss99",
+    "dhcpNetwork": "10.0.0.0",
+    "dhcpMask": "255.255.255.0",
+    "dhcpGateway": "10.0.0.1",
+    "snmpEnabled": True,
+    "snmpCommunityRo": "public",
+}
+
+
+class TestScenarioH_IncrementalPreview:
+    def test_single_field_edit_speed(self, benchmark):
+        """Re-render after one SNMP field change"""
+        gen = IncrementalGenerator()
+        gen.update(PREVIEW_DATA)
+        edits = [dict(PREVIEW_DATA, snmpCommunityRo=f"ro{i}") for i in range(2)]
+        counter = iter(range(10**9))
+
+        def edit():
+            return gen.update(edits[next(counter) % 2])
+
+        benchmark(edit)
+        assert gen.last_dirty == ("snmp",)
+
+
+# ---------------------------------------------------------------------------
+# Scenario I – IR memory per interface
+# interface_section() builds slotted Interface nodes; at 5k interfaces the
+# context must take well under half of the equivalent list of dicts.
+# ---------------------------------------------------------------------------
+IR_INTERFACES = [f"GigabitEthernet0/{i}" for i in range(5000)]
+IR_NETWORKS = [(f"10.{i >> 8 & 0xFF}.{i & 0xFF}.1", "255.255.255.0") for i in range(5000)]
+
+
+def _retained_bytes(fn):
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained = tracemalloc.get_traced_memory()[0]
+        del result
+        return retained
+    finally:
+        tracemalloc.stop()
+
+
+class TestScenarioI_IRMemory:
+    def _as_dicts(self):
+        return [{"name": name, "ip": ip, "mask": mask, "description": "", "no_shutdown": True,
+                 "isis": False, "is_nat_inside": False, "is_nat_outside": False}
+                for name, (ip, mask) in zip(IR_INTERFACES, IR_NETWORKS)]
+
+    def test_ir_context_is_compact(self):
+        """Slotted IR vs dict context for 5k interfaces"""
+        ir_bytes = _retained_bytes(lambda: interface_section(IR_INTERFACES, IR_NETWORKS))
+        dict_bytes = _retained_bytes(self._as_dicts)
+        assert ir_bytes * 2 < dict_bytes, f"IR {ir_bytes} B vs dicts {dict_bytes} B"
+
+
+# ---------------------------------------------------------------------------
+# Scenario J – Prefix aggregation
+# 50k contiguous /24 static routes with one next hop collapse into a
+# handful of supernets; the pass must stay well under a second.
+# ---------------------------------------------------------------------------
+AGGREGATED_STATIC_KWARGS = dict(
+    HUGE_STATIC_KWARGS,
+    routing_config=dict(HUGE_STATIC_KWARGS["routing_config"], aggregatePrefixes=True),
+)
+
+
+class TestScenarioJ_Aggregation:
+    def test_aggregate_50k_static_routes(self, benchmark):
+        """50k /24 routes aggregated into supernets"""
+        lines = benchmark.pedantic(
+            generate_full_config, kwargs=dict(AGGREGATED_STATIC_KWARGS, cache_sections=False),
+            rounds=3, iterations=1
+        )
+        routes = [l for l in lines if l.startswith("ip route")]
+        assert 0 < len(routes) < 20
+        if benchmark.stats is not None:
+            assert benchmark.stats.stats.mean < 1.0
+
+
+# ---------------------------------------------------------------------------
+# Scenario K – Request-level result cache
+# Re-submitting an unchanged form skips validation and rendering: a hit is
+# a canonical hash plus a dict lookup. Misses here already reuse warm
+# section_cache entries, so the gap is the request-level saving alone.
+# ---------------------------------------------------------------------------
+def _median_call(fn, forms):
+    samples = []
+    for form in forms:
+        start = time.perf_counter()
+        fn(form)
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2]
+
+
+class TestScenarioK_ResultCache:
+    def test_repeated_generate_speed(self, benchmark):
+        """process_text with an unchanged form (cache hit)"""
+        result_cache.clear()
+        try:
+            main.process_text(dict(PREVIEW_DATA))
+            miss = _median_call(main.process_text, [dict(PREVIEW_DATA, hostname=f"Preview{n}") for n in range(2, 12)])
+            hit = _median_call(main.process_text, [dict(PREVIEW_DATA) for _ in range(11)])
+            text = benchmark(main.process_text, dict(PREVIEW_DATA))
+            stats = result_cache.stats()
+        finally:
+            result_cache.clear()
+        assert "hostname Preview1" in text
+        assert stats["misses"] == 11 and stats["hits"] >= 12
+        assert hit * 3 < miss, f"hit {hit * 1000:.3f} ms vs miss {miss * 1000:.3f} ms"
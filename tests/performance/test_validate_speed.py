@@ -0,0 +1,82 @@
+"""
+Collect-all validation of fleet inputs (backend/validate.py validate_many).
+
+Validation runs before every render, so it must stay a small fraction of
+the rendering cost. That ratio is measured against a serial
+generate_fleet() baseline in the same run and holds on any host. The
+absolute floor of 10k devices per second is a ``timing`` test, run with
+``pytest --run-timing``.
+"""
+
+import time
+
+import pytest
+
+from backend.fleet import generate_fleet
+from backend.validate import validate_many
+
+
+FLEET_SIZE = 400
+
+
+def _branch_spec(i):
+    return {
+        "deviceId": f"branch-{i:04d}",
+        "hostname": f"Branch{i}",
+        "interfaces": [f"Gi0/{n}" for n in range(4)],
+        "networks": [(f"10.{i % 250}.{n}.1", "255.255.255.0") for n in range(4)],
+        "noShutdownInterfaces": [f"Gi0/{n}" for n in range(4)],
+        "routingProtocol": "OSPF",
+        "routerId": f"1.1.{i % 250}.1",
+        "enableSecret": "Branch5ecret",
+        "dhcpNetwork": f"10.{i % 250}.0.0",
+        "dhcpMask": "255.255.255.0",
+        "dhcpGateway": f"10.{i % 250}.0.1",
+        "dhcpDns": "8.8.8.8",
+        "natType": "PAT",
+        "natInside": "Gi0/0",
+        "natOutside": "Gi0/1",
+        "snmpEnabled": True,
+        "snmpCommunityRo": "public",
+        "routingConfig": {
+            "processId": "10",
+            "ospfNetworks": [{"network": f"10.{i % 250}.{n}.0", "wildcard": "0.0.0.255", "area": "0"} for n in range(4)],
+        },
+    }
+
+
+FLEET = [_branch_spec(i) for i in range(FLEET_SIZE)]
+
+
+def _best_of(func, rounds=3):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestFleetValidation:
+    def test_validate_many_throughput(self, benchmark):
+        """Every device validated in one pass (devices/s in extra_info)"""
+        fleet = FLEET * 25
+        results = benchmark.pedantic(validate_many, args=(fleet,), rounds=3, iterations=1, warmup_rounds=1)
+        assert len(results) == len(fleet) and not any(results)
+        benchmark.extra_info["devices_per_s"] = round(len(fleet) / _best_of(lambda: validate_many(fleet), 1))
+
+    def test_validation_is_a_fraction_of_rendering(self):
+        """Validating the fleet costs at most half of rendering it serially"""
+        validate_many(FLEET)
+        list(generate_fleet(FLEET, max_workers=1))
+        validation = _best_of(lambda: validate_many(FLEET))
+        rendering = _best_of(lambda: list(generate_fleet(FLEET, max_workers=1)))
+        assert validation * 2 <= rendering, f"validation {validation:.3f}s, rendering {rendering:.3f}s"
+
+    @pytest.mark.timing
+    def test_validate_many_rate(self):
+        """Absolute floor: 10k+ devices per second"""
+        fleet = FLEET * 25
+        validate_many(fleet)
+        rate = len(fleet) / _best_of(lambda: validate_many(fleet))
+        assert rate >= 10_000, f"{rate:.0f} devices/s"
@@ -0,0 +1,286 @@
+import pytest
+
+from backend import connect
+from backend.config_diff import config_delta, config_removals, normalize, parse_config
+from backend.generate import generate_full_config
+
+
+FULL = dict(
+    hostname="EdgeR1",
+    interfaces=["Gi0/0", "Gi0/1"],
+    networks=[("10.0.0.1", "255.255.255.0"), ("203.0.113.2", "255.255.255.252")],
+    ip_multicast=True,
+    routing_protocol="OSPF",
+    router_id="1.1.1.1",
+    telephony_enabled=True,
+    dn_list=[{"number": "1001", "user": "Alice", "mac": "AABB.CCDD.0001"}],
+    enable_ssh=True,
+    enable_secret="Edg3Secret",
+    console_password="ConP4ssword",
+    admin_username="admin",
+    admin_password="AdminP4ss99",
+    domain_name="edge.lab",
+    dhcp_network="10.0.0.0",
+    dhcp_mask="255.255.255.0",
+    dhcp_gateway="10.0.0.1",
+    dhcp_dns="8.8.8.8",
+    dhcp_excluded=["10.0.0.1", "10.0.0.10"],
+    nat_type="PAT",
+    nat_inside="Gi0/0",
+    nat_outside="Gi0/1",
+    snmp_enabled=True,
+    snmp_community_ro="public",
+    routing_config={"processId": "10", "ospfNetworks": [
+        {"network": "10.0.0.0", "wildcard": "0.0.0.255", "area": "0"},
+    ]},
+)
+
+# How IOS shows FULL after it has been applied once: full interface names,
+# hashed secrets, type-7 passwords, defaults the wizard never sends.
+RUNNING = """Building configuration...
+
+Current configuration : 2301 bytes
+!
+version 15.4
+service timestamps debug datetime msec
+service password-encryption
+!
+hostname EdgeR1
+!
+enable secret 9 $9$abcdefghijklmn$ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789abcdefg
+!
+ip dhcp excluded-address 10.0.0.1 10.0.0.10
+!
+ip dhcp pool LAN
+ network 10.0.0.0 255.255.255.0
+ default-router 10.0.0.1
+ dns-server 8.8.8.8
+!
+ip multicast-routing
+ip domain name edge.lab
+ip cef
+!
+username admin privilege 15 secret 9 $9$zyxwvutsrqponm$0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefg
+!
+ip ssh version 2
+!
+interface GigabitEthernet0/0
+ description LAN
+ ip address 10.0.0.1 255.255.255.0
+ ip pim sparse-dense-mode
+ ip nat inside
+ duplex auto
+ speed auto
+!
+interface GigabitEthernet0/1
+ ip address 203.0.113.2 255.255.255.252
+ ip pim sparse-dense-mode
+ ip nat outside
+ duplex auto
+ speed auto
+!
+router ospf 10
+ router-id 1.1.1.1
+ network 10.0.0.0 0.0.0.255 area 0
+!
+ip forward-protocol nd
+ip nat inside source list 1 interface GigabitEthernet0/1 overload
+!
+access-list 1 permit 10.0.0.0 0.0.0.255
+snmp-server community public RO
+!
+telephony-service
+ max-ephones 3
+ max-dn 3
+ ip source-address 10.0.0.1 port 2000
+ auto assign 1 to 3
+!
+ephone-dn  1
+ number 1001
+!
+ephone  1
+ mac-address AABB.CCDD.0001
+ name Alice
+ button  1:1
+!
+line con 0
+ password 7 0822455D0A16
+ login
+line vty 0 4
+ login local
+ transport input ssh
+!
+end
+"""
+
+
+class TestParser:
+
+    def test_hierarchy_and_skipped_lines(self):
+        tree = parse_config(["enable", "configure terminal", "router ospf 1", "  network 10.0.0.0 0.0.0.255 area 0",
+                             " exit", "!", "hostname R1", "end", "write memory"])
+        assert list(tree.children) == ["router ospf 1", "hostname R1"]
+        assert list(tree.children["router ospf 1"].children) == ["network 10.0.0.0 0.0.0.255 area 0"]
+
+    def test_repeated_blocks_merge(self):
+        tree = parse_config(["interface Gi0/0", " ip address 10.0.0.1 255.255.255.0", " exit",
+                             "interface GigabitEthernet0/0", " ip pim sparse-dense-mode", " exit"])
+        assert list(tree.children) == ["interface GigabitEthernet0/0"]
+        assert len(tree.children["interface GigabitEthernet0/0"].children) == 2
+
+    @pytest.mark.parametrize("line,key", [
+        ("interface Gi0/1", "interface GigabitEthernet0/1"),
+        ("ip nat inside source list 1 interface fa0/0 overload",
+         "ip nat inside source list 1 interface FastEthernet0/0 overload"),
+        ("ephone-dn  1", "ephone-dn 1"),
+        ("line console 0", "line con 0"),
+        ("ip domain-name lab", "ip domain name lab"),
+    ])
+    def test_normalize(self, line, key):
+        assert normalize(line) == key
+
+
+class TestConfigDelta:
+
+    def test_empty_router_gets_everything(self):
+        lines = generate_full_config(**FULL)
+        delta = config_delta("", lines)
+        assert "hostname EdgeR1" in delta
+        assert "crypto key generate rsa modulus 2048" in delta
+        assert not {"enable", "configure terminal", "end", "write memory", "!"} & set(delta)
+
+    def test_redeploy_is_a_handful_of_secret_lines(self):
+        lines = generate_full_config(**FULL)
+        delta = config_delta(RUNNING, lines)
+        assert len(lines) > 60
+        assert len(delta) <= 8, delta
+        assert "crypto key generate rsa modulus 2048" not in delta
+        assert all("secret" in l or "password" in l or l.strip() in ("line console 0", "exit") for l in delta)
+
+    def test_identical_config_has_empty_delta(self):
+        lines = generate_full_config(**FULL)
+        assert config_delta(lines, lines) == []
+
+    def test_changed_child_is_scoped_to_block(self):
+        running = ["router ospf 10", " network 10.0.0.0 0.0.0.255 area 0", " log-adjacency-changes"]
+        target = ["router ospf 10", "  network 10.9.0.0 0.0.0.255 area 0", " exit"]
+        assert config_delta(running, target) == [
+            "router ospf 10",
+            " no network 10.0.0.0 0.0.0.255 area 0",
+            " network 10.9.0.0 0.0.0.255 area 0",
+            " exit",
+        ]
+
+    def test_stale_managed_lines_removed_unmanaged_kept(self):
+        running = ["ip route 10.9.0.0 255.255.0.0 10.0.0.2", "ip cef", "router rip", " network 10.0.0.0",
+                   "snmp-server community old RO"]
+        target = ["router ospf 1", "  network 10.0.0.0 0.0.0.255 area 0", " exit", "snmp-server community public RO"]
+        delta = config_delta(running, target)
+        assert delta[:3] == ["no ip route 10.9.0.0 255.255.0.0 10.0.0.2", "no router rip", "no snmp-server community old RO"]
+        assert "no ip cef" not in delta
+        assert delta[3:] == ["router ospf 1", " network 10.0.0.0 0.0.0.255 area 0", " exit", "snmp-server community public RO"]
+
+    def test_singletons_are_replaced_not_negated(self):
+        running = ["hostname Old", "interface GigabitEthernet0/0", " ip address 10.0.0.1 255.255.255.0"]
+        target = ["hostname New", "interface Gi0/0", " ip address 10.0.0.2 255.255.255.0", " no shutdown", " exit"]
+        assert config_delta(running, target) == [
+            "hostname New", "interface Gi0/0", " ip address 10.0.0.2 255.255.255.0", " exit",
+        ]
+
+    def test_negated_target_line(self):
+        target = ["interface Gi0/0", " no shutdown", " exit"]
+        assert config_delta(["interface GigabitEthernet0/0", " shutdown"], target) == [
+            "interface Gi0/0", " no shutdown", " exit",
+        ]
+
+    def test_numbered_acl_is_rebuilt_after_removal(self):
+        running = ["access-list 1 permit 10.0.0.0 0.0.0.255", "access-list 1 permit 10.1.0.0 0.0.0.255"]
+        target = ["access-list 1 permit 10.0.0.0 0.0.0.255", "access-list 1 permit 10.2.0.0 0.0.0.255"]
+        assert config_delta(running, target) == [
+            "no access-list 1",
+            "access-list 1 permit 10.0.0.0 0.0.0.255",
+            "access-list 1 permit 10.2.0.0 0.0.0.255",
+        ]
+
+
+class TestConfigRemovals:
+
+    def test_lists_router_lines_that_delta_removes(self):
+        running = ["ip route 10.9.0.0 255.255.0.0 10.0.0.2", "ip cef", "router ospf 1", " network 10.0.0.0 0.0.0.255 area 0",
+                   "router rip", " network 10.0.0.0", "access-list 1 permit 10.1.0.0 0.0.0.255", "snmp-server community old RO"]
+        target = ["router ospf 1", " network 10.5.0.0 0.0.0.255 area 0", " exit"]
+        assert config_removals(running, target) == [
+            "ip route 10.9.0.0 255.255.0.0 10.0.0.2",
+            "router rip",
+            "access-list 1 permit 10.1.0.0 0.0.0.255",
+            "snmp-server community old RO",
+            "router ospf 1 > network 10.0.0.0 0.0.0.255 area 0",
+        ]
+
+    def test_matches_no_commands_of_delta(self):
+        lines = generate_full_config(**FULL)
+        running = RUNNING + "\nip route 172.16.0.0 255.255.0.0 10.0.0.2\n"
+        assert config_removals(running, lines) == ["ip route 172.16.0.0 255.255.0.0 10.0.0.2"]
+        assert "no ip route 172.16.0.0 255.255.0.0 10.0.0.2" in config_delta(running, lines)
+        assert config_removals(lines, lines) == []
+
+
+class _FakeConnection:
+    def __init__(self, running):
+        self.running = running
+        self.sent = []
+        self.commands = []
+
+    def is_alive(self):
+        return True
+
+    def send_command(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return self.running if cmd == "show running-config" else ""
+
+    def send_config_set(self, lines, **kwargs):
+        self.sent.extend(lines)
+        return "\n".join(lines)
+
+    def set_base_prompt(self):
+        return "R1"
+
+
+class TestDeltaDeploy:
+
+    @pytest.fixture
+    def fake(self, monkeypatch):
+        conn = _FakeConnection(RUNNING)
+        monkeypatch.setattr(connect, "_connection", conn)
+        return conn
+
+    def test_delta_sends_only_changes(self, fake):
+        lines = generate_full_config(**FULL)
+        result = connect.deploy_config(lines, delta=True)
+        assert result["ok"] and result["sent"] == len(fake.sent) <= 8
+        assert fake.commands[0] == "show running-config"
+        assert "write memory" in fake.commands
+
+    def test_up_to_date_router_is_left_alone(self, fake):
+        lines = generate_full_config(**FULL)
+        fake.running = "\n".join(lines)
+        result = connect.deploy_config(lines, delta=True)
+        assert result == {"ok": True, "output": "Router configuration is already up to date.", "error": "", "sent": 0, "errors": []}
+        assert fake.sent == [] and fake.commands == ["show running-config"]
+
+    def test_full_mode_unchanged(self, fake):
+        lines = generate_full_config(**FULL)
+        result = connect.deploy_config(lines)
+        assert result["ok"] and result["sent"] == len([l for l in lines if l.strip() not in ("!", "enable", "configure terminal", "end", "write memory")])
+
+    def test_preview_sends_nothing(self, fake):
+        lines = generate_full_config(**FULL)
+        fake.running = RUNNING + "\nip route 172.16.0.0 255.255.0.0 10.0.0.2\n"
+        preview = connect.preview_delta(lines)
+        assert preview["ok"] and preview["removals"] == ["ip route 172.16.0.0 255.255.0.0 10.0.0.2"]
+        assert preview["commands"][0] == "no ip route 172.16.0.0 255.255.0.0 10.0.0.2"
+        assert fake.sent == [] and fake.commands == ["show running-config"]
+
+    def test_preview_needs_connection(self, monkeypatch):
+        monkeypatch.setattr(connect, "_connection", None)
+        assert connect.preview_delta(["hostname R1"])["ok"] is False
@@ -0,0 +1,186 @@
+import threading
+import time
+
+import pytest
+
+from backend import deploy
+from backend.deploy import ConnectionPool, deploy_many
+
+
+class _FakeConnection:
+    def __init__(self, key):
+        self.key = key
+        self.alive = True
+        self.closed = False
+        self.sent = []
+
+    def is_alive(self):
+        return self.alive and not self.closed
+
+    def send_command(self, cmd, **kwargs):
+        return ""
+
+    def send_config_set(self, lines, **kwargs):
+        if any("FAIL" in line for line in lines):
+            raise OSError("Socket closed")
+        self.sent.extend(lines)
+        return "\n".join(lines)
+
+    def set_base_prompt(self):
+        return "R1"
+
+    def disconnect(self):
+        self.closed = True
+
+
+class _Factory:
+    def __init__(self, fail_hosts=()):
+        self.opened = []
+        self.fail_hosts = set(fail_hosts)
+
+    def __call__(self, host, port, username, password, enable_secret, timeout):
+        if host in self.fail_hosts:
+            raise ConnectionRefusedError(f"{host}:{port} refused")
+        conn = _FakeConnection((host, port, username))
+        self.opened.append(conn)
+        return conn
+
+
+class TestConnectionPool:
+
+    def test_reuses_connection_per_key(self):
+        factory = _Factory()
+        pool = ConnectionPool(factory)
+        with pool.connection("10.0.0.1", 23, "admin") as first:
+            pass
+        with pool.connection("10.0.0.1", 23, "admin") as second:
+            pass
+        with pool.connection("10.0.0.1", 23, "other") as third:
+            pass
+        assert first is second and third is not first
+        assert pool.stats() == {"created": 2, "reused": 1, "evicted": 0, "dead": 0, "size": 2}
+
+    def test_dead_connection_is_replaced_after_keepalive(self):
+        factory = _Factory()
+        pool = ConnectionPool(factory, keepalive=0)
+        with pool.connection("10.0.0.1") as first:
+            pass
+        first.alive = False
+        with pool.connection("10.0.0.1") as second:
+            pass
+        assert second is not first and first.closed
+        assert pool.stats()["dead"] == 1
+
+    def test_exception_in_block_drops_connection(self):
+        pool = ConnectionPool(_Factory())
+        with pytest.raises(RuntimeError):
+            with pool.connection("10.0.0.1") as conn:
+                raise RuntimeError("boom")
+        assert conn.closed and len(pool) == 0
+
+    def test_bounded_size_evicts_least_recently_used(self):
+        pool = ConnectionPool(_Factory(), max_size=2)
+        with pool.connection("10.0.0.1") as a:
+            pass
+        with pool.connection("10.0.0.2") as b:
+            pass
+        with pool.connection("10.0.0.1"):
+            pass
+        with pool.connection("10.0.0.3"):
+            pass
+        assert b.closed and not a.closed
+        assert len(pool) == 2 and pool.stats()["evicted"] == 1
+
+    def test_full_pool_waits_for_release(self):
+        pool = ConnectionPool(_Factory(), max_size=1)
+        acquired = []
+
+        def second():
+            with pool.connection("10.0.0.2") as conn:
+                acquired.append(conn)
+
+        with pool.connection("10.0.0.1"):
+            thread = threading.Thread(target=second)
+            thread.start()
+            time.sleep(0.05)
+            assert acquired == []
+        thread.join(timeout=5)
+        assert len(acquired) == 1
+
+    def test_checkout_replaces_idle_connections(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(deploy.time, "monotonic", lambda: clock[0])
+        pool = ConnectionPool(_Factory(), idle_timeout=300)
+        with pool.connection("10.0.0.1") as first:
+            pass
+        with pool.connection("10.0.0.2") as other:
+            pass
+        clock[0] += 299
+        with pool.connection("10.0.0.1") as again:
+            pass
+        assert again is first and not first.closed
+        clock[0] += 300
+        # Expired sessions are closed on checkout, not handed out again
+        with pool.connection("10.0.0.1") as fresh:
+            pass
+        assert fresh is not first and first.closed and other.closed
+        assert len(pool) == 1 and pool.stats()["evicted"] == 2
+
+    def test_evict_idle_and_close(self):
+        pool = ConnectionPool(_Factory(), idle_timeout=0)
+        with pool.connection("10.0.0.1") as conn:
+            assert pool.evict_idle() == 0
+        assert pool.evict_idle() == 1 and conn.closed
+        with pool.connection("10.0.0.2") as conn:
+            pass
+        pool.close()
+        assert conn.closed
+        with pytest.raises(RuntimeError):
+            with pool.connection("10.0.0.2"):
+                pass
+
+
+class TestDeployMany:
+
+    def _devices(self, n):
+        return [
+            {"device_id": f"r{i}", "host": f"10.0.0.{i}", "config": f"hostname R{i}\nend\nwrite memory"}
+            for i in range(n)
+        ]
+
+    def test_deploys_every_device(self):
+        factory = _Factory()
+        pool = ConnectionPool(factory)
+        results = dict(deploy_many(self._devices(10), concurrency=4, pool=pool))
+        assert sorted(results) == sorted(f"r{i}" for i in range(10))
+        assert all(r["ok"] and r["sent"] == 1 for r in results.values())
+        assert sorted(c.sent[0] for c in factory.opened) == sorted(f"hostname R{i}" for i in range(10))
+
+    def test_failures_are_reported_per_device(self):
+        factory = _Factory(fail_hosts={"10.0.0.1"})
+        devices = self._devices(3)
+        devices[2]["config"] = "hostname FAIL"
+        pool = ConnectionPool(factory)
+        results = dict(deploy_many(devices, concurrency=3, pool=pool))
+        assert results["r0"]["ok"]
+        assert not results["r1"]["ok"] and "refused" in results["r1"]["error"]
+        assert not results["r2"]["ok"] and "Socket closed" in results["r2"]["error"]
+        # Failed session is not returned to the pool
+        assert len(pool) == 1
+
+    def test_shared_pool_reuses_sessions(self):
+        factory = _Factory()
+        with ConnectionPool(factory) as pool:
+            list(deploy_many(self._devices(5), concurrency=2, pool=pool))
+            list(deploy_many(self._devices(5), concurrency=2, pool=pool))
+            assert pool.stats()["created"] == 5 and pool.stats()["reused"] == 5
+
+    def test_own_pool_is_closed(self, monkeypatch):
+        factory = _Factory()
+        monkeypatch.setattr(deploy, "open_connection", factory)
+        results = list(deploy_many(self._devices(3), concurrency=2))
+        assert len(results) == 3 and all(c.closed for c in factory.opened)
+
+    def test_missing_host(self):
+        results = list(deploy_many([{"config": "hostname X"}], pool=ConnectionPool(_Factory())))
+        assert results == [("device-0", {"ok": False, "output": "", "error": "Device host is required."})]
@@ -0,0 +1,118 @@
+import pytest
+
+from backend import connect, timing
+from backend.simulator import IOSSimulator
+from backend.transfer import TFTPServer
+
+
+ROUTES = [f"ip route 10.1.{n}.0 255.255.255.0 192.0.2.1" for n in range(40)]
+BROKEN = ["enable", "configure terminal", "hostname Edge"] + ROUTES[:20] + [" bogus option"] + ROUTES[20:] + ["end", "write memory"]
+
+
+@pytest.fixture
+def server():
+    with TFTPServer("127.0.0.1", 0) as server:
+        yield server
+
+
+@pytest.fixture
+def session(server, monkeypatch):
+    monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+    with IOSSimulator(hostname="R1", password="cisco", enable_secret="en", tftp_port=server.port) as sim:
+        conn = connect.open_connection("127.0.0.1", sim.port, password="cisco", enable_secret="en")
+        yield sim, conn
+        conn.disconnect()
+
+
+class TestDeployOutput:
+
+    def test_events_are_throttled_but_errors_are_immediate(self):
+        events = []
+        output = connect._DeployOutput(100, events.append)
+        for sent in range(1, 51):
+            output.write(f"line {sent}")
+            output.advance(sent)
+        assert len(events) == 1 and events[0]["sent"] == 1
+        output.advance(51, [{"line": 60, "command": "bogus", "message": "% Invalid input"}])
+        assert len(events) == 2 and events[1]["sent"] == 51 and len(events[1]["errors"]) == 1
+        assert events[1]["output"].splitlines() == [f"line {n}" for n in range(2, 51)]
+        output.flush()
+        assert len(events) == 2
+
+    def test_spool_keeps_only_tail_in_memory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(connect, "OUTPUT_TAIL", 100)
+        with open(tmp_path / "deploy.log", "w") as spool:
+            output = connect._DeployOutput(10, spool=spool)
+            for n in range(50):
+                output.write(f"R1(config)#ip route 10.0.{n}.0 255.255.255.0 192.0.2.1")
+        assert len(output.text()) == 100 and output.text().rstrip().endswith("10.0.49.0 255.255.255.0 192.0.2.1")
+        assert (tmp_path / "deploy.log").read_text().count("ip route") == 50
+
+    def test_broken_listener_does_not_stop_deploy(self):
+        def listener(event):
+            raise RuntimeError("websocket closed")
+
+        output = connect._DeployOutput(1, listener)
+        output.advance(1)
+        output.flush()
+
+
+class TestStreamingPush:
+
+    def test_line_mode_progress_reaches_total(self, session):
+        sim, conn = session
+        events = []
+        result = connect.push_config(conn, ["hostname Edge"] + ROUTES, progress=events.append)
+        assert result["ok"] and result["sent"] == 41
+        sent = [event["sent"] for event in events]
+        assert sent == sorted(sent) and sent[-1] == 41 and all(e["total"] == 41 for e in events)
+        streamed = "\n".join(event["output"] for event in events)
+        assert all(route in streamed for route in ROUTES)
+
+    def test_errors_stream_with_source_lines(self, session):
+        _, conn = session
+        events = []
+        result = connect.push_config(conn, BROKEN, progress=events.append)
+        streamed = [error for event in events for error in event["errors"]]
+        assert streamed == result["errors"] == [
+            {"line": 24, "command": "bogus option", "message": "% Invalid input detected at '^' marker."},
+        ]
+
+    @pytest.mark.parametrize("mode", [{}, {"pipelined": True, "window": 5}])
+    def test_stop_on_error_skips_rest_and_write_memory(self, session, mode):
+        sim, conn = session
+        result = connect.push_config(conn, BROKEN, stop_on_error=True, **mode)
+        assert not result["ok"] and result["aborted"]
+        assert "line 24" in result["error"] and result["errors"][0]["command"] == "bogus option"
+        assert result["sent"] == (22 if not mode else 25)
+        running = sim.running_config()
+        assert ROUTES[19] in running and ROUTES[-1] not in running
+        assert sim.stats["writes"] == 0
+        # The session is back in exec mode and usable
+        assert connect.push_config(conn, ["hostname Next"])["ok"]
+
+    def test_transfer_applies_file_but_skips_write_memory(self, session, server):
+        sim, conn = session
+        result = connect.push_config(conn, BROKEN, transfer=True, server=server, stop_on_error=True)
+        assert result["aborted"] and result["sent"] == 42
+        assert sim.stats["writes"] == 0 and ROUTES[-1] in sim.running_config()
+
+    def test_clean_deploy_ignores_stop_on_error(self, session):
+        sim, conn = session
+        result = connect.push_config(conn, ROUTES + ["write memory"], stop_on_error=True)
+        assert result["ok"] and "aborted" not in result and sim.stats["writes"] == 1
+
+
+def test_deploy_config_spools_output(session, tmp_path, monkeypatch):
+    sim, _ = session
+    monkeypatch.setattr(connect, "OUTPUT_TAIL", 300)
+    assert connect.connect("127.0.0.1", sim.port, password="cisco", enable_secret="en")["ok"]
+    try:
+        path = str(tmp_path / "crw_deploy.log")
+        result = connect.deploy_config(ROUTES + ["write memory"], spool_path=path)
+    finally:
+        connect.disconnect()
+    assert result["ok"] and result["output_file"] == path
+    assert len(result["output"]) <= 300 and "[OK]" in result["output"]
+    log = (tmp_path / "crw_deploy.log").read_text()
+    assert all(route in log for route in ROUTES) and "write memory" in log
@@ -0,0 +1,93 @@
+import pytest
+
+from backend import connect, timing
+from backend.pipeline import map_errors, send_config_pipelined, source_lines
+from backend.simulator import IOSSimulator
+
+
+LINE_MODE_OUTPUT = """configure terminal
+Enter configuration commands, one per line.  End with CNTL/Z.
+R1(config)#interface Gi0/0
+R1(config-if)# exit
+R1(config)#interface Gi0/1
+R1(config-if)# bogus
+             ^
+% Invalid input detected at '^' marker.
+R1(config-if)# exit
+R1(config)#hostname
+% Incomplete command.
+
+R1(config)#end
+R1#"""
+
+
+class TestMapErrors:
+
+    def test_errors_are_attributed_to_their_command(self):
+        commands = ["interface Gi0/0", " exit", "interface Gi0/1", " bogus", " exit", "hostname"]
+        assert map_errors(LINE_MODE_OUTPUT, commands) == [
+            {"index": 4, "command": "bogus", "message": "% Invalid input detected at '^' marker."},
+            {"index": 6, "command": "hostname", "message": "% Incomplete command."},
+        ]
+
+    def test_clean_output_has_no_errors(self):
+        assert map_errors("R1(config)#hostname R1\nR1(config)#end\nR1#", ["hostname R1"]) == []
+
+    def test_unmatched_response_keeps_echo(self):
+        output = "R1(config)#s\n% Ambiguous command:  \"s\"\nR1(config)#"
+        assert map_errors(output, ["hostname R1"]) == [
+            {"index": None, "command": "s", "message": '% Ambiguous command:  "s"'},
+        ]
+
+    def test_source_lines_skip_comments_and_synthesized_commands(self):
+        config = ["enable", "configure terminal", "hostname R1", "!", "interface Gi0/0", " exit",
+                  "interface Gi0/1", " exit", "end"]
+        commands = ["no ip route 0.0.0.0 0.0.0.0 10.0.0.1", "hostname R1", "interface Gi0/1", " exit"]
+        assert source_lines(commands, config) == [None, 3, 7, 8]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+    with IOSSimulator(hostname="R1", password="cisco", enable_secret="en", latency=0.001) as sim:
+        conn = connect.open_connection("127.0.0.1", sim.port, password="cisco", enable_secret="en")
+        yield sim, conn
+        conn.disconnect()
+
+
+CONFIG = (
+    ["enable", "configure terminal", "hostname Edge", "!"]
+    + [f"ip route 10.0.{n}.0 255.255.255.0 192.0.2.1" for n in range(30)]
+    + ["interface Gi0/0", " bogus option", " exit", "!", "hostname", "end", "write memory"]
+)
+
+
+class TestPipelinedPush:
+
+    def test_windowed_push_reports_source_lines(self, session):
+        sim, conn = session
+        result = connect.push_config(conn, CONFIG, pipelined=True, window=8)
+        assert result["ok"] and result["sent"] == 35
+        assert result["errors"] == [
+            {"line": 36, "command": "bogus option", "message": "% Invalid input detected at '^' marker."},
+            {"line": 39, "command": "hostname", "message": "% Incomplete command."},
+        ]
+        assert sim.hostname == "Edge" and sim.stats["writes"] == 1
+        assert "ip route 10.0.29.0 255.255.255.0 192.0.2.1" in sim.running_config()
+
+    def test_line_mode_reports_the_same_errors(self, session):
+        _, conn = session
+        pipelined = connect.push_config(conn, CONFIG, pipelined=True)
+        line_mode = connect.push_config(conn, CONFIG)
+        assert line_mode["errors"] == pipelined["errors"]
+
+    def test_session_survives_hostname_change(self, session):
+        _, conn = session
+        assert connect.push_config(conn, ["hostname Other"], pipelined=True)["ok"]
+        assert connect.push_config(conn, ["hostname Third"])["ok"]
+        assert conn.base_prompt == "Third"
+
+    def test_output_keeps_send_config_set_shape(self, session):
+        _, conn = session
+        output = send_config_pipelined(conn, ["hostname R1", "ip route 0.0.0.0 0.0.0.0 192.0.2.1"], window=1)
+        assert "R1(config)#hostname R1\nR1(config)#ip route 0.0.0.0 0.0.0.0 192.0.2.1\nR1(config)#end" in output
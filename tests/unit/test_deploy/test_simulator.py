@@ -0,0 +1,167 @@
+import socket
+import time
+
+import pytest
+
+from backend import connect, timing
+from backend.simulator import IOSSimulator, _strip_telnet
+from backend.generate import generate_full_config
+
+from test_config_diff import FULL
+
+
+class _Client:
+    """Minimal line-oriented telnet client for driving the simulator."""
+
+    def __init__(self, port):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        self.buffer = ""
+
+    def read_until(self, text):
+        while text not in self.buffer:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError(self.buffer)
+            self.buffer += data.decode()
+        head, _, self.buffer = self.buffer.partition(text)
+        return head + text
+
+    def send(self, line, end="\r\n"):
+        self.sock.sendall((line + end).encode())
+
+    def command(self, line, prompt):
+        self.send(line)
+        return self.read_until(prompt)
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def sim():
+    with IOSSimulator(hostname="R1", password="cisco", enable_secret="en") as sim:
+        yield sim
+
+
+@pytest.fixture
+def client(sim):
+    client = _Client(sim.port)
+    client.read_until("Password: ")
+    client.send("cisco", end="\r")
+    client.read_until("R1>")
+    yield client
+    client.close()
+
+
+def _privileged(client):
+    client.command("enable", "Password: ")
+    client.command("en", "R1#")
+
+
+class TestLogin:
+
+    def test_username_and_password(self):
+        with IOSSimulator(username="admin", password="pw") as sim:
+            client = _Client(sim.port)
+            client.read_until("Username: ")
+            client.send("admin", end="\r")
+            client.read_until("Password: ")
+            client.send("pw", end="\r")
+            assert client.read_until(">").endswith("Router>")
+            client.close()
+
+    def test_bad_password_is_rejected(self, sim):
+        client = _Client(sim.port)
+        client.read_until("Password: ")
+        client.send("wrong")
+        assert "% Bad passwords" in client.read_until("Password: ")
+        client.close()
+
+    def test_no_login_lands_on_prompt(self):
+        with IOSSimulator(hostname="Open") as sim:
+            client = _Client(sim.port)
+            assert client.read_until(">") == "Open>"
+            client.close()
+
+
+class TestModes:
+
+    def test_enable_requires_secret(self, client):
+        client.command("enable", "Password: ")
+        assert "% Bad secrets" in client.command("nope", "R1>")
+        client.command("enable", "Password: ")
+        output = client.command("en", "R1#")
+        assert "en\r\n" not in output
+
+    def test_config_prompts(self, client):
+        _privileged(client)
+        client.command("configure terminal", "R1(config)#")
+        client.command("interface Gi0/0", "R1(config-if)#")
+        client.command("router ospf 1", "R1(config-router)#")
+        client.command("exit", "R1(config)#")
+        client.command("line vty 0 4", "R1(config-line)#")
+        client.command("\x1a", "R1#")
+
+    def test_user_exec_cannot_configure(self, client):
+        assert "% Invalid input detected" in client.command("configure terminal", "R1>")
+
+    @pytest.mark.parametrize("line,marker", [
+        ("bogus command", "% Invalid input detected at '^' marker."),
+        ("hostname", "% Incomplete command."),
+        ("s", '% Ambiguous command:  "s"'),
+    ])
+    def test_error_markers(self, sim, client, line, marker):
+        _privileged(client)
+        client.command("configure terminal", "R1(config)#")
+        assert marker in client.command(line, "R1(config)#")
+        assert sim.stats["errors"] == 1
+
+    def test_running_config_tracks_changes(self, sim, client):
+        _privileged(client)
+        client.command("configure terminal", "R1(config)#")
+        for line in ["hostname Edge", "interface Gi0/0", " ip address 10.0.0.1 255.255.255.0",
+                     " ip address 10.0.0.2 255.255.255.0", "exit", "ip route 0.0.0.0 0.0.0.0 10.0.0.254",
+                     "no ip route 0.0.0.0 0.0.0.0 10.0.0.254", "enable secret s3cret"]:
+            client.command(line, "#")
+        client.command("end", "Edge#")
+        output = client.command("show running-config", "Edge#")
+        assert "hostname Edge" in output
+        assert "interface GigabitEthernet0/0\r\n ip address 10.0.0.2 255.255.255.0" in output
+        assert "ip route" not in output and "s3cret" not in output
+        assert "enable secret 9 $9$" in output
+        assert "[OK]" in client.command("write memory", "Edge#")
+        assert sim.stats["writes"] == 1 and "hostname Edge" in sim.startup_config
+
+    def test_latency_is_applied_per_line(self):
+        with IOSSimulator(hostname="Slow", latency=0.05) as sim:
+            client = _Client(sim.port)
+            client.read_until("Slow>")
+            start = time.perf_counter()
+            client.command("", "Slow>")
+            assert time.perf_counter() - start >= 0.05
+            client.close()
+
+
+def test_strip_telnet_commands():
+    assert _strip_telnet(b"ab\xff\xf1cd\xff\xfb\x01ef\xff\xff") == b"abcdef\xff"
+
+
+class TestNetmikoSession:
+
+    def test_connect_deploy_redeploy_disconnect(self, monkeypatch):
+        monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+        lines = generate_full_config(**FULL)
+        with IOSSimulator(hostname="R1", password="cisco", enable_secret="en") as sim:
+            assert connect.connect("127.0.0.1", sim.port, password="cisco", enable_secret="en") == {"ok": True, "error": ""}
+            try:
+                assert connect.get_connection_state()["connected"]
+
+                first = connect.deploy_config(lines)
+                assert first["ok"] and "% Invalid" not in first["output"] and "% Incomplete" not in first["output"]
+                assert sim.hostname == "EdgeR1" and sim.stats["writes"] == 1
+
+                second = connect.deploy_config(lines, delta=True)
+                assert second["ok"] and 0 < second["sent"] <= 10
+            finally:
+                assert connect.disconnect() == {"ok": True}
+            assert not connect.get_connection_state()["connected"]
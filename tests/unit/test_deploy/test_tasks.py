@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import pytest
+
+from backend import main
+from backend.tasks import TaskRunner
+
+
+class TestTaskRunner:
+
+    def test_run_returns_result_from_worker_thread(self):
+        runner = TaskRunner(max_workers=1)
+        assert runner.run("probe", lambda: threading.current_thread().name).startswith("crw-task")
+        runner.shutdown()
+
+    def test_exceptions_propagate(self):
+        runner = TaskRunner(max_workers=1)
+        with pytest.raises(ZeroDivisionError):
+            runner.run("boom", lambda: 1 / 0)
+        runner.shutdown()
+
+    def test_pool_is_bounded(self):
+        runner = TaskRunner(max_workers=2)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        futures = [runner.submit("work", work) for _ in range(6)]
+        assert len(runner.active()) == 6
+        for future in futures:
+            future.result()
+        assert max(peak) == 2 and runner.active() == []
+        runner.shutdown()
+
+    def test_notify_reports_state_changes(self):
+        events = []
+        runner = TaskRunner(max_workers=1, notify=events.append)
+        runner.run("deploy", time.sleep, 0.01)
+        with pytest.raises(ValueError):
+            runner.run("deploy", int, "x")
+        runner.shutdown()
+        assert [e["state"] for e in events] == ["queued", "running", "done", "queued", "running", "failed"]
+        assert events[2]["elapsed"] >= 0.01 and events[0]["id"] != events[3]["id"]
+
+    def test_broken_notify_does_not_fail_task(self):
+        def notify(event):
+            raise RuntimeError("websocket closed")
+
+        runner = TaskRunner(max_workers=1, notify=notify)
+        assert runner.run("deploy", lambda: 42) == 42
+        runner.shutdown()
+
+    def test_rejects_empty_pool(self):
+        with pytest.raises(ValueError):
+            TaskRunner(max_workers=0)
+
+
+class TestGeventMode:
+
+    def test_wait_yields_to_other_greenlets(self):
+        gevent = pytest.importorskip("gevent")
+        events = []
+        hub_thread = threading.get_ident()
+        runner = TaskRunner(max_workers=1, notify=lambda e: events.append((e["state"], threading.get_ident())))
+        runner.use_gevent()
+        ticks = []
+
+        def ticker():
+            while len(ticks) < 10:
+                ticks.append(time.perf_counter())
+                gevent.sleep(0.01)
+
+        tick = gevent.spawn(ticker)
+        start = time.perf_counter()
+        assert runner.run("deploy", time.sleep, 0.2) is None
+        tick.join()
+        runner.shutdown()
+
+        # The ticker kept running while the blocking call was in flight
+        assert len([t for t in ticks if t < start + 0.2]) >= 5
+        # Notifications are delivered on the hub thread, not the worker
+        gevent.sleep(0)
+        assert [state for state, _ in events] == ["queued", "running", "done"]
+        assert {thread for _, thread in events} == {hub_thread}
+
+
+def test_exposed_router_calls_run_off_the_calling_thread(monkeypatch):
+    calls = []
+
+    def fake_deploy(lines, **kwargs):
+        calls.append(threading.current_thread().name)
+        return {"ok": True, "output": "", "error": "", "sent": len(lines), "errors": []}
+
+    monkeypatch.setattr(main, "_tasks", TaskRunner(max_workers=1))
+    monkeypatch.setattr(main.router_connect, "deploy_config", fake_deploy)
+    monkeypatch.setattr(main.router_connect, "disconnect", lambda: calls.append(threading.current_thread().name) or {"ok": True})
+
+    assert json.loads(main.deploy_config("hostname R1\nend"))["sent"] == 2
+    assert json.loads(main.disconnect_router()) == {"ok": True}
+    assert all(name.startswith("crw-task") for name in calls) and len(calls) == 2
@@ -0,0 +1,143 @@
+import json
+import time
+
+import netmiko
+import pytest
+
+from backend import connect, timing
+from backend.timing import TimingProfile, TimingStore
+
+
+class TestTimingProfile:
+
+    def test_unknown_router_keeps_legacy_delay(self):
+        assert TimingProfile().delay_factor == pytest.approx(2.0)
+
+    def test_first_sample_replaces_default(self):
+        profile = TimingProfile()
+        profile.observe(0.002)
+        assert profile.delay_factor == timing.MIN_DELAY_FACTOR
+        assert profile.samples == 1
+
+    def test_backs_off_immediately_and_recovers_slowly(self):
+        profile = TimingProfile()
+        profile.observe(0.01)
+        profile.observe(0.3)
+        assert profile.rtt == pytest.approx(0.3)
+        profile.observe(0.01)
+        assert 0.01 < profile.rtt < 0.3
+        for _ in range(50):
+            profile.observe(0.01)
+        assert profile.rtt == pytest.approx(0.01, rel=1e-3)
+
+    def test_delay_factor_is_clamped(self):
+        assert TimingProfile(rtt=10.0).delay_factor == timing.MAX_DELAY_FACTOR
+        assert TimingProfile(rtt=0.0).delay_factor == timing.MIN_DELAY_FACTOR
+
+    def test_read_timeout_scales_with_lines_and_has_floor(self):
+        profile = TimingProfile(rtt=0.01, peak=0.02, samples=5)
+        assert profile.read_timeout() == timing.MIN_READ_TIMEOUT
+        assert profile.read_timeout(1000) == pytest.approx(timing.TIMEOUT_MARGIN * 0.02 * 1000)
+
+    def test_dict_round_trip(self):
+        profile = TimingProfile(rtt=0.0123, peak=0.05, samples=7)
+        restored = TimingProfile.from_dict(profile.to_dict())
+        assert (restored.rtt, restored.peak, restored.samples) == (0.0123, 0.05, 7)
+
+
+class TestTimingStore:
+
+    def test_profile_per_host_and_port(self):
+        store = TimingStore()
+        assert store.get("10.0.0.1", 23) is store.get(" 10.0.0.1", "23")
+        assert store.get("10.0.0.1", 2323) is not store.get("10.0.0.1", 23)
+
+    def test_persists_between_processes(self, tmp_path):
+        path = str(tmp_path / "timing.json")
+        store = TimingStore(path)
+        store.get("10.0.0.1").observe(0.004)
+        store.save()
+        assert json.loads(open(path).read())["10.0.0.1:23"]["samples"] == 1
+        assert TimingStore(path).get("10.0.0.1").rtt == pytest.approx(0.004)
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        path = tmp_path / "timing.json"
+        path.write_text("{not json")
+        assert TimingStore(str(path)).get("10.0.0.1").samples == 0
+
+    def test_in_memory_store_writes_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        store = TimingStore()
+        store.get("10.0.0.1").observe(0.01)
+        store.save()
+        assert list(tmp_path.iterdir()) == []
+
+
+class _EchoConnection:
+    RETURN = "\n"
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.global_delay_factor = 2
+        self.kwargs = []
+
+    def write_channel(self, data):
+        pass
+
+    def read_until_prompt(self, read_timeout=10.0):
+        time.sleep(self.latency)
+        return "R1#"
+
+    def is_alive(self):
+        return True
+
+    def send_command(self, cmd, **kwargs):
+        self.kwargs.append(kwargs)
+        return ""
+
+    def send_config_set(self, lines, **kwargs):
+        self.kwargs.append(kwargs)
+        time.sleep(self.latency * (len(lines) + 2))
+        return ""
+
+    def set_base_prompt(self):
+        return "R1"
+
+
+class TestSessionTiming:
+
+    def test_measure_prompt_rtt(self):
+        profile = timing.measure_prompt_rtt(_EchoConnection(0.005), TimingProfile())
+        assert profile.samples == timing.PROBES
+        assert 0.005 <= profile.rtt < 0.05
+
+    def test_push_config_uses_read_timeout_and_learns(self):
+        conn = _EchoConnection(0.002)
+        conn.timing_profile = TimingProfile()
+        result = connect.push_config(conn, ["hostname R1", "end"])
+        assert result["ok"]
+        assert all("delay_factor" not in kwargs and "read_timeout" in kwargs for kwargs in conn.kwargs)
+        assert conn.timing_profile.samples == 1
+        assert conn.global_delay_factor < 2
+
+    def test_slow_echo_backs_off(self):
+        conn = _EchoConnection(0.3)
+        conn.timing_profile = TimingProfile(rtt=0.005, samples=3)
+        connect.push_config(conn, ["hostname R1"])
+        assert conn.global_delay_factor == pytest.approx(3.0, rel=0.2)
+
+    def test_open_connection_uses_stored_profile(self, monkeypatch):
+        captured = {}
+
+        def fake_handler(**params):
+            captured.update(params)
+            return _EchoConnection(0.001)
+
+        monkeypatch.setattr(netmiko, "ConnectHandler", fake_handler)
+        monkeypatch.setattr(timing, "profiles", TimingStore())
+        timing.profiles.get("10.0.0.9").observe(0.003)
+
+        conn = connect.open_connection("10.0.0.9")
+        assert captured["global_delay_factor"] == timing.MIN_DELAY_FACTOR
+        assert conn.timing_profile is timing.profiles.get("10.0.0.9")
+        assert conn.timing_profile.samples == 1 + timing.PROBES
@@ -0,0 +1,151 @@
+import re
+import socket
+import struct
+import time
+
+import pytest
+
+from backend import connect, timing
+from backend.simulator import IOSSimulator
+from backend.transfer import TFTPServer, copy_config, copy_errors, tftp_fetch
+
+
+CONFIG = (
+    ["enable", "configure terminal", "hostname Edge", "!"]
+    + [f"ip route 10.0.{n}.0 255.255.255.0 192.0.2.1" for n in range(100)]
+    + ["interface Gi0/0", " bogus option", " exit", "!", "hostname", "end", "write memory"]
+)
+
+
+@pytest.fixture
+def server():
+    with TFTPServer("127.0.0.1", 0, timeout=0.2) as server:
+        yield server
+
+
+class TestTFTPServer:
+
+    def test_serves_published_file(self, server):
+        content = "".join(f"ip route 10.0.{n}.0 255.255.255.0 192.0.2.1\n" for n in range(50))
+        name = server.publish(content)
+        assert tftp_fetch("127.0.0.1", server.port, name) == content.encode()
+        # The server counts the transfer once it has read the final ACK, after the client returns
+        deadline = time.monotonic() + 2
+        while server.stats()["served"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.stats()["served"] == 1 and server.stats()["bytes"] == len(content)
+
+    def test_exact_multiple_of_block_size_ends_with_empty_block(self, server):
+        name = server.publish(b"x" * 1024)
+        assert tftp_fetch("127.0.0.1", server.port, name) == b"x" * 1024
+
+    def test_blksize_option_and_netascii(self, server):
+        name = server.publish("hostname R1\n" * 500)
+        assert tftp_fetch("127.0.0.1", server.port, name, mode="netascii", block_size=1428) == b"hostname R1\n" * 500
+
+    def test_unknown_and_withdrawn_files_are_not_found(self, server):
+        name = server.publish("hostname R1\n")
+        server.withdraw(name)
+        with pytest.raises(FileNotFoundError):
+            tftp_fetch("127.0.0.1", server.port, name)
+        with pytest.raises(FileNotFoundError):
+            tftp_fetch("127.0.0.1", server.port, "../etc/passwd")
+        assert server.stats()["failed"] == 2
+
+    def test_write_requests_are_refused(self, server):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(2)
+            sock.sendto(struct.pack("!H", 2) + b"upload.cfg\0octet\0", ("127.0.0.1", server.port))
+            reply, _ = sock.recvfrom(1024)
+        assert struct.unpack("!HH", reply[:4]) == (5, 2)
+
+    def test_lost_ack_is_retransmitted(self, server):
+        name = server.publish(b"y" * 700)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(2)
+            sock.sendto(struct.pack("!H", 1) + name.encode() + b"\0octet\0", ("127.0.0.1", server.port))
+            first, address = sock.recvfrom(1024)
+            # Without an ACK the server resends the same block
+            again, _ = sock.recvfrom(1024)
+            assert first == again and struct.unpack("!HH", first[:4]) == (3, 1)
+            sock.sendto(struct.pack("!HH", 4, 1), address)
+            last, _ = sock.recvfrom(1024)
+            assert struct.unpack("!HH", last[:4]) == (3, 2) and len(last) - 4 == 188
+            sock.sendto(struct.pack("!HH", 4, 2), address)
+
+
+def test_copy_errors_use_echoed_file_lines():
+    output = ("[OK - 80 bytes]\n\n bogus option\n                ^\n% Invalid input detected at '^' marker.\n"
+              "hostname\n% Incomplete command.\n\n80 bytes copied in 0.007 secs")
+    commands = ["hostname Edge", "interface Gi0/0", " bogus option", " exit", "hostname"]
+    assert copy_errors(output, commands) == [
+        {"index": 3, "command": "bogus option", "message": "% Invalid input detected at '^' marker."},
+        {"index": 5, "command": "hostname", "message": "% Incomplete command."},
+    ]
+
+
+class _RecordingConnection:
+    host = "192.0.2.10"
+
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+        self.served = None
+
+    def send_command(self, command, **kwargs):
+        self.commands.append((command, kwargs["expect_string"]))
+        if command.startswith("copy "):
+            name = command.split()[1].rsplit("/", 1)[1]
+            self.served = tftp_fetch("127.0.0.1", self.server.port, name)
+            return "Destination filename [running-config]? "
+        return "[OK - 20 bytes]\n\n20 bytes copied in 0.01 secs\nR1#"
+
+
+def test_copy_config_issues_single_copy_command(server):
+    conn = _RecordingConnection(server)
+    copy_config(conn, ["hostname R1", "ip route 0.0.0.0 0.0.0.0 192.0.2.1"], server)
+    (copy, destination), (confirm, _) = conn.commands
+    assert copy.startswith("copy tftp://") and copy.endswith(" running-config")
+    assert re.search(destination, "Destination filename [running-config]? ") and confirm == ""
+    assert conn.served == b"hostname R1\nip route 0.0.0.0 0.0.0.0 192.0.2.1\nend\n"
+    # The file is only published for the duration of the copy
+    assert server.stats()["published"] == 0
+
+
+class TestTransferDeploy:
+
+    @pytest.fixture
+    def session(self, server, monkeypatch):
+        monkeypatch.setattr(timing, "profiles", timing.TimingStore())
+        with IOSSimulator(hostname="R1", password="cisco", enable_secret="en", latency=0.001,
+                          tftp_port=server.port) as sim:
+            conn = connect.open_connection("127.0.0.1", sim.port, password="cisco", enable_secret="en")
+            yield sim, conn
+            conn.disconnect()
+
+    def test_copy_applies_config_and_maps_errors(self, server, session):
+        sim, conn = session
+        result = connect.push_config(conn, CONFIG, transfer=True, server=server)
+        assert result["ok"] and result["sent"] == 105
+        assert result["errors"] == [
+            {"line": 106, "command": "bogus option", "message": "% Invalid input detected at '^' marker."},
+            {"line": 109, "command": "hostname", "message": "% Incomplete command."},
+        ]
+        assert sim.stats["copies"] == 1 and sim.stats["writes"] == 1
+        assert sim.hostname == "Edge" and "ip route 10.0.99.0 255.255.255.0 192.0.2.1" in sim.running_config()
+        assert server.stats()["served"] == 1
+
+    def test_same_result_as_line_mode(self, server, session):
+        _, conn = session
+        copied = connect.push_config(conn, CONFIG, transfer=True, server=server)
+        line_mode = connect.push_config(conn, CONFIG)
+        assert copied["errors"] == line_mode["errors"]
+        assert connect.push_config(conn, ["hostname Other"], transfer=True, server=server)["ok"]
+        assert conn.base_prompt == "Other"
+
+    def test_unreachable_file_fails_deploy(self, session):
+        sim, conn = session
+        with TFTPServer("127.0.0.1", 0) as other:
+            result = connect.push_config(conn, ["hostname X"], transfer=True, server=other)
+        assert not result["ok"] and "%Error opening" in result["error"]
+        assert sim.hostname == "R1"
@@ -0,0 +1,108 @@
+import ipaddress
+
+import pytest
+
+from backend import addrmath
+from backend.generate import generate_nat_config
+from backend.protocols import _mask_to_wildcard, generate_protocol_config
+
+
+class TestScalar:
+
+    @pytest.mark.parametrize("mask,expected", [
+        ("255.255.255.0", 0xFFFFFF00),
+        ("24", 0xFFFFFF00),
+        ("/30", 0xFFFFFFFC),
+        ("0", 0),
+        (" 32 ", 0xFFFFFFFF),
+        ("33", None),
+        ("255.255.256.0", None),
+        ("1.2.3", None),
+        ("²", None),
+        ("", None),
+    ])
+    def test_mask_to_int(self, mask, expected):
+        assert addrmath.mask_to_int(mask) == expected
+
+    def test_ipv4_roundtrip(self):
+        assert addrmath.int_to_ipv4(addrmath.ipv4_to_int("192.168.10.77")) == "192.168.10.77"
+        assert addrmath.ipv4_to_int("10.0.0") is None
+        assert addrmath.ipv4_to_int(None) is None
+
+    def test_prefix_tables(self):
+        assert addrmath.PREFIX_MASKS[24] == "255.255.255.0"
+        assert addrmath.PREFIX_WILDCARDS[30] == "0.0.0.3"
+        assert addrmath.cidr_mask(40) == "255.255.255.0"
+        assert addrmath.cidr_mask("24") == "255.255.255.0"
+
+
+class TestStrictParsing:
+    """parse_address/parse_netmask accept exactly what ipaddress accepts."""
+
+    @staticmethod
+    def _reference_address(text):
+        try:
+            return int(ipaddress.IPv4Address(text))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _reference_netmask(text):
+        try:
+            return int(ipaddress.ip_network(f"0.0.0.0/{text}").netmask)
+        except ValueError:
+            return None
+
+    @pytest.mark.parametrize("text", [
+        "192.168.1.1", "0.0.0.0", "255.255.255.255", "01.2.3.4", "1.2.3.04", "1.2.3", "1.2.3.4.5", "256.0.0.1",
+        "1..2.3", " 1.2.3.4", "1.2.3.4\n", "١.1.1.1", "1.2.3.4/24", "",
+    ])
+    def test_parse_address_matches_ipaddress(self, text):
+        assert addrmath.parse_address(text) == self._reference_address(text)
+
+    @pytest.mark.parametrize("text", [
+        "0", "24", "32", "33", "024", "/24", " 24", "+24", "²", "",
+        "255.255.255.0", "255.255.255.255", "0.0.0.0", "255.0.255.0", "0.0.0.255", "0.0.255.255", "0.0.0.1",
+        "255.255.255.254", "255.255.256.0",
+    ])
+    def test_parse_netmask_matches_ipaddress(self, text):
+        assert addrmath.parse_netmask(text) == self._reference_netmask(text)
+
+    def test_every_prefix_and_hostmask(self):
+        for prefix in range(33):
+            mask, hostmask = addrmath.PREFIX_MASKS[prefix], addrmath.PREFIX_WILDCARDS[prefix]
+            assert addrmath.parse_netmask(mask) == self._reference_netmask(mask)
+            assert addrmath.parse_netmask(hostmask) == self._reference_netmask(hostmask)
+
+    def test_contiguous(self):
+        assert addrmath.is_contiguous(0xFFFFFF00) and addrmath.is_contiguous(0)
+        assert not addrmath.is_contiguous(0xFF00FF00)
+
+
+class TestBatch:
+
+    def test_wildcards_match_scalar(self):
+        masks = ["255.255.255.0", "/16", "bad", None, ["x"], "255.255.255.0"]
+        assert addrmath.wildcards(masks) == [
+            "0.0.0.255", "0.0.255.255", "0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.255"
+        ]
+
+    def test_dotted_masks(self):
+        assert addrmath.dotted_masks(["24", "/8", "255.255.0.0", "99"]) == [
+            "255.255.255.0", "255.0.0.0", "255.255.0.0", "255.255.255.0"
+        ]
+
+
+class TestGeneratorsUseAddrmath:
+
+    def test_legacy_wrapper_rejects_non_strings(self):
+        assert _mask_to_wildcard(["255.255.255.0"]) == "0.0.0.0"
+
+    def test_ospf_fallback_wildcards(self):
+        lines = generate_protocol_config("OSPF", "1.1.1.1", [("10.0.0.1", "255.255.255.252"), ("192.168.1.1", "/24")], cache=False)
+        assert "  network 10.0.0.1 0.0.0.3 area 0" in lines
+        assert "  network 192.168.1.1 0.0.0.255 area 0" in lines
+
+    def test_nat_accepts_cidr_dhcp_mask(self):
+        text = "\n".join(generate_nat_config("PAT", "Gi0/0", "Gi0/1", "", "", "192.168.1.0", "24"))
+        assert "access-list 1 permit 192.168.1.0 0.0.0.255" in text
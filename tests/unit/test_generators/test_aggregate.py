@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from backend.aggregate import aggregate_static_routes, bgp_aggregates, collapse, prefix_of
+from backend.ir import BgpNetwork, StaticRoute
+from backend.protocols import aggregation_summary, generate_protocol_config
+
+
+def _lpm(table, addr):
+    best = None
+    for (net, plen), attrs in table.items():
+        mask = (0xFFFFFFFF << (32 - plen)) & 0xFFFFFFFF
+        if addr & mask == net and (best is None or plen > best[0]):
+            best = (plen, attrs)
+    return best and best[1]
+
+
+class TestPrefixOf:
+
+    @pytest.mark.parametrize("address,mask,expected", [
+        ("10.0.0.0", "255.255.255.0", (0x0A000000, 24)),
+        ("0.0.0.0", "0.0.0.0", (0, 0)),
+        ("10.0.0.1", "255.255.255.0", None),      # host bits set
+        ("10.0.0.0", "255.0.255.0", None),        # non-contiguous mask
+        ("bad", "255.255.255.0", None),
+    ])
+    def test_prefix_of(self, address, mask, expected):
+        assert prefix_of(address, mask) == expected
+
+
+class TestCollapse:
+
+    def test_siblings_merge_recursively(self):
+        a = frozenset({"A"})
+        table = {(0x0A000000 + (i << 8), 24): a for i in range(4)}
+        assert collapse(table) == {(0x0A000000, 22): a}
+
+    def test_sibling_merge_blocked_by_parent_with_other_attrs(self):
+        a, b = frozenset({"A"}), frozenset({"B"})
+        table = {(0x0A000000, 24): a, (0x0A000100, 24): a, (0x0A000000, 23): b}
+        assert collapse(table) == table
+
+    def test_covered_prefix_removed_only_under_nearest_ancestor(self):
+        a, b = frozenset({"A"}), frozenset({"B"})
+        table = {(0x0A000000, 8): a, (0x0A000000, 16): b, (0x0A000500, 24): a, (0x0B000000, 16): a}
+        assert collapse(table) == table
+        table[(0x0A010000, 16)] = a
+        assert (0x0A010000, 16) not in collapse(table)
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_longest_prefix_match_is_preserved(self, seed):
+        rnd = random.Random(seed)
+        base = 0x0A000000
+        table = {}
+        for _ in range(rnd.randint(1, 40)):
+            plen = rnd.randint(18, 26)
+            net = (base + rnd.randrange(1 << 14)) & ((0xFFFFFFFF << (32 - plen)) & 0xFFFFFFFF)
+            table[(net, plen)] = frozenset({rnd.choice("AB")})
+        result = collapse(table)
+        assert len(result) <= len(table)
+        for addr in range(base, base + (1 << 14), 64):
+            assert _lpm(result, addr) == _lpm(table, addr)
+
+
+class TestAggregateNodes:
+
+    def test_static_routes_and_saved_count(self):
+        routes = [StaticRoute(f"192.168.{i}.0", "255.255.255.0", "10.0.0.2") for i in range(8)]
+        routes.append(StaticRoute("192.168.8.0", "255.255.255.0", "10.0.0.3"))
+        routes.append(StaticRoute("192.168.3.0", "255.255.255.0", "10.0.0.2"))  # duplicate
+        out, saved = aggregate_static_routes(routes)
+        assert out == [
+            StaticRoute("192.168.0.0", "255.255.248.0", "10.0.0.2"),
+            StaticRoute("192.168.8.0", "255.255.255.0", "10.0.0.3"),
+        ]
+        assert saved == 8
+
+    def test_different_ad_is_not_merged(self):
+        routes = [StaticRoute("10.0.0.0", "255.255.255.0", "1.1.1.1", ad="200"),
+                  StaticRoute("10.0.1.0", "255.255.255.0", "1.1.1.1")]
+        out, saved = aggregate_static_routes(routes)
+        assert saved == 0 and len(out) == 2
+
+    def test_unparseable_routes_pass_through(self):
+        odd = StaticRoute("10.0.0.1", "255.255.255.0", "1.1.1.1")
+        out, saved = aggregate_static_routes([odd])
+        assert out == [odd] and saved == 0
+
+    def test_bgp_aggregates(self):
+        nets = [BgpNetwork("172.16.0.0", "255.255.255.0"), BgpNetwork("172.16.1.0", "255.255.255.0")]
+        assert bgp_aggregates(nets) == [BgpNetwork("172.16.0.0", "255.255.254.0")]
+
+    def test_bgp_aggregates_only_new_fully_covered_prefixes(self):
+        nets = [
+            BgpNetwork("10.0.0.0", "255.255.0.0"), BgpNetwork("10.0.5.0", "255.255.255.0"),  # already covered
+            BgpNetwork("172.16.0.0", "255.255.255.0"), BgpNetwork("172.16.2.0", "255.255.255.0"),  # not siblings
+            BgpNetwork("192.168.1.1", "255.255.255.0"),  # host bits
+        ]
+        assert bgp_aggregates(nets) == []
+
+
+class TestProtocolIntegration:
+
+    def _static(self, aggregate):
+        rc = {"aggregatePrefixes": aggregate, "staticRoutes": [
+            {"dest": f"10.1.{i}.0", "mask": "24", "nextHop": "192.168.1.254"} for i in range(16)
+        ]}
+        return generate_protocol_config("STATIC", "", [], routing_config=rc, cache=False)
+
+    def test_static_aggregation_is_opt_in(self):
+        assert len(self._static(False)) == 17
+        assert self._static(True) == ["!", "ip route 10.1.0.0 255.255.240.0 192.168.1.254"]
+
+    def test_static_summary(self):
+        rc = {"aggregatePrefixes": True, "staticRoutes": [
+            {"dest": f"10.1.{i}.0", "mask": "24", "nextHop": "192.168.1.254"} for i in range(16)
+        ]}
+        assert aggregation_summary("STATIC", "", [], routing_config=rc) == {"savedLines": 15}
+        assert aggregation_summary("STATIC", "", [], routing_config=dict(rc, aggregatePrefixes=False)) is None
+
+    def _bgp(self, aggregate, networks):
+        rc = {"aggregatePrefixes": aggregate, "localAs": "65001", "bgpAdvertisedNetworks": [
+            {"network": net, "mask": "24"} for net in networks
+        ]}
+        return generate_protocol_config("BGP", "1.1.1.1", [], routing_config=rc, cache=False)
+
+    @staticmethod
+    def _advertised(lines):
+        """Prefixes sent to neighbours: network statements (exact RIB match)
+        plus aggregates, minus the components hidden by summary-only."""
+        networks = {tuple(l.split()[1::2]) for l in lines if l.strip().startswith("network ")}
+        aggregates = {tuple(l.split()[1:3]) for l in lines if l.strip().startswith("aggregate-address ")}
+        def inside(prefix, aggregate):
+            (net, plen), (agg, agg_len) = prefix_of(*prefix), prefix_of(*aggregate)
+            return plen > agg_len and net >> (32 - agg_len) == agg >> (32 - agg_len)
+
+        hidden = {prefix for prefix in networks if any(inside(prefix, agg) for agg in aggregates)}
+        return networks - hidden | aggregates
+
+    def test_bgp_network_statements_are_kept(self):
+        nets = ["10.2.0.0", "10.2.1.0", "10.2.2.0", "10.2.3.0", "10.9.0.0"]
+        plain, aggregated = self._bgp(False, nets), self._bgp(True, nets)
+        assert [l for l in aggregated if "network " in l] == [l for l in plain if "network " in l]
+        assert [l for l in aggregated if "aggregate-address" in l] == ["  aggregate-address 10.2.0.0 255.255.252.0 summary-only"]
+
+    def test_bgp_summary(self):
+        rc = {"aggregatePrefixes": True, "localAs": "65001", "bgpAdvertisedNetworks": [
+            {"network": net, "mask": "24"} for net in ("10.2.0.0", "10.2.1.0", "10.9.0.0")
+        ]}
+        assert aggregation_summary("BGP", "1.1.1.1", [], routing_config=rc) == {"aggregateAddresses": 1}
+        assert aggregation_summary("OSPF", "1.1.1.1", [], routing_config=rc) is None
+
+    def test_bgp_advertised_set(self):
+        nets = ["10.2.0.0", "10.2.1.0", "10.2.2.0", "10.2.3.0", "10.9.0.0"]
+        assert self._advertised(self._bgp(False, nets)) == {(net, "255.255.255.0") for net in nets}
+        assert self._advertised(self._bgp(True, nets)) == {("10.2.0.0", "255.255.252.0"), ("10.9.0.0", "255.255.255.0")}
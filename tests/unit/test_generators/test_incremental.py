@@ -0,0 +1,124 @@
+import pytest
+
+from backend.generate import generate_full_config
+from backend.incremental import ALL_SECTIONS, IncrementalGenerator, sections_for_keys
+from backend.request import RequestError, build_generation_kwargs
+
+
+BASE = {
+    "hostname": "LiveR1",
+    "interfaces": ["Gi0/0", "Gi0/1"],
+    "networks": [["192.168.10.1", "255.255.255.0"], ["10.0.0.1", "255.255.255.252"]],
+    "noShutdownInterfaces": ["Gi0/0", "Gi0/1"],
+    "descriptions": ["LAN", "WAN"],
+    "ipMulticast": True,
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "routingConfig": {"ospfProcessId": "10", "ospfArea": "0"},
+    "telephonyEnabled": True,
+    "dnList": [{"number": "1001", "user": "Alice", "mac": "AABB.CCDD.0001"}],
+    "enableSsh": True,
+    "enableSecret": "Liv3Secret",
+    "consolePassword": "ConP4ssword",
+    "adminUsername": "admin",
+    "adminPassword": "AdminP4ss99",
+    "domainName": "live.lab",
+    "dhcpNetwork": "192.168.10.0",
+    "dhcpMask": "255.255.255.0",
+    "dhcpGateway": "192.168.10.1",
+    "dhcpDns": "8.8.8.8",
+    "natType": "PAT",
+    "natInside": "Gi0/0",
+    "natOutside": "Gi0/1",
+    "snmpEnabled": True,
+    "snmpCommunityRo": "public",
+}
+
+EDITS = [
+    ("hostname", "LiveR2"),
+    ("descriptions", ["USERS", "UPLINK"]),
+    ("networks", [["192.168.20.1", "255.255.255.0"], ["10.0.0.5", "255.255.255.252"]]),
+    ("routingProtocol", "EIGRP"),
+    ("routerId", "2.2.2.2"),
+    ("ipMulticast", False),
+    ("dnList", [{"number": "1002", "user": "Bob", "mac": "AABB.CCDD.0002"}]),
+    ("enableSsh", False),
+    ("domainName", "other.lab"),
+    ("dhcpGateway", "192.168.10.254"),
+    ("dhcpDns", "1.1.1.1"),
+    ("natInside", "Gi0/1"),
+    ("snmpCommunityRo", "monitor"),
+    ("snmpLocation", "Rack 4"),
+    ("dhcpExcludedFrom", "192.168.10.1"),
+]
+
+
+def _full(config_data):
+    return generate_full_config(**build_generation_kwargs(config_data))
+
+
+class TestIncrementalGenerator:
+
+    def test_first_update_renders_everything(self):
+        gen = IncrementalGenerator()
+        assert gen.update(BASE) == _full(BASE)
+        assert gen.last_dirty == ALL_SECTIONS
+
+    @pytest.mark.parametrize("key,value", EDITS)
+    def test_single_edit_matches_full_generation(self, key, value):
+        gen = IncrementalGenerator()
+        gen.update(BASE)
+        edited = dict(BASE, **{key: value})
+        assert gen.update(edited) == _full(edited)
+        assert set(gen.last_dirty) < set(ALL_SECTIONS)
+
+    def test_sequence_of_edits_stays_consistent(self):
+        gen = IncrementalGenerator()
+        data = dict(BASE)
+        gen.update(data)
+        for key, value in EDITS:
+            data = dict(data, **{key: value})
+            assert gen.update(data) == _full(data)
+
+    def test_snmp_edit_rerenders_only_snmp(self):
+        gen = IncrementalGenerator()
+        gen.update(BASE)
+        gen.update(dict(BASE, snmpCommunityRo="monitor"))
+        assert gen.last_dirty == ("snmp",)
+
+    def test_unchanged_data_rerenders_nothing(self):
+        gen = IncrementalGenerator()
+        first = gen.update(BASE)
+        assert gen.update(dict(BASE)) == first
+        assert gen.last_dirty == ()
+
+    @pytest.mark.parametrize("protocol", ["RIP", "OSPF", "EIGRP"])
+    def test_interfaces_without_networks_update_routing(self, protocol):
+        # Placeholder networks follow the interface list into `network` lines
+        data = {"hostname": "R1", "interfaces": ["Gi0/0"], "routingProtocol": protocol, "routerId": "1.1.1.1"}
+        gen = IncrementalGenerator()
+        gen.update(data)
+        edited = dict(data, interfaces=["Gi0/0", "Gi0/1"])
+        assert gen.update(edited) == _full(edited)
+        assert "protocols" in gen.last_dirty
+
+    def test_invalid_update_keeps_previous_state(self):
+        gen = IncrementalGenerator()
+        first = gen.update(BASE)
+        with pytest.raises(RequestError):
+            gen.update(dict(BASE, interfaces=[]))
+        assert gen.lines() == first
+        edited = dict(BASE, hostname="AfterError")
+        assert gen.update(edited) == _full(edited)
+
+
+class TestSectionsForKeys:
+
+    def test_unknown_key_marks_everything_dirty(self):
+        assert sections_for_keys({"somethingNew"}) == set(ALL_SECTIONS)
+
+    def test_ignored_key(self):
+        assert sections_for_keys({"deviceId"}) == set()
+
+    def test_prefix_groups(self):
+        assert sections_for_keys({"snmpTrapHost", "natInsideLocal"}) == {"snmp", "nat"}
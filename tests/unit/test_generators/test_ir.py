@@ -0,0 +1,67 @@
+import pickle
+
+import pytest
+
+from backend.generate import interface_section, telephony_section
+from backend.ir import BgpNetwork, Ephone, Interface, OspfNetwork, StaticRoute
+from backend.jinja_env import render_template_to_lines
+from backend.protocols import protocol_section
+from backend.section_cache import canonical_key
+
+
+class TestNodes:
+
+    def test_defaults_and_keywords(self):
+        intf = Interface("Gi0/0", "10.0.0.1", "255.255.255.0", is_nat_inside=True)
+        assert intf.description == ""
+        assert intf.no_shutdown is True
+        assert intf.is_nat_inside is True
+
+    def test_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            OspfNetwork("10.0.0.0", "0.0.0.255").extra = 1
+
+    def test_missing_and_unexpected_fields(self):
+        with pytest.raises(TypeError):
+            BgpNetwork("10.0.0.0")
+        with pytest.raises(TypeError):
+            OspfNetwork("10.0.0.0", "0.0.0.255", bogus=1)
+        with pytest.raises(TypeError):
+            OspfNetwork("10.0.0.0", "0.0.0.255", "0", "extra")
+
+    def test_value_equality_and_hash(self):
+        a = StaticRoute("0.0.0.0", "0.0.0.0", "10.0.0.2")
+        b = StaticRoute("0.0.0.0", "0.0.0.0", next_hop="10.0.0.2")
+        assert a == b and hash(a) == hash(b)
+        assert a != StaticRoute("0.0.0.0", "0.0.0.0", "10.0.0.3")
+        assert len({a, b}) == 1
+
+    def test_pickle_roundtrip(self):
+        node = Ephone(1, "1001", "Alice", "AABB.CCDD.0001")
+        assert pickle.loads(pickle.dumps(node)) == node
+
+
+class TestSectionsEmitIR:
+
+    def test_interface_section(self):
+        _name, ctx = interface_section(["Gi0/0"], [("10.0.0.1", "255.255.255.0")], nat_outside="Gi0/0")
+        assert ctx["interface_data"] == [
+            Interface("Gi0/0", "10.0.0.1", "255.255.255.0", is_nat_outside=True)
+        ]
+
+    def test_telephony_section(self):
+        _name, ctx = telephony_section(True, [{"number": " 1001 ", "user": "Bob"}])
+        assert ctx["dn_list"] == [Ephone(1, "1001", "Bob", "")]
+
+    def test_static_routes_render_from_ir(self):
+        name, ctx = protocol_section("STATIC", "", [], routing_config={"staticRoutes": [
+            {"dest": "172.16.0.0", "mask": "/16", "nextHop": "10.0.0.2", "ad": "200"},
+        ]})
+        assert list(ctx["static_routes"]) == [StaticRoute("172.16.0.0", "255.255.0.0", "10.0.0.2", ad="200")]
+        assert render_template_to_lines(name, ctx) == ["!", "ip route 172.16.0.0 255.255.0.0 10.0.0.2 200"]
+
+    def test_canonical_key_follows_node_values(self):
+        def key(area):
+            return canonical_key("routing/ospf.j2", {"ospf_networks": [OspfNetwork("10.0.0.0", "0.0.0.255", area)]})
+        assert key("0") == key("0")
+        assert key("0") != key("1")
@@ -0,0 +1,185 @@
+import json
+import os
+
+import pytest
+from backend import main, result_cache as result_cache_module
+from backend.result_cache import FINGERPRINT_NAME, ResultCache, canonical_request, result_cache
+
+
+FORM = {
+    "hostname": "Edge1",
+    "interfaces": ["Gi0/0", "Gi0/1"],
+    "networks": [["10.0.0.1", "30"], ["192.168.1.1", "24"]],
+    "routingProtocol": "OSPF",
+    "routerId": "1.1.1.1",
+    "routingConfig": {"ospfProcessId": "1", "ospfArea": "0"},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_shared_cache():
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+def _entries(path):
+    return sorted(name for name in os.listdir(path) if name != FINGERPRINT_NAME)
+
+
+class TestCanonicalRequest:
+
+    def test_key_ignores_order_and_text_whitespace(self):
+        cache = ResultCache()
+        shuffled = dict(reversed(list(FORM.items())), hostname=" Edge1 ", interfaces=["Gi0/0 ", " Gi0/1"])
+        assert cache.key(shuffled) == cache.key(FORM)
+
+    def test_key_depends_on_values(self):
+        cache = ResultCache()
+        assert cache.key(dict(FORM, routerId="2.2.2.2")) != cache.key(FORM)
+        assert cache.key(dict(FORM, networks=[["10.0.0.1", "30"], ["192.168.2.1", "24"]])) != cache.key(FORM)
+
+    def test_nested_values_are_kept_verbatim(self):
+        assert '"ospfArea":"0"' in canonical_request(dict(FORM, routingConfig={"ospfArea": "0"}))
+        assert '" x "' in canonical_request({"dnList": [" x "]})
+
+    def test_unserializable_form_bypasses_cache(self):
+        cache = ResultCache()
+        assert cache.key(dict(FORM, extra=object())) is None
+        assert cache.stats()["bypassed"] == 1
+        assert ResultCache(maxsize=0).key(FORM) is None
+
+
+class TestResultCache:
+
+    def test_hits_misses_and_eviction(self):
+        cache = ResultCache(maxsize=2)
+        keys = [cache.key(dict(FORM, hostname=name)) for name in ("R1", "R2", "R3")]
+        assert cache.get(keys[0]) is None
+        for key in keys:
+            cache.put(key, key[:8])
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[2]) == keys[2][:8]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 2, 1, 2)
+        assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+    def test_latency_percentiles(self):
+        cache = ResultCache()
+        for ms in (1, 2, 3, 4):
+            cache.observe(False, ms / 1000)
+        cache.observe(True, 0.0001)
+        latency = cache.stats()["latency"]
+        assert latency["miss"]["count"] == 4 and latency["miss"]["p50_ms"] == 3.0
+        assert latency["hit"]["p95_ms"] == 0.1
+
+
+class TestDiskTier:
+
+    def test_survives_restart(self, tmp_path):
+        first = ResultCache(path=str(tmp_path))
+        key = first.key(FORM)
+        first.put(key, "hostname Edge1")
+        restarted = ResultCache(path=str(tmp_path))
+        assert restarted.get(key) == "hostname Edge1"
+        assert restarted.stats()["disk_hits"] == 1
+        # Promoted to memory: the next hit does not touch the disk
+        assert restarted.get(key) == "hostname Edge1"
+        assert restarted.stats()["disk_hits"] == 1
+
+    def test_fingerprint_change_clears_directory(self, tmp_path, monkeypatch):
+        cache = ResultCache(path=str(tmp_path))
+        cache.put(cache.key(FORM), "hostname Edge1")
+        assert len(_entries(tmp_path)) == 1
+
+        monkeypatch.setattr(result_cache_module, "_fingerprint", "templates-v2")
+        upgraded = ResultCache(path=str(tmp_path))
+        assert upgraded.get(upgraded.key(FORM)) is None
+        assert _entries(tmp_path) == []
+        assert (tmp_path / FINGERPRINT_NAME).read_text() == "templates-v2"
+
+    def test_directory_is_bounded(self, tmp_path):
+        cache = ResultCache(maxsize=1, path=str(tmp_path), max_files=4)
+        for n in range(6):
+            cache.put(cache.key(dict(FORM, hostname=f"R{n}")), f"hostname R{n}")
+        assert len(_entries(tmp_path)) <= 4
+        assert cache.stats()["disk_size"] == len(_entries(tmp_path))
+
+    def test_unusable_directory_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = ResultCache(path=str(blocker / "cache"))
+        key = cache.key(FORM)
+        cache.put(key, "hostname Edge1")
+        assert cache.get(key) == "hostname Edge1"
+        assert cache.stats()["disk"] is None
+
+
+class TestProcessText:
+
+    def test_repeated_generate_is_served_from_cache(self):
+        first = main.process_text(dict(FORM))
+        assert "hostname Edge1" in first
+        assert main.process_text(dict(FORM, hostname="Edge1  ")) == first
+        stats = json.loads(main.cache_stats())["result_cache"]
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["latency"]["hit"]["count"] == 1 and stats["latency"]["miss"]["count"] == 1
+
+    def test_changed_form_is_regenerated(self):
+        main.process_text(dict(FORM))
+        assert "hostname Edge2" in main.process_text(dict(FORM, hostname="Edge2"))
+        assert result_cache.stats()["size"] == 2
+
+    def test_errors_are_not_cached(self):
+        bad = dict(FORM, hostname="bad host")
+        assert json.loads(main.process_text(bad))["code"] == "ERR-VAL-006"
+        assert json.loads(main.process_text(bad))["code"] == "ERR-VAL-006"
+        assert result_cache.stats()["size"] == 0 and result_cache.stats()["hits"] == 0
+
+
+class TestDiskPolicy:
+
+    @pytest.mark.parametrize("value", ["", "off", "0"])
+    def test_disk_tier_is_opt_in(self, monkeypatch, value):
+        monkeypatch.setenv("CRW_DISK_CACHE", value)
+        assert result_cache_module.disk_dir_from_env() is None
+
+    def test_env_selects_directory(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        monkeypatch.setenv("CRW_DISK_CACHE", "on")
+        assert result_cache_module.disk_dir_from_env() == result_cache_module.default_cache_dir()
+        assert result_cache_module.default_cache_dir().startswith(str(tmp_path))
+        monkeypatch.setenv("CRW_DISK_CACHE", str(tmp_path / "custom"))
+        assert result_cache_module.disk_dir_from_env() == str(tmp_path / "custom")
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+    def test_files_are_private(self, tmp_path):
+        path = tmp_path / "cache"
+        cache = ResultCache(path=str(path))
+        key = cache.key(FORM)
+        cache.put(key, "hostname Edge1")
+        assert path.stat().st_mode & 0o777 == 0o700
+        for name in os.listdir(path):
+            assert (path / name).stat().st_mode & 0o777 == 0o600
+
+    @pytest.mark.parametrize("line", [
+        "enable algorithm-type scrypt secret Liv3Secret",
+        " password C0nsole!",
+        "username admin privilege 15 algorithm-type scrypt secret AdminP4ss99",
+        "snmp-server community s3cret RO",
+        "snmp-server host 10.0.0.5 version 2c s3cret",
+    ])
+    def test_credentials_stay_in_memory(self, tmp_path, line):
+        cache = ResultCache(path=str(tmp_path))
+        key = cache.key(FORM)
+        cache.put(key, f"hostname Edge1\n{line}\n")
+        assert _entries(tmp_path) == []
+        assert cache.get(key) == f"hostname Edge1\n{line}\n"
+
+    def test_generated_config_with_secrets_is_not_written(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_cache_module, "result_cache", ResultCache(path=str(tmp_path)))
+        form = dict(FORM, enableSecret="Liv3Secret", snmpEnabled=True, snmpCommunityRo="s3cret")
+        assert "Liv3Secret" in main.process_text(form)
+        main.process_text(dict(FORM))
+        written = [(tmp_path / name).read_text() for name in _entries(tmp_path)]
+        assert len(written) == 1 and "Liv3Secret" not in written[0]
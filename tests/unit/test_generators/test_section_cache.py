@@ -0,0 +1,103 @@
+import pytest
+from backend.section_cache import SectionCache, canonical_key, section_cache
+from backend.generate import generate_security_config, generate_snmp_config, generate_full_config
+from backend.protocols import generate_protocol_config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_shared_cache():
+    section_cache.clear()
+    yield
+    section_cache.clear()
+
+
+class TestCanonicalKey:
+
+    def test_key_ignores_dict_order_and_tuple_vs_list(self):
+        a = canonical_key("snmp.j2", {"x": 1, "y": ("a", "b")})
+        b = canonical_key("snmp.j2", {"y": ["a", "b"], "x": 1})
+        assert a == b
+
+    def test_key_depends_on_template_and_values(self):
+        base = canonical_key("snmp.j2", {"x": 1})
+        assert canonical_key("nat.j2", {"x": 1}) != base
+        assert canonical_key("snmp.j2", {"x": 2}) != base
+
+
+class TestSectionCache:
+
+    def test_hit_returns_same_immutable_tuple(self):
+        cache = SectionCache()
+        ctx = {"hostname": "R1"}
+        first = cache.render("base.j2", ctx)
+        second = cache.render("base.j2", dict(ctx))
+        assert isinstance(first, tuple)
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = SectionCache(maxsize=2)
+        for name in ("R1", "R2", "R1", "R3"):
+            cache.render("base.j2", {"hostname": name})
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+        # R2 was least recently used and is gone; R1 survived
+        cache.render("base.j2", {"hostname": "R1"})
+        assert cache.stats()["hits"] == 2
+
+    def test_large_tables_bypass_cache(self):
+        cache = SectionCache(max_items=3)
+        ctx = {"pim_interfaces": [f"Gi0/{i}" for i in range(5)], "ip_multicast": True}
+        lines = cache.render("multicast.j2", ctx)
+        assert "ip multicast-routing" in lines
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["bypassed"] == 1
+
+
+class TestGeneratorCaching:
+
+    def test_identical_security_sections_rendered_once(self):
+        args = (True, "S3cretPass", "ConP4ssword", "admin", "AdminP4ss99", "corp.lab")
+        a = generate_security_config(*args, cache=True)
+        b = generate_security_config(*args, cache=True)
+        assert a == b and a is not b
+        assert section_cache.stats()["hits"] == 1
+
+    def test_secret_sections_are_not_cached_by_default(self):
+        generate_security_config(True, "S3cretPass", "", "admin", "AdminP4ss99", "corp.lab")
+        generate_snmp_config(True, "public", "private", "", "", "")
+        assert section_cache.stats()["size"] == 0
+
+    @pytest.mark.parametrize("cache", [True, False])
+    def test_helpers_return_lists(self, cache):
+        assert generate_protocol_config("None", "", [], cache=cache) == []
+        lines = generate_protocol_config("RIP", "", [("192.168.1.0", "255.255.255.0")], cache=cache)
+        assert lines == ['!', 'router rip', ' version 2', ' network 192.168.1.0', ' no auto-summary', ' exit']
+        assert type(lines) is list
+        assert type(generate_snmp_config(True, "public", "", "", "", "", cache=cache)) is list
+        # A caller mutating the result does not corrupt the cached copy
+        lines.append("extra")
+        assert generate_protocol_config("RIP", "", [("192.168.1.0", "255.255.255.0")], cache=cache)[-1] == " exit"
+
+    def test_protocol_section_cached(self):
+        rc = {"ospfNetworks": [{"network": "10.0.0.0", "wildcard": "0.0.0.255", "area": "0"}]}
+        a = generate_protocol_config("OSPF", "1.1.1.1", [], routing_config=rc)
+        b = generate_protocol_config("OSPF", "1.1.1.1", [], routing_config=dict(rc))
+        assert a == b
+        assert section_cache.stats()["hits"] == 1
+
+    def test_full_config_cache_secrets_false(self):
+        kwargs = dict(
+            hostname="R1", interfaces=["Gi0/0"], networks=[("10.0.0.1", "255.255.255.0")],
+            ip_multicast=True, routing_protocol="RIP", router_id="", telephony_enabled=False,
+            dn_list=[], enable_ssh=False, enable_secret="S3cretPass", console_password="",
+            admin_username="", admin_password="", domain_name="", dhcp_network="", dhcp_mask="",
+            dhcp_gateway="", dhcp_dns="",
+        )
+        uncached = generate_full_config(**kwargs, cache_sections=False)
+        assert section_cache.stats()["size"] == 0
+        assert generate_full_config(**kwargs, cache_secrets=False) == uncached
+        # multicast + RIP cached, security skipped
+        assert section_cache.stats()["size"] == 2
@@ -0,0 +1,78 @@
+import inspect
+import types
+
+import pytest
+from backend.jinja_env import env, iter_template_lines, render_template_to_lines
+from backend.generate import generate_full_config, iter_full_config
+
+
+FULL = dict(
+    hostname="StreamR1",
+    interfaces=["Gi0/0", "Gi0/1"],
+    networks=[("192.168.1.1", "255.255.255.0"), ("10.0.0.1", "255.255.255.252")],
+    ip_multicast=True,
+    routing_protocol="STATIC",
+    router_id="",
+    telephony_enabled=True,
+    dn_list=[{"number": "1001", "user": "Alice", "mac": "AABB.CCDD.0001"}],
+    enable_ssh=True,
+    enable_secret="Str3amSecret",
+    console_password="ConP4ssword",
+    admin_username="admin",
+    admin_password="AdminP4ss99",
+    domain_name="stream.lab",
+    dhcp_network="192.168.1.0",
+    dhcp_mask="255.255.255.0",
+    dhcp_gateway="192.168.1.1",
+    dhcp_dns="8.8.8.8",
+    nat_type="PAT",
+    nat_inside="Gi0/0",
+    nat_outside="Gi0/1",
+    snmp_enabled=True,
+    snmp_community_ro="public",
+    routing_config={"staticRoutes": [
+        {"dest": "0.0.0.0", "mask": "0", "nextHop": "10.0.0.2"},
+        {"dest": "172.16.0.0", "mask": "/16", "nextHop": "10.0.0.2", "ad": "200"},
+    ]},
+)
+
+
+class TestIterTemplateLines:
+
+    @pytest.mark.parametrize("name", ["base.j2", "security.j2", "routing/ospf.j2"])
+    def test_matches_render_splitlines(self, name):
+        context = {"hostname": "R9", "enable_secret": "x", "console_password": "y",
+                   "ospf_pid": "1", "ospf_rid": "1.1.1.1",
+                   "ospf_networks": [{"ip": "10.0.0.0", "wildcard": "0.0.0.255", "area": "0"}]}
+        expected = [l for l in env.get_template(name).render(**context).splitlines() if l.strip()]
+        assert list(iter_template_lines(name, context)) == expected
+        assert render_template_to_lines(name, context) == expected
+
+    def test_is_lazy(self):
+        assert isinstance(iter_template_lines("base.j2", {"hostname": "R1"}), types.GeneratorType)
+
+
+class TestIterFullConfig:
+
+    def test_same_lines_as_generate_full_config(self):
+        assert list(iter_full_config(**FULL)) == generate_full_config(**FULL)
+
+    def test_generate_full_config_has_explicit_signature(self):
+        params = inspect.signature(generate_full_config).parameters
+        assert list(params) == list(inspect.signature(iter_full_config).parameters)
+        assert params["hostname"].default is inspect.Parameter.empty
+        with pytest.raises(TypeError):
+            generate_full_config(**dict(FULL, host_name="R1"))
+
+    def test_yields_sections_in_order(self):
+        it = iter_full_config(**FULL)
+        assert next(it) == "enable"
+        assert next(it) == "configure terminal"
+        rest = list(it)
+        assert rest[-3:] == ["!", "end", "write memory"]
+        assert "ip route 172.16.0.0 255.255.0.0 10.0.0.2 200" in rest
+        assert "ip route 0.0.0.0 0.0.0.0 10.0.0.2" in rest
+
+    def test_empty_static_table_renders_nothing(self):
+        lines = list(iter_full_config(**dict(FULL, routing_config={"staticRoutes": []})))
+        assert not any(l.startswith("ip route") for l in lines)
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+
+import pytest
+from jinja2 import Environment, ModuleLoader
+
+from backend import jinja_env
+from backend.jinja_env import ENV_OPTIONS, MANIFEST_NAME, bundle_is_fresh, template_names
+from scripts.compile_templates import compile_bundle
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    target = str(tmp_path / "bundle")
+    compile_bundle(target)
+    return target
+
+
+@pytest.fixture
+def template_copy(tmp_path, monkeypatch):
+    # Private copy of backend/templates so tests can touch and edit files
+    source = str(tmp_path / "templates")
+    shutil.copytree(jinja_env._template_dir, source)
+    monkeypatch.setattr(jinja_env, "_template_dir", source)
+    return source
+
+
+def _edit_manifest(bundle, change):
+    path = os.path.join(bundle, MANIFEST_NAME)
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    change(manifest)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+class TestTemplateBundle:
+
+    def test_compiles_every_template(self, bundle):
+        modules = [f for f in os.listdir(bundle) if f.startswith("tmpl_")]
+        assert len(modules) == len(template_names())
+        assert "routing/ospf.j2" in template_names()
+
+    def test_fresh_bundle_detected(self, bundle):
+        assert bundle_is_fresh(bundle)
+
+    def test_stale_manifest_detected(self, bundle):
+        def change(manifest):
+            manifest["templates"]["base.j2"] = "0" * 64
+            manifest["stats"]["base.j2"] = [0, 0]
+        _edit_manifest(bundle, change)
+        assert not bundle_is_fresh(bundle)
+
+    def test_unchanged_stats_skip_hashing(self, bundle, monkeypatch):
+        def no_hashing():
+            raise AssertionError("templates were hashed")
+        monkeypatch.setattr(jinja_env, "build_manifest", no_hashing)
+        assert bundle_is_fresh(bundle)
+
+    def test_other_jinja2_version_is_stale(self, bundle):
+        _edit_manifest(bundle, lambda manifest: manifest.update(jinja2="0.0"))
+        assert not bundle_is_fresh(bundle)
+
+    def test_touched_template_is_rehashed(self, template_copy, tmp_path):
+        bundle = str(tmp_path / "bundle")
+        compile_bundle(bundle)
+        path = os.path.join(template_copy, "base.j2")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert bundle_is_fresh(bundle)
+
+    def test_edited_template_is_stale(self, template_copy, tmp_path):
+        bundle = str(tmp_path / "bundle")
+        compile_bundle(bundle)
+        with open(os.path.join(template_copy, "base.j2"), "a", encoding="utf-8") as f:
+            f.write("\n! edited\n")
+        assert not bundle_is_fresh(bundle)
+
+    def test_manifest_without_stats_is_hashed(self, bundle):
+        _edit_manifest(bundle, lambda manifest: manifest.pop("stats"))
+        assert bundle_is_fresh(bundle)
+
+    def test_missing_bundle_is_not_fresh(self, tmp_path):
+        assert not bundle_is_fresh(str(tmp_path / "nope"))
+
+    def test_bundle_renders_identically(self, bundle):
+        compiled = Environment(loader=ModuleLoader(bundle), **ENV_OPTIONS)
+        context = {"hostname": "R1", "interface_data": [
+            {"name": "Gi0/0", "ip": "10.0.0.1", "mask": "255.0.0.0", "description": "uplink",
+             "no_shutdown": True, "isis": False, "is_nat_inside": True, "is_nat_outside": False}]}
+        for name in ("base.j2", "interfaces.j2"):
+            expected = jinja_env.make_filesystem_env().get_template(name).render(**context)
+            assert compiled.get_template(name).render(**context) == expected
+
+    def test_env_override_off_uses_filesystem(self, monkeypatch):
+        monkeypatch.setenv("CRW_TEMPLATE_BUNDLE", "off")
+        _loader, source = jinja_env._select_loader()
+        assert source == "filesystem"
+
+    def test_env_override_path_uses_fresh_bundle(self, monkeypatch, bundle):
+        monkeypatch.setenv("CRW_TEMPLATE_BUNDLE", bundle)
+        loader, source = jinja_env._select_loader()
+        assert source == "bundle"
+        assert isinstance(loader, ModuleLoader)
@@ -0,0 +1,170 @@
+import pytest
+from backend import main
+from backend.request import RequestError, build_generation_kwargs
+from backend.validate import validate_config, validate_inputs, validate_many
+
+
+def _config(**overrides):
+    config = {
+        "hostname": "Edge1",
+        "interfaces": ["Gi0/0", "Gi0/1"],
+        "networks": [["192.168.1.1", "255.255.255.0"], ["10.0.0.1", "30"]],
+        "routingProtocol": "OSPF",
+        "routerId": "1.1.1.1",
+        "enableSecret": "Secr3tPass",
+        "dhcpNetwork": "192.168.1.0",
+        "dhcpMask": "255.255.255.0",
+        "dhcpGateway": "192.168.1.1",
+        "dhcpDns": "8.8.8.8",
+        "natType": "PAT",
+        "natInside": "Gi0/0",
+        "natOutside": "Gi0/1",
+        "snmpEnabled": True,
+        "snmpCommunityRo": "monitor",
+        "snmpTrapHost": "10.0.0.100",
+        "routingConfig": {
+            "processId": "10",
+            "ospfNetworks": [{"network": "192.168.1.0", "wildcard": "0.0.0.255", "area": "0"}],
+        },
+    }
+    config.update(overrides)
+    return config
+
+
+def _paths(errors):
+    return [error["path"] for error in errors]
+
+
+class TestValidateConfig:
+
+    def test_valid_config_has_no_errors(self):
+        assert validate_config(_config()) == []
+
+    def test_collects_every_error_with_its_path(self):
+        errors = validate_config(_config(
+            hostname="1Edge",
+            networks=[["192.168.1.1", "255.0.255.0"], ["127.0.0.1", "30"]],
+            enableSecret="short",
+            dhcpGateway="10.9.9.9",
+        ))
+        assert _paths(errors) == ["hostname", "networks[0].mask", "networks[1].ip", "enableSecret", "dhcpGateway"]
+        assert all(error["message"].startswith("❌ Error:") for error in errors)
+
+    @pytest.mark.parametrize("overrides", [
+        {"hostname": "1Edge"},
+        {"networks": []},
+        {"networks": [["192.168.1.1", ""]]},
+        {"networks": [["192.168.1.a@", "24"]]},
+        {"routerId": ""},
+        {"routerId": "255.255.255.255"},
+        {"enableSecret": "nodigits"},
+        {"dhcpMask": "255.255.0.255"},
+        {"dhcpGateway": "10.0.0.1"},
+        {"dhcpNetwork": "192.168.1.1"},
+        {"dhcpDns": "224.0.0.5"},
+    ])
+    def test_first_error_matches_validate_inputs(self, overrides):
+        config = _config(**overrides)
+        legacy = validate_inputs(
+            networks=config["networks"], hostname=config["hostname"], routing_protocol=config["routingProtocol"],
+            router_id=config["routerId"], enable_secret=config["enableSecret"], dhcp_network=config["dhcpNetwork"],
+            dhcp_mask=config["dhcpMask"], dhcp_gateway=config["dhcpGateway"], dhcp_dns=config["dhcpDns"],
+        )
+        errors = validate_config(config)
+        assert legacy and errors[0]["message"] == legacy
+
+    def test_static_routes(self):
+        errors = validate_config(_config(routingProtocol="STATIC", routingConfig={"staticRoutes": [
+            {"dest": "0.0.0.0", "mask": "0", "nextHop": "10.0.0.2"},
+            {"dest": "10.1.0.0", "mask": "/16", "interface": "Gi0/1"},
+            {"dest": "10.2.0.1", "mask": "24", "nextHop": "10.0.0.2"},
+            {"dest": "10.3.0.0", "mask": "255.0.255.0", "nextHop": "", "ad": "300"},
+            "not a route",
+        ]}))
+        assert _paths(errors) == [
+            "routingConfig.staticRoutes[2].mask",
+            "routingConfig.staticRoutes[3].mask",
+            "routingConfig.staticRoutes[3].nextHop",
+            "routingConfig.staticRoutes[3].ad",
+            "routingConfig.staticRoutes[4]",
+        ]
+        assert "біти хоста" in errors[0]["message"]
+
+    def test_ospf_rules(self):
+        errors = validate_config(_config(routingConfig={"processId": "0", "ospfNetworks": [
+            {"network": "10.0.0.0", "wildcard": "0.0.0.255", "area": "0.0.0.1"},
+            {"network": "10.0.0", "wildcard": "0.0.0.x", "area": "backbone"},
+        ]}))
+        assert _paths(errors) == [
+            "routingConfig.processId",
+            "routingConfig.ospfNetworks[1].network",
+            "routingConfig.ospfNetworks[1].wildcard",
+            "routingConfig.ospfNetworks[1].area",
+        ]
+
+    def test_bgp_rules(self):
+        errors = validate_config(_config(routingProtocol="BGP", routingConfig={
+            "localAs": "65001",
+            "bgpNeighbors": [{"ip": "203.0.113.2", "remoteAs": "65002"}, {"ip": "127.0.0.1", "remoteAs": "0"}],
+            "bgpAdvertisedNetworks": [{"network": "192.168.1.0", "mask": "24"}, {"network": "192.168.1.1", "mask": "24"}],
+        }))
+        assert _paths(errors) == [
+            "routingConfig.bgpNeighbors[1].ip",
+            "routingConfig.bgpNeighbors[1].remoteAs",
+            "routingConfig.bgpAdvertisedNetworks[1].mask",
+        ]
+
+    def test_rules_follow_selected_protocol(self):
+        # OSPF tables left over in routingConfig are not checked for RIP
+        config = _config(routingProtocol="RIP", routingConfig={"ospfNetworks": [{"network": "bad"}], "ripNetworks": ["10.0.0.0", "10.0"]})
+        assert _paths(validate_config(config)) == ["routingConfig.ripNetworks[1]"]
+
+    def test_nat_rules(self):
+        assert _paths(validate_config(_config(natOutside="Gi0/9"))) == ["natOutside"]
+        assert _paths(validate_config(_config(natOutside="", dhcpNetwork="", dhcpMask=""))) == ["natOutside", "natType"]
+        static = validate_config(_config(natType="Static", natInsideLocal="192.168.1.10", natInsideGlobal="1.2.3"))
+        assert _paths(static) == ["natInsideGlobal"]
+        assert _paths(validate_config(_config(natType="Dynamic"))) == ["natType"]
+
+    def test_untouched_default_pat_is_not_an_error(self):
+        # web/index.html preselects PAT with empty NAT interfaces and DHCP
+        default = _config(natInside="", natOutside="", dhcpNetwork="", dhcpMask="", dhcpGateway="")
+        assert validate_config(default) == []
+        # Once a NAT interface is chosen, PAT needs the rest of its inputs
+        started = _config(natInside="", dhcpNetwork="", dhcpMask="", dhcpGateway="")
+        assert _paths(validate_config(started)) == ["natType"]
+        assert _paths(validate_config(_config(natOutside=""))) == ["natOutside"]
+
+    def test_default_form_generates(self):
+        form = {"hostname": "R1", "interfaces": ["Gi0/0"], "networks": [["192.168.1.1", "255.255.255.0"]],
+                "natType": "PAT", "routingProtocol": "None"}
+        text = main.process_text(form)
+        assert not text.startswith("{") and "hostname R1" in text
+        assert "ip nat" not in text
+        # DHCP filled in but no outside interface: the PAT block is skipped, not half-rendered
+        text = main.process_text(dict(form, dhcpNetwork="192.168.1.0", dhcpMask="255.255.255.0"))
+        assert not text.startswith("{") and "overload" not in text
+
+    def test_snmp_rules(self):
+        assert validate_config(_config(snmpEnabled=False, snmpCommunityRo="bad community")) == []
+        errors = validate_config(_config(snmpCommunityRo="bad community", snmpCommunityRw="x" * 33, snmpTrapHost="10.0.0"))
+        assert _paths(errors) == ["snmpCommunityRo", "snmpCommunityRw", "snmpTrapHost"]
+        assert _paths(validate_config(_config(snmpCommunityRo="", snmpTrapHost=""))) == ["snmpCommunityRo"]
+
+    def test_malformed_values_do_not_stop_other_checks(self):
+        errors = validate_config(_config(hostname="1Edge", networks=[[None, 5]], routingConfig={"processId": "10", "ospfNetworks": "x"}))
+        assert _paths(errors) == ["hostname", "networks[0].ip", "networks[0].mask", "routingConfig.ospfNetworks"]
+        assert validate_config(None)[0]["path"] == ""
+
+    def test_validate_many_keeps_input_order(self):
+        results = validate_many([_config(), _config(hostname="1Edge"), _config(routerId="")])
+        assert [_paths(errors) for errors in results] == [[], ["hostname"], ["routerId"]]
+
+
+def test_request_error_carries_all_errors():
+    with pytest.raises(RequestError) as info:
+        build_generation_kwargs(_config(hostname="1Edge", dhcpDns="127.0.0.1"))
+    payload = info.value.to_payload()
+    assert payload["code"] == "ERR-VAL-006"
+    assert payload["defaultMessage"] == payload["errors"][0]["message"]
+    assert _paths(payload["errors"]) == ["hostname", "dhcpDns"]
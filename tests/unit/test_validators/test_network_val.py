@@ -1,5 +1,7 @@
+import ipaddress
+
 import pytest
-from backend.validate import (validate_general, validate_ip, validate_mask, validate_dhcp, validate_inputs)
+from backend.validate import (validate_general, validate_ip, validate_mask, validate_dhcp, validate_inputs, validate_router_id)
 
 class TestNetworkValidation:
     
@@ -64,3 +66,54 @@ class TestNetworkValidation:
     def test_validate_inputs_missing_fields(self):
         invalid_networks = [("192.168.1.1", "")]
         assert "заповніть усі поля" in validate_inputs(invalid_networks)
+
+
+def _reference_validate_ip(ip):
+    # validate_ip() as it was implemented on top of ipaddress
+    try:
+        addr = ipaddress.ip_address(ip)
+    except (ValueError, TypeError):
+        return f"❌ Error: Неправильний формат IP-адреси '{ip}'."
+    if (addr.is_multicast or addr.is_loopback or addr.is_reserved) and str(addr) != "255.255.255.255":
+        return f"❌ Error: IP '{ip}' є зарезервованим (multicast, loopback тощо)."
+    return ""
+
+
+class TestParsedValidators:
+
+    @pytest.mark.parametrize("ip", [
+        "192.168.1.1", "0.0.0.0", "127.0.0.1", "126.255.255.255", "128.0.0.1", "223.255.255.255", "224.0.0.5",
+        "239.255.255.255", "240.0.0.1", "255.255.255.254", "255.255.255.255", "01.2.3.4", "1.2.3", "1.2.3.4 ",
+        "", "2001:db8::1", "::1", "ff02::1", "1.2.3.4:80", None, 3232235777,
+    ])
+    def test_validate_ip_matches_ipaddress(self, ip):
+        if not isinstance(ip, str):
+            assert validate_ip(ip) == f"❌ Error: Неправильний формат IP-адреси '{ip}'."
+        else:
+            assert validate_ip(ip) == _reference_validate_ip(ip)
+
+    @pytest.mark.parametrize("args", [
+        ("192.168.1.0", "24", "192.168.1.254", ""),
+        ("192.168.1.0", "0.0.0.255", "192.168.1.1", ""),  # hostmask, as ipaddress accepts it
+        ("192.168.1.1", "24", "192.168.1.2", ""),
+        ("192.168.1.0", "24", "not-an-ip", ""),
+        ("192.168.1.0", "24", "192.168.2.1", ""),
+    ])
+    def test_validate_dhcp_matches_ipaddress(self, args):
+        network, mask, gateway, _ = args
+        try:
+            inside = ipaddress.ip_address(gateway) in ipaddress.ip_network(f"{network}/{mask}")
+            expected = "" if inside else "❌ Error: Gateway не в межах DHCP мережі."
+        except ValueError:
+            expected = "❌ Error: Некоректна DHCP мережа/маска."
+        assert validate_dhcp(*args) == expected
+
+    def test_failures_do_not_write_to_stdout(self, capsys):
+        assert validate_ip("999.1.1.1") and validate_mask("255.0.255.0") and validate_router_id("x", "OSPF")
+        assert validate_inputs([("1.2.3", "99")])
+        assert capsys.readouterr().out == ""
+
+    def test_validate_general_unicode_letters(self):
+        # \w in the pattern keeps str.isalnum() semantics
+        assert validate_general("Київ-1") == ""
+        assert "недопустимі символи" in validate_general("a+b")
@@ -0,0 +1,89 @@
+import pytest
+from backend.nexthop import unresolved_next_hops
+from backend.request import RequestError, build_generation_kwargs
+from backend.validate import validate_config
+
+
+def _route(dest, mask, next_hop="", **extra):
+    return dict(dest=dest, mask=mask, nextHop=next_hop, **extra)
+
+
+def _config(*routes, **overrides):
+    config = {
+        "hostname": "Edge1",
+        "interfaces": ["Gi0/0", "Gi0/1"],
+        "networks": [["10.0.0.1", "30"], ["192.168.1.1", "24"]],
+        "routingProtocol": "STATIC",
+        "routingConfig": {"staticRoutes": list(routes)},
+    }
+    config.update(overrides)
+    return config
+
+
+def _paths(errors):
+    return [error["path"] for error in errors]
+
+
+class TestNextHopResolution:
+
+    def test_connected_and_recursive_next_hops_resolve(self):
+        config = _config(
+            _route("0.0.0.0", "0", "10.0.0.2"),
+            # Recursive: 172.16.0.1 only matches the default route
+            _route("172.16.0.0", "16", "172.31.255.1"),
+            # Recursive through a more specific route, given after it
+            _route("10.20.0.0", "16", "10.10.0.1"),
+            _route("10.10.0.0", "16", "192.168.1.254"),
+            _route("203.0.113.0", "24", interface="Gi0/0"),
+        )
+        assert unresolved_next_hops(config) == []
+
+    def test_next_hop_outside_every_network(self):
+        errors = unresolved_next_hops(_config(_route("172.16.0.0", "16", "10.5.5.5")))
+        assert errors == [{
+            "path": "routingConfig.staticRoutes[0].nextHop",
+            "message": "❌ Error: Next-hop 10.5.5.5 недосяжний: адреса не входить у жодну підключену мережу і не покривається іншими маршрутами.",
+        }]
+
+    def test_own_address(self):
+        errors = unresolved_next_hops(_config(_route("172.16.0.0", "16", "192.168.1.1")))
+        assert errors[0]["message"] == "❌ Error: Next-hop 192.168.1.1 — власна адреса роутера на інтерфейсі Gi0/1 (networks[1])."
+
+    def test_loops_are_detected(self):
+        errors = unresolved_next_hops(_config(
+            _route("0.0.0.0", "0", "8.8.8.8"),
+            _route("10.9.0.0", "16", "10.8.0.1"),
+            _route("10.8.0.0", "16", "10.9.0.1"),
+            _route("172.16.0.0", "12", "10.8.5.5"),
+        ))
+        assert _paths(errors) == [f"routingConfig.staticRoutes[{i}].nextHop" for i in range(4)]
+        assert "лише через сам маршрут 0.0.0.0/0" in errors[0]["message"]
+        assert "по циклу маршрутів: 10.9.0.0/16 → 10.8.0.0/16 → 10.9.0.0/16" in errors[1]["message"]
+        assert "через маршрут 10.8.0.0/16 (routingConfig.staticRoutes[2]), next-hop якого недосяжний" in errors[3]["message"]
+
+    def test_any_equal_route_is_enough(self):
+        # Two routes for the same prefix, one of them resolvable
+        config = _config(
+            _route("10.50.0.0", "16", "10.77.0.1"),
+            _route("10.50.0.0", "16", "10.0.0.2"),
+            _route("172.16.0.0", "16", "10.50.1.1"),
+        )
+        assert _paths(unresolved_next_hops(config)) == ["routingConfig.staticRoutes[0].nextHop"]
+
+    def test_only_static_protocol_and_valid_routes(self):
+        route = _route("172.16.0.0", "16", "10.5.5.5")
+        assert unresolved_next_hops(_config(route, routingProtocol="OSPF")) == []
+        assert unresolved_next_hops(_config(_route("172.16.0.1", "16", "10.5.5.5"), _route("172.17.0.0", "16", "bad"))) == []
+
+
+class TestValidationIntegration:
+
+    def test_validate_config_reports_unresolved_routes(self):
+        errors = validate_config(_config(_route("172.16.0.0", "16", "10.5.5.5"), _route("172.17.0.0", "16", "10.0.0.2")))
+        assert _paths(errors) == ["routingConfig.staticRoutes[0].nextHop"]
+
+    def test_generation_is_blocked(self):
+        with pytest.raises(RequestError) as info:
+            build_generation_kwargs(_config(_route("172.16.0.0", "16", "10.5.5.5")))
+        assert info.value.code == "ERR-VAL-006"
+        assert build_generation_kwargs(_config(_route("172.16.0.0", "16", "10.0.0.2")))["routing_protocol"] == "STATIC"
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+from backend.overlap import address_conflicts, find_overlaps
+from backend.request import RequestError, build_generation_kwargs
+from backend.validate import validate_config
+
+
+def _config(**overrides):
+    config = {
+        "interfaces": ["Gi0/0", "Gi0/1", "Gi0/2"],
+        "networks": [["192.168.1.1", "255.255.255.0"], ["203.0.113.2", "255.255.255.252"], ["10.0.0.1", "255.255.0.0"]],
+        "dhcpNetwork": "192.168.1.0",
+        "dhcpMask": "255.255.255.0",
+        "natType": "Static",
+        "natOutside": "Gi0/1",
+        "natInsideLocal": "192.168.1.10",
+        "natInsideGlobal": "203.0.113.1",
+        "routingProtocol": "STATIC",
+        "routingConfig": {"staticRoutes": [
+            {"dest": "0.0.0.0", "mask": "0", "nextHop": "203.0.113.1"},
+            {"dest": "172.16.0.0", "mask": "12", "nextHop": "10.0.0.2"},
+        ]},
+    }
+    config.update(overrides)
+    return config
+
+
+def _paths(errors):
+    return [error["path"] for error in errors]
+
+
+class TestFindOverlaps:
+
+    def test_matches_pairwise_check(self):
+        rng = random.Random(7)
+        intervals = []
+        for _ in range(400):
+            start = rng.randrange(0, 1 << 16)
+            intervals.append((start, start + rng.randrange(0, 300)))
+        expected = {
+            (i, j) for i in range(len(intervals)) for j in range(i + 1, len(intervals))
+            if intervals[i][0] <= intervals[j][1] and intervals[j][0] <= intervals[i][1]
+        }
+        assert {tuple(sorted(pair)) for pair in find_overlaps(intervals)} == expected
+
+    def test_touching_intervals_do_not_overlap(self):
+        assert find_overlaps([(0, 255), (256, 511)]) == []
+        assert find_overlaps([(0, 255), (255, 511)]) == [(0, 1)]
+
+    def test_passive_pairs_are_skipped(self):
+        intervals = [(0, 1023), (0, 255), (100, 200)]
+        assert sorted(find_overlaps(intervals, anchors=[False, False, True])) == [(0, 2), (1, 2)]
+
+
+class TestAddressConflicts:
+
+    def test_consistent_request_has_no_conflicts(self):
+        assert address_conflicts(_config()) == []
+
+    def test_duplicate_interface_address(self):
+        errors = address_conflicts(_config(networks=[["192.168.1.1", "24"], ["203.0.113.2", "30"], ["192.168.1.1", "24"]]))
+        assert errors == [{
+            "path": "networks[2].ip",
+            "message": "❌ Error: Адреса 192.168.1.1 вже призначена інтерфейсу Gi0/0 (networks[0]).",
+        }]
+
+    def test_overlapping_interface_subnets(self):
+        errors = address_conflicts(_config(networks=[["10.0.5.1", "24"], ["203.0.113.2", "30"], ["10.0.0.1", "16"]]))
+        assert _paths(errors) == ["networks[2].ip"]
+        assert "10.0.0.0/16 перетинається з мережею 10.0.5.0/24 інтерфейсу Gi0/0" in errors[0]["message"]
+
+    def test_dhcp_pool_must_stay_inside_its_subnet(self):
+        errors = address_conflicts(_config(dhcpNetwork="192.168.0.0", dhcpMask="255.255.0.0"))
+        assert _paths(errors) == ["dhcpNetwork"]
+        # A pool inside another interface's subnet is fine
+        assert address_conflicts(_config(dhcpNetwork="10.0.8.0", dhcpMask="255.255.255.0")) == []
+
+    def test_nat_inside_global(self):
+        assert _paths(address_conflicts(_config(natInsideGlobal="203.0.113.2"))) == ["natInsideGlobal"]
+        errors = address_conflicts(_config(natInsideGlobal="192.168.1.20"))
+        assert _paths(errors) == ["natInsideGlobal", "natInsideGlobal"]
+        assert "внутрішню мережу 192.168.1.0/24" in errors[0]["message"] and "DHCP-пул" in errors[1]["message"]
+        assert address_conflicts(_config(natType="PAT", natInsideGlobal="192.168.1.20")) == []
+
+    def test_static_route_equal_to_connected_network(self):
+        routes = [{"dest": "0.0.0.0", "mask": "0"}, {"dest": "10.0.0.0", "mask": "/16"}, {"dest": "10.0.0.0", "mask": "8"}]
+        errors = address_conflicts(_config(routingConfig={"staticRoutes": routes}))
+        assert _paths(errors) == ["routingConfig.staticRoutes[1].dest"]
+        assert "10.0.0.0/16" in errors[0]["message"]
+        # Routes are only rendered for the STATIC protocol
+        assert address_conflicts(_config(routingProtocol="OSPF", routingConfig={"staticRoutes": routes})) == []
+
+    def test_more_specific_route_via_connected_neighbour(self):
+        # Connected 10.0.0.0/16, a /24 inside it reached through 10.0.0.2
+        routes = [{"dest": "10.0.5.0", "mask": "24", "nextHop": "10.0.0.2"}, {"dest": "192.168.1.128", "mask": "25", "nextHop": "192.168.1.2"}]
+        assert address_conflicts(_config(routingConfig={"staticRoutes": routes})) == []
+        assert validate_config(_config(routingConfig={"staticRoutes": routes})) == []
+
+    def test_invalid_entries_are_left_to_field_rules(self):
+        config = _config(networks=[["192.168.1.1", "24"], ["bad", "30"], ["192.168.1.1", "x"]], dhcpNetwork="192.168.1.1")
+        assert address_conflicts(config) == []
+
+
+class TestValidationIntegration:
+
+    def test_validate_config_reports_conflicts_after_field_errors(self):
+        errors = validate_config(_config(hostname="1R", networks=[["192.168.1.1", "24"], ["203.0.113.2", "30"], ["192.168.1.1", "24"]]))
+        assert _paths(errors) == ["hostname", "networks[2].ip"]
+
+    def test_request_rejects_conflicts(self):
+        with pytest.raises(RequestError) as info:
+            build_generation_kwargs(_config(networks=[["192.168.1.1", "24"], ["203.0.113.2", "30"], ["192.168.1.2", "24"]]))
+        assert _paths(info.value.errors) == ["networks[2].ip"]
+
+    def test_placeholder_networks_are_not_duplicates(self):
+        kwargs = build_generation_kwargs({"interfaces": ["Gi0/0", "Gi0/1"]})
+        assert len(kwargs["networks"]) == 2
@@ -0,0 +1,74 @@
+import random
+
+from backend.addrmath import parse_address
+from backend.prefix_trie import PrefixTrie
+
+
+def _random_prefixes(rng, count):
+    prefixes = []
+    for item in range(count):
+        length = rng.choice([0, 1, 8, 12, 16, 16, 24, 24, 24, 30, 32])
+        # Most prefixes share the top bits so that they nest and collide
+        value = rng.getrandbits(32) & (0xFFF00000 if rng.random() < 0.7 else 0xFFFFFFFF)
+        prefixes.append((value, length, item))
+    return prefixes
+
+
+def _contains(value, length, address, address_length):
+    mask = (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+    return length <= address_length and (value ^ address) & mask == 0
+
+
+class TestPrefixTrie:
+
+    def test_bulk_insert_matches_single_inserts(self):
+        prefixes = _random_prefixes(random.Random(3), 2000)
+        bulk = PrefixTrie()
+        bulk.insert_many(prefixes)
+        single = PrefixTrie()
+        for prefix in prefixes:
+            single.insert(*prefix)
+        mixed = PrefixTrie()
+        mixed.insert_many(prefixes[:700])
+        mixed.insert_many(prefixes[700:])
+        assert list(bulk) == list(single) == list(mixed)
+        assert len(bulk) == len({(value & ((0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF), length) for value, length, _ in prefixes})
+
+    def test_items_keep_insertion_order(self):
+        trie = PrefixTrie()
+        trie.insert_many([(0x0A000001, 24, "a"), (0x0A000000, 8, "core"), (0x0A0000FF, 24, "b")])
+        assert list(trie) == [(0x0A000000, 8, ["core"]), (0x0A000000, 24, ["a", "b"])]
+
+    def test_covering_and_longest_match(self):
+        rng = random.Random(5)
+        prefixes = _random_prefixes(rng, 1500)
+        trie = PrefixTrie()
+        trie.insert_many(prefixes)
+        stored = {(value, length): items for value, length, items in trie}
+        for _ in range(2000):
+            address = rng.getrandbits(32) & (0xFFF00000 | rng.getrandbits(32))
+            address_length = rng.choice([32, 24, 8, 0])
+            expected = sorted(
+                ((value, length, items) for (value, length), items in stored.items()
+                 if _contains(value, length, address, address_length)),
+                key=lambda entry: entry[1],
+            )
+            assert trie.covering(address, address_length) == expected
+            assert trie.longest_match(address, address_length) == (expected[-1] if expected else None)
+
+    def test_walk_yields_ancestors(self):
+        trie = PrefixTrie()
+        trie.insert_many([
+            (parse_address("10.0.0.0"), 8, "core"),
+            (parse_address("10.1.0.0"), 16, "region"),
+            (parse_address("10.1.2.0"), 24, "branch"),
+            (parse_address("10.2.0.0"), 16, "other"),
+        ])
+        walked = {items[0]: [outer[0] for outer in ancestors] for _, _, items, ancestors in trie.walk()}
+        assert walked == {"core": [], "region": ["core"], "branch": ["core", "region"], "other": ["core"]}
+
+    def test_empty_trie(self):
+        trie = PrefixTrie()
+        assert len(trie) == 0 and list(trie) == [] and trie.longest_match(0) is None
+        trie.insert(0, 0, "default")
+        assert trie.longest_match(parse_address("192.0.2.1")) == (0, 0, ["default"])
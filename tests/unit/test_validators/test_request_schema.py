@@ -0,0 +1,151 @@
+import inspect
+
+import pytest
+from backend.generate import iter_full_config
+from backend.request import (
+    GENERATION_ARGS, REQUEST_SCHEMA, GenerationRequest, RequestError,
+    _normalize_fields, build_generation_kwargs, normalize_request,
+)
+
+
+BASE = {
+    "hostname": "Edge1",
+    "interfaces": ["Gi0/0", "Gi0/1"],
+    "networks": [["10.0.0.1", "30"], ["192.168.1.1", "24"]],
+}
+
+
+def _request(**overrides):
+    return normalize_request(dict(BASE, **overrides))
+
+
+class _CountingForm(dict):
+    """Form dict that records every key read through get()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = []
+
+    def get(self, key, default=None):
+        self.reads.append(key)
+        return super().get(key, default)
+
+
+class TestSchema:
+
+    def test_generation_args_match_generate_full_config(self):
+        accepted = set(inspect.signature(iter_full_config).parameters)
+        assert set(GENERATION_ARGS) <= accepted
+        assert len(set(GENERATION_ARGS)) == len(GENERATION_ARGS)
+
+    def test_each_form_key_is_read_once(self):
+        form = _CountingForm(BASE)
+        _normalize_fields(form)
+        keys = [key for _name, key, _kind, _default in REQUEST_SCHEMA]
+        assert form.reads == keys
+
+    def test_request_has_slots_only(self):
+        request = _request()
+        assert not hasattr(request, "__dict__")
+        with pytest.raises(AttributeError):
+            request.unknown_field = 1
+
+    def test_as_kwargs_matches_build_generation_kwargs(self):
+        form = dict(BASE, dhcpGateway="192.168.1.1", enableSsh=True)
+        kwargs = normalize_request(form).as_kwargs()
+        assert kwargs == build_generation_kwargs(form)
+        assert tuple(kwargs) == GENERATION_ARGS
+
+    def test_repr_lists_fields(self):
+        assert "hostname='Edge1'" in repr(_request())
+        assert repr(_request()).startswith(f"{GenerationRequest.__name__}(")
+
+
+class TestFieldNormalization:
+
+    def test_text_fields_are_stripped(self):
+        request = _request(hostname="  Edge2 ", domainName=" corp.lab ", interfaces=[" Gi0/0", "Gi0/1 "])
+        assert (request.hostname, request.domain_name) == ("Edge2", "corp.lab")
+        assert request.interfaces == ["Gi0/0", "Gi0/1"]
+
+    def test_missing_and_none_values_fall_back_to_defaults(self):
+        request = _request(adminUsername=None, natType=None, routingConfig=None)
+        assert request.admin_username == "admin"
+        assert request.domain_name == "local.lab"
+        assert request.nat_type == "None"
+        assert request.routing_config == {}
+        assert request.descriptions == [] and request.no_shutdown_interfaces == []
+
+    def test_empty_hostname_uses_default(self):
+        assert _request(hostname="   ").hostname == "R1"
+        assert _request(autoAssignRange="").auto_assign_range == "1 to 3"
+
+    def test_counts_accept_strings_and_ignore_lists(self):
+        request = _request(maxEphones="12", maxDn=["1", "2"])
+        assert (request.max_ephones, request.max_dn) == (12, 3)
+
+    def test_flags_are_bools(self):
+        request = _request(enableSsh=1, ipMulticast="", telephonyEnabled=None)
+        assert (request.enable_ssh, request.ip_multicast, request.telephony_enabled) == (True, False, False)
+
+    def test_defaults_are_not_shared_between_requests(self):
+        first, second = _request(), _request()
+        first.routing_config["ospfArea"] = "0"
+        assert second.routing_config == {}
+
+
+class TestNetworks:
+
+    def test_missing_networks_become_placeholders(self):
+        request = _request(networks=None)
+        assert request.placeholder_networks
+        assert request.networks == [("192.168.1.1", "255.255.255.0")] * 2
+
+    def test_network_count_builds_placeholders(self):
+        request = _request(networks=2)
+        assert request.placeholder_networks and len(request.networks) == 2
+
+    @pytest.mark.parametrize("networks, code", [
+        (-1, "ERR-VAL-002"),
+        ("10.0.0.1/30", "ERR-VAL-003"),
+        ([["10.0.0.1", "30"]], "ERR-VAL-004"),
+    ])
+    def test_invalid_networks(self, networks, code):
+        with pytest.raises(RequestError) as excinfo:
+            _request(networks=networks)
+        assert excinfo.value.code == code
+
+    def test_no_interfaces(self):
+        with pytest.raises(RequestError) as excinfo:
+            normalize_request(None)
+        assert excinfo.value.code == "ERR-VAL-001"
+
+    def test_validation_errors_are_collected(self):
+        with pytest.raises(RequestError) as excinfo:
+            _request(hostname="bad host", networks=[["10.0.0.1", "30"], ["10.0.0.1", "30"]])
+        assert excinfo.value.code == "ERR-VAL-006"
+        assert len(excinfo.value.errors) >= 2
+
+
+class TestDerivedFields:
+
+    @pytest.mark.parametrize("overrides, expected", [
+        ({"cmeSourceIp": "10.0.0.1", "dhcpGateway": "192.168.1.1"}, "10.0.0.1"),
+        ({"dhcpGateway": "192.168.1.1"}, "192.168.1.1"),
+        ({}, "10.0.0.1"),
+        ({"networks": [["192.168.1.1", "24"], ["10.0.0.1", "30"]]}, "192.168.1.1"),
+        ({"networks": 2}, "10.0.0.1"),
+    ])
+    def test_ip_source_address(self, overrides, expected):
+        assert _request(**overrides).ip_source_address == expected
+
+    @pytest.mark.parametrize("overrides, expected", [
+        ({"dhcpExcludedFrom": "192.168.1.1", "dhcpExcludedTo": "192.168.1.20"}, ("192.168.1.1", "192.168.1.20")),
+        ({"dhcpExcludedFrom": "192.168.1.1"}, ("192.168.1.1",)),
+        ({"dhcpExcluded": [" 192.168.1.1 ", "192.168.1.5"]}, ("192.168.1.1", "192.168.1.5")),
+        ({"dhcpGateway": "192.168.1.1"}, ("192.168.1.1", "192.168.1.10")),
+        ({"dhcpGateway": "192.168.1.250"}, ("192.168.1.250",)),
+        ({}, ()),
+    ])
+    def test_dhcp_excluded(self, overrides, expected):
+        assert _request(**overrides).dhcp_excluded == expected
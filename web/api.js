@@ -41,9 +41,21 @@ function _updateDeployButton() {
 }
 
 // ===================== ГЕНЕРАЦІЯ КОНФІГУРАЦІЇ =====================
+// Ідентифікатор сесії прев'ю: бекенд пам'ятає попередні секції і
+// перерендерює лише ті, що залежать від змінених полів.
+const _previewSessionId = "s" + Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+
+// Текст помилки генерації: усі помилки валідації з шляхами полів, якщо є.
+function _validationErrorsText(parsed) {
+    if (Array.isArray(parsed.errors) && parsed.errors.length) {
+        return parsed.errors.map(e => (e.path ? e.path + ": " : "") + e.message).join("\n");
+    }
+    return "Error: " + (parsed.defaultMessage || "Generation failed.");
+}
+
 async function sendToPython(configData) {
     try {
-        const res = await eel.process_text(configData)();
+        const res = await eel.preview_config(configData, _previewSessionId)();
 
         // Перевіряємо, чи повернув Python JSON-помилку
         try {
@@ -54,7 +66,7 @@ async function sendToPython(configData) {
 
                 const responseDiv = document.getElementById("response");
                 if (responseDiv) {
-                    responseDiv.innerText = "Error: " + (parsed.defaultMessage || "Generation failed.");
+                    responseDiv.innerText = _validationErrorsText(parsed);
                     responseDiv.style.color = "#aa0000";
                 }
                 _setConfigGenerated(false);
@@ -185,26 +197,43 @@ async function deployToRouter() {
         deployBtn.textContent = "⏳ Відправка...";
     }
 
-    _showDeployLog("⏳ Відправка " + configText.split('\n').length + " команд на роутер...", "info");
-
     try {
-        const res = await eel.deploy_config(configText)();
+        const delta = !!document.getElementById("deploy-delta")?.checked;
+        if (delta && !(await _confirmDelta(configText))) return;
+
+        _showDeployLog("⏳ Відправка " + configText.split('\n').length + " команд на роутер...", "info");
+        const pipelined = !!document.getElementById("deploy-pipelined")?.checked;
+        const transfer = !!document.getElementById("deploy-transfer")?.checked;
+        const stopOnError = !!document.getElementById("deploy-stop-on-error")?.checked;
+        _deployProgress = { lines: [], errors: 0 };
+        const res = await eel.deploy_config(configText, delta, pipelined, transfer, stopOnError)();
         const parsed = JSON.parse(res);
 
         if (parsed.ok) {
+            const sentInfo = delta ? " (надіслано команд: " + (parsed.sent ?? 0) + ")" : "";
+            const errors = parsed.errors || [];
+            const errorInfo = errors.length
+                ? "\n\n⚠️ Роутер відхилив команд: " + errors.length + "\n" + errors.map(e =>
+                    (e.line ? "рядок " + e.line + ": " : "") + e.command + " — " + e.message
+                ).join("\n")
+                : "";
             _showDeployLog(
-                "✅ Конфігурація успішно застосована!\n\n--- Вивід роутера ---\n" + (parsed.output || "(немає виводу)"),
-                "success"
+                (errors.length ? "⚠️ Конфігурацію застосовано з помилками" : "✅ Конфігурація успішно застосована!") + sentInfo + errorInfo
+                    + "\n\n--- Вивід роутера ---\n" + (parsed.output || "(немає виводу)") + _outputFileNote(parsed),
+                errors.length ? "error" : "success"
             );
         } else {
             _showDeployLog(
-                "❌ Помилка деплою: " + (parsed.error || "Unknown error"),
+                "❌ Помилка деплою: " + (parsed.error || "Unknown error")
+                    + (parsed.aborted ? "\nНадіслано команд: " + parsed.sent + ". write memory не виконано." : "")
+                    + (parsed.output ? "\n\n--- Вивід роутера ---\n" + parsed.output + _outputFileNote(parsed) : ""),
                 "error"
             );
         }
     } catch (err) {
         _showDeployLog("❌ Критична помилка: " + err.message, "error");
     } finally {
+        _deployProgress = null;
         if (deployBtn) {
             deployBtn.textContent = "🚀 Застосувати на роутері";
             _updateDeployButton();
@@ -212,6 +241,82 @@ async function deployToRouter() {
     }
 }
 
+// Дельта-деплой видаляє з роутера керовані майстром рядки, яких немає в
+// згенерованій конфігурації (backend/config_diff.py, REMOVABLE): перед
+// надсиланням показуємо їх і просимо підтвердження.
+async function _confirmDelta(configText) {
+    _showDeployLog("⏳ Порівняння з running-config...", "info");
+    const preview = JSON.parse(await eel.preview_deploy(configText)());
+    if (!preview.ok) {
+        _showDeployLog("❌ Не вдалося обчислити зміни: " + (preview.error || "Unknown error"), "error");
+        return false;
+    }
+    if (!preview.commands.length) {
+        _showDeployLog("✅ Конфігурація роутера вже актуальна, надсилати нічого.", "success");
+        return false;
+    }
+    const removals = preview.removals || [];
+    if (removals.length) {
+        const list = removals.map(line => "  - " + line).join("\n");
+        _showDeployLog("⚠️ Буде видалено з роутера (" + removals.length + "):\n" + list, "error");
+        if (!confirm("Дельта-деплой видалить з роутера " + removals.length + " рядків:\n\n" + list + "\n\nПродовжити?")) {
+            _showDeployLog("⏹ Деплой скасовано. Рядки, які було б видалено:\n" + list, "info");
+            return false;
+        }
+    }
+    return true;
+}
+
+// ===================== ПРОГРЕС ДЕПЛОЮ =====================
+// Python надсилає події {"sent", "total", "output", "errors"} під час
+// деплою (backend/connect.py); у лозі лишаються останні рядки виводу.
+const _DEPLOY_LOG_LINES = 500;
+let _deployProgress = null;
+
+function _onDeployProgress(eventJson) {
+    if (!_deployProgress) return;
+    const event = JSON.parse(eventJson);
+    const progress = _deployProgress;
+    if (event.output) {
+        progress.lines.push(...event.output.split("\n"));
+        if (progress.lines.length > _DEPLOY_LOG_LINES) {
+            progress.lines.splice(0, progress.lines.length - _DEPLOY_LOG_LINES);
+        }
+    }
+    progress.errors += event.errors.length;
+
+    const deployBtn = document.getElementById("deploy-btn");
+    if (deployBtn) {
+        deployBtn.textContent = "⏳ " + event.sent + " / " + event.total;
+    }
+    const header = "⏳ Надіслано " + event.sent + " з " + event.total + " команд"
+        + (progress.errors ? " (помилок: " + progress.errors + ")" : "");
+    _showDeployLog(header + "\n\n" + progress.lines.join("\n"), progress.errors ? "error" : "info");
+}
+eel.expose(_onDeployProgress, "crw_deploy_progress");
+
+function _outputFileNote(parsed) {
+    return parsed.output_file ? "\n\n(повний вивід: " + parsed.output_file + ")" : "";
+}
+
+// ===================== СТАН ФОНОВИХ ЗАВДАНЬ =====================
+// Python (backend/tasks.py) виконує connect/deploy у пулі потоків і
+// повідомляє про зміну стану: {"id", "name", "state", "elapsed"}.
+const _TASK_LABELS = {
+    connect: { queued: "У черзі...", running: "Підключення..." },
+    deploy: { queued: "⏳ У черзі...", running: "⏳ Відправка..." },
+};
+
+function _onTaskUpdate(eventJson) {
+    const event = JSON.parse(eventJson);
+    const label = (_TASK_LABELS[event.name] || {})[event.state];
+    const button = document.getElementById(event.name === "connect" ? "connect-btn" : "deploy-btn");
+    if (label && button && button.disabled) {
+        button.textContent = label;
+    }
+}
+eel.expose(_onTaskUpdate, "crw_task_update");
+
 // ===================== УТИЛІТИ =====================
 function _showDeployLog(message, type = "info") {
     const logEl = document.getElementById("deploy-log");